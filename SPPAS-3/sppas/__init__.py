@@ -40,12 +40,14 @@
 Main package of SPPAS: sources, binaries, scripts, translations, etc.
 ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-Import all source packages except those of the UI.
+Import all source packages except those of the UI. Annotations, plugins,
+images and videos are imported on demand.
 
 """
 
 import os
 import sys
+import importlib
 
 try:
     from importlib import reload  # Python 3.4+
@@ -70,11 +72,55 @@ from sppas.src.resources import *
 
 from sppas.src.anndata import *
 from sppas.src.audiodata import *
-from sppas.src.imgdata import *
-from sppas.src.videodata import *
 
-from sppas.src.annotations import *
-from sppas.src.plugins import *
+# ---------------------------------------------------------------------------
+# The following packages are long to import -- mainly because of opencv and
+# numpy. Their classes are imported the first time one of them is requested,
+# for example with "from sppas import sppasImage".
+# ---------------------------------------------------------------------------
+
+_LAZY_PACKAGES = {
+    "sppas.src.annotations": (
+        "SppasFiles", "sppasMomel", "sppasIntsint", "sppasFillIPUs",
+        "sppasSearchIPUs", "sppasTextNorm", "sppasPhon", "sppasAlign",
+        "sppasSyll", "sppasTGA", "sppasIVA", "sppasSelfRepet",
+        "sppasActivity", "sppasRMS", "sppasOtherRepet", "sppasOverActivity",
+        "StopWords", "sppasStopWords", "sppasLexMetric", "sppasReOcc",
+        "sppasFindTier", "sppasParam", "sppasAnnotationsManager",
+        "sppasLexRep", "sppasFaceDetection", "sppasFaceSights",
+        "ImageFaceLandmark", "sppasCuedSpeech"),
+    "sppas.src.plugins": (
+        "sppasPluginsManager", "sppasPluginParam", "sppasPluginProcess"),
+    "sppas.src.imgdata": (
+        "sppasCoords", "sppasImage", "ImageSequence", "sppasImageCompare",
+        "sppasImagesSimilarity", "sppasCoordsCompare",
+        "sppasCoordsImageWriter", "sppasImageCoordsReader",
+        "image_extensions", "HaarCascadeDetector", "NeuralNetONNXDetector",
+        "NeuralNetTensorFlowDetector", "NeuralNetCaffeDetector",
+        "sppasImageObjectDetection"),
+    "sppas.src.videodata": (
+        "sppasVideoReader", "sppasVideoWriter", "sppasImageVideoWriter",
+        "sppasVideoReaderBuffer", "sppasCoordsVideoBuffer",
+        "sppasCoordsVideoWriter", "sppasCoordsVideoReader",
+        "sppasVideoSegments", "video_extensions"),
+}
+
+# The package of each class of the lazy packages
+_LAZY_NAMES = {name: package_name
+               for package_name, names in _LAZY_PACKAGES.items()
+               for name in names}
+
+
+def __getattr__(name):
+    """Import the class of a lazy package when it is requested."""
+    if name not in _LAZY_NAMES:
+        raise AttributeError(
+            "module {:s} has no attribute {:s}".format(__name__, name))
+
+    package = importlib.import_module(_LAZY_NAMES[name])
+    value = getattr(package, name)
+    globals()[name] = value
+    return value
 
 # ---------------------------------------------------------------------------
 
@@ -49,90 +49,111 @@ from sppas.src.models import sppasNgramsModel
 from sppas.src.models import sppasArpaIO
 
 
-# ----------------------------------------------------------------------------
-# Verify and extract args:
 # ----------------------------------------------------------------------------
 
-parser = ArgumentParser(usage="%s -i file " % os.path.basename(PROGRAM),
-                        description="... a script to train a statistical language model.")
 
-parser.add_argument("-i",
-                    metavar="input",
-                    action='append',
-                    help='Input file name of the training corpus.')
+def main():
+    """Train a statistical language model from the arguments of the command line.
 
-parser.add_argument("-r",
-                    metavar="vocab",
-                    required=False,
-                    help='List of known words.')
+    The processes counting the n-grams re-import this script: it must not
+    do anything when it is imported.
 
-parser.add_argument("-n",
-                    metavar="order",
-                    required=False,
-                    default=3,
-                    type=int,
-                    help='N-gram order value (default=1).')
+    """
+    # ------------------------------------------------------------------------
+    # Verify and extract args:
+    # ------------------------------------------------------------------------
 
-parser.add_argument("-m",
-                    metavar="method",
-                    required=False,
-                    default="logml",
-                    type=str,
-                    help='Method to estimates probabilities (one of: raw, lograw, ml, logml).')
+    parser = ArgumentParser(usage="%s -i file " % os.path.basename(PROGRAM),
+                            description="... a script to train a statistical language model.")
 
-parser.add_argument("-o",
-                    metavar="output",
-                    help='Output file name.')
+    parser.add_argument("-i",
+                        metavar="input",
+                        action='append',
+                        help='Input file name of the training corpus.')
 
-parser.add_argument("--quiet",
-                    action='store_true',
-                    help="Disable the verbosity.")
+    parser.add_argument("-r",
+                        metavar="vocab",
+                        required=False,
+                        help='List of known words.')
 
-args = parser.parse_args()
+    parser.add_argument("-n",
+                        metavar="order",
+                        required=False,
+                        default=3,
+                        type=int,
+                        help='N-gram order value (default=1).')
 
-# ----------------------------------------------------------------------------
-# Main program
-# ----------------------------------------------------------------------------
+    parser.add_argument("-m",
+                        metavar="method",
+                        required=False,
+                        default="logml",
+                        type=str,
+                        help='Method to estimates probabilities (one of: raw, lograw, ml, logml).')
 
-# ---------------------------------
-# 1. Create a sppasNgramsModel
+    parser.add_argument("-o",
+                        metavar="output",
+                        help='Output file name.')
 
-model = sppasNgramsModel(args.n)
-if args.r:
-    model.set_vocab(args.r)
+    parser.add_argument("-p",
+                        metavar="workers",
+                        required=False,
+                        default=1,
+                        type=int,
+                        help='Number of processes to count n-grams of the input files (default=1).')
 
-if args.i:
-    if not args.o:
-        print("-o is required if -i option is used.")
-        sys.exit(1)
+    parser.add_argument("--quiet",
+                        action='store_true',
+                        help="Disable the verbosity.")
 
-    # ---------------------------------
-    # 2. Estimate counts of each n-gram
-    model.count(*(args.i))
+    args = parser.parse_args()
 
     # ---------------------------------
-    # 3. Estimate probabilities
-    probas = model.probabilities(args.m)
+    # 1. Create a sppasNgramsModel
 
-    # ---------------------------------
-    # 4. Write in an ARPA file
-    arpaio = sppasArpaIO()
-    arpaio.set(probas)
-    arpaio.save(args.o)
+    model = sppasNgramsModel(args.n)
+    if args.r:
+        model.set_vocab(args.r)
 
-else:
+    if args.i:
+        if not args.o:
+            print("-o is required if -i option is used.")
+            sys.exit(1)
 
-    # ---------------------------------
-    # 2. Get sentences from stdin
-    all_lines = list()
-    for line in sys.stdin:
-        line = line.strip()
-        all_lines.append(line)
+        # ---------------------------------
+        # 2. Estimate counts of each n-gram
+        model.count(*(args.i), nb_workers=args.p)
+
+        # ---------------------------------
+        # 3. Estimate probabilities, while writing
+        probas = model.probabilities(args.m, stream=True)
+
+        # ---------------------------------
+        # 4. Write in an ARPA file
+        arpaio = sppasArpaIO()
+        arpaio.set(probas)
+        arpaio.save(args.o)
+
+    else:
+
+        # ---------------------------------
+        # 2. Get sentences from stdin
+        all_lines = list()
+        for line in sys.stdin:
+            line = line.strip()
+            all_lines.append(line)
+
+        # ---------------------------------
+        # 3. Estimate counts of each n-gram
+        model.append_sentences(all_lines)
+        probas = model.probabilities(args.m)
+
+        for t in probas[args.n-1]:
+            print("{:s}\t{:d}".format(t[0], t[1]))
+
+# ----------------------------------------------------------------------------
+# Main program
+# ----------------------------------------------------------------------------
 
-    # ---------------------------------
-    # 3. Estimate counts of each n-gram
-    model.append_sentences(all_lines)
-    probas = model.probabilities(args.m)
 
-    for t in probas[args.n-1]:
-        print("{:s}\t{:d}".format(t[0], t[1]))
+if __name__ == "__main__":
+    main()
@@ -42,35 +42,57 @@
 
 """
 
-from .annotationpro import sppasANT
-from .annotationpro import sppasANTX
-from .anvil import sppasAnvil
-from .audacity import sppasAudacity
-from .elan import sppasEAF
-from .htk import sppasLab
-from .phonedit import sppasMRK
-from .phonedit import sppasSignaix
-from .praat import sppasTextGrid
-from .praat import sppasIntensityTier
-from .praat import sppasPitchTier
-from .sclite import sppasCTM
-from .sclite import sppasSTM
-from .subtitle import sppasSubRip
-from .subtitle import sppasSubViewer
-from .subtitle import sppasWebVTT
-from .text import sppasRawText
-from .text import sppasCSV
-from .table import sppasARFF
-from .table import sppasXRFF
-from .table import sppasTRA
-from .xtrans import sppasTDF
-from .xra import sppasXRA
+import importlib
 
 from .aioutils import serialize_label
 from .aioutils import serialize_labels
 from .aioutils import format_label
 from .aioutils import format_labels
 
+# ----------------------------------------------------------------------------
+# Readers/writers are imported on demand: each module is loaded the first
+# time one of its classes is requested, e.g. "from .aio import sppasXRA".
+# ----------------------------------------------------------------------------
+
+_READERS_MODULES = {
+    "sppasANT": "annotationpro",
+    "sppasANTX": "annotationpro",
+    "sppasAnvil": "anvil",
+    "sppasAudacity": "audacity",
+    "sppasEAF": "elan",
+    "sppasLab": "htk",
+    "sppasMRK": "phonedit",
+    "sppasSignaix": "phonedit",
+    "sppasTextGrid": "praat",
+    "sppasIntensityTier": "praat",
+    "sppasPitchTier": "praat",
+    "sppasCTM": "sclite",
+    "sppasSTM": "sclite",
+    "sppasSubRip": "subtitle",
+    "sppasSubViewer": "subtitle",
+    "sppasWebVTT": "subtitle",
+    "sppasRawText": "text",
+    "sppasCSV": "text",
+    "sppasARFF": "table",
+    "sppasXRFF": "table",
+    "sppasTRA": "table",
+    "sppasTDF": "xtrans",
+    "sppasXRA": "xra",
+    "sppasSBA": "binary",
+}
+
+
+def __getattr__(name):
+    """Import the module of a reader/writer class when it is requested."""
+    if name in _READERS_MODULES:
+        module = importlib.import_module(
+            "." + _READERS_MODULES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(
+        "module {:s} has no attribute {:s}".format(__name__, name))
+
 # ----------------------------------------------------------------------------
 # Variables
 # ----------------------------------------------------------------------------
@@ -130,6 +152,7 @@ __all__ = (
     "sppasARFF",
     "sppasXRFF",
     "sppasXRA",
+    "sppasSBA",
     "extensions",
     "extensions_in",
     "extensions_out",
@@ -0,0 +1,617 @@
+# -*- coding: UTF-8 -*-
+"""
+:filename: sppas.src.anndata.aio.binary.py
+:author:   Brigitte Bigi
+:contact:  develop@sppas.org
+:summary:  SPPAS native binary and columnar file format.
+
+.. _This file is part of SPPAS: http://www.sppas.org/
+..
+    -------------------------------------------------------------------------
+
+     ___   __    __    __    ___
+    /     |  \  |  \  |  \  /              the automatic
+    \__   |__/  |__/  |___| \__             annotation and
+       \  |     |     |   |    \             analysis
+    ___/  |     |     |   | ___/              of speech
+
+    Copyright (C) 2011-2021  Brigitte Bigi
+    Laboratoire Parole et Langage, Aix-en-Provence, France
+
+    Use of this software is governed by the GNU Public License, version 3.
+
+    SPPAS is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    SPPAS is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+    This banner notice must not be removed.
+
+    -------------------------------------------------------------------------
+
+SBA -- SPPAS Binary Annotations, is a fast to save and to load format for
+the intermediate files of the automatic annotations.
+
+A SBA file is made of:
+
+    - a header: the magic string, the offset and the size of the directory;
+    - one chunk per column of each tier: arrays of numbers in little-endian
+      order and aligned on 8 bytes, so that they can be memory-mapped;
+    - the directory: a JSON document with the metadata, media, controlled
+      vocabularies, hierarchy and, for each tier, the position of its
+      columns in the file.
+
+The annotations of a tier are stored into columns. Variable-length lists
+(localizations of an annotation, points of a localization, labels of an
+annotation, tags of a label) are represented by an array of pointers:
+the items of the i-th element are in [ptr[i], ptr[i+1]). The labels and
+identifiers are interned: they are stored only once in a table of strings
+and referred by their index.
+
+"""
+
+import os
+import sys
+import json
+import mmap
+import math
+import struct
+from array import array
+from collections import OrderedDict
+
+from ..anndataexc import AioError
+from ..anndataexc import AioFormatError
+from ..anndataexc import AnnDataKeyError
+from ..media import sppasMedia
+from ..ctrlvocab import sppasCtrlVocab
+from ..ann.annlocation import sppasLocation
+from ..ann.annlocation import sppasPoint
+from ..ann.annlocation import sppasInterval
+from ..ann.annlocation import sppasDisjoint
+from ..ann.annlabel import sppasLabel
+from ..ann.annlabel import sppasTag
+
+from .basetrsio import sppasBaseIO
+
+# ---------------------------------------------------------------------------
+
+# magic string, offset of the directory, size of the directory
+SBA_MAGIC = b"SPPASSBA"
+SBA_HEADER = struct.Struct("<8sQQ")
+SBA_ALIGN = 8
+
+# Types of localizations and types of tags, stored as indexes
+LOC_TYPES = ("point", "interval", "disjoint")
+TAG_TYPES = ("str", "float", "int", "bool")
+
+# Name and typecode of the columns of a tier
+SBA_COLUMNS = OrderedDict()
+SBA_COLUMNS["ann_id"] = "I"       # index of the identifier in strings
+SBA_COLUMNS["ann_score"] = "d"    # score of the annotation or nan
+SBA_COLUMNS["loc_ptr"] = "I"      # annotation -> localizations
+SBA_COLUMNS["loc_type"] = "B"     # index in LOC_TYPES
+SBA_COLUMNS["loc_score"] = "d"    # score of the localization or nan
+SBA_COLUMNS["pts_ptr"] = "I"      # localization -> points
+SBA_COLUMNS["midpoint"] = "d"     # midpoint value of the points
+SBA_COLUMNS["radius"] = "d"       # radius of the points or nan
+SBA_COLUMNS["is_int"] = "B"       # 1 if the point is a frame number
+SBA_COLUMNS["lab_ptr"] = "I"      # annotation -> labels
+SBA_COLUMNS["tag_ptr"] = "I"      # label -> tags
+SBA_COLUMNS["tag_str"] = "I"      # index of the tag content in strings
+SBA_COLUMNS["tag_type"] = "B"     # index in TAG_TYPES
+SBA_COLUMNS["tag_score"] = "d"    # score of the tag or nan
+SBA_COLUMNS["str_ptr"] = "I"      # string -> bytes
+SBA_COLUMNS["str_data"] = "B"     # utf-8 encoded strings
+SBA_COLUMNS["ann_meta"] = "B"     # JSON of the annotations extra metadata
+
+# ---------------------------------------------------------------------------
+
+
+def _to_score(value):
+    """Return the stored value of a score: nan means no score."""
+    if value is None:
+        return float("nan")
+    return float(value)
+
+
+def _from_score(value):
+    """Return the score of a stored value: None if nan."""
+    if math.isnan(value):
+        return None
+    return value
+
+# ---------------------------------------------------------------------------
+
+
+class sppasSBA(sppasBaseIO):
+    """SPPAS binary annotations reader and writer.
+
+    SBA files are the native binary format of SPPAS. They are much faster
+    to write and to read than XRA, and a tier can be loaded without reading
+    the others:
+
+        >>> trs = sppasSBA()
+        >>> trs.read("file.sba", tier_names=["PhonAlign"])
+
+    Columns of a tier can also be accessed directly, without creating any
+    annotation, as memory-mapped arrays:
+
+        >>> columns = sppasSBA.load_columns("file.sba", "PhonAlign")
+        >>> columns["midpoint"][:4]
+
+    """
+
+    @staticmethod
+    def detect(filename):
+        """Check whether a file is of SBA format or not.
+
+        :param filename: (str) Name of the file to check.
+        :returns: (bool)
+
+        """
+        try:
+            with open(filename, 'rb') as fp:
+                magic = fp.read(len(SBA_MAGIC))
+        except IOError:
+            return False
+
+        return magic == SBA_MAGIC
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def read_directory(filename):
+        """Return the directory of a SBA file.
+
+        :param filename: (str)
+        :returns: (dict) The JSON directory of the file
+        :raises: AioError, AioFormatError
+
+        """
+        if os.path.exists(filename) is False:
+            raise AioError(filename)
+
+        with open(filename, 'rb') as fp:
+            header = fp.read(SBA_HEADER.size)
+            if len(header) != SBA_HEADER.size:
+                raise AioFormatError(filename)
+            magic, offset, size = SBA_HEADER.unpack(header)
+            if magic != SBA_MAGIC:
+                raise AioFormatError(filename)
+            fp.seek(offset)
+            return json.loads(fp.read(size).decode("utf-8"))
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def get_tier_names(filename):
+        """Return the list of tier names of a SBA file, without reading them.
+
+        :param filename: (str)
+        :returns: (list of str)
+
+        """
+        directory = sppasSBA.read_directory(filename)
+        return [t["name"] for t in directory["tiers"]]
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def load_columns(filename, tier_name):
+        """Return the columns of a tier, as memory-mapped arrays.
+
+        The returned arrays are read-only memoryview() of the file content:
+        nothing is copied, nothing is read from the disk until an item is
+        accessed.
+
+        :param filename: (str)
+        :param tier_name: (str) Name of the tier
+        :returns: (dict) key=column name, value=memoryview
+        :raises: AnnDataKeyError
+
+        """
+        directory = sppasSBA.read_directory(filename)
+        tier_dir = sppasSBA.__find_tier(directory, tier_name)
+        with open(filename, 'rb') as fp:
+            buffer = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return sppasSBA.__columns(memoryview(buffer), tier_dir)
+
+    # -----------------------------------------------------------------------
+
+    def __init__(self, name=None):
+        """Initialize a new SBA instance.
+
+        :param name: (str) This transcription name.
+
+        """
+        if name is None:
+            name = self.__class__.__name__
+        super(sppasSBA, self).__init__(name)
+
+        self.default_extension = "sba"
+        self.software = "SPPAS3"
+
+        self._accept_multi_tiers = True
+        self._accept_no_tiers = True
+        self._accept_metadata = True
+        self._accept_ctrl_vocab = True
+        self._accept_media = True
+        self._accept_hierarchy = True
+        self._accept_point = True
+        self._accept_interval = True
+        self._accept_disjoint = True
+        self._accept_alt_localization = True
+        self._accept_alt_tag = True
+        self._accept_radius = True
+        self._accept_gaps = True
+        self._accept_overlaps = True
+
+        self.__format = "1.0"
+
+    # -----------------------------------------------------------------------
+    # Read
+    # -----------------------------------------------------------------------
+
+    def read(self, filename, tier_names=None):
+        """Read a SBA file and fill the Transcription.
+
+        :param filename: (str)
+        :param tier_names: (list) Name of the tiers to load or None for all
+
+        """
+        directory = sppasSBA.read_directory(filename)
+        if "name" in directory:
+            self.set_name(directory["name"])
+        sppasSBA._parse_metadata(self, directory["meta"])
+
+        media = dict()
+        for media_dir in directory["media"]:
+            m = sppasMedia(media_dir["url"], media_dir["id"], media_dir["mime"])
+            sppasSBA._parse_metadata(m, media_dir["meta"])
+            if len(media_dir["content"]) > 0:
+                m.set_content(media_dir["content"])
+            self.add_media(m)
+            media[media_dir["id"]] = m
+
+        vocabs = dict()
+        for vocab_dir in directory["vocabs"]:
+            vocab = sppasCtrlVocab(vocab_dir["name"], vocab_dir["description"])
+            sppasSBA._parse_metadata(vocab, vocab_dir["meta"])
+            for content, tag_type, description in vocab_dir["entries"]:
+                vocab.add(sppasTag(content, tag_type), description)
+            self.add_ctrl_vocab(vocab)
+            vocabs[vocab_dir["name"]] = vocab
+
+        with open(filename, 'rb') as fp:
+            for tier_dir in directory["tiers"]:
+                if tier_names is not None and tier_dir["name"] not in tier_names:
+                    continue
+                tier = self.create_tier(tier_dir["name"])
+                sppasSBA._parse_metadata(tier, tier_dir["meta"])
+                if tier_dir["media"] is not None:
+                    tier.set_media(media.get(tier_dir["media"], None))
+                if tier_dir["vocab"] is not None:
+                    tier.set_ctrl_vocab(vocabs.get(tier_dir["vocab"], None))
+
+                # Read only the bytes of the columns of this tier
+                start, end = sppasSBA.__tier_range(tier_dir)
+                fp.seek(start)
+                data = memoryview(fp.read(end - start))
+                columns = sppasSBA.__columns(data, tier_dir, start)
+                sppasSBA._parse_annotations(tier, columns)
+
+        for link_type, parent_id, child_id in directory["hierarchy"]:
+            parent_tier = self.find_id(parent_id)
+            child_tier = self.find_id(child_id)
+            if parent_tier is not None and child_tier is not None:
+                self.add_hierarchy_link(link_type, parent_tier, child_tier)
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_metadata(meta_object, entries):
+        """Set the metadata of an object from a list of (key, value)."""
+        for key, value in entries:
+            meta_object.set_meta(key, value)
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_annotations(tier, columns):
+        """Create the annotations of a tier from its columns.
+
+        :param tier: (sppasTier)
+        :param columns: (dict) key=column name, value=array of values
+
+        """
+        strings = sppasSBA.__strings(columns)
+        ann_meta = dict()
+        if len(columns["ann_meta"]) > 0:
+            ann_meta = json.loads(bytes(columns["ann_meta"]).decode("utf-8"))
+
+        loc_ptr = columns["loc_ptr"]
+        loc_type = columns["loc_type"]
+        loc_score = columns["loc_score"]
+        pts_ptr = columns["pts_ptr"]
+        midpoint = columns["midpoint"]
+        radius = columns["radius"]
+        is_int = columns["is_int"]
+        lab_ptr = columns["lab_ptr"]
+        tag_ptr = columns["tag_ptr"]
+        tag_str = columns["tag_str"]
+        tag_type = columns["tag_type"]
+        tag_score = columns["tag_score"]
+
+        def point(p):
+            r = _from_score(radius[p])
+            if is_int[p] == 1:
+                return sppasPoint(int(midpoint[p]),
+                                  None if r is None else int(r))
+            return sppasPoint(midpoint[p], r)
+
+        for i in range(len(columns["ann_id"])):
+            location = sppasLocation()
+            for j in range(loc_ptr[i], loc_ptr[i+1]):
+                p = pts_ptr[j]
+                kind = LOC_TYPES[loc_type[j]]
+                if kind == "point":
+                    localization = point(p)
+                elif kind == "interval":
+                    localization = sppasInterval(point(p), point(p+1))
+                else:
+                    localization = sppasDisjoint(
+                        [sppasInterval(point(k), point(k+1))
+                         for k in range(p, pts_ptr[j+1], 2)])
+                location.append(localization, _from_score(loc_score[j]))
+
+            labels = list()
+            for j in range(lab_ptr[i], lab_ptr[i+1]):
+                label = sppasLabel(None)
+                for k in range(tag_ptr[j], tag_ptr[j+1]):
+                    label.append(sppasTag(strings[tag_str[k]],
+                                          TAG_TYPES[tag_type[k]]),
+                                 _from_score(tag_score[k]))
+                labels.append(label)
+
+            ann = tier.create_annotation(location, labels)
+            ann.set_meta("id", strings[columns["ann_id"][i]])
+            ann.set_score(_from_score(columns["ann_score"][i]))
+            for key, value in ann_meta.get(str(i), list()):
+                ann.set_meta(key, value)
+
+    # -----------------------------------------------------------------------
+    # Write
+    # -----------------------------------------------------------------------
+
+    def write(self, filename):
+        """Write a SBA file.
+
+        :param filename: (str)
+
+        """
+        directory = OrderedDict()
+        directory["format"] = self.__format
+        directory["name"] = self.get_name()
+        directory["meta"] = sppasSBA._format_metadata(self)
+        directory["media"] = [sppasSBA._format_media(m)
+                              for m in self.get_media_list()]
+        directory["vocabs"] = [sppasSBA._format_vocabulary(v)
+                               for v in self.get_ctrl_vocab_list()]
+        directory["hierarchy"] = self._format_hierarchy()
+        directory["tiers"] = list()
+
+        with open(filename, 'wb') as fp:
+            fp.write(SBA_HEADER.pack(SBA_MAGIC, 0, 0))
+            for tier in self:
+                tier_dir = OrderedDict()
+                tier_dir["name"] = tier.get_name()
+                tier_dir["meta"] = sppasSBA._format_metadata(tier)
+                media = tier.get_media()
+                tier_dir["media"] = None if media is None else media.get_meta("id")
+                vocab = tier.get_ctrl_vocab()
+                tier_dir["vocab"] = None if vocab is None else vocab.get_name()
+                tier_dir["size"] = len(tier)
+                tier_dir["columns"] = OrderedDict()
+                for col_name, values in sppasSBA.format_columns(tier).items():
+                    tier_dir["columns"][col_name] = \
+                        sppasSBA.__write_chunk(fp, values)
+                directory["tiers"].append(tier_dir)
+
+            offset = fp.tell()
+            content = json.dumps(directory).encode("utf-8")
+            fp.write(content)
+            fp.seek(0)
+            fp.write(SBA_HEADER.pack(SBA_MAGIC, offset, len(content)))
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def format_columns(tier):
+        """Return the columns of a tier.
+
+        :param tier: (sppasTier)
+        :returns: (OrderedDict) key=column name, value=array
+
+        """
+        columns = OrderedDict()
+        for col_name, typecode in SBA_COLUMNS.items():
+            columns[col_name] = array(typecode)
+        for ptr in ("loc_ptr", "pts_ptr", "lab_ptr", "tag_ptr", "str_ptr"):
+            columns[ptr].append(0)
+
+        strings = OrderedDict()
+        str_data = bytearray()
+
+        def intern(s):
+            if s not in strings:
+                strings[s] = len(strings)
+                str_data.extend(s.encode("utf-8"))
+                columns["str_ptr"].append(len(str_data))
+            return strings[s]
+
+        def add_point(p):
+            columns["midpoint"].append(p.get_midpoint())
+            columns["radius"].append(_to_score(p.get_radius()))
+            columns["is_int"].append(1 if isinstance(p.get_midpoint(), int) else 0)
+
+        ann_meta = OrderedDict()
+        for i, ann in enumerate(tier):
+            columns["ann_id"].append(intern(ann.get_meta("id")))
+            columns["ann_score"].append(_to_score(ann.get_score()))
+            extra = [(k, ann.get_meta(k)) for k in ann.get_meta_keys() if k != "id"]
+            if len(extra) > 0:
+                ann_meta[str(i)] = extra
+
+            for localization, score in ann.get_location():
+                if localization.is_point():
+                    columns["loc_type"].append(0)
+                    add_point(localization)
+                elif localization.is_interval():
+                    columns["loc_type"].append(1)
+                    add_point(localization.get_begin())
+                    add_point(localization.get_end())
+                else:
+                    columns["loc_type"].append(2)
+                    for interval in localization:
+                        add_point(interval.get_begin())
+                        add_point(interval.get_end())
+                columns["loc_score"].append(_to_score(score))
+                columns["pts_ptr"].append(len(columns["midpoint"]))
+            columns["loc_ptr"].append(len(columns["loc_type"]))
+
+            for label in ann.get_labels():
+                for tag, score in label:
+                    columns["tag_str"].append(intern(tag.get_content()))
+                    columns["tag_type"].append(TAG_TYPES.index(tag.get_type()))
+                    columns["tag_score"].append(_to_score(score))
+                columns["tag_ptr"].append(len(columns["tag_str"]))
+            columns["lab_ptr"].append(len(columns["tag_ptr"]) - 1)
+
+        columns["str_data"].frombytes(bytes(str_data))
+        if len(ann_meta) > 0:
+            columns["ann_meta"].frombytes(json.dumps(ann_meta).encode("utf-8"))
+
+        return columns
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _format_metadata(meta_object):
+        """Return the metadata of an object as a list of (key, value)."""
+        return [(key, meta_object.get_meta(key))
+                for key in meta_object.get_meta_keys()]
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _format_media(media):
+        """Return a dict representing a sppasMedia."""
+        media_dir = OrderedDict()
+        media_dir["id"] = media.get_meta("id")
+        media_dir["url"] = media.get_filename()
+        media_dir["mime"] = media.get_mime_type()
+        media_dir["content"] = media.get_content()
+        media_dir["meta"] = sppasSBA._format_metadata(media)
+        return media_dir
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _format_vocabulary(vocab):
+        """Return a dict representing a sppasCtrlVocab."""
+        vocab_dir = OrderedDict()
+        vocab_dir["name"] = vocab.get_name()
+        vocab_dir["description"] = vocab.get_description()
+        vocab_dir["meta"] = sppasSBA._format_metadata(vocab)
+        vocab_dir["entries"] = [(e.get_content(), e.get_type(),
+                                 vocab.get_tag_description(e)) for e in vocab]
+        return vocab_dir
+
+    # -----------------------------------------------------------------------
+
+    def _format_hierarchy(self):
+        """Return the list of hierarchy links (type, parent id, child id)."""
+        links = list()
+        for child_tier in self:
+            parent_tier = self._hierarchy.get_parent(child_tier)
+            if parent_tier is not None:
+                link_type = self._hierarchy.get_hierarchy_type(child_tier)
+                links.append((link_type, parent_tier.get_id(), child_tier.get_id()))
+        return links
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __find_tier(directory, tier_name):
+        for tier_dir in directory["tiers"]:
+            if tier_dir["name"] == tier_name:
+                return tier_dir
+        raise AnnDataKeyError("Tier name", tier_name)
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __write_chunk(fp, values):
+        """Write an array at an aligned position and return its entry."""
+        padding = (-fp.tell()) % SBA_ALIGN
+        fp.write(b"\x00" * padding)
+        offset = fp.tell()
+        if sys.byteorder == "big" and values.itemsize > 1:
+            values = array(values.typecode, values)
+            values.byteswap()
+        values.tofile(fp)
+        return [offset, len(values), values.typecode, values.itemsize]
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __tier_range(tier_dir):
+        """Return the first and last+1 positions of the columns of a tier."""
+        chunks = tier_dir["columns"].values()
+        start = min(c[0] for c in chunks)
+        end = max(c[0] + c[1] * c[3] for c in chunks)
+        return start, end
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __columns(buffer, tier_dir, start=0):
+        """Return the columns of a tier from a buffer.
+
+        :param buffer: (memoryview) Content of the file from position start
+        :param tier_dir: (dict) Entry of the tier in the directory
+        :param start: (int) Position in the file of the buffer
+
+        """
+        columns = dict()
+        for col_name, (offset, size, typecode, itemsize) in tier_dir["columns"].items():
+            if array(typecode).itemsize != itemsize:
+                raise AioFormatError(col_name)
+            offset -= start
+            view = buffer[offset:offset + size * itemsize].cast(typecode)
+            if sys.byteorder == "big" and itemsize > 1:
+                view = array(typecode, view)
+                view.byteswap()
+            columns[col_name] = view
+        return columns
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __strings(columns):
+        """Return the list of interned strings of a tier."""
+        data = bytes(columns["str_data"])
+        ptr = columns["str_ptr"]
+        return [data[ptr[i]:ptr[i+1]].decode("utf-8")
+                for i in range(len(ptr) - 1)]
@@ -40,6 +40,7 @@
 """
 
 import logging
+import importlib
 import os
 from collections import OrderedDict
 
@@ -50,30 +51,88 @@ from sppas.src.utils.datatype import sppasTime
 from ..anndataexc import AioEncodingError
 from ..anndataexc import AioError
 
-from .text import sppasRawText
-from .text import sppasCSV
-from .sclite import sppasCTM
-from .sclite import sppasSTM
-from .xtrans import sppasTDF
-from .praat import sppasTextGrid
-from .praat import sppasPitchTier
-from .praat import sppasIntensityTier
-from .phonedit import sppasMRK
-from .phonedit import sppasSignaix
-from .htk import sppasLab
-from .subtitle import sppasSubRip
-from .subtitle import sppasSubViewer
-from .subtitle import sppasWebVTT
-from .table import sppasTRA
-from .table import sppasARFF
-from .table import sppasXRFF
-from .transcriber import sppasTRS
-from .audacity import sppasAudacity
-from .anvil import sppasAnvil
-from .elan import sppasEAF
-from .annotationpro import sppasANT
-from .annotationpro import sppasANTX
-from .xra import sppasXRA
+# ---------------------------------------------------------------------------
+
+_AIO = "sppas.src.anndata.aio."
+
+# ---------------------------------------------------------------------------
+
+
+class sppasTrsFormats(object):
+    """Lazy registry of the annotated file formats.
+
+    Each file extension is associated to the name of the module and the
+    name of the class of its reader-writer. The module is imported only
+    the first time the class is requested, so that the cost of importing
+    all the formats is not paid when only one of them is used.
+
+    A class can also be registered directly with the [] operator.
+
+    >>> formats = sppasTrsFormats()
+    >>> formats.register("xra", "sppas.src.anndata.aio.xra", "sppasXRA")
+    >>> formats["xra"]
+    <class 'sppas.src.anndata.aio.xra.sppasXRA'>
+
+    """
+
+    def __init__(self):
+        """Create an empty registry."""
+        # key=extension, value=(module name, class name) or the class
+        self.__formats = OrderedDict()
+
+    # -----------------------------------------------------------------------
+
+    def register(self, extension, module_name, class_name):
+        """Associate an extension to the class of a module, not imported yet.
+
+        :param extension: (str) File extension, without the dot
+        :param module_name: (str) Absolute name of the module
+        :param class_name: (str) Name of the class in the module
+
+        """
+        self.__formats[extension] = (module_name, class_name)
+
+    # -----------------------------------------------------------------------
+
+    def is_loaded(self, extension):
+        """Return True if the class of the given extension was imported."""
+        return isinstance(self.__formats[extension], tuple) is False
+
+    # -----------------------------------------------------------------------
+
+    def keys(self):
+        return self.__formats.keys()
+
+    def values(self):
+        return [self[ext] for ext in self.__formats]
+
+    def items(self):
+        return [(ext, self[ext]) for ext in self.__formats]
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __getitem__(self, extension):
+        value = self.__formats[extension]
+        if isinstance(value, tuple) is True:
+            module_name, class_name = value
+            value = getattr(importlib.import_module(module_name), class_name)
+            self.__formats[extension] = value
+        return value
+
+    def __setitem__(self, extension, value):
+        self.__formats[extension] = value
+
+    def __contains__(self, extension):
+        return extension in self.__formats
+
+    def __iter__(self):
+        for ext in self.__formats:
+            yield ext
+
+    def __len__(self):
+        return len(self.__formats)
 
 # ---------------------------------------------------------------------------
 
@@ -85,36 +144,38 @@ class sppasTrsRW(object):
 
     """
 
-    # A dictionary to associate a file extension and a class to instantiate.
-    TRANSCRIPTION_TYPES = OrderedDict()
+    # A registry to associate a file extension and a class to instantiate.
+    # The module of a class is imported only when the format is used.
+    TRANSCRIPTION_TYPES = sppasTrsFormats()
 
     # ANNOT
-    TRANSCRIPTION_TYPES[sppasXRA().default_extension] = sppasXRA
-    TRANSCRIPTION_TYPES[sppasTextGrid().default_extension] = sppasTextGrid
-    TRANSCRIPTION_TYPES[sppasAnvil().default_extension] = sppasAnvil
-    TRANSCRIPTION_TYPES[sppasEAF().default_extension] = sppasEAF
-    TRANSCRIPTION_TYPES[sppasANT().default_extension] = sppasANT
-    TRANSCRIPTION_TYPES[sppasANTX().default_extension] = sppasANTX
-    TRANSCRIPTION_TYPES[sppasTRS().default_extension] = sppasTRS
-    TRANSCRIPTION_TYPES[sppasMRK().default_extension] = sppasMRK
-    TRANSCRIPTION_TYPES[sppasSignaix().default_extension] = sppasSignaix
-    TRANSCRIPTION_TYPES[sppasLab().default_extension] = sppasLab
-    TRANSCRIPTION_TYPES[sppasSubRip().default_extension] = sppasSubRip
-    TRANSCRIPTION_TYPES[sppasSubViewer().default_extension] = sppasSubViewer
-    TRANSCRIPTION_TYPES[sppasWebVTT().default_extension] = sppasWebVTT
-    TRANSCRIPTION_TYPES[sppasCTM().default_extension] = sppasCTM
-    TRANSCRIPTION_TYPES[sppasSTM().default_extension] = sppasSTM
-    TRANSCRIPTION_TYPES[sppasAudacity().default_extension] = sppasAudacity
-    TRANSCRIPTION_TYPES[sppasTDF().default_extension] = sppasTDF
-    TRANSCRIPTION_TYPES[sppasCSV().default_extension] = sppasCSV
-    TRANSCRIPTION_TYPES[sppasRawText().default_extension] = sppasRawText
+    TRANSCRIPTION_TYPES.register("xra", _AIO + "xra", "sppasXRA")
+    TRANSCRIPTION_TYPES.register("sba", _AIO + "binary", "sppasSBA")
+    TRANSCRIPTION_TYPES.register("TextGrid", _AIO + "praat", "sppasTextGrid")
+    TRANSCRIPTION_TYPES.register("anvil", _AIO + "anvil", "sppasAnvil")
+    TRANSCRIPTION_TYPES.register("eaf", _AIO + "elan", "sppasEAF")
+    TRANSCRIPTION_TYPES.register("ant", _AIO + "annotationpro", "sppasANT")
+    TRANSCRIPTION_TYPES.register("antx", _AIO + "annotationpro", "sppasANTX")
+    TRANSCRIPTION_TYPES.register("trs", _AIO + "transcriber", "sppasTRS")
+    TRANSCRIPTION_TYPES.register("mrk", _AIO + "phonedit", "sppasMRK")
+    TRANSCRIPTION_TYPES.register("hz", _AIO + "phonedit", "sppasSignaix")
+    TRANSCRIPTION_TYPES.register("lab", _AIO + "htk", "sppasLab")
+    TRANSCRIPTION_TYPES.register("srt", _AIO + "subtitle", "sppasSubRip")
+    TRANSCRIPTION_TYPES.register("sub", _AIO + "subtitle", "sppasSubViewer")
+    TRANSCRIPTION_TYPES.register("vtt", _AIO + "subtitle", "sppasWebVTT")
+    TRANSCRIPTION_TYPES.register("ctm", _AIO + "sclite", "sppasCTM")
+    TRANSCRIPTION_TYPES.register("stm", _AIO + "sclite", "sppasSTM")
+    TRANSCRIPTION_TYPES.register("aup", _AIO + "audacity", "sppasAudacity")
+    TRANSCRIPTION_TYPES.register("tdf", _AIO + "xtrans", "sppasTDF")
+    TRANSCRIPTION_TYPES.register("csv", _AIO + "text", "sppasCSV")
+    TRANSCRIPTION_TYPES.register("txt", _AIO + "text", "sppasRawText")
     # TABLE
-    TRANSCRIPTION_TYPES[sppasTRA().default_extension] = sppasTRA
-    TRANSCRIPTION_TYPES[sppasARFF().default_extension] = sppasARFF
-    TRANSCRIPTION_TYPES[sppasXRFF().default_extension] = sppasXRFF
+    TRANSCRIPTION_TYPES.register("tra", _AIO + "table", "sppasTRA")
+    TRANSCRIPTION_TYPES.register("arff", _AIO + "table", "sppasARFF")
+    TRANSCRIPTION_TYPES.register("xrff", _AIO + "table", "sppasXRFF")
     # MEASURE
-    TRANSCRIPTION_TYPES[sppasIntensityTier().default_extension] = sppasIntensityTier
-    TRANSCRIPTION_TYPES[sppasPitchTier().default_extension] = sppasPitchTier
+    TRANSCRIPTION_TYPES.register("IntensityTier", _AIO + "praat", "sppasIntensityTier")
+    TRANSCRIPTION_TYPES.register("PitchTier", _AIO + "praat", "sppasPitchTier")
 
     # -----------------------------------------------------------------------
 
@@ -294,7 +355,7 @@ class sppasTrsRW(object):
                     return file_reader()
             except:
                 continue
-        return sppasRawText()
+        return sppasTrsRW.TRANSCRIPTION_TYPES["txt"]()
 
     # -----------------------------------------------------------------------
 
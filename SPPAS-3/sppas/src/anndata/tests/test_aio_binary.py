@@ -0,0 +1,252 @@
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.anndata.tests.test_aio_binary.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      develop@sppas.org
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2021  Brigitte Bigi
+    :summary:      Test the class sppasSBA().
+
+    To read and write SPPAS binary annotations files.
+
+"""
+import unittest
+import os.path
+import shutil
+
+from ..aio.binary import sppasSBA
+from ..aio.xra import sppasXRA
+from ..aio.readwrite import sppasTrsRW
+from ..anndataexc import AioFormatError
+from ..anndataexc import AnnDataKeyError
+from ..ann.annlocation import sppasLocation
+from ..ann.annlocation import sppasPoint
+from ..ann.annlocation import sppasInterval
+from ..ann.annlocation import sppasDisjoint
+from ..ann.annlabel import sppasLabel
+from ..ann.annlabel import sppasTag
+from sppas.src.wkps.fileutils import sppasFileUtils
+
+from .test_aio_rw import compare_tiers_trs
+from .test_aio_rw import compare_ctrl_vocab_trs
+from .test_aio_rw import compare_media_trs
+
+# ---------------------------------------------------------------------------
+
+TEMP = sppasFileUtils().set_random()
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+# ---------------------------------------------------------------------------
+
+
+class TestSBA(unittest.TestCase):
+    """
+    Represents a SBA file, the native binary format of SPPAS.
+
+    """
+    def setUp(self):
+        if os.path.exists(TEMP) is False:
+            os.mkdir(TEMP)
+
+    def tearDown(self):
+        shutil.rmtree(TEMP)
+
+    # -----------------------------------------------------------------------
+
+    def test_members(self):
+        sba = sppasSBA()
+        self.assertEqual("sba", sba.default_extension)
+        self.assertTrue(sba.multi_tiers_support())
+        self.assertTrue(sba.no_tiers_support())
+        self.assertTrue(sba.metadata_support())
+        self.assertTrue(sba.ctrl_vocab_support())
+        self.assertTrue(sba.media_support())
+        self.assertTrue(sba.hierarchy_support())
+        self.assertTrue(sba.point_support())
+        self.assertTrue(sba.interval_support())
+        self.assertTrue(sba.disjoint_support())
+        self.assertTrue(sba.alternative_localization_support())
+        self.assertTrue(sba.alternative_tag_support())
+        self.assertTrue(sba.radius_support())
+        self.assertTrue(sba.gaps_support())
+        self.assertTrue(sba.overlaps_support())
+        self.assertTrue("sba" in sppasTrsRW.extensions_in())
+        self.assertTrue("sba" in sppasTrsRW.extensions_out())
+
+    # -----------------------------------------------------------------------
+
+    def test_detect(self):
+        self.assertFalse(sppasSBA.detect(os.path.join(DATA, "sample-1.4.xra")))
+        self.assertFalse(sppasSBA.detect(os.path.join(DATA, "toto.sba")))
+        with self.assertRaises(AioFormatError):
+            sppasSBA().read(os.path.join(DATA, "sample-1.4.xra"))
+
+        sba = sppasSBA()
+        sba.write(os.path.join(TEMP, "empty.sba"))
+        self.assertTrue(sppasSBA.detect(os.path.join(TEMP, "empty.sba")))
+        sba2 = sppasSBA()
+        sba2.read(os.path.join(TEMP, "empty.sba"))
+        self.assertEqual(0, len(sba2))
+
+    # -----------------------------------------------------------------------
+
+    def test_read_write_xra(self):
+        """Read an XRA file, write it in SBA, read the SBA and compare."""
+        for filename in ("sample-1.1.xra", "sample-1.2.xra",
+                         "sample-1.3.xra", "sample-1.4.xra"):
+            xra = sppasXRA()
+            xra.read(os.path.join(DATA, filename))
+            sba = sppasSBA()
+            sba.set(xra)
+            sba.write(os.path.join(TEMP, filename + ".sba"))
+
+            sba2 = sppasSBA()
+            sba2.read(os.path.join(TEMP, filename + ".sba"))
+            self.assertEqual(xra.get_name(), sba2.get_name())
+            self.assertEqual(list(xra.get_meta_keys()),
+                             list(sba2.get_meta_keys()))
+            self.assertEqual(len(xra), len(sba2))
+            self.assertTrue(compare_tiers_trs(xra, sba2))
+            self.assertTrue(compare_ctrl_vocab_trs(xra, sba2))
+            self.assertTrue(compare_media_trs(xra, sba2))
+            for t1, t2 in zip(xra, sba2):
+                p1 = xra.get_hierarchy().get_parent(t1)
+                p2 = sba2.get_hierarchy().get_parent(t2)
+                if p1 is None:
+                    self.assertIsNone(p2)
+                else:
+                    self.assertEqual(p1.get_id(), p2.get_id())
+
+    # -----------------------------------------------------------------------
+
+    def test_read_write_locations_labels(self):
+        """Lossless save and load of any kind of location and label."""
+        sba = sppasSBA()
+        tier1 = sba.create_tier("points")
+        ann = tier1.create_annotation(
+            sppasLocation(sppasPoint(1.5, 0.005)),
+            sppasLabel(sppasTag(3, "int"), 0.5))
+        ann.set_score(0.8)
+        ann.set_meta("comment", "a comment")
+        tier1.create_annotation(
+            sppasLocation(sppasPoint(2.25)),
+            [sppasLabel(sppasTag(1, "int")), sppasLabel(sppasTag(-2, "int"))])
+
+        tier2 = sba.create_tier("frames")
+        loc = sppasLocation(sppasInterval(sppasPoint(2, 1), sppasPoint(5, 1)), 0.6)
+        loc.append(sppasInterval(sppasPoint(3, 1), sppasPoint(5, 1)), 0.4)
+        label = sppasLabel(sppasTag(True, "bool"), 0.1)
+        label.append(sppasTag(False, "bool"), 0.9)
+        tier2.create_annotation(loc, label)
+        tier2.create_annotation(
+            sppasLocation(sppasInterval(sppasPoint(12), sppasPoint(14))))
+        tier3 = sba.create_tier("copy")
+        for a in tier1:
+            tier3.create_annotation(a.get_location().copy())
+        sba.add_hierarchy_link("TimeAssociation", tier1, tier3)
+        sba.create_tier("strings").create_annotation(
+            sppasLocation(sppasPoint(0.)),
+            [sppasLabel(sppasTag("é")), sppasLabel(sppasTag("àb c"))])
+        sba.create_tier("disjoint").create_annotation(
+            sppasLocation(sppasDisjoint([
+                sppasInterval(sppasPoint(6), sppasPoint(8)),
+                sppasInterval(sppasPoint(10), sppasPoint(12))])),
+            sppasLabel(sppasTag(0.25, "float")))
+
+        sba.write(os.path.join(TEMP, "sample.sba"))
+        sba2 = sppasSBA()
+        sba2.read(os.path.join(TEMP, "sample.sba"))
+
+        self.assertTrue(compare_tiers_trs(sba, sba2))
+        self.assertEqual(0.8, sba2[0][0].get_score())
+        self.assertEqual("a comment", sba2[0][0].get_meta("comment"))
+        self.assertIsNone(sba2[0][1].get_score())
+        self.assertIsInstance(sba2[1][0].get_lowest_localization().get_midpoint(), int)
+        self.assertIsInstance(sba2[0][0].get_lowest_localization().get_midpoint(), float)
+        self.assertEqual(0.005, sba2[0][0].get_lowest_localization().get_radius())
+        self.assertEqual(2, len(sba2[1][0].get_location()))
+        self.assertEqual(0.4, sba2[1][0].get_location()[1][1])
+        self.assertEqual(2, len(sba2[1][0].get_labels()[0]))
+        self.assertEqual(0.9, sba2[1][0].get_labels()[0][1][1])
+        self.assertFalse(sba2[1][1].is_labelled())
+        self.assertTrue(sba2[4][0].location_is_disjoint())
+        self.assertEqual(0.25, sba2[4][0].get_best_tag().get_typed_content())
+        self.assertEqual(sba2[0], sba2.get_hierarchy().get_parent(sba2[2]))
+        self.assertEqual("àb c", sba2[3][0].get_labels()[1].get_best().get_content())
+
+    # -----------------------------------------------------------------------
+
+    def test_read_one_tier(self):
+        xra = sppasXRA()
+        xra.read(os.path.join(DATA, "sample-1.4.xra"))
+        sba = sppasSBA()
+        sba.set(xra)
+        sba.write(os.path.join(TEMP, "sample.sba"))
+
+        names = sppasSBA.get_tier_names(os.path.join(TEMP, "sample.sba"))
+        self.assertEqual([t.get_name() for t in xra], names)
+
+        sba2 = sppasSBA()
+        sba2.read(os.path.join(TEMP, "sample.sba"), tier_names=[names[1]])
+        self.assertEqual(1, len(sba2))
+        self.assertEqual(names[1], sba2[0].get_name())
+        self.assertEqual(len(xra[1]), len(sba2[0]))
+        for a1, a2 in zip(xra[1], sba2[0]):
+            self.assertEqual(a1, a2)
+
+        # Access to the columns without creating annotations
+        columns = sppasSBA.load_columns(os.path.join(TEMP, "sample.sba"), names[1])
+        self.assertEqual(len(xra[1]), len(columns["ann_id"]))
+        self.assertEqual(len(xra[1]) + 1, len(columns["loc_ptr"]))
+        first = xra[1][0].get_lowest_localization().get_midpoint()
+        self.assertEqual(first, columns["midpoint"][0])
+        with self.assertRaises(AnnDataKeyError):
+            sppasSBA.load_columns(os.path.join(TEMP, "sample.sba"), "toto")
+
+    # -----------------------------------------------------------------------
+
+    def test_trs_rw(self):
+        parser = sppasTrsRW(os.path.join(DATA, "sample-1.4.xra"))
+        trs1 = parser.read()
+        parser.set_filename(os.path.join(TEMP, "sample-1.4.sba"))
+        parser.write(trs1)
+        trs2 = parser.read()
+        self.assertIsInstance(trs2, sppasSBA)
+        self.assertTrue(compare_tiers_trs(trs1, trs2))
+        self.assertTrue(compare_ctrl_vocab_trs(trs1, trs2))
+        self.assertTrue(compare_media_trs(trs1, trs2))
+
+        trs3 = sppasTrsRW.create_trs_from_heuristic(
+            os.path.join(TEMP, "sample-1.4.sba"))
+        self.assertIsInstance(trs3, sppasSBA)
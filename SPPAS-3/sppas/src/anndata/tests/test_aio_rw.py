@@ -47,6 +47,7 @@ import shutil
 
 from sppas.src.wkps.fileutils import sppasFileUtils
 from ..aio.readwrite import sppasTrsRW
+from ..aio.readwrite import sppasTrsFormats
 
 # ---------------------------------------------------------------------------
 
@@ -164,6 +165,27 @@ class TestAIO(unittest.TestCase):
 
     # -----------------------------------------------------------------------
 
+    def test_formats_registry(self):
+        formats = sppasTrsFormats()
+        formats.register("xra", "sppas.src.anndata.aio.xra", "sppasXRA")
+        self.assertEqual(1, len(formats))
+        self.assertTrue("xra" in formats)
+        self.assertFalse(formats.is_loaded("xra"))
+        xra = formats["xra"]
+        self.assertEqual("sppasXRA", xra.__name__)
+        self.assertTrue(formats.is_loaded("xra"))
+        self.assertEqual(["xra"], list(formats))
+        self.assertEqual([xra], formats.values())
+        with self.assertRaises(KeyError):
+            formats["toto"]
+
+        # all the extensions are matching the default one of the class
+        for ext in sppasTrsRW.TRANSCRIPTION_TYPES:
+            trs = sppasTrsRW.TRANSCRIPTION_TYPES[ext]()
+            self.assertEqual(ext, trs.default_extension)
+
+    # -----------------------------------------------------------------------
+
     def test_IO_Properties(self):
         self.assertTrue("xra" in sppasTrsRW.annot_extensions())
         self.assertFalse("PitchTier" in sppasTrsRW.annot_extensions())
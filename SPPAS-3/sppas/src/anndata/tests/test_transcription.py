@@ -259,3 +259,52 @@ class TestTranscription(unittest.TestCase):
             parent.remove(a.get_lowest_localization(), a.get_highest_localization())
         with self.assertRaises(HierarchyAssociationError):
             child.remove(1, 3)
+
+    # -----------------------------------------------------------------------
+
+    def test_export(self):
+        """Test the export of annotations into rows, columns and records."""
+        trs = sppasTranscription()
+        phones = trs.create_tier("PhonAlign")
+        a1 = phones.create_annotation(
+            sppasLocation(sppasInterval(sppasPoint(1.), sppasPoint(1.5))),
+            sppasLabel(sppasTag("a"), 0.8))
+        a1.append_label(sppasLabel(sppasTag("b")))
+        phones.create_annotation(
+            sppasLocation(sppasInterval(sppasPoint(1.5), sppasPoint(2.))))
+        points = trs.create_tier("Points")
+        points.create_annotation(sppasLocation(sppasPoint(3)),
+                                 sppasLabel(sppasTag("x")))
+
+        rows = list(trs.export_rows())
+        self.assertEqual(3, len(rows))
+        self.assertEqual(("PhonAlign", 1., 1.5, "a b", 0.8), rows[0])
+        self.assertEqual(("PhonAlign", 1.5, 2., "", None), rows[1])
+        self.assertEqual(("Points", 3., 3., "x", None), rows[2])
+        self.assertEqual(rows[:2], list(phones.export_rows()))
+
+        # Tier selection
+        self.assertEqual(rows[2:], list(trs.export_rows(["Points", "toto"])))
+        self.assertEqual([], list(trs.export_rows([])))
+
+        columns = trs.export_columns(["PhonAlign"])
+        self.assertEqual(["PhonAlign", "PhonAlign"], columns["tier"])
+        self.assertEqual([1., 1.5], list(columns["begin"]))
+        self.assertEqual([1.5, 2.], list(columns["end"]))
+        self.assertEqual(["a b", ""], columns["label"])
+        self.assertEqual(0.8, columns["score"][0])
+        self.assertNotEqual(columns["score"][1], columns["score"][1])
+        self.assertEqual(16, memoryview(columns["begin"]).nbytes)
+
+        try:
+            import numpy
+        except ImportError:
+            return
+        records = trs.export_records()
+        self.assertEqual(3, len(records))
+        self.assertEqual(["PhonAlign", "PhonAlign", "Points"],
+                         records["tier"].tolist())
+        self.assertEqual([1., 1.5, 3.], records["begin"].tolist())
+        self.assertEqual("a b", records["label"][0])
+        self.assertTrue(numpy.isnan(records["score"][1]))
+        self.assertEqual(0, len(trs.export_records(["toto"])))
@@ -1440,6 +1440,40 @@ class sppasTier(sppasMetaData):
 
         return ft
 
+    # -----------------------------------------------------------------------
+
+    def export_rows(self):
+        """Iterate over the annotations as rows of plain values.
+
+        Each row is a tuple (tier name, begin, end, label, score) with:
+
+            - begin and end: the lowest and highest midpoints of the
+              localization, as floats; begin=end if the tier is of type point;
+            - label: the best tag of each label, separated by whitespace,
+              or an empty string if the annotation is not labelled;
+            - score: the score of the best tag of the first label, or None.
+
+        It's the content of a CSV file, without creating the file.
+
+        :returns: (generator of tuples)
+
+        """
+        for ann in self.__ann:
+            begin = float(ann.get_lowest_localization().get_midpoint())
+            end = float(ann.get_highest_localization().get_midpoint())
+
+            contents = list()
+            score = None
+            for label in ann.get_labels():
+                if label.is_tagged() is False:
+                    continue
+                tag = label.get_best()
+                if len(contents) == 0:
+                    score = label.get_score(tag)
+                contents.append(tag.get_content())
+
+            yield self.__name, begin, end, " ".join(contents), score
+
     # -----------------------------------------------------------------------
     # Private
     # -----------------------------------------------------------------------
@@ -35,6 +35,7 @@
 """
 
 import logging
+from array import array
 
 from sppas.src.utils import sppasUnicode
 
@@ -745,6 +746,96 @@ class sppasTranscription(sppasMetaData):
                 for ann in reversed(tier):
                     ann.get_location().shift(delay)
 
+    # -----------------------------------------------------------------------
+    # Export of the annotations into tables, without writing a file
+    # -----------------------------------------------------------------------
+
+    def export_rows(self, tier_names=None):
+        """Iterate over the annotations of the tiers as rows.
+
+        Each row is a tuple (tier name, begin, end, label, score): see
+        sppasTier.export_rows() for details.
+
+        :param tier_names: (list) Names of the tiers to export or None for all
+        :returns: (generator of tuples)
+
+        """
+        for tier in self.__export_tiers(tier_names):
+            for row in tier.export_rows():
+                yield row
+
+    # -----------------------------------------------------------------------
+
+    def export_columns(self, tier_names=None):
+        """Return the annotations of the tiers as columns.
+
+        Begin, end and score columns are arrays of doubles: they support the
+        buffer protocol so that numpy.frombuffer() or pyarrow.py_buffer()
+        can use them without any copy. A missing score is NaN. Tier names
+        and labels are lists of strings.
+
+        :Example:
+
+            >>> columns = trs.export_columns(["PhonAlign", "TokensAlign"])
+            >>> pandas.DataFrame(columns)
+
+        :param tier_names: (list) Names of the tiers to export or None for all
+        :returns: (dict) key=column name, value=column content
+
+        """
+        columns = dict(tier=list(), begin=array("d"), end=array("d"),
+                       label=list(), score=array("d"))
+        for name, begin, end, label, score in self.export_rows(tier_names):
+            columns["tier"].append(name)
+            columns["begin"].append(begin)
+            columns["end"].append(end)
+            columns["label"].append(label)
+            columns["score"].append(float("nan") if score is None else score)
+
+        return columns
+
+    # -----------------------------------------------------------------------
+
+    def export_records(self, tier_names=None):
+        """Return the annotations of the tiers as a numpy structured array.
+
+        The fields are "tier", "begin", "end", "label" and "score". A
+        missing score is NaN.
+
+        :param tier_names: (list) Names of the tiers to export or None for all
+        :returns: (numpy.ndarray)
+        :raises: ImportError: numpy is not installed
+
+        """
+        import numpy
+
+        columns = self.export_columns(tier_names)
+        tier_len = max([len(t) for t in columns["tier"]] + [1])
+        label_len = max([len(t) for t in columns["label"]] + [1])
+        records = numpy.empty(len(columns["begin"]), dtype=[
+            ("tier", "U{:d}".format(tier_len)),
+            ("begin", "f8"),
+            ("end", "f8"),
+            ("label", "U{:d}".format(label_len)),
+            ("score", "f8")])
+        for key in columns:
+            records[key] = columns[key]
+
+        return records
+
+    # -----------------------------------------------------------------------
+
+    def __export_tiers(self, tier_names=None):
+        """Return the list of tiers matching the given names.
+
+        Tiers are returned in the order of the transcription. Names which
+        don't match any tier are ignored.
+
+        """
+        if tier_names is None:
+            return list(self._tiers)
+        return [t for t in self._tiers if t.get_name() in tier_names]
+
     # -----------------------------------------------------------------------
     # Overloads
     # -----------------------------------------------------------------------
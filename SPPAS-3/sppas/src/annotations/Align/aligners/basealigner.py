@@ -33,9 +33,6 @@
 
 """
 import os
-import shutil
-import random
-from datetime import date
 
 from sppas.src.models.acm.tiedlist import sppasTiedList
 from sppas.src.utils.makeunicode import sppasUnicode
@@ -77,6 +74,11 @@ class BaseAligner(object):
         self._phones = ""       # string of the phonemes to time-align
         self._tokens = ""       # string of the tokens to time-align
 
+        # tiedlist of the model, loaded on demand and completed in memory
+        self._tiedlist = None
+        self._tiedlist_changed = False    # changed since it was last saved
+        self._tiedlist_file = None        # file it was last saved into
+
     # ------------------------------------------------------------------------
     # members
     # ------------------------------------------------------------------------
@@ -101,33 +103,103 @@ class BaseAligner(object):
     # alignment options
     # -----------------------------------------------------------------------
 
+    def get_tiedlist(self):
+        """Return the tiedlist of the model, or None if it does not have one.
+
+        The tiedlist file of the model is read only once.
+
+        :returns: (sppasTiedList) or None
+
+        """
+        if self._tiedlist is None and self._model is not None:
+            tied_file = os.path.join(self._model, "tiedlist")
+            if os.path.exists(tied_file) is True:
+                self._tiedlist = sppasTiedList()
+                self._tiedlist.read(tied_file)
+
+        return self._tiedlist
+
+    # -----------------------------------------------------------------------
+
     def add_tiedlist(self, entries):
         """Add missing triphones/biphones in the tiedlist of the model.
 
-        Backup the initial file if entries were added.
+        The entries are added into the tiedlist loaded in memory: the files
+        of the model are never modified. The completed tiedlist is then
+        used for all the next alignments of this aligner.
 
         :param entries: (list) List of missing entries into the tiedlist.
         :returns: list of entries really added
 
         """
-        tied_file = os.path.join(self._model, "tiedlist")
-        if os.path.exists(tied_file) is False:
+        tie = self.get_tiedlist()
+        if tie is None:
             return []
 
-        tie = sppasTiedList()
-        tie.read(tied_file)
         add_entries = tie.add_to_tie(entries)
         if len(add_entries) > 0:
-            today = str(date.today())
-            rand_val = str(int(random.random()*10000))
-            backup_tied_file = os.path.join(
-                self._model,
-                "tiedlist." + today + "." + rand_val)
-            shutil.copy(tied_file, backup_tied_file)
-            tie.save(tied_file)
+            self._tiedlist_changed = True
 
         return add_entries
 
+    # -----------------------------------------------------------------------
+
+    def add_missing_triphones(self):
+        """Add the within-word triphones of the phones in the tiedlist.
+
+        The aligner can then be executed only once even if the phonetization
+        is using triphones that were not observed in the training corpus.
+
+        :returns: list of entries added
+
+        """
+        tie = self.get_tiedlist()
+        if tie is None:
+            return []
+
+        entries = list()
+        for pron in self._phones.split():
+            for variant in pron.split("|"):
+                phones = variant.split("-")
+                for i in range(1, len(phones) - 1):
+                    triphone = phones[i-1] + "-" + phones[i] + "+" + phones[i+1]
+                    if tie.is_observed(triphone) is False and \
+                            tie.is_tied(triphone) is False:
+                        entries.append(triphone)
+
+        return self.add_tiedlist(entries)
+
+    # -----------------------------------------------------------------------
+
+    def get_tiedlist_filename(self, basename):
+        """Return the name of the tiedlist file the aligner has to use.
+
+        It is the one of the model, except if entries were added to the
+        tiedlist: it is then saved into the given base name + ".tiedlist"
+        if it has changed since it was last saved, or if the last saved
+        file does not exist anymore. Otherwise, the last saved file is
+        returned.
+
+        :param basename: (str) base name of the files of the alignment
+        :returns: (str) File name or None if the model has no tiedlist
+
+        """
+        if self._tiedlist_changed is False and self._tiedlist_file is None:
+            if self._model is None:
+                return None
+            tied_file = os.path.join(self._model, "tiedlist")
+            if os.path.exists(tied_file) is False:
+                return None
+            return tied_file
+
+        if self._tiedlist_changed is True or \
+                os.path.exists(self._tiedlist_file) is False:
+            self._tiedlist_file = basename + ".tiedlist"
+            self._tiedlist.save(self._tiedlist_file)
+            self._tiedlist_changed = False
+
+        return self._tiedlist_file
+
     # ------------------------------------------------------------------------
 
     def set_phones(self, phones):
@@ -251,7 +251,7 @@ class JuliusAligner(BaseAligner):
         if self._model is None:
             raise IOError('Julius aligner requires an acoustic model')
         # Fix file names
-        tiedlist = os.path.join(self._model, "tiedlist")
+        tiedlist = self.get_tiedlist_filename(basename)
         config = os.path.join(self._model, "config")
         # Fix file names and protect special characters.
         hmmdefs = '"' + \
@@ -272,7 +272,7 @@ class JuliusAligner(BaseAligner):
 
         # 1. the acoustic model
         command += " -h " + hmmdefs
-        if os.path.isfile(tiedlist):
+        if tiedlist is not None:
             command += " -hlist " + '"' + tiedlist.replace('"', '\\"') + '"'
         if os.path.isfile(config):
             # force Julius to use configuration file of HTK, by David Yeung
@@ -372,6 +372,10 @@ class JuliusAligner(BaseAligner):
         else:
             self.gen_slm_dependencies(basename)
 
+        # Tie the triphones that are not in the model before julius
+        # complains about them
+        self.add_missing_triphones()
+
         self.run_julius(input_wav, basename, output_align)
         lines = BaseAlignersReader.get_lines(output_align)
         error_lines = ""
@@ -390,11 +394,12 @@ class JuliusAligner(BaseAligner):
                     entries.append(tie)
 
         if len(entries) > 0:
-            message = "SPPAS will try to add the following {:d} triphones in the acoustic model: \n{:s}\n".format(len(entries), "\n".join(entries))
+            message = "SPPAS will try to add the following {:d} triphones in the tiedlist of the alignment: \n{:s}\n".format(len(entries), "\n".join(entries))
             added = self.add_tiedlist(entries)
             if len(added) == len(entries):
-                message += "The acoustic model was modified. All the missing " \
-                           "entries were successfully added in the model: " \
+                message += "The tiedlist was completed. All the missing " \
+                           "entries were successfully added in a copy of the " \
+                           "tiedlist of the model, used by the alignment: " \
                            "{:s}.\nSPPAS calls Julius alignment system for a 2nd time." \
                            "\n".format(",".join(added))
                 self.run_julius(input_wav, basename, output_align)
@@ -403,13 +408,13 @@ class JuliusAligner(BaseAligner):
                     f.close()
 
             elif len(added) > 0:
-                    message += "The acoustic model was modified. " \
-                              "The following entries were successfully added in the acoustic model: {:s}.\n" \
+                    message += "The tiedlist was completed. " \
+                              "The following entries were successfully added in a copy of the tiedlist of the model: {:s}.\n" \
                               "However not all missing entries were added. " \
                               "Alignment can't be performed by 'Julius' aligner." \
                               "\n".format(added)
             else:
-                message += "None of the entries were added in the acoustic model. " \
+                message += "None of the entries were added in the tiedlist. " \
                           "Alignment can't be performed by 'Julius' aligner." \
                           "\n".format(added)
 
@@ -53,6 +53,9 @@ is based on the following principles:
 from sppas.src.config import cfg
 from sppas.src.config import sppasEnableFeatureError
 
+# The "video" feature is checked when importing imgdata: opencv and numpy
+import sppas.src.imgdata
+
 from .lpckeys import CuedSpeechKeys
 
 # ---------------------------------------------------------------------------
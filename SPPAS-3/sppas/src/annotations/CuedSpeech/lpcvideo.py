@@ -40,14 +40,16 @@
 """
 
 import logging
+import numpy
 
 from sppas.src.config import sppasError
+from sppas.src.config import IntervalRangeException
 from sppas.src.anndata import sppasTier
 from sppas.src.videodata import sppasVideoWriter
+from sppas.src.videodata import sppasVideoSegments
 from sppas.src.imgdata import sppasCoords
 
 from sppas.src.annotations.FaceSights import sppasSightsVideoReader
-from sppas.src.annotations.FaceSights import Sights
 
 from .videokeys import sppasKeysVideoBuffer
 from .videokeys import sppasKeysVideoWriter
@@ -60,9 +62,36 @@ MSG_ERROR_MISMATCH = "The given {:d} coordinates in CSV file doesn't match " \
 # ---------------------------------------------------------------------------
 
 
+def tag_video_segment(video, start, end, csv_sights, syll_keys):
+    """Return the vowels positions and the key of the frames of a segment.
+
+    Target of the processes estimating the keys of a video by segments:
+    each one creates its own tagger, which loads the sights of the CSV.
+
+    :param video: (str) Filename of the input video
+    :param start: (int) Index of the first frame of the segment
+    :param end: (int) Index of the frame to stop at
+    :param csv_sights: (str) Filename of the CSV with sights
+    :param syll_keys: (sppasTier) Codes of the C-V syllables
+    :return: (list) The vowels positions and the key of each frame
+
+    """
+    tagger = CuedSpeechVideoTagger(video, csv_sights)
+    try:
+        return tagger.segment_keys(start, end, syll_keys)
+    finally:
+        tagger.close()
+
+# ---------------------------------------------------------------------------
+
+
 class CuedSpeechVideoTagger(object):
     """Create a video with hands tagged on the face of a video.
 
+    With several workers, the vowels positions and the keys of the frames
+    are estimated by segments of the video in a pool of processes. The
+    images are then tagged and written into the video by this process.
+
     """
 
     def __init__(self, video=None, csv_sights=None):
@@ -73,6 +102,10 @@ class CuedSpeechVideoTagger(object):
 
         """
         self.__data = None
+        self.__vowels = None
+        self.__video = None
+        self.__csv_sights = None
+        self.__nb_workers = 1
         self.__video_buffer = sppasKeysVideoBuffer()
         self.__video_writer = sppasKeysVideoWriter()
         self.__video_writer.set_options(csv=False, folder=False, tag=True, crop=False)
@@ -82,6 +115,26 @@ class CuedSpeechVideoTagger(object):
 
     # -----------------------------------------------------------------------
 
+    def get_nb_workers(self):
+        """Return the max number of processes to estimate the keys."""
+        return self.__nb_workers
+
+    # -----------------------------------------------------------------------
+
+    def set_nb_workers(self, value=1):
+        """Fix the max number of processes to estimate the keys of a video.
+
+        :param value: (int) Number of processes. 1 to disable parallelism.
+        :raise: IntervalRangeException
+
+        """
+        value = int(value)
+        if value < 1:
+            raise IntervalRangeException(value, 1, 256)
+        self.__nb_workers = value
+
+    # -----------------------------------------------------------------------
+
     def load(self, video, csv_sights):
         """Open the video and load the CVS data.
 
@@ -94,24 +147,29 @@ class CuedSpeechVideoTagger(object):
         # Open the CSV file dans load all its data
         self.__data = sppasSightsVideoReader(csv_sights)
         # Only one kid is expected
-        for entry in self.__data.ids:
-            if len(entry) > 1:
-                raise ValueError("Only one identified face was expected. Get {:d}."
-                                 "".format(len(entry)))
+        nfaces = self.__data.get_nfaces()
+        if nfaces > 1:
+            raise ValueError("Only one identified face was expected. Get {:d}."
+                             "".format(nfaces))
 
         # Open the video file
         self.__video_buffer.open(video)
 
         # The nb of lines in the CSV must correspond to the number of frames of the video
         nframes = self.__video_buffer.get_nframes()
-        if len(self.__data.coords) != nframes:
+        if self.__data.get_nframes() != nframes:
             # Release the video stream
             self.__video_buffer.close()
             self.__video_buffer.reset()
-            raise sppasError(MSG_ERROR_MISMATCH.format(len(self.__data.coords), nframes))
+            raise sppasError(MSG_ERROR_MISMATCH.format(self.__data.get_nframes(), nframes))
+
+        # Use the 68 face sights to fix the positions of the 5 possible keys
+        self.__vowels = self.__vowels_positions()
 
         # Adjust the video writer
         self.__video_writer.set_fps(self.__video_buffer.get_framerate())
+        self.__video = video
+        self.__csv_sights = csv_sights
 
     # -----------------------------------------------------------------------
 
@@ -142,6 +200,12 @@ class CuedSpeechVideoTagger(object):
         if self.__video_buffer.is_opened() is False:
             return ()
 
+        # Estimate the keys of all the frames by segments of the video
+        frames = None
+        if self.__nb_workers > 1:
+            segments = sppasVideoSegments(self.__video, self.__nb_workers)
+            frames = segments.map(tag_video_segment, self.__csv_sights, syll_keys)
+
         result = list()
         i = 0   # index of the first image of each buffer
         nb = 0  # buffer number
@@ -154,14 +218,14 @@ class CuedSpeechVideoTagger(object):
             # Fill-in the buffer with images
             read_next = self.__video_buffer.next()
 
-            # Use the 68 face sights to fix the positions of the 5 possible keys
-            self.__fix_vowels_position(self.__data.sights[i:i+len(self.__video_buffer)])
-
-            # Browse the tier to fix the key of each image of the buffer
-            image_duration = 1. / self.__video_buffer.get_framerate()
-            start_time = float(i) * image_duration
-            end_time = float(i + len(self.__video_buffer)) * image_duration
-            self.__fix_keys(start_time, end_time, syll_keys)
+            # Fix the positions of the 5 possible keys and the key of each image
+            if frames is None:
+                buffer_frames = self.segment_keys(i, i + len(self.__video_buffer), syll_keys)
+            else:
+                buffer_frames = frames[i:i + len(self.__video_buffer)]
+            for buf_idx, (coords, key) in enumerate(buffer_frames):
+                self.__video_buffer.set_coordinates(buf_idx, coords)
+                self.__video_buffer.set_key(buf_idx, key[0], key[1])
 
             # Save the current result in a video
             if output is not None:
@@ -175,91 +239,118 @@ class CuedSpeechVideoTagger(object):
 
     # -----------------------------------------------------------------------
 
-    def __fix_vowels_position(self, all_sights):
-        """Fix the 5 vowels positions in each image of the buffer.
+    def segment_keys(self, start, end, syll_keys):
+        """Return the vowels positions and the key of the frames of a segment.
+
+        :param start: (int) Index of the first frame of the segment
+        :param end: (int) Index of the frame to stop at
+        :param syll_keys: (sppasTier) Codes of the C-V syllables
+        :return: (list) List of (coords, (consonant, vowel)) of each frame
+
+        """
+        # Create a tier with only the annotations of the segment to increase
+        # all the "find" needed later to browse the annotations
+        image_duration = 1. / self.__video_buffer.get_framerate()
+        anns = syll_keys.find(float(start) * image_duration,
+                              float(end) * image_duration, overlaps=True)
+        tier = sppasTier("")
+        for a in anns:
+            tier.add(a)
+
+        result = list()
+        for frame in range(start, end):
+            result.append((self.__vowels_coords(frame),
+                           self.__frame_key(frame, image_duration, tier)))
+        return result
+
+    # -----------------------------------------------------------------------
+
+    def __vowels_positions(self):
+        """Estimate the 5 vowels positions in all the images of the video.
 
-        :param all_sights: (list of 68 sights)
+        The sights of the kid are the ones of the first face. An image
+        without sights is using the ones of the previous image.
+
+        :return: (numpy.ndarray) Array of shape (frames, 5, 3) with x, y, score
 
         """
-        kid_sights = Sights(nb=68)
-        for buf_idx, sights in enumerate(all_sights):
-            # Get the sights of the kid in the image or use the previous ones
-            if len(sights) > 0:
-                kid_sights = sights[0]
-
-            # Among the 68, get the sights needed to fix the 5 positions of the keys
-            x0, y0, s0 = kid_sights.get_sight(0)
-            x2, y2, s2 = kid_sights.get_sight(2)
-            x8, y8, s8 = kid_sights.get_sight(8)
-            x36, y36, s36 = kid_sights.get_sight(36)
-            x48, y48, s48 = kid_sights.get_sight(48)
-            x57, y57, s57 = kid_sights.get_sight(57)
-            x60, y60, s60 = kid_sights.get_sight(60)
-
-            # Position 1 is close to the left eye
-            x = x0 + ((x36 - x0) // 2)
-            y = y0 + (y0 - y36)
-            c1 = sppasCoords(x, y, confidence=s0)
-
-            # Position 2 is in the middle of the chin
-            x = x8
-            y = y8 - ((y8 - y57) // 4)
-            c2 = sppasCoords(x, y, confidence=s8)
-
-            # Position 3 is on the left side of the face
-            x = max(0, x2 - (x36 - x0))
-            y = y2
-            c3 = sppasCoords(x, y, confidence=s2)
-
-            # Position 4 is at the left of the lips
-            x = x48 - (x60 - x48)
-            y = y48 + ((y57 - y48) // 2)
-            c4 = sppasCoords(x, y, confidence=s48)
-
-            # Position 5 is at the glottis
-            x = x8
-            y = y8 + (y8-y57)
-            c5 = sppasCoords(x, y, confidence=s57)
-
-            self.__video_buffer.set_coordinates(buf_idx, [c1, c2, c3, c4, c5])
+        sights = self.__data.get_face_sights(0, fill=True)
+        x = sights[:, :, 0].astype(int)
+        y = sights[:, :, 1].astype(int)
+        s = sights[:, :, 2]
+        positions = numpy.zeros((len(sights), 5, 3), dtype=numpy.float64)
+
+        # Position 1 is close to the left eye
+        positions[:, 0, 0] = x[:, 0] + ((x[:, 36] - x[:, 0]) // 2)
+        positions[:, 0, 1] = y[:, 0] + (y[:, 0] - y[:, 36])
+        positions[:, 0, 2] = s[:, 0]
+
+        # Position 2 is in the middle of the chin
+        positions[:, 1, 0] = x[:, 8]
+        positions[:, 1, 1] = y[:, 8] - ((y[:, 8] - y[:, 57]) // 4)
+        positions[:, 1, 2] = s[:, 8]
+
+        # Position 3 is on the left side of the face
+        positions[:, 2, 0] = numpy.maximum(0, x[:, 2] - (x[:, 36] - x[:, 0]))
+        positions[:, 2, 1] = y[:, 2]
+        positions[:, 2, 2] = s[:, 2]
+
+        # Position 4 is at the left of the lips
+        positions[:, 3, 0] = x[:, 48] - (x[:, 60] - x[:, 48])
+        positions[:, 3, 1] = y[:, 48] + ((y[:, 57] - y[:, 48]) // 2)
+        positions[:, 3, 2] = s[:, 48]
+
+        # Position 5 is at the glottis
+        positions[:, 4, 0] = x[:, 8]
+        positions[:, 4, 1] = y[:, 8] + (y[:, 8] - y[:, 57])
+        positions[:, 4, 2] = s[:, 57]
+
+        return positions
 
     # -----------------------------------------------------------------------
 
-    def __fix_keys(self, start_time, end_time, syll_tier):
-        """Fix the key of each image of the buffer.
+    def __vowels_coords(self, frame):
+        """Return the 5 vowels positions in an image of the video.
 
-        :return: (list of tuples) List of vowel-consonant
+        :param frame: (int) Index of the image in the video
+        :return: (list of sppasCoords)
 
         """
-        # Create a tier with only the annotations of the buffer to increase
-        # all the "find" needed later to browse the annotations
-        anns = syll_tier.find(start_time, end_time, overlaps=True)
-        tier = sppasTier("")
-        for a in anns:
-            tier.add(a)
+        coords = list()
+        for x, y, score in self.__vowels[frame].tolist():
+            confidence = None if numpy.isnan(score) else score
+            coords.append(sppasCoords(int(x), int(y), confidence=confidence))
+        return coords
 
-        image_duration = 1. / self.__video_buffer.get_framerate()
-        for buf_idx, image in enumerate(self.__video_buffer):
-            # Get the annotations during the image
-            s = start_time + (buf_idx * image_duration)
-            e = s + image_duration
-            anns = tier.find(s, e, overlaps=True)
-            if len(anns) == 0:
-                # There no key assigned to the image
-                self.__video_buffer.set_key(buf_idx, "0", "0")
-            elif len(anns) == 1:
-                # A key is matching the image time
-                labels = anns[0].get_labels()
-                if len(labels) == 2:
-                    consonant = labels[0].get_best().get_content()
-                    vowel = labels[1].get_best().get_content()
-                    self.__video_buffer.set_key(buf_idx, consonant, vowel)
-                else:
-                    raise ValueError(
-                        "Two labels (consonant, vowel) were expected in "
-                        "CuedSpeech. Got {:d} instead.".format(len(labels)))
-            else:
-                # There are several keys assigned to the image.
-                # It is probably a transition between 2 keys but both are
-                # too short in time to be drawn.
-                self.__video_buffer.set_key(buf_idx, "0", "0")
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __frame_key(frame, image_duration, tier):
+        """Return the key of an image of the video.
+
+        :param frame: (int) Index of the image in the video
+        :param image_duration: (float) Duration of an image
+        :param tier: (sppasTier) Codes of the C-V syllables
+        :return: (tuple) consonant, vowel
+
+        """
+        # Get the annotations during the image
+        s = float(frame) * image_duration
+        e = s + image_duration
+        anns = tier.find(s, e, overlaps=True)
+        if len(anns) == 1:
+            # A key is matching the image time
+            labels = anns[0].get_labels()
+            if len(labels) == 2:
+                consonant = labels[0].get_best().get_content()
+                vowel = labels[1].get_best().get_content()
+                return consonant, vowel
+
+            raise ValueError(
+                "Two labels (consonant, vowel) were expected in "
+                "CuedSpeech. Got {:d} instead.".format(len(labels)))
+
+        # There's no key assigned to the image or there are several ones.
+        # Several keys is probably a transition between 2 keys but both are
+        # too short in time to be drawn.
+        return "0", "0"
@@ -105,6 +105,7 @@ class sppasCuedSpeech(sppasBaseAnnotation):
         Available options are:
 
             - createvideo
+            - workers
 
         :param options: (sppasOption)
 
@@ -115,6 +116,9 @@ class sppasCuedSpeech(sppasBaseAnnotation):
             if "createvideo" == key:
                 self.set_create_video(opt.get_value())
 
+            elif "workers" == key:
+                self.set_nb_workers(opt.get_value())
+
             elif "pattern" in key:
                 self._options[key] = opt.get_value()
 
@@ -131,6 +135,18 @@ class sppasCuedSpeech(sppasBaseAnnotation):
         """
         self._options['createvideo'] = create
 
+    # -----------------------------------------------------------------------
+
+    def set_nb_workers(self, value=1):
+        """Fix the number of processes to estimate the keys of a video.
+
+        :param value: (int) Number of processes. 1 to disable parallelism.
+
+        """
+        value = int(value)
+        self.__tagger.set_nb_workers(value)
+        self._options['workers'] = value
+
     # -----------------------------------------------------------------------
     # Syllabification of time-aligned phonemes stored into a tier
     # -----------------------------------------------------------------------
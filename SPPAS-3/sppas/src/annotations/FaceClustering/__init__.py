@@ -46,6 +46,9 @@ import logging
 from sppas.src.config import cfg
 from sppas.src.config import sppasEnableFeatureError
 
+# The "video" feature is checked when importing imgdata: opencv and numpy
+import sppas.src.imgdata
+
 # ---------------------------------------------------------------------------
 
 if cfg.feature_installed("video") is False:
@@ -42,6 +42,7 @@
 import logging
 import collections
 import os
+import numpy
 
 from sppas.src.config import sppasError
 from sppas.src.calculus import symbols_to_items
@@ -57,6 +58,7 @@ from sppas.src.imgdata import sppasImagesSimilarity
 from sppas.src.annotations.FaceDetection import ImageFaceDetection
 
 from .kidsbuffer import sppasKidsVideoBuffer
+from .kidscrops import sppasKidsCropsStore
 from .kidswriter import sppasKidsVideoReader
 from .kidswriter import sppasKidsVideoWriter
 
@@ -77,8 +79,10 @@ class VideoCoordsIdentification(object):
         """Create a new instance.
 
         """
-        # Video stream with a buffer of images and the lists of coordinates
+        # Video stream with a buffer of images and the lists of coordinates.
+        # The next images are decoded while the current ones are identified.
         self._video_buffer = sppasKidsVideoBuffer()
+        self._video_buffer.set_prefetch(True)
 
         # Threshold applied to the confidence score in order to determinate 
         # if it's a kid candidate.
@@ -90,6 +94,10 @@ class VideoCoordsIdentification(object):
         # Kids data & similarity measures: identifier, images, coords...
         self.__kidsim = sppasImagesSimilarity()
 
+        # Images of the coords, cropped when the video is decoded and
+        # downscaled to the size of the images of the recognizer
+        self.__crops = sppasKidsCropsStore(max_size=160)
+
         # Export a video file for each identified person
         self._out_ident = True
 
@@ -116,8 +124,9 @@ class VideoCoordsIdentification(object):
     # -----------------------------------------------------------------------
 
     def invalidate(self):
-        """Invalidate the list of all known identifiers."""
+        """Invalidate the list of all known identifiers and stored images."""
         self.__kidsim = sppasImagesSimilarity()
+        self.__crops.close()
 
     # -----------------------------------------------------------------------
     # Assign an identity to detected coordinates
@@ -126,6 +135,11 @@ class VideoCoordsIdentification(object):
     def video_identity(self, video, csv_coords, video_writer=None, output=None, pattern="-ident"):
         """Browse the video, get coords then cluster, identify and write results.
 
+        The video is decoded by the 1st pass only, which stores the images
+        of the coords, downscaled. The 2nd pass is using these stored images,
+        and the 3rd one decodes the video again only if there's something to
+        write.
+
         :param video: (str) Video filename
         :param csv_coords: (str) Filename with the coords
         :param video_writer: (sppasKidsVideoWriter)
@@ -138,37 +152,37 @@ class VideoCoordsIdentification(object):
         self.invalidate()
         # Open the video stream
         self._video_buffer.open(video)
-        if video_writer is not None:
-            video_writer.set_fps(self._video_buffer.get_framerate())
-
-        # Load the coordinates from the CSV file
-        br = sppasKidsVideoReader(csv_coords)
-        coords = br.coords
-        nframes = self._video_buffer.get_nframes()
-        if len(coords) != nframes:
-            # Release the video stream
-            self._video_buffer.close()
-            self._video_buffer.reset()
-            raise sppasError(MSG_ERROR_MISMATCH.format(len(coords), nframes))
-
-        # Cluster coords into kids and remove duplicated kids
-        self.__first_pass_clustering(coords)
-        self.__filter_kids()
-        if output is not None:
-            # write the stored images of each kid in the output folder
-            self.__kidsim.write(output)
+        try:
+            if video_writer is not None:
+                video_writer.set_fps(self._video_buffer.get_framerate())
+
+            # Load the coordinates from the CSV file
+            br = sppasKidsVideoReader(csv_coords)
+            coords = br.coords
+            nframes = self._video_buffer.get_nframes()
+            if len(coords) != nframes:
+                raise sppasError(MSG_ERROR_MISMATCH.format(len(coords), nframes))
+
+            # Cluster coords into kids and remove duplicated kids
+            self.__first_pass_clustering(coords)
+            self.__filter_kids()
+            if output is not None:
+                # write the stored images of each kid in the output folder
+                self.__kidsim.write(output)
 
-        # Associate each coord to a kid or remove it if no kid matches
-        self.__kidsim.train_recognizer()
-        coords, idents = self.__second_pass_identification(coords)
+            # Associate each coord to a kid or remove it if no kid matches
+            self.__kidsim.train_recognizer()
+            coords, idents = self.__second_pass_identification(coords)
 
-        # Smooth coordinates and save into video/csv/image files
-        # result is the list of created file names
-        result = self.__third_pass_smoothing(coords, idents, video_writer, output, pattern)
+            # Smooth coordinates and save into video/csv/image files
+            # result is the list of created file names
+            result = self.__third_pass_smoothing(coords, idents, video_writer, output, pattern)
 
-        # Release the video stream
-        self._video_buffer.close()
-        self._video_buffer.reset()
+        finally:
+            # Release the video stream and the stored images
+            self._video_buffer.close()
+            self._video_buffer.reset()
+            self.__crops.close()
 
         if output is not None and video_writer is not None:
             return result
@@ -197,10 +211,12 @@ class VideoCoordsIdentification(object):
             logging.info(" ... buffer number {:d}".format(nb+1))
             read_next = self._video_buffer.next()
 
-            # fill-in the buffer with coords
+            # fill-in the buffer with coords and store their images
             for buf_idx, image in enumerate(self._video_buffer):
                 all_idx_coords = coords[i+buf_idx]
                 self._video_buffer.set_coordinates(buf_idx, all_idx_coords)
+                for f, c in enumerate(all_idx_coords):
+                    self.__crops.add(i+buf_idx, f, image.icrop(c))
 
             # cluster the coords to set the identities
             self.__cluster_buffer()
@@ -216,28 +232,24 @@ class VideoCoordsIdentification(object):
         """Verify if all kids are different ones and remove duplicated.
         
         """
-        dist = dict()
+        pids = list(self.__kidsim)
+        scores = self.__kidsim.compare_all_kids_coords()
         remove_ids = list()
-        for pid1 in self.__kidsim:
-            for pid2 in self.__kidsim:
-                if pid1 == pid2:
-                    continue
-                if (pid1, pid2) not in dist and (pid2, pid1) not in dist:
-                    score_coords = self.__kidsim.compare_kids_coords(pid1, pid2)
-                    dist[(pid1, pid2)] = score_coords
-                    if score_coords > 0.1:
-                        # The coordinates are overlapping
-                        # Do we have also to compare image contents to confirm?????????
-                        nb1 = self.__kidsim.get_nb_images(pid1)
-                        nb2 = self.__kidsim.get_nb_images(pid2)
-                        if nb1 >= nb2 and pid2 not in remove_ids:
-                            remove_ids.append(pid2)
-                            logging.info(" ... identity {:s} is removed because "
-                                         "duplicated with {:s}".format(pid2, pid1))
-                        if nb2 > nb1 and pid1 not in remove_ids:
-                            remove_ids.append(pid1)
-                            logging.info(" ... identity {:s} is removed because "
-                                         "duplicated with {:s}".format(pid1, pid2))
+        # Browse the pairs of kids with overlapping coordinates
+        for i, j in zip(*numpy.nonzero(numpy.triu(scores > 0.1, k=1))):
+            pid1 = pids[i]
+            pid2 = pids[j]
+            # Do we have also to compare image contents to confirm?????????
+            nb1 = self.__kidsim.get_nb_images(pid1)
+            nb2 = self.__kidsim.get_nb_images(pid2)
+            if nb1 >= nb2 and pid2 not in remove_ids:
+                remove_ids.append(pid2)
+                logging.info(" ... identity {:s} is removed because "
+                             "duplicated with {:s}".format(pid2, pid1))
+            if nb2 > nb1 and pid1 not in remove_ids:
+                remove_ids.append(pid1)
+                logging.info(" ... identity {:s} is removed because "
+                             "duplicated with {:s}".format(pid1, pid2))
 
         for pid in remove_ids:
             self.__kidsim.remove_identifier(pid)
@@ -255,7 +267,8 @@ class VideoCoordsIdentification(object):
         logging.info("System 2nd pass: assign each coordinate an identity or "
                      "remove it.")
 
-        # Browse the video using the buffer of images
+        # Browse the video using the buffer, without decoding the images:
+        # the images of the coords were stored by the 1st pass.
         read_next = True
         idents = list()
         revised_coords = list()
@@ -263,9 +276,9 @@ class VideoCoordsIdentification(object):
         nb = 0
         self._video_buffer.seek_buffer(0)
         while read_next is True:
-            # fill-in the buffer with 'size'-images of the video
+            # fill-in the buffer with 'size'-frames of the video
             logging.info(" ... buffer number {:d}".format(nb+1))
-            read_next = self._video_buffer.next()
+            read_next = self._video_buffer.next(decode=False)
 
             # fill-in the buffer with coords
             for buf_idx, image in enumerate(self._video_buffer):
@@ -300,6 +313,10 @@ class VideoCoordsIdentification(object):
         self._video_buffer.seek_buffer(0)
         self._video_buffer.set_buffer_size(int(2. * video_writer.get_fps()))
         kids_video_writers, kids_video_buffers = self.create_kids_writers_buffers(video_writer)
+        # the images are needed only to be written
+        decode = False
+        if output is not None and video_writer is not None:
+            decode = video_writer.get_image_output() or self._out_ident
 
         while read_next is True:
             # fill-in the buffer with 'size'-images of the video
@@ -307,7 +324,7 @@ class VideoCoordsIdentification(object):
                 logging.info(" ... buffer number {:d}".format(nb + 1))
 
             # fill-in the buffer with images, coords and ids
-            read_next = self._video_buffer.next()
+            read_next = self._video_buffer.next(decode)
             for buf_idx, image in enumerate(self._video_buffer):
                 self._video_buffer.set_coordinates(buf_idx, coords[i + buf_idx])
                 self._video_buffer.set_ids(buf_idx, idents[i + buf_idx])
@@ -331,6 +348,10 @@ class VideoCoordsIdentification(object):
             nb += 1
             i += len(self._video_buffer)
 
+        # Encode the last images of the kids videos
+        for kid in kids_video_writers:
+            kids_video_writers[kid].close()
+
         return result
 
     # -----------------------------------------------------------------------
@@ -703,8 +724,8 @@ class VideoCoordsIdentification(object):
         """Set a kid to each coord of the buffer with image similarities.
 
         """
+        first_frame = self._video_buffer.get_buffer_range()[0]
         for i in range(len(self._video_buffer)):
-            image = self._video_buffer[i]
             coords_i = self._video_buffer.get_coordinates(i)
 
             # for each of the coordinates, assign a kid
@@ -715,7 +736,7 @@ class VideoCoordsIdentification(object):
                 identity, score = self.__kidsim.identify(image=None, coords=c)
                 if identity is None:
                     # Coords are not matching enough. Rescue with the image similarities.
-                    img = image.icrop(c)
+                    img = self.__get_cropped_image(first_frame + i, f)
                     identity, score = self.__kidsim.identify(image=img, coords=None)
                 # The similarity measure identified a kid
                 if identity is not None:
@@ -749,6 +770,22 @@ class VideoCoordsIdentification(object):
 
     # -----------------------------------------------------------------------
 
+    def __get_cropped_image(self, frame_index, coords_index):
+        """Return the image of a coord, either stored or cropped.
+
+        :param frame_index: (int) Index of the frame in the video
+        :param coords_index: (int) Index of the coords in the frame
+
+        """
+        img = self.__crops.get(frame_index, coords_index)
+        if img is None:
+            buffer_index = frame_index - self._video_buffer.get_buffer_range()[0]
+            image = self._video_buffer[buffer_index]
+            img = image.icrop(self._video_buffer.get_coordinate(buffer_index, coords_index))
+        return img
+
+    # -----------------------------------------------------------------------
+
     def __create_kid(self, image_index, coords_index):
         """Create and add a new kid.
         
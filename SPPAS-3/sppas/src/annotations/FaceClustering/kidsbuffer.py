@@ -82,11 +82,13 @@ class sppasKidsVideoBuffer(sppasCoordsVideoBuffer):
 
     # -----------------------------------------------------------------------
 
-    def next(self):
+    def next(self, decode=True):
         """Override. Fill in the buffer with the next images & reset ids.
 
+        :param decode: (bool) Read the images from the video
+
         """
-        ret = sppasCoordsVideoBuffer.next(self)
+        ret = sppasCoordsVideoBuffer.next(self, decode)
         self.__init_ids()
         return ret
 
@@ -0,0 +1,191 @@
+# -*- coding : UTF-8 -*-
+"""
+:filename: sppas.src.annotations.FaceClustering.kidscrops.py
+:author:   Brigitte Bigi
+:contact:  develop@sppas.org
+:summary:  A memory-mapped store of the cropped images of the coords.
+
+.. _This file is part of SPPAS: http://www.sppas.org/
+..
+    ---------------------------------------------------------------------
+
+     ___   __    __    __    ___
+    /     |  \  |  \  |  \  /              the automatic
+    \__   |__/  |__/  |___| \__             annotation and
+       \  |     |     |   |    \             analysis
+    ___/  |     |     |   | ___/              of speech
+
+    Copyright (C) 2011-2021  Brigitte Bigi
+    Laboratoire Parole et Langage, Aix-en-Provence, France
+
+    Use of this software is governed by the GNU Public License, version 3.
+
+    SPPAS is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    SPPAS is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+    This banner notice must not be removed.
+
+    ---------------------------------------------------------------------
+
+"""
+
+import os
+import numpy
+import cv2
+
+from sppas.src.config import sppasTypeError
+from sppas.src.config import NegativeValueError
+from sppas.src.imgdata import sppasImage
+from sppas.src.wkps import sppasFileUtils
+
+# ---------------------------------------------------------------------------
+
+
+class sppasKidsCropsStore(object):
+    """Store the images cropped at the coords of a video, on disk.
+
+    The identification of the coords of a video needs to compare parts of
+    the images of the video several times. Instead of decoding the video
+    again, each cropped image is appended to a temporary file which is
+    then memory-mapped to get them back.
+
+    The images can be downscaled to the size the similarity measures are
+    working with: they are stored with a max width and height, and they
+    are resized back to their original size when they are got.
+
+    :Example:
+
+    >>> store = sppasKidsCropsStore(max_size=160)
+    >>> store.add(frame_idx, coord_idx, image.icrop(coord))
+    >>> cropped = store.get(frame_idx, coord_idx)
+    >>> store.close()
+
+    """
+
+    def __init__(self, max_size=0):
+        """Create a new instance. The temporary file is created when needed.
+
+        :param max_size: (int) Max width and height of the stored images or 0
+        :raise: NegativeValueError
+
+        """
+        max_size = int(max_size)
+        if max_size < 0:
+            raise NegativeValueError(max_size)
+        self.__max_size = max_size
+
+        self.__filename = None
+        self.__fd = None
+        self.__data = None
+
+        # key=(frame index, coord index), value=(offset, shape, original shape)
+        self.__index = dict()
+        self.__offset = 0
+
+    # -----------------------------------------------------------------------
+
+    def get_max_size(self):
+        """Return the max width and height of the stored images, 0 if none."""
+        return self.__max_size
+
+    # -----------------------------------------------------------------------
+
+    def add(self, frame_idx, coord_idx, image):
+        """Store the image of a coord.
+
+        :param frame_idx: (int) Index of the frame in the video
+        :param coord_idx: (int) Index of the coord in the frame
+        :param image: (sppasImage) The cropped image
+        :raise: sppasTypeError
+
+        """
+        if isinstance(image, sppasImage) is False:
+            raise sppasTypeError(image, "sppasImage")
+
+        if self.__fd is None:
+            self.__filename = sppasFileUtils().set_random(root="sppas_crops")
+            self.__fd = open(self.__filename, "wb+")
+        # the file will be mapped again at the next reading
+        self.__data = None
+
+        content = numpy.ascontiguousarray(image, dtype=numpy.uint8)
+        shape = content.shape
+        if self.__max_size > 0 and content.size > 0:
+            h, w = shape[:2]
+            if max(w, h) > self.__max_size:
+                ratio = float(self.__max_size) / float(max(w, h))
+                size = (max(1, int(w * ratio)), max(1, int(h * ratio)))
+                content = numpy.ascontiguousarray(
+                    cv2.resize(content, size, interpolation=cv2.INTER_AREA))
+
+        self.__fd.write(content.tobytes())
+        self.__index[(frame_idx, coord_idx)] = (self.__offset, content.shape, shape)
+        self.__offset += content.size
+
+    # -----------------------------------------------------------------------
+
+    def get(self, frame_idx, coord_idx):
+        """Return the stored image of a coord.
+
+        :param frame_idx: (int) Index of the frame in the video
+        :param coord_idx: (int) Index of the coord in the frame
+        :return: (sppasImage) or None if no image was stored
+
+        """
+        if (frame_idx, coord_idx) not in self.__index:
+            return None
+
+        offset, shape, original = self.__index[(frame_idx, coord_idx)]
+        size = int(numpy.prod(shape))
+        if size == 0:
+            return sppasImage(input_array=numpy.zeros(shape, dtype=numpy.uint8))
+
+        if self.__data is None:
+            self.__fd.flush()
+            self.__data = numpy.memmap(self.__filename, dtype=numpy.uint8, mode="r")
+
+        content = numpy.array(self.__data[offset:offset+size]).reshape(shape)
+        if shape != original:
+            # the image was downscaled when stored
+            content = cv2.resize(content, (original[1], original[0]),
+                                 interpolation=cv2.INTER_LINEAR)
+            content = content.reshape(original)
+        return sppasImage(input_array=content)
+
+    # -----------------------------------------------------------------------
+
+    def close(self):
+        """Forget all the stored images and delete the temporary file."""
+        self.__data = None
+        if self.__fd is not None:
+            self.__fd.close()
+            self.__fd = None
+        if self.__filename is not None and os.path.exists(self.__filename):
+            os.remove(self.__filename)
+        self.__filename = None
+        self.__index = dict()
+        self.__offset = 0
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __len__(self):
+        """Return the number of stored images."""
+        return len(self.__index)
+
+    # -----------------------------------------------------------------------
+
+    def __contains__(self, item):
+        """Return True if an image is stored for the (frame, coord) item."""
+        return item in self.__index
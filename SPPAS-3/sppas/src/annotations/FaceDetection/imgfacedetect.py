@@ -87,14 +87,14 @@ class ImageFaceDetection(sppasImageObjectDetection):
 
     # -----------------------------------------------------------------------
 
-    def detect(self, image):
-        """Determine the coordinates of all the detected faces.
+    def _filter_detection(self, image):
+        """Override. Filter and sort the detected faces of the given image.
 
-        :param image: (sppasImage or numpy.ndarray)
+        :param image: (sppasImage) The image the faces were detected in
 
         """
-        # Launch the base method to detect objects, here objects are faces
-        sppasImageObjectDetection.detect(self, image)
+        # Launch the base method to filter objects, here objects are faces
+        sppasImageObjectDetection._filter_detection(self, image)
 
         # Overlapped faces are much rarer than overlapped objects:
         # re-filter with overlapping portraits.
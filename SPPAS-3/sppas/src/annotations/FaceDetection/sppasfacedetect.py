@@ -148,6 +148,9 @@ class sppasFaceDetection(sppasBaseAnnotation):
             elif key == "height":
                 self.set_img_height(opt.get_value())
 
+            elif key == "workers":
+                self.set_nb_workers(opt.get_value())
+
             elif "pattern" in key:
                 self._options[key] = opt.get_value()
 
@@ -262,6 +265,18 @@ class sppasFaceDetection(sppasBaseAnnotation):
         self.__video_writer.set_options(folder=out_folder)
         self._options["folder"] = out_folder
 
+    # -----------------------------------------------------------------------
+
+    def set_nb_workers(self, value=1):
+        """Fix the number of processes to detect the faces of a video.
+
+        :param value: (int) Number of processes. 1 to disable parallelism.
+
+        """
+        value = int(value)
+        self.__fdv.set_nb_workers(value)
+        self._options["workers"] = value
+
     # -----------------------------------------------------------------------
     # Apply the annotation on a given file
     # -----------------------------------------------------------------------
@@ -39,19 +39,64 @@
 
 """
 
+import os
 import logging
+import cv2
 
 from sppas.src.config import sppasError
+from sppas.src.config import IntervalRangeException
 from sppas.src.videodata import sppasCoordsVideoBuffer
+from sppas.src.videodata import sppasVideoSegments
 
 from .imgfacedetect import ImageFaceDetection
 
 # ---------------------------------------------------------------------------
 
 
+def detect_video_segment(video, start, end, config):
+    """Return the coordinates of the faces of a segment of a video.
+
+    Target of the processes detecting the faces of a video by segments:
+    each one creates its own detection system and video buffer. The number
+    of threads of OpenCV is limited in order to not run more threads than
+    processors with all the processes.
+
+    :param video: (str) Video filename
+    :param start: (int) Index of the first frame of the segment
+    :param end: (int) Index of the frame to stop at
+    :param config: (dict) Configuration of the face detection system
+    :return: (list) The list of sppasCoords of each frame of the segment
+
+    """
+    # The segment can be processed by the calling process itself
+    nb_threads = cv2.getNumThreads()
+    cv2.setNumThreads(config["threads"])
+    try:
+        fdi = ImageFaceDetection()
+        fdi.set_min_ratio(config["min_ratio"])
+        fdi.set_min_score(config["min_score"])
+        fdi.set_batch_size(config["batch_size"])
+        fdi.load_model(*config["models"])
+
+        fdv = VideoFaceDetection(fdi)
+        fdv.set_filter_best(config["nbest"])
+        fdv.set_filter_confidence(config["confidence"])
+        fdv.set_portrait(config["portrait"])
+        return fdv.segment_face_detect(video, start, end)
+    finally:
+        cv2.setNumThreads(nb_threads)
+
+# ---------------------------------------------------------------------------
+
+
 class VideoFaceDetection(object):
     """Search for faces on all images of a video.
 
+    With several workers, the video is split into segments and the faces
+    of each segment are detected by a process of a pool. The coordinates
+    are then stitched back in the order of the frames, and the results are
+    written as if the video were processed by a single process.
+
     """
 
     def __init__(self, face_detection):
@@ -64,13 +109,16 @@ class VideoFaceDetection(object):
         if isinstance(face_detection, ImageFaceDetection) is False:
             raise sppasError("A face detection system was expected.")
 
+        # The next images are decoded while faces are detected
         self._video_buffer = sppasCoordsVideoBuffer()
+        self._video_buffer.set_prefetch(True)
 
         # Configure the face detection system
         self.__fd = face_detection
         self.__confidence = face_detection.get_min_score()
         self.__nbest = 0
         self.__portrait = True
+        self.__nb_workers = 1
 
     # -----------------------------------------------------------------------
 
@@ -120,6 +168,26 @@ class VideoFaceDetection(object):
         """
         self.__portrait = bool(value)
 
+    # -----------------------------------------------------------------------
+
+    def get_nb_workers(self):
+        """Return the max number of processes to detect the faces."""
+        return self.__nb_workers
+
+    # -----------------------------------------------------------------------
+
+    def set_nb_workers(self, value=1):
+        """Fix the max number of processes to detect the faces of a video.
+
+        :param value: (int) Number of processes. 1 to disable parallelism.
+        :raise: IntervalRangeException
+
+        """
+        value = int(value)
+        if value < 1:
+            raise IntervalRangeException(value, 1, 256)
+        self.__nb_workers = value
+
     # -----------------------------------------------------------------------
     # Automatic detection of the faces in a video
     # -----------------------------------------------------------------------
@@ -134,6 +202,9 @@ class VideoFaceDetection(object):
         :return: (list) The coordinates of all detected faces on all images
 
         """
+        if self.__nb_workers > 1:
+            return self.__parallel_face_detect(video, video_writer, output)
+
         # Browse the video using the buffer of images
         result = list()
         read_next = True
@@ -170,6 +241,102 @@ class VideoFaceDetection(object):
 
         return result
 
+    # -----------------------------------------------------------------------
+
+    def segment_face_detect(self, video, start, end):
+        """Browse a segment of the video and detect faces.
+
+        :param video: (str) Video filename
+        :param start: (int) Index of the first frame of the segment
+        :param end: (int) Index of the frame to stop at
+        :return: (list) The coordinates of all detected faces on all images
+
+        """
+        result = list()
+        buffer_size = self._video_buffer.get_buffer_size()
+        self._video_buffer.open(video)
+        self._video_buffer.seek_buffer(start)
+        end = min(end, self._video_buffer.get_nframes())
+
+        read_next = True
+        while read_next is True and start + len(result) < end:
+            # do not read nor detect the frames after the end of the segment
+            remaining = end - start - len(result)
+            if remaining < self._video_buffer.get_buffer_size():
+                self._video_buffer.set_buffer_size(remaining)
+                self._video_buffer.seek_buffer(start + len(result))
+
+            read_next = self._video_buffer.next()
+            self.detect_buffer()
+            for i in range(len(self._video_buffer)):
+                result.append(self._video_buffer.get_coordinates(i))
+
+        # Release the video stream
+        self._video_buffer.close()
+        self._video_buffer.reset()
+        self._video_buffer.set_buffer_size(buffer_size)
+
+        return result
+
+    # -----------------------------------------------------------------------
+
+    def __parallel_face_detect(self, video, video_writer=None, output=None):
+        """Detect faces by segments of the video then write results.
+
+        :param video: (str) Video filename
+        :param video_writer: ()
+        :param output: (str) The output name for the folder and/or the video
+
+        :return: (list) The coordinates of all detected faces on all images
+
+        """
+        # The detection system isn't ready
+        if self.__fd.get_nb_recognizers() == 0:
+            raise sppasError("A face detector must be initialized first.")
+
+        # Share out the processors between the processes
+        nb_threads = max(1, (os.cpu_count() or 1) // self.__nb_workers)
+        config = {
+            "models": self.__fd.get_models(),
+            "min_ratio": self.__fd.get_min_ratio(),
+            "min_score": self.__fd.get_min_score(),
+            "batch_size": self.__fd.get_batch_size(),
+            "nbest": self.__nbest,
+            "confidence": self.__confidence,
+            "portrait": self.__portrait,
+            "threads": nb_threads
+        }
+
+        segments = sppasVideoSegments(video, self.__nb_workers)
+        coords = segments.map(detect_video_segment, config)
+        if output is None or video_writer is None:
+            return coords
+
+        # Write the coordinates, buffer by buffer. The images are decoded
+        # only if they are needed to write the results.
+        decode = video_writer.get_image_output()
+        result = list()
+        read_next = True
+        i = 0
+
+        self._video_buffer.open(video)
+        self._video_buffer.seek_buffer(0)
+        video_writer.set_fps(self._video_buffer.get_framerate())
+
+        while read_next is True:
+            read_next = self._video_buffer.next(decode)
+            for j in range(len(self._video_buffer)):
+                self._video_buffer.set_coordinates(j, coords[i + j])
+            new_files = video_writer.write(self._video_buffer, output)
+            result.extend(new_files)
+            i += len(self._video_buffer)
+
+        # Release the video stream
+        self._video_buffer.close()
+        self._video_buffer.reset()
+
+        return result
+
     # -----------------------------------------------------------------------
     # Work on a buffer...
     # -----------------------------------------------------------------------
@@ -192,11 +359,10 @@ class VideoFaceDetection(object):
         if self.__fd.get_nb_recognizers() == 0:
             raise sppasError("A face detector must be initialized first.")
 
-        # Find the coordinates of faces in each image.
-        for i, image in enumerate(self._video_buffer):
-
-            # Perform face detection to detect all faces in the current image
-            self.__fd.detect(image)
+        # Find the coordinates of faces in each image. Face detection is
+        # performed on batches of images of the buffer.
+        images = [image for image in self._video_buffer]
+        for i, image in enumerate(self.__fd.detect_all(images)):
 
             # Apply filters to keep the better ones
             if self.__nbest != 0:
@@ -44,6 +44,9 @@ This package requires 'video' feature, for opencv and numpy dependencies.
 from sppas.src.config import cfg
 from sppas.src.config import sppasEnableFeatureError
 
+# The "video" feature is checked when importing imgdata: opencv and numpy
+import sppas.src.imgdata
+
 
 if cfg.feature_installed("video") is True:
     # -----------------------------------------------------------------------
@@ -55,6 +58,7 @@ if cfg.feature_installed("video") is True:
     from .videosights import sppasSightsVideoBuffer
     from .videosights import sppasSightsVideoWriter
     from .videosights import sppasSightsVideoReader
+    from .sightsstore import sppasSightsVideoStore
     from .sppasfacesights import sppasFaceSights
 
 else:
@@ -86,6 +90,11 @@ else:
             raise sppasEnableFeatureError("video")
 
 
+    class sppasSightsVideoStore(object):
+        def __init__(self):
+            raise sppasEnableFeatureError("video")
+
+
     class sppasFaceSights(object):
         def __init__(self):
             raise sppasEnableFeatureError("video")
@@ -97,5 +106,6 @@ __all__ = (
     "sppasSightsVideoBuffer",
     "sppasSightsVideoWriter",
     "sppasSightsVideoReader",
+    "sppasSightsVideoStore",
     "sppasFaceSights"
 )
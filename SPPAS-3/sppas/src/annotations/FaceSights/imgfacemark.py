@@ -85,6 +85,7 @@ class ImageFaceLandmark(object):
         """Create a new FaceLandmark instance."""
         # The landmark recognizers -- at least one must be instantiated
         self.__markers = list()
+        self.__models = list()
 
         # The 68 sights detected on the face
         self.__sights = Sights(nb=68)
@@ -103,6 +104,12 @@ class ImageFaceLandmark(object):
 
     # -----------------------------------------------------------------------
 
+    def get_models(self):
+        """Return the filenames of the models of the landmark recognizers."""
+        return list(self.__models)
+
+    # -----------------------------------------------------------------------
+
     def load_model(self, model_landmark, *args):
         """Initialize the face detection and recognizer from model files.
 
@@ -147,6 +154,7 @@ class ImageFaceLandmark(object):
             fm.loadModel(filename)
             # TODO: check that the model is based on the detection of 68 sights but there's nothing in cv2 to do that...
             self.__markers.append(fm)
+            self.__models.append(filename)
         except cv2.error as e:
             logging.error("Loading the model {} failed.".format(filename))
             raise sppasError(str(e))
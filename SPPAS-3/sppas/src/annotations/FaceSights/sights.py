@@ -40,6 +40,7 @@
 """
 
 import codecs
+import numpy
 
 from sppas.src.config import NegativeValueError
 from sppas.src.config import IndexRangeException
@@ -58,62 +59,79 @@ class Sights(object):
         - y: coordinate on the y axis, initialized to 0
         - an optional confidence score, initialized to None
 
-    Notice that each of the sight parameter is stored into a list of 'nb'
-    values, instead of storing a single list of 'nb' lists of values:
+    The sights are stored into a numpy array of shape (nb, 3): x and y in
+    the first two columns, and the confidence score in the last one -- nan
+    when no score is assigned. This array can be given at initialization,
+    so that the instance is a view over a part of a larger array, like the
+    one of a sppasSightsVideoStore.
 
-    - 2 lists of 'nb' int and 1 of float = [x1,x2,...] [y1,y2,...] [s1,s2,...]
-        3*64 + 2*68*24 + 1*68*24 = 5088
-    - 1 list of 'nb' lists of 2 int and 1 float: [[x1,y1,s1], [x2,y2,s2]...]
-        64 + 68*64 + 2*68*24 + 1*68*24 = 9312
+        >>> s = Sights(68)
+        >>> s.set_sight(0, 10, 20, 0.8)
+        >>> s.get_sight(0)
+        (10, 20, 0.8)
 
     """
 
-    def __init__(self, nb=68):
+    def __init__(self, nb=68, data=None):
         """Create a new instance.
 
         :param nb: (int) Number of expected sights.
+        :param data: (numpy.ndarray) An array (nb, 3) to store the sights in
+        :raise: sppasTypeError, ValueError
 
         """
         # Number of sights to store
         self.__nb = sppasCoords.to_dtype(nb, int, unsigned=True)
 
-        # Axis values
-        self.__x = [0]*nb
-        self.__y = [0]*nb
-        # Confidence scores -- save memory when there are not used.
-        self.__confidence = None
+        if data is None:
+            # Axis values and confidence scores
+            self.__data = numpy.zeros((self.__nb, 3), dtype=numpy.float64)
+            self.__data[:, 2] = numpy.nan
+        else:
+            if isinstance(data, numpy.ndarray) is False:
+                raise sppasTypeError(type(data), "numpy.ndarray")
+            if data.shape != (self.__nb, 3):
+                raise ValueError("Expected an array of shape ({:d}, 3). "
+                                 "Got {} instead.".format(self.__nb, data.shape))
+            self.__data = data
 
     # -----------------------------------------------------------------------
 
     def copy(self):
         """Return a deep copy of the current Sights()."""
-        copied = Sights(nb=self.__nb)
-        for i in range(self.__nb):
-            x, y, s = self.get_sight(i)
-            copied.set_sight(i, x, y, s)
-        return copied
+        return Sights(nb=self.__nb, data=self.to_array())
+
+    # -----------------------------------------------------------------------
+
+    def to_array(self):
+        """Return a copy of the sights into an array of shape (nb, 3).
+
+        A missing confidence score is represented by nan.
+
+        """
+        return self.__data.copy()
 
     # -----------------------------------------------------------------------
 
     def get_x(self):
         """Return the list of x values."""
-        # returning self.__x allows it to be modified: a list is mutable.
-        # here we return a copy in a tuple so self.__x won't change.
-        return tuple(self.__x)
+        # return a copy in a tuple so self.__data won't change.
+        return tuple(self.__data[:, 0].astype(int).tolist())
 
     # -----------------------------------------------------------------------
 
     def get_y(self):
         """Return the list of y values."""
-        return tuple(self.__y)
+        return tuple(self.__data[:, 1].astype(int).tolist())
 
     # -----------------------------------------------------------------------
 
     def get_s(self):
         """Return the list of confidence score values or None."""
-        if self.__confidence is None:
+        scores = self.__data[:, 2]
+        if numpy.isnan(scores).all():
             return None
-        return tuple(self.__confidence)
+        return tuple(None if numpy.isnan(s) else s for s in scores.tolist())
 
     # -----------------------------------------------------------------------
 
@@ -124,8 +142,11 @@ class Sights(object):
         :return: tuple(x, y, confidence)
 
         """
-        score = self.get_score(idx)
-        return self.__x[idx], self.__y[idx], score
+        idx = self.check_index(idx)
+        x, y, score = self.__data[idx].tolist()
+        if numpy.isnan(score):
+            score = None
+        return int(x), int(y), score
 
     # -----------------------------------------------------------------------
 
@@ -143,9 +164,9 @@ class Sights(object):
         x = sppasCoords.to_dtype(x, int, unsigned=True)
         y = sppasCoords.to_dtype(y, int, unsigned=True)
 
-        # Assign values to our data structures
-        self.__x[idx] = x
-        self.__y[idx] = y
+        # Assign values to our data structure
+        self.__data[idx, 0] = x
+        self.__data[idx, 1] = y
         self.set_score(idx, s)
 
     # -----------------------------------------------------------------------
@@ -157,17 +178,17 @@ class Sights(object):
         :return: (int or None)
 
         """
-        if self.__confidence is None:
-            return None
-
         if idx is not None:
             idx = self.check_index(idx)
-            return self.__confidence[idx]
-        else:
-            values = [v for v in self.__confidence if v is not None]
-            if len(values) == 0:
+            score = float(self.__data[idx, 2])
+            if numpy.isnan(score):
                 return None
-            return sum(values) / len(values)
+            return score
+
+        values = [v for v in self.__data[:, 2].tolist() if not numpy.isnan(v)]
+        if len(values) == 0:
+            return None
+        return sum(values) / len(values)
 
     # -----------------------------------------------------------------------
 
@@ -179,18 +200,12 @@ class Sights(object):
 
         """
         idx = self.check_index(idx)
-        # If a score is assigned
         if s is not None:
             s = sppasCoords.to_dtype(s, float, unsigned=False)
-            if self.__confidence is None:
-                # hum... we never assigned a score... create the list now
-                self.__confidence = [None] * self.__nb
-            self.__confidence[idx] = s
+            self.__data[idx, 2] = s
         else:
-            if self.__confidence is not None:
-                # A score is not set but we already have some. Clear the
-                # one that is already existing.
-                self.__confidence[idx] = None
+            # Clear the score if one is already existing.
+            self.__data[idx, 2] = numpy.nan
 
     # -----------------------------------------------------------------------
 
@@ -203,14 +218,17 @@ class Sights(object):
         """
         # Check if the given value is an integer
         try:
-            value = int(value)
+            idx = int(value)
         except ValueError:
             raise sppasTypeError(value, "int")
+        if isinstance(value, float) and idx != value:
+            raise sppasTypeError(value, "int")
+        value = idx
 
-        # Check if the given value is in the range [0,nb]
+        # Check if the given value is in the range [0,nb[
         if value < 0:
             raise NegativeValueError(value)
-        if self.__nb < value:
+        if self.__nb <= value:
             raise IndexRangeException(value, 0, self.__nb)
 
         # The given value is good
@@ -231,21 +249,16 @@ class Sights(object):
         if len(other) != self.__nb:
             raise ValueError("Intermediate estimation expected {:d} sights. "
                              "Got {:d} instead.".format(self.__nb, len(other)))
-        s = Sights(self.__nb)
-        i = 0
-        for s1, s2 in zip(self, other):  # s1=(x1,y1,c1) and s2=(x2,y2,c2)
-            # estimate the middle point
-            x = s1[0] + ((s2[0] - s1[0]) // 2)
-            y = s1[1] + ((s2[1] - s1[1]) // 2)
-            # estimate the average score
-            c = None
-            if s1[2] is not None and s2[2] is not None:
-                c = (s1[2] + s2[2]) / 2.
-            # Then set the sight position and score
-            s.set_sight(i, x, y, c)
-            i += 1
 
-        return s
+        s1 = self.__data
+        s2 = other.to_array()
+        data = numpy.empty_like(s1)
+        # estimate the middle points
+        data[:, :2] = s1[:, :2] + ((s2[:, :2] - s1[:, :2]) // 2)
+        # estimate the average scores: nan if one of both is missing
+        data[:, 2] = (s1[:, 2] + s2[:, 2]) / 2.
+
+        return Sights(self.__nb, data=data)
 
     # -----------------------------------------------------------------------
     # Overloads
@@ -253,11 +266,10 @@ class Sights(object):
 
     def __str__(self):
         s = ""
-        for i in range(self.__nb):
-            s += "({:d},{:d}".format(self.__x[i], self.__y[i])
-            if self.__confidence is not None:
-                if self.__confidence[i] is not None:
-                    s += ": {:f}".format(self.__confidence[i])
+        for x, y, score in self:
+            s += "({:d},{:d}".format(x, y)
+            if score is not None:
+                s += ": {:f}".format(score)
             s += ") "
         return s
 
@@ -306,10 +318,8 @@ class Sights(object):
         if len(other) < 2:
             return False
 
-        for i in range(self.__nb):
-            if self.__x[i] == other[0] and self.__y[i] == other[1]:
-                return True
-        return False
+        found = (self.__data[:, 0] == other[0]) & (self.__data[:, 1] == other[1])
+        return bool(found.any())
 
 # ---------------------------------------------------------------------------
 
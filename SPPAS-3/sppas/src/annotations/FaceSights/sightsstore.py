@@ -0,0 +1,519 @@
+# -*- coding : UTF-8 -*-
+"""
+:filename: sppas.src.annotations.FaceSights.sightsstore.py
+:author:   Brigitte Bigi
+:contact:  develop@sppas.org
+:summary:  Store the coordinates and sights of all the faces of a video.
+
+.. _This file is part of SPPAS: http://www.sppas.org/
+..
+    ---------------------------------------------------------------------
+
+     ___   __    __    __    ___
+    /     |  \  |  \  |  \  /              the automatic
+    \__   |__/  |__/  |___| \__             annotation and
+       \  |     |     |   |    \             analysis
+    ___/  |     |     |   | ___/              of speech
+
+    Copyright (C) 2011-2021  Brigitte Bigi
+    Laboratoire Parole et Langage, Aix-en-Provence, France
+
+    Use of this software is governed by the GNU Public License, version 3.
+
+    SPPAS is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    SPPAS is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+    This banner notice must not be removed.
+
+    ---------------------------------------------------------------------
+
+"""
+
+import codecs
+import numpy
+
+from sppas.src.config import sppasTypeError
+from sppas.src.config import IndexRangeException
+from sppas.src.imgdata import sppasCoords
+
+from .sights import Sights
+
+# ---------------------------------------------------------------------------
+
+
+class sppasSightsVideoStore(object):
+    """Store the coordinates and sights of all the faces of a video.
+
+    Instead of lists of lists of sppasCoords and Sights instances, all the
+    values of a video are stored into a few numpy arrays:
+
+        - sights: (frames, faces, nb, 3) float: x, y, score -- nan if none
+        - coords: (frames, faces, 5) float: x, y, w, h, confidence
+        - nfaces: (frames,) int: number of faces in each frame
+        - marked: (frames, faces) bool: sights were estimated for the face
+        - ids: (frames, faces) object: identifier of each face
+
+    The faces axis is enlarged when a frame has more faces than expected.
+    The Sights() returned by this class are views over the sights array,
+    so that modifying them is modifying the store.
+
+        >>> store = sppasSightsVideoStore(nframes=2, nsights=68)
+        >>> store.set_frame(0, [sppasCoords(10, 10, 100, 100, 0.9)])
+        >>> store.get_nfaces(0)
+        1
+        >>> store.get_sights(0)
+        [None]
+
+    The data can be read/written from/to a CSV file, in the format of the
+    sppasSightsVideoWriter, or from/to a numpy binary file.
+
+    """
+
+    def __init__(self, nframes=0, nsights=68):
+        """Create a new instance.
+
+        :param nframes: (int) Number of frames of the video
+        :param nsights: (int) Number of sights of each face
+
+        """
+        self.__nframes = 0
+        self.__nsights = sppasCoords.to_dtype(nsights, int, unsigned=True)
+        self.__sights = None
+        self.__coords = None
+        self.__nfaces = None
+        self.__marked = None
+        self.__ids = None
+        self.reset(nframes)
+
+    # -----------------------------------------------------------------------
+
+    def reset(self, nframes=0, nfaces=1, nsights=None):
+        """Allocate the arrays for the given number of frames and faces.
+
+        All the previously stored data are lost.
+
+        :param nframes: (int) Number of frames of the video
+        :param nfaces: (int) Expected max number of faces in a frame
+        :param nsights: (int) Number of sights of each face or None to keep
+
+        """
+        nframes = sppasCoords.to_dtype(nframes, int, unsigned=True)
+        nfaces = sppasCoords.to_dtype(nfaces, int, unsigned=True)
+        if nsights is not None:
+            self.__nsights = sppasCoords.to_dtype(nsights, int, unsigned=True)
+
+        self.__nframes = nframes
+        self.__sights = numpy.zeros((nframes, nfaces, self.__nsights, 3), dtype=numpy.float64)
+        self.__sights[:, :, :, 2] = numpy.nan
+        self.__coords = numpy.zeros((nframes, nfaces, 5), dtype=numpy.float64)
+        self.__nfaces = numpy.zeros(nframes, dtype=numpy.int32)
+        self.__marked = numpy.zeros((nframes, nfaces), dtype=bool)
+        self.__ids = numpy.full((nframes, nfaces), "", dtype=object)
+
+    # -----------------------------------------------------------------------
+    # Getters
+    # -----------------------------------------------------------------------
+
+    def get_nframes(self):
+        """Return the number of frames."""
+        return self.__nframes
+
+    # -----------------------------------------------------------------------
+
+    def get_nsights(self):
+        """Return the number of sights of each face."""
+        return self.__nsights
+
+    # -----------------------------------------------------------------------
+
+    def get_nfaces(self, frame_idx=None):
+        """Return the number of faces of a frame or the max of all frames.
+
+        :param frame_idx: (int) Index of the frame or None
+        :return: (int)
+
+        """
+        if frame_idx is None:
+            if self.__nframes == 0:
+                return 0
+            return int(self.__nfaces.max())
+        frame_idx = self.check_frame_index(frame_idx)
+        return int(self.__nfaces[frame_idx])
+
+    # -----------------------------------------------------------------------
+
+    def get_sights_array(self):
+        """Return the array of sights (frames, faces, nb, 3) -- not a copy."""
+        return self.__sights
+
+    # -----------------------------------------------------------------------
+
+    def get_coords_array(self):
+        """Return the array of face coords (frames, faces, 5) -- not a copy."""
+        return self.__coords
+
+    # -----------------------------------------------------------------------
+
+    def get_marked_array(self):
+        """Return the array (frames, faces) of faces with sights -- not a copy."""
+        return self.__marked
+
+    # -----------------------------------------------------------------------
+
+    def get_face_sights(self, face_idx=0, fill=True):
+        """Return the sights of a face in all frames.
+
+        When 'fill' is enabled, a frame without sights for the given face
+        gets the sights of the last previous frame with ones. Frames before
+        the first estimated sights have all sights at (0, 0, nan).
+
+        :param face_idx: (int) Index of the face
+        :param fill: (bool) Fill the missing sights with the previous ones
+        :return: (numpy.ndarray) A copy of shape (frames, nb, 3)
+
+        """
+        nfaces = self.__sights.shape[1]
+        if face_idx < 0 or face_idx >= nfaces:
+            raise IndexRangeException(face_idx, 0, nfaces)
+
+        data = self.__sights[:, face_idx].copy()
+        if fill is True and self.__nframes > 0:
+            # Index of the last frame with sights, or -1 if none yet
+            last = numpy.where(self.__marked[:, face_idx],
+                               numpy.arange(self.__nframes), -1)
+            numpy.maximum.accumulate(last, out=last)
+            data = data[last]
+            data[last < 0, :, :2] = 0
+            data[last < 0, :, 2] = numpy.nan
+
+        return data
+
+    # -----------------------------------------------------------------------
+
+    def get_coordinates(self, frame_idx):
+        """Return the coordinates of the faces of a frame.
+
+        :param frame_idx: (int) Index of the frame
+        :return: (list of sppasCoords) New instances
+
+        """
+        frame_idx = self.check_frame_index(frame_idx)
+        coords = list()
+        for x, y, w, h, c in self.__coords[frame_idx, :self.__nfaces[frame_idx]].tolist():
+            confidence = None if numpy.isnan(c) else c
+            coords.append(sppasCoords(int(x), int(y), int(w), int(h), confidence))
+        return coords
+
+    # -----------------------------------------------------------------------
+
+    def get_sights(self, frame_idx):
+        """Return the sights of the faces of a frame.
+
+        :param frame_idx: (int) Index of the frame
+        :return: (list of Sights or None) Sights are views over the store
+
+        """
+        frame_idx = self.check_frame_index(frame_idx)
+        sights = list()
+        for j in range(self.__nfaces[frame_idx]):
+            if self.__marked[frame_idx, j]:
+                sights.append(Sights(self.__nsights, data=self.__sights[frame_idx, j]))
+            else:
+                sights.append(None)
+        return sights
+
+    # -----------------------------------------------------------------------
+
+    def get_ids(self, frame_idx):
+        """Return the identifiers of the faces of a frame.
+
+        :param frame_idx: (int) Index of the frame
+        :return: (list)
+
+        """
+        frame_idx = self.check_frame_index(frame_idx)
+        return self.__ids[frame_idx, :self.__nfaces[frame_idx]].tolist()
+
+    # -----------------------------------------------------------------------
+    # Setters
+    # -----------------------------------------------------------------------
+
+    def set_frame(self, frame_idx, coords, sights=None, ids=None):
+        """Set the coordinates, sights and identifiers of a frame.
+
+        :param frame_idx: (int) Index of the frame
+        :param coords: (list of sppasCoords) Coordinates of the faces
+        :param sights: (list of Sights or None) Sights of the faces
+        :param ids: (list) Identifiers of the faces -- default is the face number
+        :raise: sppasTypeError, ValueError
+
+        """
+        frame_idx = self.check_frame_index(frame_idx)
+        if isinstance(coords, (list, tuple)) is False:
+            raise sppasTypeError(type(coords), "(list, tuple)")
+        nb = len(coords)
+        if sights is None:
+            sights = [None] * nb
+        if ids is None:
+            ids = [str(j + 1) for j in range(nb)]
+        if len(sights) < nb or len(ids) < nb:
+            raise ValueError("Expected {:d} sights and identifiers. Got {:d} "
+                             "and {:d} instead.".format(nb, len(sights), len(ids)))
+        if nb > self.__sights.shape[1]:
+            self.__enlarge(nb)
+
+        # Clear the previous content of the frame
+        self.__sights[frame_idx, :, :, :2] = 0
+        self.__sights[frame_idx, :, :, 2] = numpy.nan
+        self.__coords[frame_idx] = 0
+        self.__marked[frame_idx] = False
+        self.__ids[frame_idx] = ""
+
+        for j in range(nb):
+            c = coords[j]
+            confidence = c.get_confidence()
+            self.__coords[frame_idx, j] = (c.x, c.y, c.w, c.h,
+                                           numpy.nan if confidence is None else confidence)
+            self.__ids[frame_idx, j] = ids[j]
+            if sights[j] is not None:
+                if isinstance(sights[j], Sights) is False:
+                    raise sppasTypeError(sights[j], "Sights")
+                if len(sights[j]) != self.__nsights:
+                    raise ValueError("Expected {:d} sights. Got {:d} instead."
+                                     "".format(self.__nsights, len(sights[j])))
+                self.__sights[frame_idx, j] = sights[j].to_array()
+                self.__marked[frame_idx, j] = True
+
+        self.__nfaces[frame_idx] = nb
+
+    # -----------------------------------------------------------------------
+
+    def check_frame_index(self, value):
+        """Raise an exception if the given frame index is not valid.
+
+        :param value: (int)
+        :raise: sppasTypeError, IndexRangeException
+
+        """
+        try:
+            value = int(value)
+        except ValueError:
+            raise sppasTypeError(value, "int")
+        if value < 0 or value >= self.__nframes:
+            raise IndexRangeException(value, 0, self.__nframes)
+        return value
+
+    # -----------------------------------------------------------------------
+    # Files
+    # -----------------------------------------------------------------------
+
+    def load_csv(self, filename, separator=";"):
+        """Load the content of a CSV file of a sppasSightsVideoWriter.
+
+        All the lines are parsed before the arrays are allocated, so that
+        they are filled in only once.
+
+        :param filename: (str) CSV file name
+        :param separator: (char) Columns separator in the CSV file
+        :raise: ValueError
+
+        """
+        with codecs.open(filename, "r") as csv:
+            lines = csv.readlines()
+
+        # Group the columns of the faces by frame -- a frame without face
+        # has a line with the success column at 0.
+        frames = list()
+        prev_frame = None
+        nsights = None
+        for line in lines:
+            line = line.strip()
+            if len(line) == 0:
+                continue
+            columns = line.split(separator)
+            if columns[0] != prev_frame:
+                frames.append(list())
+                prev_frame = columns[0]
+            if int(columns[4]) == 1 and len(columns) > 8:
+                frames[-1].append(columns)
+                if nsights is None and len(columns) > 13 and columns[12] == "1":
+                    nsights = int(columns[13])
+
+        nfaces = max([len(f) for f in frames] + [1])
+        self.reset(len(frames), nfaces, nsights)
+
+        for i, faces in enumerate(frames):
+            self.__nfaces[i] = len(faces)
+            for j, columns in enumerate(faces):
+                self.__ids[i, j] = columns[1]
+                self.__coords[i, j, :4] = [int(v) for v in columns[5:9]]
+                self.__coords[i, j, 4] = sppasSightsVideoStore.__to_float(columns[3])
+
+                # columns[12] is 0=failed, 1=success -- sights found or not
+                if len(columns) > 13 and columns[12] == "1":
+                    nb = int(columns[13])
+                    if nb != self.__nsights:
+                        raise ValueError("Expected {:d} sights. Got {:d} instead."
+                                         "".format(self.__nsights, nb))
+                    self.__sights[i, j, :, 0] = [int(v) for v in columns[14:14 + nb]]
+                    self.__sights[i, j, :, 1] = [int(v) for v in columns[14 + nb:14 + 2*nb]]
+                    if len(columns) >= 14 + 3*nb:
+                        self.__sights[i, j, :, 2] = [sppasSightsVideoStore.__to_float(v)
+                                                     for v in columns[14 + 2*nb:14 + 3*nb]]
+                    self.__marked[i, j] = True
+
+    # -----------------------------------------------------------------------
+
+    def save_csv(self, filename, fps=25., separator=";"):
+        """Save the content into a CSV file.
+
+        :param filename: (str) CSV file name
+        :param fps: (float) Frame rate of the video to estimate timestamps
+        :param separator: (char) Columns separator in the CSV file
+
+        """
+        with codecs.open(filename, "w", encoding="utf-8") as fd:
+            self.write_csv(fd, fps, separator)
+
+    # -----------------------------------------------------------------------
+
+    def write_csv(self, fd, fps=25., separator=";", buffer_size=0, offset=0):
+        """Write the content into a stream, in a single write.
+
+        Columns are the ones of a sppasSightsVideoWriter.
+
+        :param fd: (Stream) File descriptor, String descriptor, stdout, etc
+        :param fps: (float) Frame rate of the video to estimate timestamps
+        :param separator: (char) Columns separator in the CSV file
+        :param buffer_size: (int) Size of the buffers to fill the buffer columns
+        :param offset: (int) Index of the first frame in the video
+
+        """
+        sep = separator
+        lines = list()
+        for i in range(self.__nframes):
+            frame_idx = offset + i
+            if buffer_size > 0:
+                buffer_nb, buffer_idx = divmod(frame_idx, buffer_size)
+            else:
+                buffer_nb, buffer_idx = 0, frame_idx
+            frame = "{:d}{:s}".format(frame_idx + 1, sep)
+            timestamp = "{:.3f}{:s}".format(float(frame_idx) / fps, sep)
+            buffer = "{:d}{:s}{:d}{:s}".format(buffer_nb + 1, sep, buffer_idx, sep)
+
+            if self.__nfaces[i] == 0:
+                lines.append(frame + "0" + sep + timestamp + "none" + sep + "0" + sep +
+                             ("0" + sep) * 4 + buffer)
+
+            for j in range(self.__nfaces[i]):
+                x, y, w, h, c = self.__coords[i, j].tolist()
+                confidence = "none" if numpy.isnan(c) else "{:f}".format(c)
+                coords = sep.join([confidence, "1", "{:d}".format(int(x)),
+                                   "{:d}".format(int(y)), "{:d}".format(int(w)),
+                                   "{:d}".format(int(h))]) + sep
+                lines.append(frame + "{}".format(self.__ids[i, j]) + sep +
+                             timestamp + coords + buffer + self.__sights_to_csv(i, j, sep))
+
+        if len(lines) > 0:
+            fd.write("\n".join(lines) + "\n")
+
+    # -----------------------------------------------------------------------
+
+    def save(self, filename):
+        """Save the arrays into a numpy binary file.
+
+        :param filename: (str) File name -- numpy adds '.npz' if missing
+
+        """
+        numpy.savez(filename,
+                    sights=self.__sights,
+                    coords=self.__coords,
+                    nfaces=self.__nfaces,
+                    marked=self.__marked,
+                    ids=self.__ids.astype(str))
+
+    # -----------------------------------------------------------------------
+
+    def load(self, filename):
+        """Load the arrays from a numpy binary file.
+
+        :param filename: (str) File name of a saved sppasSightsVideoStore
+
+        """
+        with numpy.load(filename, allow_pickle=False) as data:
+            sights = data["sights"]
+            self.__nframes = sights.shape[0]
+            self.__nsights = sights.shape[2]
+            self.__sights = sights
+            self.__coords = data["coords"]
+            self.__nfaces = data["nfaces"]
+            self.__marked = data["marked"]
+            self.__ids = numpy.empty(self.__marked.shape, dtype=object)
+            self.__ids[:, :] = data["ids"].tolist()
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __enlarge(self, nfaces):
+        """Enlarge the faces axis of the arrays to the given size."""
+        more = nfaces - self.__sights.shape[1]
+        sights = numpy.zeros((self.__nframes, more, self.__nsights, 3), dtype=numpy.float64)
+        sights[:, :, :, 2] = numpy.nan
+        self.__sights = numpy.concatenate((self.__sights, sights), axis=1)
+        self.__coords = numpy.concatenate(
+            (self.__coords, numpy.zeros((self.__nframes, more, 5))), axis=1)
+        self.__marked = numpy.concatenate(
+            (self.__marked, numpy.zeros((self.__nframes, more), dtype=bool)), axis=1)
+        self.__ids = numpy.concatenate(
+            (self.__ids, numpy.full((self.__nframes, more), "", dtype=object)), axis=1)
+
+    # -----------------------------------------------------------------------
+
+    def __sights_to_csv(self, frame_idx, face_idx, sep):
+        """Return the CSV columns of the sights of a face in a frame."""
+        if bool(self.__marked[frame_idx, face_idx]) is False:
+            return "none" + sep + "0" + sep
+
+        data = self.__sights[frame_idx, face_idx]
+        scores = data[:, 2].tolist()
+        values = [s for s in scores if not numpy.isnan(s)]
+
+        # average score, success, number of sights
+        columns = ["none" if len(values) == 0 else "{:f}".format(sum(values) / len(values)),
+                   "1", "{:d}".format(self.__nsights)]
+        # all x values then all y values
+        columns.extend(str(v) for v in data[:, 0].astype(int).tolist())
+        columns.extend(str(v) for v in data[:, 1].astype(int).tolist())
+        # confidence scores if they exist
+        if len(values) > 0:
+            columns.extend("none" if numpy.isnan(s) else "{:f}".format(s) for s in scores)
+
+        return sep.join(columns) + sep
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __to_float(value):
+        """Return the float of a CSV column or nan if 'none'."""
+        if value == "none":
+            return numpy.nan
+        return float(value)
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __len__(self):
+        """Return the number of frames."""
+        return self.__nframes
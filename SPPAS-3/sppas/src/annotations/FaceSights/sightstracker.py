@@ -0,0 +1,226 @@
+# -*- coding : UTF-8 -*-
+"""
+:filename: sppas.src.annotations.FaceSights.sightstracker.py
+:author:   Brigitte Bigi
+:contact:  develop@sppas.org
+:summary:  Track the sights of faces from an image to the next one.
+
+.. _This file is part of SPPAS: http://www.sppas.org/
+..
+    ---------------------------------------------------------------------
+
+     ___   __    __    __    ___
+    /     |  \  |  \  |  \  /              the automatic
+    \__   |__/  |__/  |___| \__             annotation and
+       \  |     |     |   |    \             analysis
+    ___/  |     |     |   | ___/              of speech
+
+    Copyright (C) 2011-2021  Brigitte Bigi
+    Laboratoire Parole et Langage, Aix-en-Provence, France
+
+    Use of this software is governed by the GNU Public License, version 3.
+
+    SPPAS is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    SPPAS is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+    This banner notice must not be removed.
+
+    ---------------------------------------------------------------------
+
+"""
+
+import cv2
+import numpy
+
+from .sights import Sights
+
+# ---------------------------------------------------------------------------
+
+
+class SightsTracker(object):
+    """Track the sights of faces from an image to the next one.
+
+    The sights of the reference image are propagated into the next image
+    with the pyramidal Lucas-Kanade optical flow. A sight is properly
+    tracked if it is found in both forward and backward directions with a
+    small error. The tracking fails, and the sights must be estimated
+    again, if:
+
+        - there's no reference image or sights;
+        - the image is very different from the reference one: scene cut;
+        - too many sights of a face were not properly tracked;
+        - the given coords of the faces do not match the tracked sights.
+
+    """
+
+    # Min ratio of the sights of a face that must be tracked
+    MIN_TRACKED_RATIO = 0.8
+
+    # Max distance (pixels) between a sight and its forward-backward track
+    MAX_FB_ERROR = 2.
+
+    # Min average difference of gray levels between two images of a cut
+    SCENE_CUT = 30.
+
+    # Size of the images to compare two images for a scene cut
+    THUMB_SIZE = (64, 64)
+
+    # -----------------------------------------------------------------------
+
+    def __init__(self):
+        """Create a new instance."""
+        # The gray image, its thumbnail, coords and sights of the reference
+        self.__gray = None
+        self.__thumb = None
+        self.__coords = list()
+        self.__sights = list()
+
+        # Parameters of the optical flow
+        self.__lk_params = dict(
+            winSize=(15, 15),
+            maxLevel=2,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03))
+
+    # -----------------------------------------------------------------------
+
+    def reset(self):
+        """Forget the reference image, coords and sights."""
+        self.__gray = None
+        self.__thumb = None
+        self.__coords = list()
+        self.__sights = list()
+
+    # -----------------------------------------------------------------------
+
+    def set_reference(self, image, coords, sights):
+        """Set the image and its faces the next tracking will start from.
+
+        :param image: (sppasImage or numpy.ndarray) BGR image
+        :param coords: (list of sppasCoords) Coordinates of the faces
+        :param sights: (list of Sights) Sights of each face
+
+        """
+        if len(coords) != len(sights) or any(s is None for s in sights):
+            self.reset()
+            return
+
+        self.__gray = SightsTracker.to_gray(image)
+        self.__thumb = cv2.resize(self.__gray, SightsTracker.THUMB_SIZE,
+                                  interpolation=cv2.INTER_AREA)
+        self.__coords = [c.copy() for c in coords]
+        self.__sights = [s.copy() for s in sights]
+
+    # -----------------------------------------------------------------------
+
+    def is_scene_cut(self, gray):
+        """Return True if the given gray image is not a continuation of the reference.
+
+        :param gray: (numpy.ndarray) Gray image
+        :return: (bool)
+
+        """
+        if self.__thumb is None:
+            return True
+        thumb = cv2.resize(gray, SightsTracker.THUMB_SIZE, interpolation=cv2.INTER_AREA)
+        diff = cv2.absdiff(thumb, self.__thumb)
+        return float(diff.mean()) > SightsTracker.SCENE_CUT
+
+    # -----------------------------------------------------------------------
+
+    def track(self, image, coords=None):
+        """Track the sights of the reference into the given image.
+
+        If the coords of the faces are given, they must match the tracked
+        sights. If not, the coords of the reference faces are moved like
+        their sights.
+
+        :param image: (sppasImage or numpy.ndarray) BGR image
+        :param coords: (list of sppasCoords) Known coords of the faces
+        :return: (list of sppasCoords, list of Sights) or None if there is
+        no face to track or if tracking failed
+
+        """
+        # Nothing to track: faces may have appeared since the reference,
+        # so they have to be detected.
+        if self.__gray is None or len(self.__sights) == 0:
+            return None
+        if coords is not None and len(coords) != len(self.__coords):
+            return None
+
+        gray = SightsTracker.to_gray(image)
+        if self.is_scene_cut(gray) is True:
+            return None
+
+        # Track all the sights of all faces at once
+        nb = len(self.__sights[0])
+        prev_data = numpy.concatenate([s.to_array() for s in self.__sights])
+        points = prev_data[:, :2].astype(numpy.float32).reshape(-1, 1, 2)
+        moved, status, _ = cv2.calcOpticalFlowPyrLK(
+            self.__gray, gray, points, None, **self.__lk_params)
+        back, back_status, _ = cv2.calcOpticalFlowPyrLK(
+            gray, self.__gray, moved, None, **self.__lk_params)
+        fb_error = numpy.linalg.norm((points - back).reshape(-1, 2), axis=1)
+        tracked = (status.ravel() == 1) & (back_status.ravel() == 1) & \
+                  (fb_error < SightsTracker.MAX_FB_ERROR)
+        moved = moved.reshape(-1, 2)
+
+        h, w = gray.shape[:2]
+        new_coords = list()
+        new_sights = list()
+        for f in range(len(self.__sights)):
+            face = slice(f * nb, (f + 1) * nb)
+            ok = tracked[face]
+            if ok.mean() < SightsTracker.MIN_TRACKED_RATIO:
+                return None
+
+            # The sights that were lost are moved like the other ones
+            shift = numpy.median(moved[face][ok] - points[face].reshape(-1, 2)[ok], axis=0)
+            data = prev_data[face].copy()
+            data[ok, :2] = moved[face][ok]
+            data[~ok, :2] += shift
+            data[:, 0] = numpy.clip(numpy.round(data[:, 0]), 0, w - 1)
+            data[:, 1] = numpy.clip(numpy.round(data[:, 1]), 0, h - 1)
+
+            if coords is None:
+                c = self.__coords[f].copy()
+                c.shift(int(round(shift[0])), int(round(shift[1])))
+                if c.x + c.w > w or c.y + c.h > h:
+                    return None
+            else:
+                c = coords[f]
+                # the tracked face must be inside the given coords
+                cx, cy = data[:, :2].mean(axis=0)
+                if not (c.x <= cx <= c.x + c.w and c.y <= cy <= c.y + c.h):
+                    return None
+
+            new_coords.append(c)
+            new_sights.append(Sights(nb, data=data))
+
+        return new_coords, new_sights
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def to_gray(image):
+        """Return the gray version of a BGR image.
+
+        :param image: (sppasImage or numpy.ndarray) BGR image
+        :return: (numpy.ndarray)
+
+        """
+        image = numpy.asarray(image)
+        if image.ndim == 2:
+            return image
+        if image.shape[2] == 4:
+            return cv2.cvtColor(image, cv2.COLOR_BGRA2GRAY)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
@@ -138,6 +138,12 @@ class sppasFaceSights(sppasBaseAnnotation):
             elif key == "height":
                 self.set_img_height(opt.get_value())
 
+            elif key == "tracking":
+                self.set_tracking(opt.get_value())
+
+            elif key == "workers":
+                self.set_nb_workers(opt.get_value())
+
             elif "pattern" in key:
                 self._options[key] = opt.get_value()
 
@@ -216,6 +222,29 @@ class sppasFaceSights(sppasBaseAnnotation):
         self.__video_writer.set_options(height=value)
         self._options["height"] = value
 
+    # -----------------------------------------------------------------------
+
+    def set_tracking(self, value):
+        """Estimate the sights every N images only and track them in-between.
+
+        :param value: (int) Max number of images with tracked sights (0=no)
+
+        """
+        self.__flv.set_tracking(value)
+        self._options["tracking"] = self.__flv.get_tracking()
+
+    # -----------------------------------------------------------------------
+
+    def set_nb_workers(self, value=1):
+        """Fix the number of processes to estimate the sights of a video.
+
+        :param value: (int) Number of processes. 1 to disable parallelism.
+
+        """
+        value = int(value)
+        self.__flv.set_nb_workers(value)
+        self._options["workers"] = value
+
     # ----------------------------------------------------------------------
     # Apply the annotation on a given file
     # -----------------------------------------------------------------------
@@ -39,13 +39,64 @@
 
 """
 
+import os
 import logging
+import cv2
 
 from sppas.src.config import sppasError
+from sppas.src.config import NegativeValueError
+from sppas.src.config import IntervalRangeException
 from sppas.src.videodata import sppasCoordsVideoReader
+from sppas.src.videodata import sppasVideoSegments
+
+from ..FaceDetection import ImageFaceDetection
 
 from .videosights import sppasSightsVideoBuffer
 from .imgfacemark import ImageFaceLandmark
+from .sightstracker import SightsTracker
+
+# ---------------------------------------------------------------------------
+
+ERR_NO_FACES = "Face sights estimation requires faces or a face detection " \
+               "system. None of them was declared."
+
+# ---------------------------------------------------------------------------
+
+
+def mark_video_segment(video, start, end, config):
+    """Return the faces, sights and identifiers of a segment of a video.
+
+    Target of the processes estimating the sights of a video by segments:
+    each one creates its own landmark and detection systems and video
+    buffer. The number of threads of OpenCV is limited in order to not run
+    more threads than processors with all the processes.
+
+    :param video: (str) Video filename
+    :param start: (int) Index of the first frame of the segment
+    :param end: (int) Index of the frame to stop at
+    :param config: (dict) Configuration of the face sights system
+    :return: (list) The coords, sights and identifiers of each frame of the segment
+
+    """
+    # The segment can be processed by the calling process itself
+    nb_threads = cv2.getNumThreads()
+    cv2.setNumThreads(config["threads"])
+    try:
+        fli = ImageFaceLandmark()
+        fli.load_model(*config["models"])
+
+        fdi = None
+        if config["detection"] is not None:
+            fdi = ImageFaceDetection()
+            fdi.set_min_ratio(config["detection"]["min_ratio"])
+            fdi.set_min_score(config["detection"]["min_score"])
+            fdi.load_model(*config["detection"]["models"])
+
+        flv = VideoFaceLandmark(fli, fdi)
+        flv.set_tracking(config["tracking"])
+        return flv.segment_face_sights(video, start, end, config["csv_faces"])
+    finally:
+        cv2.setNumThreads(nb_threads)
 
 # ---------------------------------------------------------------------------
 
@@ -56,6 +107,18 @@ class VideoFaceLandmark(object):
     If faces were previously detected, this result can be loaded from a CSV
     file but if not, a FD system must be declared when initializing this class.
 
+    When tracking is enabled, the sights are estimated on some images only:
+    every N+1 images of the video, after a scene cut or when the tracking
+    failed. On the other images, the sights -- and the faces if they are not
+    given -- are tracked from the previous image with an optical flow.
+
+    With several workers, the video is split into segments and the sights
+    of each segment are estimated by a process of a pool. Each segment is
+    browsed from the N images before it: the sights of its first image are
+    then the ones of a single process. The coordinates, sights and
+    identifiers are stitched back in the order of the frames, and the
+    results are written as if the video were processed by a single process.
+
     """
 
     def __init__(self, face_landmark, face_detection=None):
@@ -69,10 +132,59 @@ class VideoFaceLandmark(object):
         if isinstance(face_landmark, ImageFaceLandmark) is False:
             raise sppasError("A face detection system was expected.")
 
+        # The next images are decoded while sights are detected
         self._video_buffer = sppasSightsVideoBuffer()
+        self._video_buffer.set_prefetch(True)
         self.__fl = face_landmark
         self.__fd = face_detection
 
+        # Max nb of images between two estimations of the sights. 0=disabled
+        self.__tracking = 0
+        self.__tracker = SightsTracker()
+
+        # Number of processes to estimate the sights of a video
+        self.__nb_workers = 1
+
+    # -----------------------------------------------------------------------
+
+    def get_tracking(self):
+        """Return the max number of images with tracked sights (0=disabled)."""
+        return self.__tracking
+
+    # -----------------------------------------------------------------------
+
+    def set_tracking(self, value=0):
+        """Estimate the sights every N+1 images only and track them in-between.
+
+        :param value: (int) Max number of images with tracked sights. 0 to disable.
+        :raise: NegativeValueError
+
+        """
+        value = int(value)
+        if value < 0:
+            raise NegativeValueError(value)
+        self.__tracking = value
+
+    # -----------------------------------------------------------------------
+
+    def get_nb_workers(self):
+        """Return the max number of processes to estimate the sights."""
+        return self.__nb_workers
+
+    # -----------------------------------------------------------------------
+
+    def set_nb_workers(self, value=1):
+        """Fix the max number of processes to estimate the sights of a video.
+
+        :param value: (int) Number of processes. 1 to disable parallelism.
+        :raise: IntervalRangeException
+
+        """
+        value = int(value)
+        if value < 1:
+            raise IntervalRangeException(value, 1, 256)
+        self.__nb_workers = value
+
     # -----------------------------------------------------------------------
     # Automatic detection of the face sights in a video
     # -----------------------------------------------------------------------
@@ -92,36 +204,28 @@ class VideoFaceLandmark(object):
         if self.__fl.get_nb_recognizers() == 0:
             raise sppasError("A landmark recognizer must be initialized first")
 
+        if self.__nb_workers > 1:
+            return self.__parallel_face_sights(video, csv_faces, video_writer, output)
+
         # Browse the video using the buffer of images
         result = list()
         read_next = True
         nb = 0
-        i = 0
 
         # Open the video stream
         self._video_buffer.open(video)
         self._video_buffer.seek_buffer(0)
+        self.__tracker.reset()
         if video_writer is not None:
             video_writer.set_fps(self._video_buffer.get_framerate())
 
         # Get coordinates of the faces -- if previously estimated
-        coords_buffer = None
-        if csv_faces is not None:
-            br = sppasCoordsVideoReader(csv_faces)
-            coords_buffer = br.coords
-            nframes = self._video_buffer.get_nframes()
-            if len(coords_buffer) != nframes:
-                logging.error("The given {:d} coordinates doesn't match the"
-                              " number of frames of the video {:d}"
-                              "".format(len(coords_buffer), nframes))
-                coords_buffer = None
-
+        coords_buffer = self.__load_faces(csv_faces)
         if coords_buffer is None and self.__fd is None:
             # Release the video stream
             self._video_buffer.close()
             self._video_buffer.reset()
-            raise sppasError("Face sights estimation requires faces or a "
-                             "face detection system. None of them was declared.")
+            raise sppasError(ERR_NO_FACES)
 
         while read_next is True:
             logging.info("Read buffer number {:d}".format(nb+1))
@@ -132,6 +236,7 @@ class VideoFaceLandmark(object):
             # face sights on the current images of the buffer
             if coords_buffer is not None:
                 # get face coordinates from the CSV
+                i = self._video_buffer.get_buffer_range()[0]
                 self._detect_buffer(coords_buffer[i:i+len(self._video_buffer)])
             else:
                 # estimate face coordinates from the FD system
@@ -147,6 +252,133 @@ class VideoFaceLandmark(object):
                     result.append(faces)
 
             nb += 1
+
+        # Release the video stream
+        self._video_buffer.close()
+        self._video_buffer.reset()
+
+        return result
+
+    # -----------------------------------------------------------------------
+
+    def segment_face_sights(self, video, start, end, csv_faces=None):
+        """Browse a segment of the video, get faces then detect sights.
+
+        :param video: (str) Video filename
+        :param start: (int) Index of the first frame of the segment
+        :param end: (int) Index of the frame to stop at
+        :param csv_faces: (str) Filename with the coords of all faces
+        :return: (list) The coords, sights and identifiers of all images
+
+        """
+        result = list()
+        buffer_size = self._video_buffer.get_buffer_size()
+        self._video_buffer.open(video)
+        self._video_buffer.seek_buffer(start)
+        self.__tracker.reset()
+        end = min(end, self._video_buffer.get_nframes())
+
+        coords_buffer = self.__load_faces(csv_faces)
+        if coords_buffer is None and self.__fd is None:
+            self._video_buffer.close()
+            self._video_buffer.reset()
+            raise sppasError(ERR_NO_FACES)
+
+        read_next = True
+        while read_next is True and start + len(result) < end:
+            # do not read nor detect the frames after the end of the segment
+            remaining = end - start - len(result)
+            if remaining < self._video_buffer.get_buffer_size():
+                self._video_buffer.set_buffer_size(remaining)
+                self._video_buffer.seek_buffer(start + len(result))
+
+            read_next = self._video_buffer.next()
+            if coords_buffer is not None:
+                i = self._video_buffer.get_buffer_range()[0]
+                self._detect_buffer(coords_buffer[i:i+len(self._video_buffer)])
+            else:
+                self._detect_buffer()
+
+            for i in range(len(self._video_buffer)):
+                result.append((self._video_buffer.get_coordinates(i),
+                               self._video_buffer.get_sights(i),
+                               self._video_buffer.get_ids(i)))
+
+        # Release the video stream
+        self._video_buffer.close()
+        self._video_buffer.reset()
+        self._video_buffer.set_buffer_size(buffer_size)
+
+        return result
+
+    # -----------------------------------------------------------------------
+
+    def __parallel_face_sights(self, video, csv_faces=None, video_writer=None, output=None):
+        """Estimate the sights by segments of the video then write results.
+
+        :param video: (str) Video filename
+        :param csv_faces: (str) Filename with the coords of all faces
+        :param video_writer: ()
+        :param output: (str) The output name for the folder and/or the video
+
+        :return: (list) The coordinates of all detected sights on all images
+
+        """
+        # Check the faces before starting the processes
+        self._video_buffer.open(video)
+        coords_buffer = self.__load_faces(csv_faces)
+        self._video_buffer.close()
+        if coords_buffer is None:
+            if self.__fd is None:
+                raise sppasError(ERR_NO_FACES)
+            csv_faces = None
+
+        # Share out the processors between the processes
+        nb_threads = max(1, (os.cpu_count() or 1) // self.__nb_workers)
+        detection = None
+        if coords_buffer is None:
+            detection = {
+                "models": self.__fd.get_models(),
+                "min_ratio": self.__fd.get_min_ratio(),
+                "min_score": self.__fd.get_min_score()
+            }
+        config = {
+            "models": self.__fl.get_models(),
+            "detection": detection,
+            "csv_faces": csv_faces,
+            "tracking": self.__tracking,
+            "threads": nb_threads
+        }
+
+        # The N images before a segment are enough to reach the image the
+        # sights are estimated on, when tracking every N+1 images.
+        segments = sppasVideoSegments(video, self.__nb_workers, self.__tracking)
+        frames = segments.map(mark_video_segment, config)
+        if output is None or video_writer is None:
+            return [coords for coords, sights, ids in frames]
+
+        # Write the results, buffer by buffer. The images are decoded
+        # only if they are needed to write the results.
+        decode = video_writer.get_image_output()
+        result = list()
+        read_next = True
+        i = 0
+
+        self._video_buffer.open(video)
+        self._video_buffer.seek_buffer(0)
+        video_writer.set_fps(self._video_buffer.get_framerate())
+
+        while read_next is True:
+            read_next = self._video_buffer.next(decode)
+            for j in range(len(self._video_buffer)):
+                coords, sights, ids = frames[i + j]
+                self._video_buffer.set_coordinates(j, coords)
+                for f, s in enumerate(sights):
+                    if s is not None:
+                        self._video_buffer.set_sight(j, f, s)
+                self._video_buffer.set_ids(j, ids)
+            new_files = video_writer.write(self._video_buffer, output)
+            result.extend(new_files)
             i += len(self._video_buffer)
 
         # Release the video stream
@@ -157,6 +389,29 @@ class VideoFaceLandmark(object):
 
     # -----------------------------------------------------------------------
 
+    def __load_faces(self, csv_faces=None):
+        """Return the coordinates of the faces of each frame of the video.
+
+        :param csv_faces: (str) Filename with the coords of all faces
+        :return: (list of list of sppasCoords) or None
+
+        """
+        if csv_faces is None:
+            return None
+
+        br = sppasCoordsVideoReader(csv_faces)
+        coords_buffer = br.coords
+        nframes = self._video_buffer.get_nframes()
+        if len(coords_buffer) != nframes:
+            logging.error("The given {:d} coordinates doesn't match the"
+                          " number of frames of the video {:d}"
+                          "".format(len(coords_buffer), nframes))
+            return None
+
+        return coords_buffer
+
+    # -----------------------------------------------------------------------
+
     def _detect_buffer(self, coords=None):
         """Determine the sights of all the detected faces of all images.
 
@@ -169,21 +424,50 @@ class VideoFaceLandmark(object):
             return
 
         # Find the sights of faces in each image.
+        first = self._video_buffer.get_buffer_range()[0]
         for i, image in enumerate(self._video_buffer):
-            if coords is None:
-                self.__fd.detect(image)
-                faces = [c.copy() for c in self.__fd]
-            else:
-                faces = coords[i]
-            self._video_buffer.set_coordinates(i, faces)
-
-            # Perform detection on all faces in the current image
-            if len(faces) > 0:
-                for f, face_coord in enumerate(faces):
-                    self.__fl.detect_sights(image, face_coord)
-                    # Save results into the list of sights of such image
-                    self._video_buffer.set_sight(i, f, self.__fl.get_sights())
-
-            if self.__fd is not None:
-                self.__fd.invalidate()
-            self.__fl.invalidate()
+            faces = None if coords is None else coords[i]
+
+            # Track the sights from the previous image, except on the images
+            # the sights are estimated on: they depend on the frame index
+            # only, not on the frame the video was browsed from.
+            if self.__tracking > 0 and (first + i) % (self.__tracking + 1) != 0:
+                tracked = self.__tracker.track(image, faces)
+                if tracked is not None:
+                    faces, sights = tracked
+                    self._video_buffer.set_coordinates(i, faces)
+                    for f, s in enumerate(sights):
+                        self._video_buffer.set_sight(i, f, s)
+                    self.__tracker.set_reference(image, faces, sights)
+                    continue
+
+            self.__detect_image(i, image, faces)
+            if self.__tracking > 0:
+                self.__tracker.set_reference(image,
+                                             self._video_buffer.get_coordinates(i),
+                                             self._video_buffer.get_sights(i))
+
+    # -----------------------------------------------------------------------
+
+    def __detect_image(self, i, image, faces=None):
+        """Determine the sights of all the faces of an image of the buffer.
+
+        :param i: (int) Index of the image in the buffer
+        :param image: (sppasImage) The image
+        :param faces: (list of sppasCoords) Coordinates of the faces or None to detect
+
+        """
+        if faces is None:
+            self.__fd.detect(image)
+            faces = [c.copy() for c in self.__fd]
+        self._video_buffer.set_coordinates(i, faces)
+
+        # Perform detection on all faces in the current image
+        for f, face_coord in enumerate(faces):
+            self.__fl.detect_sights(image, face_coord)
+            # Save results into the list of sights of such image
+            self._video_buffer.set_sight(i, f, self.__fl.get_sights())
+
+        if self.__fd is not None:
+            self.__fd.invalidate()
+        self.__fl.invalidate()
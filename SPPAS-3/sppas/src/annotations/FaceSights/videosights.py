@@ -41,7 +41,6 @@
 
 import os
 import logging
-import codecs
 
 from sppas.src.config import sppasTypeError
 from sppas.src.imgdata import sppasCoords
@@ -50,6 +49,7 @@ from sppas.src.videodata import sppasCoordsVideoWriter
 
 from .sights import Sights
 from .sights import sppasSightsImageWriter
+from .sightsstore import sppasSightsVideoStore
 
 # ---------------------------------------------------------------------------
 
@@ -96,11 +96,13 @@ class sppasSightsVideoBuffer(sppasCoordsVideoBuffer):
 
     # -----------------------------------------------------------------------
 
-    def next(self):
+    def next(self, decode=True):
         """Override. Fill in the buffer with the next images & reset sights.
 
+        :param decode: (bool) Read the images from the video
+
         """
-        ret = sppasCoordsVideoBuffer.next(self)
+        ret = sppasCoordsVideoBuffer.next(self, decode)
         self.__init_sights()
         return ret
 
@@ -358,7 +360,7 @@ class sppasSightsVideoBuffer(sppasCoordsVideoBuffer):
 # ---------------------------------------------------------------------------
 
 
-class sppasSightsVideoReader(object):
+class sppasSightsVideoReader(sppasSightsVideoStore):
     """Read&create list of coords and sights from a CSV file.
 
     The CSV file must have the following columns:
@@ -368,9 +370,9 @@ class sppasSightsVideoReader(object):
         - timestamp
         - confidence         -- face detection
         - success            -- face detection
+        - x, y, w, h
         - buffer number
         - index in the buffer
-        - x, y, w, h
         - average confidence -- face landmark
         - success            -- face landmark
         - n                  -- number of sights
@@ -378,6 +380,9 @@ class sppasSightsVideoReader(object):
         - y_1 .. y_n
         - optionally score_1 .. score_n
 
+    The content is loaded into the arrays of a sppasSightsVideoStore. The
+    lists of coords, sights and ids of each frame are created on demand.
+
     """
 
     def __init__(self, csv_file, separator=";"):
@@ -387,57 +392,24 @@ class sppasSightsVideoReader(object):
         :param separator: (char) Columns separator in the CSV file
 
         """
+        super(sppasSightsVideoReader, self).__init__()
         logging.info("Sights CSV file reader")
-        self.coords = list()
-        self.sights = list()
-        self.ids = list()
-
-        with codecs.open(csv_file, "r") as csv:
-            lines = csv.readlines()
-
-        if len(lines) > 0:
-            for line in lines:
-                columns = line.split(separator)
-
-                # 1st coord = new image
-                if int(columns[1]) in (0, 1):
-                    self.coords.append(list())
-                    self.sights.append(list())
-                    self.ids.append(list())
-
-                # columns[4] is 0=failed, 1=success -- face found or not
-                if int(columns[4]) == 1 and len(columns) > 8:
-                    # identifier (the face number by default)
-                    name = columns[1]
-                    self.ids[len(self.ids) - 1].append(name)
-                    # coordinates
-                    coord = sppasCoords(int(columns[5]),
-                                        int(columns[6]),
-                                        int(columns[7]),
-                                        int(columns[8]),
-                                        float(columns[3]))
-                    self.coords[len(self.coords) - 1].append(coord)
-
-                    # sights
-                    # columns[11] is the average score of sights or "none"
-                    # columns[12] is 0=failed, 1=success -- sights found or not
-                    if len(columns) > 12 and int(columns[12]) == 1:
-                        # number of sight values
-                        nb = int(columns[13])
-                        s = Sights(nb)
-                        # extract all (x, y, score)
-                        for i in range(14, 14+nb):
-                            x = int(columns[i])
-                            y = int(columns[i+nb])
-                            if len(columns) > (14+(2*nb)):
-                                score = float(columns[i+(2*nb)])
-                            else:
-                                score = None
-                            s.set_sight(i-14, x, y, score)
-
-                        self.sights[len(self.sights) - 1].append(s)
-                    else:
-                        self.sights[len(self.sights) - 1].append(None)
+        self.load_csv(csv_file, separator)
+
+    # -----------------------------------------------------------------------
+
+    def __get_coords(self):
+        return [self.get_coordinates(i) for i in range(self.get_nframes())]
+
+    def __get_sights(self):
+        return [self.get_sights(i) for i in range(self.get_nframes())]
+
+    def __get_ids(self):
+        return [self.get_ids(i) for i in range(self.get_nframes())]
+
+    coords = property(__get_coords, None)
+    sights = property(__get_sights, None)
+    ids = property(__get_ids, None)
 
 # ---------------------------------------------------------------------------
 
@@ -530,6 +502,43 @@ class sppasSightsVideoWriter(sppasCoordsVideoWriter):
 
     # -----------------------------------------------------------------------
 
+    def write_buffer_coords(self, fd, video_buffer, buffer_idx):
+        """Override to write the coords AND sights AND ids of the buffer.
+
+        The content of the buffer is copied into a sppasSightsVideoStore
+        which is writing all the lines at once.
+
+        :param fd: (Stream) File descriptor, String descriptor, stdout, etc
+        :param video_buffer: (sppasSightsVideoBuffer)
+        :param buffer_idx: (int) Buffer number
+
+        """
+        nb = len(video_buffer)
+        all_sights = [video_buffer.get_sights(i) for i in range(nb)]
+
+        # Number of sights of the faces -- the same for all of them
+        nsights = 68
+        for sights in all_sights:
+            known = [len(s) for s in sights if s is not None]
+            if len(known) > 0:
+                nsights = known[0]
+                break
+
+        store = sppasSightsVideoStore(nb, nsights)
+        for i in range(nb):
+            coords = video_buffer.get_coordinates(i)
+            sights = list(all_sights[i])
+            sights.extend([None] * (len(coords) - len(sights)))
+            ids = list(video_buffer.get_ids(i))
+            ids.extend([str(j + 1) for j in range(len(ids), len(coords))])
+            store.set_frame(i, coords, sights, ids)
+
+        store.write_csv(fd, self._fps, self._img_writer.get_csv_sep(),
+                        video_buffer.get_buffer_size(),
+                        buffer_idx * video_buffer.get_buffer_size())
+
+    # -----------------------------------------------------------------------
+
     def write_video(self, video_buffer, out_name, pattern):
         """Save the result in video format.
 
@@ -580,7 +589,7 @@ class sppasSightsVideoWriter(sppasCoordsVideoWriter):
             # Tag&write the image with squares at the coords,
             # with circled for sights and a rectangle with the name
             img = self._img_writer.tag_image(image, coords, colors)
-            img = self._img_writer.tag_image(img, sights, colors)
+            self._img_writer.tag_image(img, sights, colors, inplace=True)
             self._text_image(img, coords, person_ids, colors)
             self._tag_video_writer.write(img)
 
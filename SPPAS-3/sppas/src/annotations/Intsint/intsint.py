@@ -32,9 +32,20 @@
     src.annotations.Intsint.intsint.py
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
+    When numpy is installed, the tones of all the (mid, range) values of
+    the optimisation grid are fixed together, target after target. The
+    values of the grid whose error is already higher than a known one are
+    discarded on the way.
+
 """
 
 import math
+try:
+    import numpy
+    numpy_import = True
+except ImportError:
+    numpy_import = False
+
 from ..annotationsexc import SmallSizeInputError
 
 # ----------------------------------------------------------------------------
@@ -98,6 +109,9 @@ class Intsint(object):
 
     def __init__(self):
         """Create a new Intsint instance."""
+        # Optimise all the values of the grid together
+        self.vectorized = numpy_import
+
         self.best_intsint = None
         self.best_estimate = None
 
@@ -287,6 +301,10 @@ class Intsint(object):
         mean +/- 50 Hz for key and [0.5..2.5 octaves] for range.
 
         """
+        if self.vectorized is True:
+            self.__recode_array()
+            return
+
         _range = Intsint.MIN_RANGE
 
         while _range < Intsint.MAX_RANGE:
@@ -300,6 +318,144 @@ class Intsint(object):
 
     # -------------------------------------------------------------------
 
+    def __recode_array(self):
+        """Array-based version of recode().
+
+        A coarse sub-grid is optimised first: its lowest error is an upper
+        bound of the best one, so that the values of the whole grid with a
+        higher partial error can be discarded.
+
+        """
+        mids = list()
+        ranges = list()
+        _range = Intsint.MIN_RANGE
+        while _range < Intsint.MAX_RANGE:
+            lm = self.min_mean
+            while lm < self.max_mean:
+                mids.append(octave(lm))
+                ranges.append(_range)
+                lm += Intsint.STEP_SHIFT
+            _range += Intsint.STEP_RANGE
+        mids = numpy.array(mids)
+        ranges = numpy.array(ranges)
+
+        coarse = numpy.arange(0, len(mids), 7)
+        ss_error, _, _, _ = self.__optimise_array(mids[coarse], ranges[coarse])
+        bound = ss_error.min() if len(ss_error) > 0 else None
+
+        ss_error, cells, tones, estimates = \
+            self.__optimise_array(mids, ranges, bound)
+        if len(cells) == 0:
+            return
+        # the first of the lowest errors, like optimise() does
+        best = int(numpy.argmin(ss_error))
+        if ss_error[best] < self.min_ss_error:
+            self.min_ss_error = float(ss_error[best])
+            self.best_range = float(ranges[cells[best]])
+            self.best_mid = float(mids[cells[best]])
+            self.best_intsint = [Intsint.TONES[t] for t in tones[:, best]]
+            self.best_estimate = estimates[:, best].tolist()
+            self.intsint = self.best_intsint[:]
+            self.estimates = self.best_estimate[:]
+
+    # -------------------------------------------------------------------
+
+    def __optimise_array(self, mids, ranges, bound=None):
+        """Fix tones for several mid and range values.
+
+        The tones are chosen and the errors are summed like optimise()
+        does, for all the values at once.
+
+        :param mids: (numpy.ndarray) Mid values in octaves
+        :param ranges: (numpy.ndarray) Range values in octaves
+        :param bound: (float) Discard the values with a higher error
+        :returns: sum of squared errors, index of the (mid, range) values,
+        indexes of tones and estimates of the values which were not discarded
+
+        """
+        tones_rel = [Intsint.TONES.index(t) for t in Intsint.TONES
+                     if t != "M"]
+        t_tone = Intsint.TONES.index("T")
+        m_tone = Intsint.TONES.index("M")
+        b_tone = Intsint.TONES.index("B")
+
+        cells = numpy.arange(len(mids))
+        top = mids + ranges / 2
+        bottom = mids - ranges / 2
+        ss_error = numpy.zeros(len(mids))
+        tones = numpy.zeros((len(self.targets), len(mids)), dtype=int)
+        estimates = numpy.zeros((len(self.targets), len(mids)))
+        last_estimate = None
+
+        for i, target in enumerate(self.targets):
+            if i == 0 or self.time[i] - self.time[i - 1] > Intsint.MIN_PAUSE:
+                # first target or after pause choose from (MTB)
+                diff = numpy.fabs(target - mids)
+                is_top = (top - target) < diff
+                is_bottom = ~is_top & ((target - bottom) < diff)
+                tone = numpy.where(is_top, t_tone,
+                                   numpy.where(is_bottom, b_tone, m_tone))
+                estimate = numpy.where(is_top, top,
+                                       numpy.where(is_bottom, bottom, mids))
+            else:
+                # elsewhere any tone except M
+                candidates = numpy.array(
+                    [self.__estimate_array(Intsint.TONES[t], last_estimate,
+                                           top, bottom)
+                     for t in tones_rel])
+                best = numpy.argmin(numpy.fabs(target - candidates), axis=0)
+                tone = numpy.array(tones_rel)[best]
+                estimate = candidates[best, numpy.arange(len(cells))]
+
+            tones[i] = tone
+            estimates[i] = estimate
+            error = numpy.fabs(estimate - target)
+            ss_error += error * error
+            last_estimate = estimate
+
+            # discard the values with a too high partial error
+            if bound is not None:
+                keep = numpy.flatnonzero(ss_error <= bound)
+                if len(keep) < len(cells):
+                    cells = cells[keep]
+                    mids = mids[keep]
+                    top = top[keep]
+                    bottom = bottom[keep]
+                    ss_error = ss_error[keep]
+                    tones = tones[:, keep]
+                    estimates = estimates[:, keep]
+                    last_estimate = last_estimate[keep]
+
+        return ss_error, cells, tones, estimates
+
+    # -------------------------------------------------------------------
+
+    @staticmethod
+    def __estimate_array(tone, last_anchor, top, bottom):
+        """Array-based version of estimate() for a relative tone.
+
+        :param tone: (str) One of the relative tones, or T or B
+        :param last_anchor: (numpy.ndarray) Last estimates
+        :param top: (numpy.ndarray) Top values
+        :param bottom: (numpy.ndarray) Bottom values
+
+        """
+        if tone == "S":
+            return last_anchor
+        if tone == "T":
+            return top
+        if tone == "H":
+            return last_anchor + (top - last_anchor) * Intsint.HIGHER
+        if tone == "U":
+            return last_anchor + (top - last_anchor) * Intsint.UP
+        if tone == "B":
+            return bottom
+        if tone == "L":
+            return last_anchor - (last_anchor - bottom) * Intsint.LOWER
+        return last_anchor - (last_anchor - bottom) * Intsint.DOWN
+
+    # -------------------------------------------------------------------
+
     def annotate(self, momel_anchors):
         """Provide optimal INTSINT coding for sequence of target points.
 
@@ -63,8 +63,20 @@
     the spline knot. This, in fact, defines the most simple mathematical
     function for which the curves are both continuous and smooth.
 
+    When numpy is installed, the target estimation and the reductions work
+    on arrays: all the regression windows of a pitch array are fitted at
+    once and the outliers are removed with masks. The sums are accumulated
+    in the same order than the loops of the reference implementation, so
+    that both give the same anchors.
+
 """
 import math
+try:
+    import numpy
+    from numpy.lib.stride_tricks import sliding_window_view
+    numpy_import = True
+except ImportError:
+    numpy_import = False
 
 from .anchor import Anchor
 from .momelutil import quicksortcib
@@ -92,12 +104,19 @@ class Momel(object):
         self.RAPP_GLITCH = 0.05
         self.ELIM_GLITCH = True
 
+        # Number of regression windows fitted together by the array-based
+        # implementation. It bounds the memory which is used.
+        self.BLOCK_SIZE = 4096
+        # Use the array-based implementation
+        self.VECTORIZED = numpy_import
+
         # Array of pitch values
         self.hzptr = []
         self.nval = 0
         self.delta = 0.01
 
-        # Output of cible:
+        # Output of cible: a list of Anchor, or an array of (x, y) rows
+        # with the array-based implementation
         self.cib = []
         # Output of reduc:
         self.cibred = []
@@ -152,6 +171,18 @@ class Momel(object):
     def set_option_elim_glitch(self, activate=True):
         self.ELIM_GLITCH = activate
 
+    def set_option_vectorized(self, activate=True):
+        """Use the array-based implementation or the loop-based one.
+
+        :param activate: (bool)
+        :raises: ImportError: numpy is not installed
+
+        """
+        if activate is True and numpy_import is False:
+            raise ImportError("The array-based implementation of Momel "
+                              "requires numpy.")
+        self.VECTORIZED = activate
+
     def set_option_win1(self, val):
         self.lfen1 = val
         assert(self.lfen1 > 0)
@@ -183,6 +214,10 @@ class Momel(object):
         are greater than 5% more than the current value.
 
         """
+        if self.VECTORIZED is True:
+            self.__elim_glitch_array()
+            return
+
         _delta = 1.0 + self.RAPP_GLITCH
         for i in range(1, self.nval-1):
             cur = self.hzptr[i]
@@ -193,6 +228,34 @@ class Momel(object):
 
     # ------------------------------------------------------------------
 
+    def __elim_glitch_array(self):
+        """Array-based version of elim_glitch().
+
+        A glitch which is eliminated is 0 when its next value is examined:
+        the latter is then a glitch if it is greater than 5% more than
+        its own next value.
+
+        """
+        if self.nval < 3:
+            return
+        _delta = 1.0 + self.RAPP_GLITCH
+        hz = numpy.asarray(self.hzptr, dtype=float)
+        cur = hz[1:-1]
+        gnext = cur > hz[2:] * _delta
+        # glitch if the previous value is unchanged or set to 0
+        g_orig = gnext & (cur > hz[:-2] * _delta)
+        g_zero = gnext & (cur > 0.)
+
+        # a glitch is eliminated if it follows a run of eliminated values
+        # starting by an usual glitch
+        idx = numpy.arange(len(cur))
+        last_break = numpy.maximum.accumulate(numpy.where(g_zero, -1, idx))
+        last_orig = numpy.maximum.accumulate(numpy.where(g_orig, idx, -1))
+        for i in numpy.flatnonzero(g_zero & (last_orig > last_break)):
+            self.hzptr[i+1] = 0.
+
+    # ------------------------------------------------------------------
+
     def calcrgp(self, pond, dpx, fpx):
         """From inputs, estimates: a0, a1, a2.
 
@@ -248,6 +311,9 @@ class Momel(object):
             raise IOError('Empty pitch array')
         if self.hzsup < self.hzinf:
             raise ValueError('F0 ceiling > F0 threshold')
+        if self.VECTORIZED is True:
+            self.__cible_array()
+            return
 
         pond = []
         pondloc = []  # local copy of pond
@@ -319,58 +385,124 @@ class Momel(object):
 
     # ------------------------------------------------------------------
 
-    def reduc(self):
-        """First target reduction of too close points."""
-        # initialisations
-        # ---------------
-        xdist = []
-        ydist = []
-        dist = []
-        for i in range(self.nval):
-            xdist.append(-1.)
-            ydist.append(-1.)
-            dist.append(-1.)
+    def __cible_array(self):
+        """Array-based version of cible().
 
-        lf = int(self.lfen2 / 2)
-        xds = yds = 0.
-        np = 0
+        The regression windows are fitted together, by blocks of frames.
+        A window is made of lfen1+1 values: the ones out of the pitch array
+        are masked.
 
-        # xdist and ydist estimations
-        for i in range(self.nval-1):
-            # j1 and j2 estimations (interval min and max values)
-            j1 = 0
-            if i > lf:
-                j1 = i - lf
-            j2 = self.nval - 1
-            if i+lf < self.nval-1:
-                j2 = i + lf
+        """
+        half = int(self.lfen1 / 2)
+        win = self.lfen1 + 1
+        hz = numpy.zeros(self.nval + win - 1)
+        hz[half:half+self.nval] = self.hzptr
+        x = numpy.arange(-half, self.nval + win - 1 - half, dtype=float)
+        inside = (x >= 0) & (x < self.nval)
+
+        self.cib = numpy.zeros((self.nval, 2))
+        for start in range(0, self.nval, self.BLOCK_SIZE):
+            end = min(start + self.BLOCK_SIZE, self.nval)
+            sl = slice(start, end + win - 1)
+            self.cib[start:end] = self.__cible_block(
+                sliding_window_view(x[sl], win),
+                sliding_window_view(hz[sl], win),
+                sliding_window_view(inside[sl], win),
+                numpy.arange(start, end))
 
-            # left (g means left)
-            sxg = syg = 0.
-            ng = 0
-            for j in range(j1, i+1):
-                if self.cib[j].y > self.SEUILV:
-                    sxg = sxg + self.cib[j].x
-                    syg = syg + self.cib[j].y
-                    ng += 1
+    # ------------------------------------------------------------------
 
-            # right (d means right)
-            sxd = syd = 0.
-            nd = 0
-            for j in range(i+1, j2):
-                if self.cib[j].y > self.SEUILV:
-                    sxd = sxd + self.cib[j].x
-                    syd = syd + self.cib[j].y
-                    nd += 1
+    def __cible_block(self, x, hz, inside, ix):
+        """Estimate the targets of a block of frames.
 
-            # xdist[i] and ydist[i] evaluations
-            if nd * ng > 0:
-                xdist[i] = math.fabs(sxg / ng - sxd / nd)
-                ydist[i] = math.fabs(syg / ng - syd / nd)
+        :param x: (numpy.ndarray) Frame index of each value of each window
+        :param hz: (numpy.ndarray) Pitch value of each value of each window
+        :param inside: (numpy.ndarray) Values of the windows in the pitch array
+        :param ix: (numpy.ndarray) Frame index of the windows
+        :returns: (numpy.ndarray) (x, y) of the targets, (0, 0) if none
+
+        """
+        nb = len(ix)
+        x2 = x * x
+        # pn, sx, sx2, sx3, sx4, sy, sxy, sx2y
+        terms = numpy.stack((numpy.ones_like(x), x, x2, x2 * x, x2 * x2,
+                             hz, x * hz, x2 * hz), axis=2)
+        pond = ((hz > self.SEUILV) & inside).astype(float)
+        a = numpy.zeros((nb, 3))
+        failed = numpy.zeros(nb, dtype=bool)
+        nsupr = numpy.zeros(nb, dtype=int)
+        rows = numpy.arange(nb)
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            while len(rows) > 0:
+                # Estimate values of: a0, a1, a2 with the current weights.
+                # The sums are accumulated like in calcrgp().
+                s = numpy.cumsum(pond[rows, :, None] * terms[rows], axis=1)
+                pn, sx, sx2, sx3, sx4, sy, sxy, sx2y = s[:, -1, :].T
+                spdxy = sxy - (sx * sy) / pn
+                spdx2 = sx2 - (sx * sx) / pn
+                spdx3 = sx3 - (sx * sx2) / pn
+                spdx4 = sx4 - (sx2 * sx2) / pn
+                spdx2y = sx2y - (sx2 * sy) / pn
+                muet = (spdx2 * spdx4) - (spdx3 * spdx3)
+                ko = (pn < 3.) | (spdx2 == 0.) | (muet == 0.)
+                failed[rows[ko]] = True
+
+                ok = ~ko
+                rows = rows[ok]
+                a2 = (spdx2y[ok] * spdx2[ok] - spdxy[ok] * spdx3[ok]) / muet[ok]
+                a1 = (spdxy[ok] - a2 * spdx3[ok]) / spdx2[ok]
+                a0 = (sy[ok] - a1 * sx[ok] - a2 * sx2[ok]) / pn[ok]
+                a[rows] = numpy.column_stack((a0, a1, a2))
+
+                # Remove the values too far from the estimated ones
+                xr = x[rows]
+                hzr = hz[rows]
+                hzes = a0[:, None] + (a1[:, None] + a2[:, None] * xr) * xr
+                sup = inside[rows] & ((hzr == 0.) | (hzes / hzr > self.maxec))
+                pond[rows] = numpy.where(sup, 0., pond[rows])
+                nsup = sup.sum(axis=1)
+
+                # Iterate while the number of removed values increases
+                more = nsup > nsupr[rows]
+                nsupr[rows] = nsup
+                rows = rows[more]
+
+            # Now estimate xc and yc for the new 'cible'
+            a0, a1, a2 = a.T
+            vxc = (0.0 - a1) / (a2 + a2)
+            vyc = a0 + (a1 + a2 * vxc) * vxc
+            found = ~failed & (a2 != 0.) & \
+                (vxc > ix - self.lfen1) & (vxc < ix + self.lfen1) & \
+                (vyc > self.hzinf) & (vyc < self.hzsup)
+
+        cib = numpy.zeros((nb, 2))
+        cib[found, 0] = vxc[found]
+        cib[found, 1] = vyc[found]
+        return cib
+
+    # ------------------------------------------------------------------
+
+    def reduc(self):
+        """First target reduction of too close points."""
+        if self.VECTORIZED is True:
+            cibx = self.cib[:, 0].tolist()
+            ciby = self.cib[:, 1].tolist()
+            xdist, ydist = self.__dist_array()
+            xdist = xdist.tolist()
+            ydist = ydist.tolist()
+        else:
+            cibx = [c.x for c in self.cib]
+            ciby = [c.y for c in self.cib]
+            xdist, ydist = self.__dist(cibx, ciby)
+
+        xds = yds = 0.
+        np = 0
+        for i in range(self.nval):
+            if xdist[i] >= 0.:
                 xds = xds + xdist[i]
                 yds = yds + ydist[i]
                 np += 1
-        # end for
 
         if np == 0 or xds == 0. or yds == 0.:
             raise ValueError('Not enough values more than ' +
@@ -378,6 +510,7 @@ class Momel(object):
 
         # dist estimation (on pondere par la distance moyenne)
         # ----------------------------------------------------
+        dist = [-1.] * self.nval
         px = float(np) / xds
         py = float(np) / yds
         for i in range(self.nval):
@@ -428,11 +561,11 @@ class Momel(object):
             # moyenne sigma
             for j in range(parinf, parsup):
                 # sur la pop d'une partition
-                if self.cib[j].y > 0.:
-                    sx += self.cib[j].x
-                    sx2 += self.cib[j].x * self.cib[j].x
-                    sy += self.cib[j].y
-                    sy2 += self.cib[j].y * self.cib[j].y
+                if ciby[j] > 0.:
+                    sx += cibx[j]
+                    sx2 += cibx[j] * cibx[j]
+                    sy += ciby[j]
+                    sy2 += ciby[j] * ciby[j]
                     n += 1
 
             # pour la variance
@@ -457,22 +590,22 @@ class Momel(object):
 
                 #  Elimination (set cib to 0)
                 for j in range(parinf, parsup):
-                    if self.cib[j].y > 0. and \
-                            (self.cib[j].x < seuilbx or
-                             self.cib[j].x > seuilhx or
-                             self.cib[j].y < seuilby or
-                             self.cib[j].y > seuilhy):
-                        self.cib[j].x = 0.
-                        self.cib[j].y = 0.
+                    if ciby[j] > 0. and \
+                            (cibx[j] < seuilbx or
+                             cibx[j] > seuilhx or
+                             ciby[j] < seuilby or
+                             ciby[j] > seuilhy):
+                        cibx[j] = 0.
+                        ciby[j] = 0.
 
             # Recalcule moyennes
             # ------------------
             sx = sy = 0.
             n = 0
             for j in range(parinf, parsup):
-                if self.cib[j].y > 0.:
-                    sx += self.cib[j].x
-                    sy += self.cib[j].y
+                if ciby[j] > 0.:
+                    sx += cibx[j]
+                    sy += ciby[j]
                     n += 1
 
             # Reduit la liste des cibles
@@ -501,6 +634,100 @@ class Momel(object):
 
     # ------------------------------------------------------------------
 
+    def __dist(self, cibx, ciby):
+        """Distances between the left and the right targets of each frame.
+
+        :param cibx: (list) x values of the targets
+        :param ciby: (list) y values of the targets
+        :returns: xdist and ydist lists, with -1. if not estimated
+
+        """
+        xdist = [-1.] * self.nval
+        ydist = [-1.] * self.nval
+        lf = int(self.lfen2 / 2)
+
+        # xdist and ydist estimations
+        for i in range(self.nval-1):
+            # j1 and j2 estimations (interval min and max values)
+            j1 = 0
+            if i > lf:
+                j1 = i - lf
+            j2 = self.nval - 1
+            if i+lf < self.nval-1:
+                j2 = i + lf
+
+            # left (g means left)
+            sxg = syg = 0.
+            ng = 0
+            for j in range(j1, i+1):
+                if ciby[j] > self.SEUILV:
+                    sxg = sxg + cibx[j]
+                    syg = syg + ciby[j]
+                    ng += 1
+
+            # right (d means right)
+            sxd = syd = 0.
+            nd = 0
+            for j in range(i+1, j2):
+                if ciby[j] > self.SEUILV:
+                    sxd = sxd + cibx[j]
+                    syd = syd + ciby[j]
+                    nd += 1
+
+            # xdist[i] and ydist[i] evaluations
+            if nd * ng > 0:
+                xdist[i] = math.fabs(sxg / ng - sxd / nd)
+                ydist[i] = math.fabs(syg / ng - syd / nd)
+
+        return xdist, ydist
+
+    # ------------------------------------------------------------------
+
+    def __dist_array(self):
+        """Distances between the left and the right targets of each frame.
+
+        Array-based version of __dist(): the left and right windows of all
+        the frames are summed at once.
+
+        :returns: xdist and ydist arrays, with -1. if not estimated
+
+        """
+        xdist = numpy.full(self.nval, -1.)
+        ydist = numpy.full(self.nval, -1.)
+        if self.nval < 2:
+            return xdist, ydist
+        lf = int(self.lfen2 / 2)
+
+        voiced = self.cib[:, 1] > self.SEUILV
+        values = numpy.zeros((self.nval, 3))
+        values[voiced, 0] = self.cib[voiced, 0]
+        values[voiced, 1] = self.cib[voiced, 1]
+        values[voiced, 2] = 1.
+
+        # left: the frames of [i-lf, i]
+        padded = numpy.concatenate((numpy.zeros((lf, 3)), values))
+        windows = sliding_window_view(padded, lf + 1, axis=0)
+        left = numpy.cumsum(windows[:self.nval-1], axis=2)[:, :, -1]
+
+        # right: the frames of [i+1, i+lf[, without the last one
+        if lf > 1:
+            values[-1, :] = 0.
+            padded = numpy.concatenate((values, numpy.zeros((lf, 3))))
+            windows = sliding_window_view(padded, lf - 1, axis=0)
+            right = numpy.cumsum(windows[1:self.nval], axis=2)[:, :, -1]
+        else:
+            right = numpy.zeros((self.nval-1, 3))
+
+        ok = numpy.flatnonzero((left[:, 2] > 0) & (right[:, 2] > 0))
+        left = left[ok]
+        right = right[ok]
+        xdist[ok] = numpy.fabs(left[:, 0] / left[:, 2] - right[:, 0] / right[:, 2])
+        ydist[ok] = numpy.fabs(left[:, 1] / left[:, 2] - right[:, 1] / right[:, 2])
+
+        return xdist, ydist
+
+    # ------------------------------------------------------------------
+
     def reduc2(self):
         """reduc2.
 
@@ -559,10 +786,15 @@ class Momel(object):
         # ------------
 
         # Recherche 1er voise
-        premier_voise = 0
-        while premier_voise < self.nval and \
-                self.hzptr[premier_voise] < self.SEUILV:
-            premier_voise += 1
+        if self.VECTORIZED is True:
+            hz = numpy.asarray(self.hzptr, dtype=float)
+            voise = numpy.flatnonzero(hz >= self.SEUILV)
+            premier_voise = int(voise[0]) if len(voise) > 0 else self.nval
+        else:
+            premier_voise = 0
+            while premier_voise < self.nval and \
+                    self.hzptr[premier_voise] < self.SEUILV:
+                premier_voise += 1
 
         if int(self.cibred2[0].x) > (premier_voise + halo):
             # origine des t : ancre.x, et des y : ancre.y
@@ -589,9 +821,13 @@ class Momel(object):
                       (2 * a * (ancre.x - frontiere) * (ancre.x - frontiere))
 
         # recherche dernier voisement
-        dernier_voise = self.nval - 1
-        while dernier_voise >= 0 and self.hzptr[dernier_voise] < self.SEUILV:
-            dernier_voise -= 1
+        if self.VECTORIZED is True:
+            dernier_voise = int(voise[-1]) if len(voise) > 0 else -1
+        else:
+            dernier_voise = self.nval - 1
+            while dernier_voise >= 0 and \
+                    self.hzptr[dernier_voise] < self.SEUILV:
+                dernier_voise -= 1
 
         # ################################################################## #
 
@@ -38,6 +38,7 @@
     -------------------------------------------------------------------------
 
 """
+import os
 
 from sppas.src.anndata.aio.praat import sppasPitchTier
 from sppas.src.anndata import sppasTrsRW
@@ -49,6 +50,8 @@ from sppas.src.anndata import sppasLabel
 from sppas.src.anndata import sppasTag
 
 from sppas.src.structs import sppasOption
+from sppas.src.audiodata.aio import extensions as audio_extensions
+from sppas.src.audiodata.audiopitch import AudioPitch
 
 from sppas.src.config import annots
 
@@ -188,16 +191,27 @@ class sppasMomel(sppasBaseAnnotation):
     # Annotate
     # -----------------------------------------------------------------------
 
-    @staticmethod
-    def fix_pitch(input_filename):
+    def fix_pitch(self, input_filename):
         """Load pitch values from a file.
 
         It is supposed that the given file contains a tier with name "Pitch"
         with a pitch value every 10ms, or a tier with name "PitchTier".
+        If the given file is an audio file, the pitch values are estimated
+        from its first channel.
 
         :returns: A list of pitch values (one value each 10 ms).
 
         """
+        ext = os.path.splitext(input_filename)[1].lower()
+        if ext in audio_extensions:
+            pitch = AudioPitch(delta=0.01,
+                               fmin=self._options['lo'],
+                               fmax=self._options['hi'])
+            pitch_list = pitch.eval_pitch(input_filename)
+            if len(pitch_list) == 0:
+                raise EmptyInputError(name="Pitch")
+            return pitch_list
+
         parser = sppasTrsRW(input_filename)
         trs = parser.read()
         pitch_tier = sppasFindTier.pitch(trs)
@@ -365,5 +379,11 @@ class sppasMomel(sppasBaseAnnotation):
 
     @staticmethod
     def get_input_extensions():
-        """Extensions that the annotation expects for its input filename."""
-        return [SppasFiles.get_informat_extensions("ANNOT_MEASURE")]
+        """Extensions that the annotation expects for its input filename.
+
+        Priority is given to a file with pitch values. Otherwise, the pitch
+        is estimated from the audio file.
+
+        """
+        return [SppasFiles.get_informat_extensions("ANNOT_MEASURE") +
+                SppasFiles.get_informat_extensions("AUDIO")]
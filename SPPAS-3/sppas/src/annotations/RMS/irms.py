@@ -34,6 +34,13 @@
 
 """
 
+from math import fsum
+try:
+    import numpy
+    numpy_import = True
+except ImportError:
+    numpy_import = False
+
 from sppas.src.audiodata.channel import sppasChannel
 from sppas.src.audiodata.channelvolume import sppasChannelVolume
 
@@ -58,6 +65,8 @@ class IntervalsRMS(object):
 
         """
         self.__win_len = 0.010
+        # Number of samples of the channel converted at a time
+        self.__chunk_size = 1048576
 
         self._channel = None
         self.__volumes = None
@@ -107,6 +116,141 @@ class IntervalsRMS(object):
 
     # -----------------------------------------------------------------------
 
+    def estimate_intervals(self, intervals):
+        """Estimate RMS values of several intervals at once.
+
+        Give the same results than estimate() on each interval but the
+        squared samples of the channel are summed only once: the RMS of
+        all the windows of all the intervals are obtained from differences
+        of these sums, instead of extracting a fragment for each interval.
+
+        :param intervals: (list of tuple) Start and end values, in seconds
+        :returns: (list of tuple) global rms, rms values and fmean rms of
+        each interval
+
+        """
+        results = list()
+        if numpy_import is False:
+            for begin, end in intervals:
+                self.estimate(begin, end)
+                results.append((self.get_rms(),
+                                list(self.get_values()),
+                                self.get_fmean()))
+            return results
+
+        if len(intervals) == 0:
+            return results
+        for begin, end in intervals:
+            if (float(end) - float(begin)) < self.__win_len:
+                raise Exception('Invalid interval [{:f};{:f}]'
+                                ''.format(float(begin), float(end)))
+
+        # Frames of the intervals, like extract_fragment() does
+        framerate = float(self._channel.get_framerate())
+        nframes = self._channel.get_nframes()
+        bounds = numpy.array(intervals, dtype=float) * framerate
+        from_pos = bounds[:, 0].astype(numpy.int64)
+        to_pos = bounds[:, 1].astype(numpy.int64)
+        to_pos[(to_pos < 0) | (to_pos > nframes)] = int(nframes)
+        from_pos[from_pos < 0] = 0
+        from_pos = numpy.minimum(from_pos, to_pos)
+        nb = to_pos - from_pos
+
+        # Windows of the intervals, like sppasChannelVolume() does
+        win_frames = int(self.__win_len * self._channel.get_framerate())
+        nb_vols = ((nb / framerate) / self.__win_len).astype(numpy.int64) + 1
+        first = numpy.cumsum(nb_vols) - nb_vols
+        owner = numpy.repeat(numpy.arange(len(intervals)), nb_vols)
+        index = numpy.arange(len(owner)) - first[owner]
+        win_from = numpy.minimum(from_pos[owner] + index * win_frames,
+                                 to_pos[owner])
+        win_to = numpy.minimum(win_from + win_frames, to_pos[owner])
+
+        sums = self.__sum_squares(numpy.concatenate(
+            (win_from, win_to, from_pos, to_pos)))
+        n = len(owner)
+        volumes = self.__rms(sums[n:2*n] - sums[:n], win_to - win_from)
+        rms = self.__rms(sums[-len(intervals):] - sums[2*n:-len(intervals)],
+                         nb)
+
+        volumes = volumes.tolist()
+        for i in range(len(intervals)):
+            values = volumes[first[i]:first[i]+nb_vols[i]]
+            if values[-1] == 0:
+                values.pop()
+            fmean = 0.
+            if len(values) > 0:
+                fmean = fsum(values) / float(len(values))
+            results.append((int(rms[i]), values, fmean))
+
+        return results
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __rms(sum_squares, nb):
+        """Return the rms values like audioop does, 0 if no sample.
+
+        :param sum_squares: (numpy.ndarray) Sums of the squared samples
+        :param nb: (numpy.ndarray) Number of samples
+
+        """
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            rms = numpy.floor(numpy.sqrt(sum_squares / nb))
+        rms[nb == 0] = 0
+        return rms.astype(numpy.int64)
+
+    # -----------------------------------------------------------------------
+
+    def __sum_squares(self, positions):
+        """Return the sum of the squared samples before each position.
+
+        The channel is read by chunks to not convert all its frames at once.
+
+        :param positions: (numpy.ndarray) Frame positions
+        :returns: (numpy.ndarray)
+
+        """
+        sampwidth = self._channel.get_sampwidth()
+        frames = self._channel.get_frames()
+        nframes = len(frames) // sampwidth
+        # Sums are exact with integers, but 32 bits squares would overflow.
+        dtype = numpy.int64 if sampwidth < 4 else numpy.float64
+
+        uniq, inverse = numpy.unique(positions, return_inverse=True)
+        sums = numpy.zeros(len(uniq), dtype=dtype)
+        total = dtype(0)
+        for start in range(0, nframes, self.__chunk_size):
+            end = min(start + self.__chunk_size, nframes)
+            samples = self.__samples(frames, sampwidth, start, end)
+            cumsum = numpy.cumsum(samples.astype(dtype) ** 2) + total
+            # positions in ]start, end]
+            lo = numpy.searchsorted(uniq, start, side='right')
+            hi = numpy.searchsorted(uniq, end, side='right')
+            sums[lo:hi] = cumsum[uniq[lo:hi] - start - 1]
+            total = cumsum[-1]
+
+        return sums[inverse]
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __samples(frames, sampwidth, start, end):
+        """Return the signed samples of the frames from start to end.
+
+        :param frames: (bytes) Frames of a channel
+        :param sampwidth: (int) Sample width of the frames
+        :param start: (int) First sample
+        :param end: (int) Last sample (excluded)
+
+        """
+        dtype = {1: numpy.int8, 2: "<i2", 4: "<i4"}[sampwidth]
+        return numpy.frombuffer(frames, dtype=dtype,
+                                count=end - start,
+                                offset=sampwidth * start)
+
+    # -----------------------------------------------------------------------
+
     def get_values(self):
         """Return the list of estimated rms values."""
         if self.__volumes is None:
@@ -131,8 +131,9 @@ class sppasRMS(sppasBaseAnnotation):
         rms_values = sppasTier("RMS-values")
         rms_mean = sppasTier("RMS-mean")
 
+        annotations = list()
+        intervals = list()
         for ann in tier:
-
             content = serialize_labels(ann.get_labels())
             if len(content) == 0:
                 continue
@@ -140,12 +141,16 @@ class sppasRMS(sppasBaseAnnotation):
             # Localization of the current annotation
             begin = ann.get_lowest_localization()
             end = ann.get_highest_localization()
+            annotations.append(ann)
+            intervals.append((begin.get_midpoint(), end.get_midpoint()))
+
+        # Estimate all RMS values during all the annotations
+        results = self.__rms.estimate_intervals(intervals)
 
-            # Estimate all RMS values during this ann
-            self.__rms.estimate(begin.get_midpoint(), end.get_midpoint())
+        for ann, (rms, values, fmean) in zip(annotations, results):
 
             # The global RMS of the fragment between begin and end
-            rms_tag = sppasTag(self.__rms.get_rms(), "int")
+            rms_tag = sppasTag(rms, "int")
             rms_avg.create_annotation(
                 ann.get_location().copy(),
                 sppasLabel(rms_tag)
@@ -153,12 +158,12 @@ class sppasRMS(sppasBaseAnnotation):
 
             # All the RMS values (one each 10 ms)
             labels = list()
-            for value in self.__rms.get_values():
+            for value in values:
                 labels.append(sppasLabel(sppasTag(value, "int")))
             rms_values.create_annotation(ann.get_location().copy(), labels)
 
             # The fmean RMS of the fragment between begin and end
-            rms_mean_tag = sppasTag(self.__rms.get_fmean(), "float")
+            rms_mean_tag = sppasTag(fmean, "float")
             rms_mean.create_annotation(
                 ann.get_location().copy(),
                 sppasLabel(rms_mean_tag)
@@ -29,8 +29,13 @@
 
         ---------------------------------------------------------------------
 
+    src.annotations.ReOccurrences.reoccurrences.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
 """
 
+from bisect import bisect_left
+
 
 class ReOccurences(object):
     """Manager for a set of re-occurrences annotations.
@@ -41,10 +46,26 @@ class ReOccurences(object):
     :license:      GPL, v3
     :copyright:    Copyright (C) 2011-2019  Brigitte Bigi
 
+    The annotations to search re-occurrences in can be indexed: each typed
+    content of their tags is associated to the sorted list of the indexes
+    of the annotations it is in. Searching for the re-occurrences of an
+    annotation is then an intersection of the annotations matching each
+    of its labels instead of a comparison of all the labels of all the
+    annotations.
+
     """
 
     def __init__(self):
         super(ReOccurences, self).__init__()
+        self.__anns = list()
+        self.__begins = list()
+        self.__ends = list()
+        # typed content: sorted indexes of the annotations
+        self.__index = dict()
+        # sorted indexes of the annotations with a label matching any label
+        self.__wildcards = list()
+        # sorted indexes of the annotations with at least one label
+        self.__labelled = list()
 
     # -----------------------------------------------------------------------
 
@@ -76,30 +97,154 @@ class ReOccurences(object):
 
         :param ann1: (sppasAnnotation)
         :param anns2: (list of sppasAnnotation)
-        :returns: (list of sppasAnnotation)
+        :returns: (list of sppasAnnotation) in the order of anns2
+
+        """
+        reocc = ReOccurences()
+        reocc.set_annotations(anns2)
+        # remove duplicates but keep the order of the annotations
+        return list(dict.fromkeys(reocc.find(ann1)))
+
+    # -----------------------------------------------------------------------
+
+    def set_annotations(self, anns2):
+        """Index the annotations to search for re-occurrences in.
+
+        :param anns2: (sppasTier or list of sppasAnnotation) Annotations
+        sorted by time if they are searched with window().
+
+        """
+        self.__anns = list(anns2)
+        self.__begins = list()
+        self.__ends = list()
+        self.__index = dict()
+        self.__wildcards = list()
+        self.__labelled = list()
+
+        for i, ann2 in enumerate(self.__anns):
+            if len(ann2.get_labels()) > 0:
+                self.__labelled.append(i)
+            wildcard = False
+            for label2 in ann2.get_labels():
+                tags2 = [tag.get_typed_content() for tag, score in label2]
+                # a label with twice the same tag is matching any label:
+                # see compare_labels().
+                if len(set(tags2)) != len(tags2):
+                    wildcard = True
+                for content in set(tags2):
+                    indexes = self.__index.setdefault(content, list())
+                    if len(indexes) == 0 or indexes[-1] != i:
+                        indexes.append(i)
+            if wildcard is True:
+                self.__wildcards.append(i)
+
+    # -----------------------------------------------------------------------
+
+    def window(self, moment, span):
+        """Return the indexes of the next annotations after a moment.
+
+        Same as tier.find(moment, end, overlaps=False)[:span] with end the
+        end of the last annotation, but only the returned annotations are
+        examined.
+
+        :param moment: (sppasPoint)
+        :param span: (int) Max number of annotations
+        :returns: (list of int)
+
+        """
+        if len(self.__anns) == 0:
+            return list()
+        if len(self.__begins) != len(self.__anns):
+            self.__begins = [a.get_lowest_localization() for a in self.__anns]
+            self.__ends = [a.get_highest_localization() for a in self.__anns]
+
+        end = self.__ends[-1]
+        if moment > end:
+            return list()
+
+        indexes = list()
+        i = self.__first(moment)
+        while i < len(self.__anns) and len(indexes) < span:
+            b = self.__begins[i]
+            if b >= moment and self.__ends[i] <= end:
+                indexes.append(i)
+            if b >= end:
+                break
+            i += 1
+
+        return indexes
+
+    # -----------------------------------------------------------------------
+
+    def __first(self, moment):
+        """Return the index to start a search from, like sppasTier does.
+
+        :param moment: (sppasPoint)
 
         """
-        reocc = list()
-        for ann2 in anns2:
-
-            # Evaluate if all labels of ann1 are also in ann2
-            match = False
-            for label1 in ann1.get_labels():
-                match = False
-                for label2 in ann2.get_labels():
-                    equals = ReOccurences.compare_labels(label1, label2)
-                    # we've found that a label of ann2 is matching label1
-                    # we can stop to search it anymore. label1 == label2
-                    if equals > 0:
-                        match = True
-                        break
-
-                # As soon as a label1 is missing in ann2, we can stop:
-                # ann2 is not a re-occurrence of ann1
-                if match is False:
-                    break
-
-            if match is True:
-                reocc.append(ann2)
-
-        return list(set(reocc))
+        if len(self.__anns) == 1:
+            return 0
+        if self.__anns[0].get_location().is_point() is True:
+            return bisect_left(self.__begins, moment)
+
+        lo = 0
+        hi = len(self.__anns)
+        mid = (lo + hi) // 2
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.__begins[mid] <= moment < self.__ends[mid]:
+                return mid
+            if moment < self.__ends[mid]:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        return mid
+
+    # -----------------------------------------------------------------------
+
+    def find(self, ann1, indexes=None):
+        """Return the re-occurrences of an annotation.
+
+        An indexed annotation is matching ann1 if all labels of ann1 are
+        in it, like eval() does.
+
+        :param ann1: (sppasAnnotation)
+        :param indexes: (list of int) Indexes of the annotations to search
+        in, or None to search in all of them
+        :returns: (list of sppasAnnotation) sorted like the indexed ones
+
+        """
+        if indexes is None:
+            indexes = range(len(self.__anns))
+        if len(indexes) == 0 or len(ann1.get_labels()) == 0:
+            return list()
+        lo = min(indexes)
+        hi = max(indexes) + 1
+
+        matching = set(indexes)
+        for label1 in ann1.get_labels():
+            tags1 = [tag.get_typed_content() for tag, score in label1]
+            if len(set(tags1)) != len(tags1):
+                # label1 is matching any label of any annotation
+                found = ReOccurences.__between(self.__labelled, lo, hi)
+            else:
+                found = ReOccurences.__between(self.__wildcards, lo, hi)
+                for content in tags1:
+                    found |= ReOccurences.__between(
+                        self.__index.get(content, []), lo, hi)
+
+            # As soon as a label1 is missing, annotations are not
+            # re-occurrences of ann1
+            matching &= found
+            if len(matching) == 0:
+                break
+
+        return [self.__anns[i] for i in sorted(matching)]
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __between(indexes, lo, hi):
+        """Return the set of sorted indexes in range [lo, hi[."""
+        return set(indexes[bisect_left(indexes, lo):bisect_left(indexes, hi)])
@@ -145,22 +145,20 @@ class sppasReOcc(sppasBaseAnnotation):
         if tier_spk1.is_float():
             tier_spk2.set_radius(0.04)
 
-        end_loc = tier_spk2[-1].get_highest_localization()
+        # Index the labels of the annotations of spk2
+        self.__reocc.set_annotations(tier_spk2)
         for ann1 in tier_spk1:
 
             # Localization of the end of the current annotation of spk1
             cur_loc = ann1.get_highest_localization()
 
-            # Search for the annotations of spk2 after this localization
-            all_anns2 = tier_spk2.find(cur_loc, end_loc, overlaps=False)
-
-            # Select only the next N annotations of spk2
-            window_size = min(len(all_anns2), self._options["span"])
-            anns2 = all_anns2[:window_size]
+            # Select only the next N annotations of spk2 after this
+            # localization
+            anns2 = self.__reocc.window(cur_loc, self._options["span"])
 
             # Search for the re-occurring labels of annotations
             # -------------------------------------------------
-            reoccs = self.__reocc.eval(ann1, anns2)
+            reoccs = self.__reocc.find(ann1, anns2)
             if len(reoccs) > 0:
                 annset.append(ann1, reoccs)
 
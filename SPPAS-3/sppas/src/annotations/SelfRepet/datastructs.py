@@ -36,6 +36,7 @@
 """
 
 import re
+from bisect import bisect_left
 
 from sppas.src.config import symbols
 from sppas.src.config import RangeBoundsException
@@ -228,6 +229,11 @@ class DataSpeaker(object):
 
     Stored data are a list of formatted unicode strings.
 
+    The words are indexed when the instance is created: each distinct word
+    is associated to the sorted list of its positions in the entries. The
+    search for the next occurrence of a word is then a binary search in
+    this list instead of a scan of the entries.
+
     """
 
     def __init__(self, tokens):
@@ -240,6 +246,17 @@ class DataSpeaker(object):
         for tok in tokens:
             self.__entries.append(Entry(tok).get())
 
+        # Positions of the words, and positions of each distinct word
+        self.__words = list()
+        self.__index = dict()
+        for i, entry in enumerate(self.__entries):
+            if self.is_word(i) is True:
+                self.__words.append(i)
+                if entry in self.__index:
+                    self.__index[entry].append(i)
+                else:
+                    self.__index[entry] = [i]
+
     # -----------------------------------------------------------------------
 
     def is_word(self, idx):
@@ -284,11 +301,37 @@ class DataSpeaker(object):
         self.__get_entry(current)
 
         # search for the next word after the current index
-        c_next = current + 1
-        while c_next < len(self.__entries):
-            if self.is_word(c_next) is True:
-                return c_next
-            c_next += 1
+        i = bisect_left(self.__words, current + 1)
+        if i < len(self.__words):
+            return self.__words[i]
+
+        return -1
+
+    # -----------------------------------------------------------------------
+
+    def get_vocabulary(self):
+        """Return the list of distinct words of the entries."""
+        return list(self.__index.keys())
+
+    # -----------------------------------------------------------------------
+
+    def find_word(self, word, current=0):
+        """Return the index of the first occurrence of a word.
+
+        :param word: (str) Formatted entry to search for
+        :param current: (int) Index to start the search from
+        :returns: (int) Index of the word or -1 if it does not occur
+        from the given index
+
+        """
+        if current < 0:
+            return -1
+        positions = self.__index.get(word, None)
+        if positions is None:
+            return -1
+        i = bisect_left(positions, current)
+        if i < len(positions):
+            return positions[i]
 
         return -1
 
@@ -308,15 +351,7 @@ class DataSpeaker(object):
             return -1
 
         # Search for this word in the other speaker data
-        word = self.__entries[current]
-        while 0 <= other_current < len(other_speaker):
-            other_token = other_speaker[other_current]
-            if word == other_token:
-                return other_current
-            # not found. try next one
-            other_current = other_speaker.get_next_word(other_current)
-
-        return -1
+        return other_speaker.find_word(self.__entries[current], other_current)
 
     # -----------------------------------------------------------------------
     # Private
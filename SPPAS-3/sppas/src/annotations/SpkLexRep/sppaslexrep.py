@@ -300,9 +300,46 @@ class sppasLexRep(sppasBaseRepet):
 
     # -----------------------------------------------------------------------
 
+    @staticmethod
+    def _index_windows(windows):
+        """Return the windows each word is occurring in.
+
+        :param windows: (list of DataSpeaker)
+        :returns: (dict) key=word, value=sorted list of window indexes
+
+        """
+        index = dict()
+        for widx, dataspk in enumerate(windows):
+            for word in dataspk.get_vocabulary():
+                if word in index:
+                    index[word].append(widx)
+                else:
+                    index[word] = [widx]
+        return index
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _get_first_word(dataspk):
+        """Return the first word of a DataSpeaker or None."""
+        if len(dataspk) == 0:
+            return None
+        idx = 0
+        if dataspk.is_word(0) is False:
+            idx = dataspk.get_next_word(0)
+            if idx == -1:
+                return None
+        return dataspk[idx]
+
+    # -----------------------------------------------------------------------
+
     def _detect_all_sources(self, win_spk1, win_spk2):
         """Return all reprises of speaker1 in speaker2.
 
+        Only the windows of speaker 2 containing the first word of a window
+        of speaker 1 can contain a repeated sequence: the others are not
+        examined.
+
         :return: (dict) dict of sources
 
         - key: (index_start, index_end)
@@ -310,6 +347,7 @@ class sppasLexRep(sppasBaseRepet):
 
         """
         sources = list()
+        spk2_index = sppasLexRep._index_windows(win_spk2)
 
         # index of the end-token of the longest detected source in the previous window
         prev_max_index = -1
@@ -319,9 +357,9 @@ class sppasLexRep(sppasBaseRepet):
             data_spk1 = win_spk1[spk1_widx]
 
             max_index = -1
-            # for each window on data of speaker 2
-            spk2_widx = 0
-            while spk2_widx < len(win_spk2):
+            # for each window on data of speaker 2 with the first word
+            first_word = sppasLexRep._get_first_word(data_spk1)
+            for spk2_widx in spk2_index.get(first_word, []):
                 data_spk2 = win_spk2[spk2_widx]
 
                 # get the index of the longest selected sequence of tokens
@@ -331,7 +369,6 @@ class sppasLexRep(sppasBaseRepet):
                         max_index = spk2_echo_idx
                         if max_index == self._options["span"]:
                             break
-                spk2_widx += 1
 
             if max_index > -1:
                 sppasLexRep._add_source(sources,
@@ -56,6 +56,12 @@ class SyllRules(object):
     The syllable configuration file is a simple ASCII text file that the user
     can change as needed.
 
+    When loaded, the rules are also compiled into tables of integers: each
+    class is given an identifier, the class rules are indexed by the
+    sequence of class identifiers and the phoneme rules are indexed by
+    the phonemes they fix. If the rules are modified without using load(),
+    compile() must be invoked to apply the changes to these tables.
+
     """
 
     BREAK_SYMBOL = "#"
@@ -73,6 +79,15 @@ class SyllRules(object):
         self.gap = dict()        # list of gap rules
         self.phonclass = dict()  # list of tuple (phoneme, classe)
 
+        # Compiled rules
+        self.__class_names = list()
+        self.__phon_ids = dict()
+        self.__vowel_ids = tuple()
+        self.__class_len = list()
+        self.__exception_ids = dict()
+        self.__general_len = dict()
+        self.__gap_ids = list()
+
         if filename is not None:
             self.load(filename)
         else:
@@ -99,6 +114,8 @@ class SyllRules(object):
         for phone in symbols.all:
             self.phonclass[phone] = SyllRules.BREAK_SYMBOL
 
+        self.compile()
+
     # ------------------------------------------------------------------------
 
     def load(self, filename):
@@ -133,6 +150,71 @@ class SyllRules(object):
                     s = " ".join(wds[1:6])
                     self.gap[s] = int(wds[6])
 
+        self.compile()
+
+    # ------------------------------------------------------------------------
+
+    def compile(self):
+        """Compile the rules into tables of integers.
+
+        The break symbol is the class 0. Class rules are indexed by the
+        tuple of class identifiers they are matching, general rules by
+        their length and phoneme rules by the phonemes which are not "ANY".
+
+        """
+        names = sorted(set(self.phonclass.values()))
+        if SyllRules.BREAK_SYMBOL in names:
+            names.remove(SyllRules.BREAK_SYMBOL)
+        self.__class_names = [SyllRules.BREAK_SYMBOL] + names
+        class_ids = {c: i for i, c in enumerate(self.__class_names)}
+        self.__class_len = [len(c) for c in self.__class_names]
+        self.__phon_ids = {p: class_ids[c] for p, c in self.phonclass.items()}
+        self.__vowel_ids = tuple(class_ids[c] for c in ("V", "W")
+                                 if c in class_ids)
+
+        # Class rules: an exception is a string of classes
+        self.__exception_ids = dict()
+        for rule, value in self.exception.items():
+            for key in SyllRules.__split_classes(rule, self.__class_names):
+                self.__exception_ids[key] = value
+        self.__general_len = dict()
+        for rule, value in self.general.items():
+            if len(rule) not in self.__general_len:
+                self.__general_len[len(rule)] = value
+
+        # Phoneme rules: one table for each position of the ANY phonemes
+        tables = dict()
+        for order, (rule, value) in enumerate(self.gap.items()):
+            phons = rule.split()
+            mask = tuple(i for i, p in enumerate(phons) if p != "ANY")
+            key = tuple(phons[i] for i in mask)
+            if (len(phons), mask) not in tables:
+                tables[(len(phons), mask)] = dict()
+            if key not in tables[(len(phons), mask)]:
+                tables[(len(phons), mask)][key] = (order, value)
+        self.__gap_ids = [(size, mask, table)
+                          for (size, mask), table in tables.items()]
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def __split_classes(rule, names):
+        """Return all the sequences of class identifiers matching a rule.
+
+        :param rule: (str) Concatenated class names
+        :param names: (list) Class names, the index is the identifier
+        :returns: list of tuples
+
+        """
+        if len(rule) == 0:
+            return [tuple()]
+        sequences = list()
+        for i, name in enumerate(names):
+            if len(name) > 0 and rule.startswith(name):
+                for seq in SyllRules.__split_classes(rule[len(name):], names):
+                    sequences.append((i,) + seq)
+        return sequences
+
     # ------------------------------------------------------------------------
 
     def get_class(self, phoneme):
@@ -148,6 +230,38 @@ class SyllRules(object):
 
     # ------------------------------------------------------------------------
 
+    def get_class_ids(self, phonemes):
+        """Return the class identifiers of a sequence of phonemes.
+
+        Unknown phonemes are assigned to the class of the break symbol,
+        which identifier is 0.
+
+        :param phonemes: (list) Phonemes
+        :returns: (list of int)
+
+        """
+        get = self.__phon_ids.get
+        return [get(p, 0) for p in phonemes]
+
+    # ------------------------------------------------------------------------
+
+    def get_class_name(self, class_id):
+        """Return the name of a class from its identifier.
+
+        :param class_id: (int)
+        :returns: (str)
+
+        """
+        return self.__class_names[class_id]
+
+    # ------------------------------------------------------------------------
+
+    def get_vowel_ids(self):
+        """Return the identifiers of the classes of a nucleus."""
+        return self.__vowel_ids
+
+    # ------------------------------------------------------------------------
+
     def is_exception(self, rule):
         """Return True if the rule is an exception rule.
 
@@ -208,6 +322,47 @@ class SyllRules(object):
 
     # ------------------------------------------------------------------------
 
+    def get_class_ids_boundary(self, class_ids):
+        """Get the index of the syllable boundary from class identifiers.
+
+        Same as get_class_rules_boundary() but with the compiled rules.
+
+        :param class_ids: (tuple) The class identifiers to syllabify
+        :returns: (int) boundary index or 0 if it does not match any rule.
+
+        """
+        value = self.__exception_ids.get(class_ids, None)
+        if value is not None:
+            return value
+
+        size = 0
+        for c in class_ids:
+            size += self.__class_len[c]
+        return self.__general_len.get(size, 0)
+
+    # ------------------------------------------------------------------------
+
+    def get_phonemes_gap(self, phonemes):
+        """Return the shift to apply to a sequence of phonemes (OTHRULES).
+
+        Same as get_gap() but with the compiled rules.
+
+        :param phonemes: (tuple) Phonemes to syllabify
+        :returns: (int) boundary shift
+
+        """
+        found = None
+        for size, mask, table in self.__gap_ids:
+            if size == len(phonemes):
+                rule = table.get(tuple(phonemes[i] for i in mask), None)
+                if rule is not None and (found is None or rule[0] < found[0]):
+                    found = rule
+        if found is None:
+            return 0
+        return found[1]
+
+    # ------------------------------------------------------------------------
+
     def get_gap(self, phonemes):
         """Return the shift to apply (OTHRULES).
 
@@ -193,6 +193,13 @@ class sppasSyll(sppasBaseAnnotation):
         syllables = sppasTier("SyllAlign")
         syllables.set_meta('syllabification_of_tier', phonemes.get_name())
 
+        # the classes of the phonemes are estimated once for the whole tier
+        contents = list()
+        for ann in phonemes:
+            tag = ann.get_best_tag()
+            contents.append(None if tag is None else tag.get_typed_content())
+        class_ids = self.__syllabifier.rules.get_class_ids(contents)
+
         for interval in intervals:
 
             # get the index of the phonemes containing the begin
@@ -213,10 +220,11 @@ class sppasSyll(sppasBaseAnnotation):
 
             # syllabify within the interval
             if start_phon_idx != -1 and end_phon_idx != -1:
-                self.syllabify_interval(phonemes,
-                                        start_phon_idx,
-                                        end_phon_idx,
-                                        syllables)
+                self.__add_syllables(phonemes,
+                                     start_phon_idx,
+                                     contents[start_phon_idx:end_phon_idx+1],
+                                     class_ids[start_phon_idx:end_phon_idx+1],
+                                     syllables)
             else:
                 self.logfile.print_message(
                     (info(1224, "annotations")).format(interval),
@@ -263,8 +271,24 @@ class sppasSyll(sppasBaseAnnotation):
             tag = ann.get_best_tag()
             p.append(tag.get_typed_content())
 
+        self.__add_syllables(phonemes, from_p, p,
+                             self.__syllabifier.rules.get_class_ids(p),
+                             syllables)
+
+    # ----------------------------------------------------------------------
+
+    def __add_syllables(self, phonemes, from_p, p, class_ids, syllables):
+        """Syllabify a sequence of phonemes and add the syllables.
+
+        :param phonemes: (sppasTier)
+        :param from_p: (int) index of the first phoneme to be syllabified
+        :param p: (list) the phonemes to be syllabified
+        :param class_ids: (list) the class identifiers of the phonemes
+        :param syllables: (sppasTier)
+
+        """
         # create the sequence of syllables
-        s = self.__syllabifier.annotate(p)
+        s = self.__syllabifier.annotate_ids(class_ids, p)
 
         # add the syllables into the tier
         for i, syll in enumerate(s):
@@ -48,6 +48,9 @@ class Syllabifier(object):
     :license:      GPL, v3
     :copyright:    Copyright (C) 2011-2018  Brigitte Bigi
 
+    The phonemes are syllabified from the integer identifiers of their
+    classes, with the rules compiled by SyllRules.
+
     """
 
     def __init__(self, rules_filename=None):
@@ -74,45 +77,76 @@ class Syllabifier(object):
         :returns: list of tuples (begin index, end index)
 
         """
-        # Convert a list of phonemes into a list of classes.
-        classes = [self.rules.get_class(p) for p in phonemes]
-        syllables = list()
+        return self.annotate_ids(self.rules.get_class_ids(phonemes), phonemes)
+
+    # -----------------------------------------------------------------------
+
+    def annotate_batch(self, sequences):
+        """Return the syllable boundaries of several sequences of phonemes.
+
+        :param sequences: (list) List of lists of phonemes
+        :returns: list of lists of tuples (begin index, end index)
+
+        """
+        return [self.annotate(phonemes) for phonemes in sequences]
 
-        # Find the first vowel = first nucleus
-        nucleus = Syllabifier._fix_nucleus(classes, 0)
-        if nucleus == -1:
-            return list()
+    # -----------------------------------------------------------------------
+
+    def annotate_ids(self, class_ids, phonemes):
+        """Return the syllable boundaries of a sequence of class identifiers.
+
+        :param class_ids: (list) Identifiers of the classes of the phonemes
+        :param phonemes: (list) The phonemes, for the phoneme-based rules
+        :returns: list of tuples (begin index, end index)
 
+        """
+        nb = len(class_ids)
+        vowels = self.rules.get_vowel_ids()
+
+        # Index of the next vowel, the next break and the previous
+        # vowel or break of each position
+        next_vowel = [-1] * (nb + 1)
+        next_break = [-1] * (nb + 1)
+        for i in reversed(range(nb)):
+            c = class_ids[i]
+            next_vowel[i] = i if c in vowels else next_vowel[i+1]
+            next_break[i] = i if c == 0 else next_break[i+1]
+        prev_stop = [-1] * (nb + 1)
+        for i in range(nb):
+            c = class_ids[i]
+            prev_stop[i+1] = i if (c == 0 or c in vowels) else prev_stop[i]
+
+        syllables = list()
+        nucleus = next_vowel[0]
         end_syll = -1
         while nucleus != -1:
 
-            start_syll = self._fix_start_syll(classes, end_syll, nucleus)
-            next_nucleus = Syllabifier._find_next_vowel(classes, nucleus+1)
-            next_break = Syllabifier._find_next_break(classes, nucleus)
+            if end_syll == nucleus:
+                start_syll = nucleus
+            else:
+                start_syll = max(end_syll, prev_stop[nucleus]) + 1
+            next_nucleus = next_vowel[nucleus+1]
+            brk = next_break[nucleus]
 
-            if next_break != -1 and \
-                    (next_break < next_nucleus or next_nucleus == -1):
+            if brk != -1 and (brk < next_nucleus or next_nucleus == -1):
                 # no rule to apply if the next event is a break.
-                # ie next break occurs before next nucleus or
-                # no next nucleus
-                syllables.append((start_syll, next_break-1))
+                syllables.append((start_syll, brk-1))
 
-            elif next_break == -1 and next_nucleus == -1:
+            elif brk == -1 and next_nucleus == -1:
                 # no rule to apply if current nucleus concerns
                 # the last syllable
-                end_syll = len(phonemes) - 1
+                end_syll = nb - 1
                 syllables.append((start_syll, end_syll))
 
             else:
                 # apply the exception rule or the general one
-                end_syll = self._apply_class_rules(classes,
-                                                   nucleus,
-                                                   next_nucleus)
+                end_syll = nucleus + self.rules.get_class_ids_boundary(
+                    tuple(class_ids[nucleus:next_nucleus+1]))
                 # apply the specific rules on phonemes to shift the end
-                end_syll = self._apply_phon_rules(phonemes,
-                                                  end_syll,
-                                                  nucleus,
-                                                  next_nucleus)
+                end_syll = self._apply_phon_ids_rules(phonemes,
+                                                      end_syll,
+                                                      nucleus,
+                                                      next_nucleus)
                 syllables.append((start_syll, end_syll))
 
             nucleus = next_nucleus
@@ -241,6 +275,30 @@ class Syllabifier(object):
 
     # -----------------------------------------------------------------------
 
+    def _apply_phon_ids_rules(self, phonemes, end_syll, v1, v2):
+        """Apply the compiled phoneme-based rules between v1 and v2."""
+        nb = v2-v1
+        if nb > 1:
+            # specific rules are sequences of 5 consonants max
+            if nb == 5:
+                seq = ("V", )
+            elif nb < 5:
+                seq = ("ANY", )*(5-nb) + ("V", )
+            else:
+                seq = tuple()
+            seq += tuple(phonemes[v1+1:v2])
+
+            d = self.rules.get_phonemes_gap(seq)
+            if d != 0:
+                # check validity before assigning...
+                new_end = end_syll + d
+                if v2 >= new_end >= v1:
+                    end_syll = new_end
+
+        return end_syll
+
+    # -----------------------------------------------------------------------
+
     def _apply_phon_rules(self, phonemes, end_syll, v1, v2):
         """Apply the specific phoneme-based syllabification rules.
 
@@ -33,9 +33,8 @@
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
 """
-import sppas.src.calculus.stats.variability as variability
-from sppas.src.calculus.stats.linregress import tga_linear_regression
 from sppas.src.calculus.stats.descriptivesstats import sppasDescriptiveStatistics
+from sppas.src.calculus.stats.groupedstats import sppasGroupedStatistics
 
 # ----------------------------------------------------------------------------
 
@@ -66,6 +65,8 @@ class TimeGroupAnalysis(sppasDescriptiveStatistics):
     >>> print(slope['tg_1'])
     >>> print(slope['tg_2'])
 
+    All the time groups are estimated together by sppasGroupedStatistics.
+
     """
 
     def __init__(self, dict_items):
@@ -75,6 +76,69 @@ class TimeGroupAnalysis(sppasDescriptiveStatistics):
 
         """
         super(TimeGroupAnalysis, self).__init__(dict_items)
+        self.__stats = sppasGroupedStatistics.from_dict(dict_items)
+
+    # -----------------------------------------------------------------------
+    # Descriptive statistics of the time groups
+    # -----------------------------------------------------------------------
+
+    def len(self):
+        """Estimate the number of segments of each time group."""
+        return self.__stats.len()
+
+    # -----------------------------------------------------------------------
+
+    def total(self):
+        """Estimate the total duration of each time group."""
+        return self.__stats.total()
+
+    # -----------------------------------------------------------------------
+
+    def min(self):
+        """Estimate the minimum duration of each time group."""
+        return self.__stats.min()
+
+    # -----------------------------------------------------------------------
+
+    def max(self):
+        """Estimate the maximum duration of each time group."""
+        return self.__stats.max()
+
+    # -----------------------------------------------------------------------
+
+    def mean(self):
+        """Estimate the mean duration of each time group."""
+        return self.__stats.mean()
+
+    # -----------------------------------------------------------------------
+
+    def median(self):
+        """Estimate the median duration of each time group."""
+        return self.__stats.median()
+
+    # -----------------------------------------------------------------------
+
+    def variance(self):
+        """Estimate the variance of the durations of each time group."""
+        return self.__stats.variance()
+
+    # -----------------------------------------------------------------------
+
+    def stdev(self):
+        """Estimate the standard deviation of each time group."""
+        return self.__stats.stdev()
+
+    # -----------------------------------------------------------------------
+
+    def coefvariation(self):
+        """Estimate the coefficient of variation of each time group."""
+        return self.__stats.coefvariation()
+
+    # -----------------------------------------------------------------------
+
+    def zscore(self):
+        """Estimate the z-scores of the durations of each time group."""
+        return self.__stats.zscore()
 
     # -----------------------------------------------------------------------
     # Specific estimators for speech rythm analysis
@@ -86,8 +150,7 @@ class TimeGroupAnalysis(sppasDescriptiveStatistics):
         :returns: (dict) a dictionary of (key, nPVI) of float values
 
         """
-        return dict((key, variability.rPVI(values))
-                    for key, values in self._items.items())
+        return self.__stats.rPVI()
 
     # -----------------------------------------------------------------------
 
@@ -97,8 +160,7 @@ class TimeGroupAnalysis(sppasDescriptiveStatistics):
         :returns: (dict) a dictionary of (key, nPVI) of float values
 
         """
-        return dict((key, variability.nPVI(values))
-                    for key, values in self._items.items())
+        return self.__stats.nPVI()
 
     # -----------------------------------------------------------------------
 
@@ -112,12 +174,7 @@ class TimeGroupAnalysis(sppasDescriptiveStatistics):
         :returns: (dict) a dict of (key, (intercept,slope)) of float values
 
         """
-        lin_reg = list()
-        for key, values in self._items.items():
-            points = [(pos, dur) for pos, dur in enumerate(values)]
-            lin_reg.append((key, (tga_linear_regression(points))))
-
-        return dict(lin_reg)
+        return self.__stats.intercept_slope_original()
 
     # -----------------------------------------------------------------------
 
@@ -131,13 +188,4 @@ class TimeGroupAnalysis(sppasDescriptiveStatistics):
         :returns: (dict) a dict of (key, (intercept, slope)) of float values
 
         """
-        lin_reg = list()
-        for key, values in self._items.items():
-            points = list()
-            timestamp = 0.
-            for duration in values:
-                points.append((timestamp, duration))
-                timestamp += duration
-            lin_reg.append((key, (tga_linear_regression(points))))
-
-        return dict(lin_reg)
+        return self.__stats.intercept_slope()
@@ -58,6 +58,8 @@ Requires the following other packages:
 
 """
 
+import importlib
+
 from .autils import SppasFiles
 from .Activity import sppasActivity
 from .Align import sppasAlign
@@ -80,16 +82,35 @@ from .TGA import sppasTGA
 from .IVA import sppasIVA
 from .Overlaps import sppasOverActivity
 
-from .FaceDetection import sppasFaceDetection
-from .FaceSights import sppasFaceSights
-from .FaceSights import ImageFaceLandmark
-from .CuedSpeech import sppasCuedSpeech
-
 from .searchtier import sppasFindTier
 from .param import sppasParam
 from .manager import sppasAnnotationsManager
 
 # ---------------------------------------------------------------------------
+# Annotations of images and videos require opencv and numpy: they are
+# imported only when requested.
+# ---------------------------------------------------------------------------
+
+_VIDEO_ANNOTATIONS = {
+    "sppasFaceDetection": "FaceDetection",
+    "sppasFaceSights": "FaceSights",
+    "ImageFaceLandmark": "FaceSights",
+    "sppasCuedSpeech": "CuedSpeech",
+}
+
+
+def __getattr__(name):
+    """Import the package of an image or video annotation when requested."""
+    if name in _VIDEO_ANNOTATIONS:
+        module = importlib.import_module(
+            "." + _VIDEO_ANNOTATIONS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(
+        "module {:s} has no attribute {:s}".format(__name__, name))
+
+# ---------------------------------------------------------------------------
 
 
 __all__ = (
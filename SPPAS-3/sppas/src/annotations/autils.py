@@ -43,9 +43,7 @@ import logging
 
 from sppas.src.config import annots
 from sppas.src.anndata import sppasTrsRW
-from sppas.src.imgdata import image_extensions
 from sppas.src.audiodata.aio import extensions as audio_extensions
-from sppas.src.videodata import video_extensions
 
 # ---------------------------------------------------------------------------
 
@@ -118,10 +116,14 @@ class SppasFiles:
             all_ext_in = sppasTrsRW.extensions_in()
             return ["." + e for e in annot_ext if e in all_ext_in]
 
+        # imgdata and videodata are imported only if needed: they are
+        # long to load because of opencv.
         if filetype_format == "IMAGE":
+            from sppas.src.imgdata import image_extensions
             return image_extensions
 
         if filetype_format == "VIDEO":
+            from sppas.src.videodata import video_extensions
             return video_extensions
 
         if filetype_format == "AUDIO":
@@ -166,10 +168,14 @@ class SppasFiles:
             all_ext_out = sppasTrsRW.extensions_out()
             return ["." + e for e in annot_ext if e in all_ext_out]
 
+        # imgdata and videodata are imported only if needed: they are
+        # long to load because of opencv.
         if filetype_format == "IMAGE":
+            from sppas.src.imgdata import image_extensions
             return image_extensions
 
         if filetype_format == "VIDEO":
+            from sppas.src.videodata import video_extensions
             return video_extensions
 
         if filetype_format == "AUDIO":
@@ -45,17 +45,39 @@ from sppas.src.config import sg
 from sppas.src.config import annots
 from sppas.src.config import info
 
-import sppas.src.imgdata
 from sppas.src.anndata import sppasTrsRW
 import sppas.src.audiodata.aio
-import sppas.src.videodata
 
 # ----------------------------------------------------------------------------
 
-anndata_ext = ["." + e.lower() for e in sppasTrsRW.extensions_in()]
-videodata_ext = [e.lower() for e in sppas.src.videodata.video_extensions]
-imgdata_ext = [e.lower() for e in sppas.src.imgdata.image_extensions]
-audiodata_ext = [e.lower() for e in sppas.src.audiodata.aio.extensions]
+
+def _extensions(data_type):
+    """Return the list of supported extensions of a type of data.
+
+    Annotated files, images and videos extensions are estimated at the
+    first call: it requires to load all readers, opencv and numpy.
+
+    :param data_type: (str) One of "anndata", "imgdata", "videodata", "audiodata"
+    :returns: (list) Extensions in lower case, starting with a dot
+
+    """
+    if data_type not in _EXTENSIONS:
+        if data_type == "anndata":
+            ext = ["." + e for e in sppasTrsRW.extensions_in()]
+        elif data_type == "imgdata":
+            import sppas.src.imgdata
+            ext = sppas.src.imgdata.image_extensions
+        elif data_type == "videodata":
+            import sppas.src.videodata
+            ext = sppas.src.videodata.video_extensions
+        else:
+            ext = sppas.src.audiodata.aio.extensions
+        _EXTENSIONS[data_type] = [e.lower() for e in ext]
+
+    return _EXTENSIONS[data_type]
+
+
+_EXTENSIONS = dict()
 
 # ----------------------------------------------------------------------------
 
@@ -92,16 +114,16 @@ class sppasDiagnosis:
 
         ext = os.path.splitext(filename)[1]
 
-        if ext.lower() in audiodata_ext:
+        if ext.lower() in _extensions("audiodata"):
             return sppasDiagnosis.check_audio_file(filename)
 
-        if ext.lower() in anndata_ext:
+        if ext.lower() in _extensions("anndata"):
             return sppasDiagnosis.check_trs_file(filename)
 
-        if ext.lower() in imgdata_ext:
+        if ext.lower() in _extensions("imgdata"):
             return sppasDiagnosis.check_img_file(filename)
 
-        if ext.lower() in videodata_ext:
+        if ext.lower() in _extensions("videodata"):
             return sppasDiagnosis.check_video_file(filename)
 
         message = info(1006, "annotations") + (info(1020, "annotations")).format(extension=ext)
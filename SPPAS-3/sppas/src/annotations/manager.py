@@ -40,7 +40,7 @@
 
 import logging
 import traceback
-import sys
+import importlib
 import os
 from threading import Thread
 
@@ -49,41 +49,43 @@ from sppas.src.wkps import States
 from sppas.src.anndata import sppasTranscription, sppasTrsRW
 
 import sppas.src.audiodata.aio
-import sppas.src.anndata.aio
-from sppas.src.videodata import video_extensions
-
-# STANDALONE
-from sppas.src.annotations.Activity import sppasActivity
-from sppas.src.annotations.Align import sppasAlign
-from sppas.src.annotations.FillIPUs import sppasFillIPUs
-from sppas.src.annotations.Intsint import sppasIntsint
-from sppas.src.annotations.LexMetric import sppasLexMetric
-from sppas.src.annotations.Momel import sppasMomel
-from sppas.src.annotations.Phon import sppasPhon
-from sppas.src.annotations.RMS import sppasRMS
-from sppas.src.annotations.SearchIPUs import sppasSearchIPUs
-from sppas.src.annotations.SelfRepet import sppasSelfRepet
-from sppas.src.annotations.StopWords import sppasStopWords
-from sppas.src.annotations.Syll import sppasSyll
-from sppas.src.annotations.TextNorm import sppasTextNorm
-from sppas.src.annotations.TGA import sppasTGA
-from sppas.src.annotations.IVA import sppasIVA
-
-# INTERACTIONS
-from sppas.src.annotations.OtherRepet import sppasOtherRepet
-from sppas.src.annotations.ReOccurrences import sppasReOcc
-from sppas.src.annotations.Overlaps import sppasOverActivity
-
-# SPEAKER
-from sppas.src.annotations.SpkLexRep import sppasLexRep
-
-# Annotations on either an image or a video:
-from sppas.src.annotations.FaceDetection import sppasFaceDetection
-from sppas.src.annotations.FaceSights import sppasFaceSights
-
-# Annotations on a video:
-from sppas.src.annotations.FaceClustering import sppasFaceIdentifier
-from sppas.src.annotations.CuedSpeech import sppasCuedSpeech
+
+# ----------------------------------------------------------------------------
+# The annotations are imported only when they are instantiated: the ones on
+# images or videos require opencv and numpy, which are long to load.
+# key=name of the class, value=module it belongs to.
+# ----------------------------------------------------------------------------
+
+ANNOTATIONS_MODULES = {
+    # STANDALONE
+    "sppasActivity": "sppas.src.annotations.Activity",
+    "sppasAlign": "sppas.src.annotations.Align",
+    "sppasFillIPUs": "sppas.src.annotations.FillIPUs",
+    "sppasIntsint": "sppas.src.annotations.Intsint",
+    "sppasLexMetric": "sppas.src.annotations.LexMetric",
+    "sppasMomel": "sppas.src.annotations.Momel",
+    "sppasPhon": "sppas.src.annotations.Phon",
+    "sppasRMS": "sppas.src.annotations.RMS",
+    "sppasSearchIPUs": "sppas.src.annotations.SearchIPUs",
+    "sppasSelfRepet": "sppas.src.annotations.SelfRepet",
+    "sppasStopWords": "sppas.src.annotations.StopWords",
+    "sppasSyll": "sppas.src.annotations.Syll",
+    "sppasTextNorm": "sppas.src.annotations.TextNorm",
+    "sppasTGA": "sppas.src.annotations.TGA",
+    "sppasIVA": "sppas.src.annotations.IVA",
+    # INTERACTIONS
+    "sppasOtherRepet": "sppas.src.annotations.OtherRepet",
+    "sppasReOcc": "sppas.src.annotations.ReOccurrences",
+    "sppasOverActivity": "sppas.src.annotations.Overlaps",
+    # SPEAKER
+    "sppasLexRep": "sppas.src.annotations.SpkLexRep",
+    # Annotations on either an image or a video:
+    "sppasFaceDetection": "sppas.src.annotations.FaceDetection",
+    "sppasFaceSights": "sppas.src.annotations.FaceSights",
+    # Annotations on a video:
+    "sppasFaceIdentifier": "sppas.src.annotations.FaceClustering",
+    "sppasCuedSpeech": "sppas.src.annotations.CuedSpeech",
+}
 
 from .autils import SppasFiles
 from .infotier import sppasMetaInfoTier
@@ -214,7 +216,8 @@ class sppasAnnotationsManager(Thread):
         if class_name is None:
             raise KeyError('Unknown annotation key: {:s}'.format(annotation_key))
 
-        return getattr(sys.modules[__name__], class_name)
+        module = importlib.import_module(ANNOTATIONS_MODULES[class_name])
+        return getattr(module, class_name)
 
     # ------------------------------------------------------------------------
 
@@ -35,8 +35,10 @@
 """
 import unittest
 import os
+import shutil
 
 from sppas.src.config import paths
+from sppas.src.wkps.fileutils import sppasFileUtils
 
 from ..Align.aligners import sppasAligners
 from ..Align.aligners.basealigner import BaseAligner
@@ -236,6 +238,55 @@ class TestBaseAligner(unittest.TestCase):
         self.assertTrue(len(self._aligner.check_data()) > 20)  # error msg
         self.assertEqual("w_0 w_1 w_2", self._aligner._tokens)
 
+    def test_tiedlist(self):
+        self.assertIsNone(self._aligner.get_tiedlist())
+        self.assertEqual([], self._aligner.add_tiedlist(["a-b+c"]))
+
+        temp = sppasFileUtils().set_random()
+        os.mkdir(temp)
+        try:
+            tied_file = os.path.join(temp, "tiedlist")
+            with open(tied_file, "w") as fp:
+                fp.write("a\nb\nc\na-b+a\nb+c\nc-b+a a-b+a\n")
+            aligner = BaseAligner(temp)
+            self.assertEqual(tied_file, aligner.get_tiedlist_filename(
+                os.path.join(temp, "track")))
+
+            # Only the missing within-word triphones are tied
+            aligner.set_phones("a-b-a c-b-a|a-b-c b")
+            self.assertEqual(["a-b+c"], aligner.add_missing_triphones())
+            self.assertEqual("a-b+a", aligner.get_tiedlist().tied["a-b+c"])
+            self.assertEqual([], aligner.add_missing_triphones())
+
+            # The model is not modified
+            with open(tied_file, "r") as fp:
+                self.assertEqual(6, len(fp.readlines()))
+            filename = aligner.get_tiedlist_filename(
+                os.path.join(temp, "track"))
+            self.assertEqual(os.path.join(temp, "track.tiedlist"), filename)
+            with open(filename, "r") as fp:
+                self.assertEqual(7, len(fp.readlines()))
+
+            # The tiedlist is saved again only if it has changed...
+            self.assertEqual(filename, aligner.get_tiedlist_filename(
+                os.path.join(temp, "track2")))
+            self.assertFalse(os.path.exists(os.path.join(temp, "track2.tiedlist")))
+            self.assertEqual(["c-b+c"], aligner.add_tiedlist(["c-b+c"]))
+            filename = aligner.get_tiedlist_filename(
+                os.path.join(temp, "track3"))
+            self.assertEqual(os.path.join(temp, "track3.tiedlist"), filename)
+            with open(filename, "r") as fp:
+                self.assertEqual(8, len(fp.readlines()))
+
+            # ... or if the saved file was removed
+            os.remove(filename)
+            filename = aligner.get_tiedlist_filename(
+                os.path.join(temp, "track4"))
+            self.assertEqual(os.path.join(temp, "track4.tiedlist"), filename)
+            self.assertTrue(os.path.exists(filename))
+        finally:
+            shutil.rmtree(temp)
+
 # ---------------------------------------------------------------------------
 
 
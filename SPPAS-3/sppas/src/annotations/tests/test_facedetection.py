@@ -219,6 +219,31 @@ class TestFaceDetection(unittest.TestCase):
         w.write(img, coords, fn)
         self.assertEqual(3, len(fd))
 
+    # ------------------------------------------------------------------------
+
+    def test_detect_all(self):
+        fd = ImageFaceDetection()
+        fd.load_model(NETTS, NETCAFFE)
+        self.assertEqual(ImageFaceDetection.DEFAULT_BATCH_SIZE, fd.get_batch_size())
+        fd.set_batch_size(2)
+        self.assertEqual(2, fd.get_batch_size())
+        with self.assertRaises(ValueError):
+            fd.set_batch_size(0)
+
+        images = list()
+        for fn in ("montage.png", "Slovenia2016.jpg", "Slovenia2016.jpg",
+                   "Slovenia2016Sea.jpg", "montage.png", "montage.png"):
+            images.append(sppasImage(filename=os.path.join(DATA, fn)))
+
+        # The same faces are detected with or without batches
+        expected = list()
+        for img in images:
+            fd.detect(img)
+            expected.append([c.copy() for c in fd])
+        for i, img in enumerate(fd.detect_all(images)):
+            self.assertEqual(expected[i], [c.copy() for c in fd])
+        self.assertEqual(0, len(fd))
+
 # ---------------------------------------------------------------------------
 
 
@@ -34,15 +34,23 @@
 """
 
 import os
+import shutil
 import unittest
+import numpy
 
 from sppas.src.config import paths
+from sppas.src.wkps.fileutils import sppasFileUtils
 from sppas.src.imgdata import sppasImage
 from sppas.src.imgdata import sppasCoordsImageWriter
 from sppas.src.imgdata import sppasCoords
 
 from ..FaceDetection import ImageFaceDetection
 from ..FaceSights.sights import Sights
+from ..FaceSights.sights import sppasSightsImageWriter
+from ..FaceSights.sightsstore import sppasSightsVideoStore
+from ..FaceSights.videosights import sppasSightsVideoReader
+from ..FaceSights.videosights import sppasSightsVideoWriter
+from ..FaceSights.sightstracker import SightsTracker
 from ..FaceSights.imgfacemark import ImageFaceLandmark
 from ..FaceSights.videofacemark import VideoFaceLandmark
 
@@ -57,6 +65,8 @@ NET = os.path.join(paths.resources, "faces", "res10_300x300_ssd_iter_140000_fp16
 HAAR1 = os.path.join(paths.resources, "faces", "haarcascade_profileface.xml")
 HAAR2 = os.path.join(paths.resources, "faces", "haarcascade_frontalface_alt.xml")
 
+TEMP = sppasFileUtils().set_random()
+
 # ---------------------------------------------------------------------------
 
 
@@ -136,6 +146,162 @@ class TestSights(unittest.TestCase):
         self.assertEqual("anything", x[0])
         self.assertEqual((10, 20, None), s[0])
 
+    # ------------------------------------------------------------------------
+
+    def test_view(self):
+        store = sppasSightsVideoStore(nframes=1, nsights=5)
+        data = store.get_sights_array()[0, 0]
+        s = Sights(5, data=data)
+        s.set_sight(1, 10, 20, 0.5)
+        self.assertEqual([10., 20., 0.5], data[1].tolist())
+        self.assertEqual((10, 20, 0.5), s.copy().get_sight(1))
+
+        with self.assertRaises(ValueError):
+            Sights(4, data=data)
+
+# ---------------------------------------------------------------------------
+
+
+class TestSightsVideoStore(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(TEMP) is False:
+            os.mkdir(TEMP)
+
+        self.store = sppasSightsVideoStore(nframes=3, nsights=5)
+        s = Sights(5)
+        for i in range(5):
+            s.set_sight(i, 10 + i, 20 + i, 0.5)
+        self.store.set_frame(0, [sppasCoords(1, 2, 30, 40, 0.9)], [s])
+        self.store.set_frame(2, [sppasCoords(5, 6, 30, 40, 0.8),
+                                 sppasCoords(50, 60, 30, 40, 0.7)],
+                             [None, s], ["kid", "adult"])
+
+    def tearDown(self):
+        shutil.rmtree(TEMP)
+
+    # ------------------------------------------------------------------------
+
+    def test_get_set(self):
+        self.assertEqual(3, len(self.store))
+        self.assertEqual(2, self.store.get_nfaces())
+        self.assertEqual(0, self.store.get_nfaces(1))
+        self.assertEqual((3, 2, 5, 3), self.store.get_sights_array().shape)
+
+        self.assertEqual([], self.store.get_coordinates(1))
+        self.assertEqual(["1"], self.store.get_ids(0))
+        self.assertEqual(["kid", "adult"], self.store.get_ids(2))
+        coords = self.store.get_coordinates(2)
+        self.assertEqual(sppasCoords(50, 60, 30, 40), coords[1])
+        self.assertEqual(0.7, coords[1].get_confidence())
+
+        sights = self.store.get_sights(2)
+        self.assertIsNone(sights[0])
+        self.assertEqual((12, 22, 0.5), sights[1].get_sight(2))
+        # Sights are views over the store
+        sights[1].set_sight(2, 100, 200)
+        self.assertEqual((100, 200, None), self.store.get_sights(2)[1].get_sight(2))
+
+        with self.assertRaises(Exception):
+            self.store.get_sights(3)
+        with self.assertRaises(ValueError):
+            self.store.set_frame(1, [sppasCoords(1, 2, 30, 40)], [Sights(68)])
+
+    # ------------------------------------------------------------------------
+
+    def test_face_sights(self):
+        sights = self.store.get_face_sights(0, fill=False)
+        self.assertEqual((3, 5, 3), sights.shape)
+        self.assertEqual([0., 0.], sights[1, 0, :2].tolist())
+
+        # The frame 1 has no face and the face 0 of frame 2 has no sights
+        sights = self.store.get_face_sights(0, fill=True)
+        self.assertEqual([10., 20., 0.5], sights[1, 0].tolist())
+        self.assertEqual([10., 20., 0.5], sights[2, 0].tolist())
+
+    # ------------------------------------------------------------------------
+
+    def test_csv(self):
+        filename = os.path.join(TEMP, "sights.csv")
+        self.store.save_csv(filename, fps=25.)
+        with open(filename, "r") as fp:
+            lines = fp.readlines()
+        self.assertEqual(4, len(lines))
+        self.assertTrue(lines[1].startswith("2;0;0.040;none;0;"))
+        self.assertTrue(lines[3].startswith("3;adult;0.080;0.700000;1;50;60;30;40;1;2;0.500000;1;5;"))
+
+        reader = sppasSightsVideoReader(filename)
+        self.assertEqual(3, reader.get_nframes())
+        self.assertEqual([["1"], [], ["kid", "adult"]], reader.ids)
+        self.assertIsNone(reader.sights[2][0])
+        self.assertEqual(str(self.store.get_sights(0)[0]), str(reader.sights[0][0]))
+        self.assertEqual(self.store.get_coordinates(2), reader.coords[2])
+
+    # ------------------------------------------------------------------------
+
+    def test_binary(self):
+        filename = os.path.join(TEMP, "sights.npz")
+        self.store.save(filename)
+        store = sppasSightsVideoStore()
+        store.load(filename)
+        self.assertEqual(3, len(store))
+        self.assertEqual(5, store.get_nsights())
+        self.assertEqual(["kid", "adult"], store.get_ids(2))
+        self.assertEqual(str(self.store.get_sights(2)[1]), str(store.get_sights(2)[1]))
+        self.assertEqual(self.store.get_coordinates(0), store.get_coordinates(0))
+
+# ---------------------------------------------------------------------------
+
+
+class TestSightsTracker(unittest.TestCase):
+
+    def setUp(self):
+        # A smooth textured image, and the same one moved by (3, 2) pixels
+        x, y = numpy.meshgrid(numpy.arange(320), numpy.arange(240))
+        texture = 127 + 60 * numpy.sin(x / 7.) * numpy.cos(y / 5.) + 60 * numpy.sin((x + y) / 11.)
+        gray = texture.astype(numpy.uint8)
+        self.image = numpy.dstack([gray, gray, gray])
+        self.moved = numpy.roll(self.image, (2, 3), axis=(0, 1))
+
+        self.coords = sppasCoords(100, 80, 100, 100)
+        self.sights = Sights(5)
+        for i in range(5):
+            self.sights.set_sight(i, 120 + (i * 15), 100 + (i * 12), 0.5)
+
+    # ------------------------------------------------------------------------
+
+    def test_track(self):
+        tracker = SightsTracker()
+        self.assertIsNone(tracker.track(self.image))
+
+        tracker.set_reference(self.image, [self.coords], [self.sights])
+        coords, sights = tracker.track(self.moved)
+        self.assertEqual(sppasCoords(103, 82, 100, 100), coords[0])
+        for i in range(5):
+            x, y, s = sights[0].get_sight(i)
+            self.assertEqual((123 + (i * 15), 102 + (i * 12), 0.5), (x, y, s))
+
+        # the given coords must match the tracked sights
+        self.assertIsNotNone(tracker.track(self.moved, [sppasCoords(90, 90, 100, 100)]))
+        self.assertIsNone(tracker.track(self.moved, [sppasCoords(0, 0, 50, 50)]))
+        self.assertIsNone(tracker.track(self.moved, []))
+
+        # no face in the reference: the faces must be detected
+        tracker.set_reference(self.image, [], [])
+        self.assertIsNone(tracker.track(self.moved))
+        self.assertIsNone(tracker.track(self.moved, []))
+
+    # ------------------------------------------------------------------------
+
+    def test_scene_cut(self):
+        tracker = SightsTracker()
+        tracker.set_reference(self.image, [self.coords], [self.sights])
+        self.assertIsNone(tracker.track(255 - self.image))
+
+        # sights without values can't be tracked
+        tracker.set_reference(self.image, [self.coords], [None])
+        self.assertIsNone(tracker.track(self.moved))
+
 # ---------------------------------------------------------------------------
 
 
@@ -272,4 +438,35 @@ class TestVideoFaceLandmark(unittest.TestCase):
         flv = VideoFaceLandmark(fli, fld)
         results = flv.video_face_sights(TestVideoFaceLandmark.VIDEO)
 
+    # -----------------------------------------------------------------------
 
+    def test_workers(self):
+        if os.path.exists(TEMP) is False:
+            os.mkdir(TEMP)
+        fld = ImageFaceDetection()
+        fld.load_model(NET)
+        fli = ImageFaceLandmark()
+        fli.load_model(MODEL_LBF68, MODEL_DAT)
+        flv = VideoFaceLandmark(fli, fld)
+        flv.set_tracking(5)
+
+        # The sights estimated with several processes are the same as the
+        # ones of a single process, even with a tracking of the sights.
+        coords = flv.video_face_sights(TestVideoFaceLandmark.VIDEO)
+        flv.set_nb_workers(3)
+        self.assertEqual(coords, flv.video_face_sights(TestVideoFaceLandmark.VIDEO))
+
+        # Same sights and identifiers are written in the CSV files
+        results = list()
+        for nb in (1, 3):
+            flv.set_nb_workers(nb)
+            writer = sppasSightsVideoWriter(sppasSightsImageWriter())
+            writer.set_options(csv=True)
+            output = os.path.join(TEMP, "sights_{:d}".format(nb))
+            flv.video_face_sights(TestVideoFaceLandmark.VIDEO,
+                                  video_writer=writer, output=output)
+            writer.close()
+            with open(output + ".csv", "r") as fp:
+                results.append(fp.read())
+        self.assertEqual(results[0], results[1])
+        shutil.rmtree(TEMP)
@@ -43,8 +43,10 @@
 
 """
 import unittest
+import random
 
 from ..Intsint import Intsint, sppasIntsint
+from ..Intsint.intsint import numpy_import
 
 # ---------------------------------------------------------------------------
 
@@ -63,6 +65,26 @@ class TestIntsint(unittest.TestCase):
         with self.assertRaises(IOError):
             Intsint().annotate([(0.1, 240)])
 
+    @unittest.skipIf(numpy_import is False, "numpy is not installed")
+    def test_vectorized(self):
+        """The array-based optimisation gives the same coding."""
+        rand = random.Random(2)
+        for n in (2, 4, 10, 40):
+            t = 0.
+            anchors = list()
+            for i in range(n):
+                t += rand.choice([0.1, 0.2, 0.4, 0.8])
+                anchors.append((t, rand.uniform(80., 300.)))
+
+            results = list()
+            for vectorized in (False, True):
+                intsint = Intsint()
+                intsint.vectorized = vectorized
+                tones = intsint.annotate(anchors)
+                results.append((tones, intsint.best_mid, intsint.best_range,
+                                intsint.min_ss_error, intsint.best_estimate))
+            self.assertEqual(results[0], results[1])
+
     def test_sppasintsint(self):
         si = sppasIntsint()
         # to be continued...
@@ -0,0 +1,165 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+        ---------------------------------------------------------------------
+
+    src.annotations.tests.test_kidscrops.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+
+import os
+import glob
+import tempfile
+import unittest
+import numpy
+
+from sppas.src.config import sppasTypeError
+from sppas.src.config import NegativeValueError
+from sppas.src.imgdata import sppasImage
+
+from ..FaceClustering.kidscrops import sppasKidsCropsStore
+
+# ---------------------------------------------------------------------------
+
+
+def crops_files():
+    """Return the temporary files of the stores of this process."""
+    pattern = "sppas_crops_*_{:d}_*".format(os.getpid())
+    return glob.glob(os.path.join(tempfile.gettempdir(), pattern))
+
+# ---------------------------------------------------------------------------
+
+
+class TestKidsCropsStore(unittest.TestCase):
+
+    def setUp(self):
+        # 10 images of different sizes and contents
+        self.images = list()
+        for i in range(10):
+            img = numpy.random.randint(0, 255, (20 + i, 10 + 2*i, 3), dtype=numpy.uint8)
+            self.images.append(sppasImage(input_array=img))
+
+    # -----------------------------------------------------------------------
+
+    def tearDown(self):
+        # do not let the files of a failed test disturb the next ones
+        for filename in crops_files():
+            os.remove(filename)
+
+    # -----------------------------------------------------------------------
+
+    def test_init(self):
+        store = sppasKidsCropsStore()
+        self.assertEqual(0, len(store))
+        self.assertEqual(0, store.get_max_size())
+        self.assertIsNone(store.get(0, 0))
+        self.assertEqual(160, sppasKidsCropsStore(max_size=160).get_max_size())
+        with self.assertRaises(NegativeValueError):
+            sppasKidsCropsStore(max_size=-1)
+
+    # -----------------------------------------------------------------------
+
+    def test_add_get(self):
+        store = sppasKidsCropsStore()
+        with self.assertRaises(sppasTypeError):
+            store.add(0, 0, numpy.zeros((10, 10, 3), dtype=numpy.uint8))
+        self.assertEqual(0, len(store))
+
+        store.add(3, 1, self.images[0])
+        self.assertEqual(1, len(store))
+        self.assertTrue((3, 1) in store)
+        self.assertFalse((1, 3) in store)
+        img = store.get(3, 1)
+        self.assertIsInstance(img, sppasImage)
+        self.assertTrue(numpy.array_equal(self.images[0], img))
+        self.assertIsNone(store.get(1, 3))
+
+        # an image of a coord outside of the frame is empty
+        store.add(4, 0, sppasImage(input_array=numpy.zeros((0, 0, 3), dtype=numpy.uint8)))
+        self.assertEqual((0, 0, 3), store.get(4, 0).shape)
+
+        # the image of a coord is replaced
+        store.add(3, 1, self.images[1])
+        self.assertEqual(2, len(store))
+        self.assertTrue(numpy.array_equal(self.images[1], store.get(3, 1)))
+        store.close()
+
+    # -----------------------------------------------------------------------
+
+    def test_growth(self):
+        store = sppasKidsCropsStore()
+        self.assertEqual(0, len(crops_files()))
+
+        # the images are appended to the file while the others are read
+        for i, image in enumerate(self.images):
+            store.add(i, 0, image)
+            self.assertEqual(1, len(crops_files()))
+            self.assertEqual(i + 1, len(store))
+            for j in range(i + 1):
+                self.assertTrue(numpy.array_equal(self.images[j], store.get(j, 0)))
+
+        # all the images are in the temporary file
+        size = sum(numpy.asarray(image).size for image in self.images)
+        self.assertEqual(size, os.path.getsize(crops_files()[0]))
+        store.close()
+
+    # -----------------------------------------------------------------------
+
+    def test_downscale(self):
+        store = sppasKidsCropsStore(max_size=16)
+        big = numpy.full((40, 20, 3), 100, dtype=numpy.uint8)
+        store.add(0, 0, sppasImage(input_array=big))
+        store.add(1, 0, self.images[0][:10, :10])
+
+        # the big image is stored downscaled but got back at its size
+        self.assertTrue(numpy.array_equal(big, store.get(0, 0)))
+        self.assertTrue(numpy.array_equal(self.images[0][:10, :10], store.get(1, 0)))
+        self.assertEqual(16 * 8 * 3 + 10 * 10 * 3, os.path.getsize(crops_files()[0]))
+        store.close()
+
+    # -----------------------------------------------------------------------
+
+    def test_close(self):
+        store = sppasKidsCropsStore()
+        store.close()
+        for i, image in enumerate(self.images):
+            store.add(i, 0, image)
+        store.get(0, 0)
+        self.assertEqual(1, len(crops_files()))
+
+        # the temporary file is deleted and the images are forgotten
+        store.close()
+        self.assertEqual(0, len(crops_files()))
+        self.assertEqual(0, len(store))
+        self.assertIsNone(store.get(0, 0))
+
+        # the store can be used again
+        store.add(0, 0, self.images[2])
+        self.assertTrue(numpy.array_equal(self.images[2], store.get(0, 0)))
+        store.close()
+        self.assertEqual(0, len(crops_files()))
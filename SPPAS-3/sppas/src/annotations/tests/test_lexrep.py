@@ -234,6 +234,28 @@ class test_sppasLexRep(unittest.TestCase):
 
     # -----------------------------------------------------------------------
 
+    def test_index_windows(self):
+        dataspk1 = ["bonjour", "moi", "ca", "va", "bien", "#", "et", "toi"]
+        dataspk2 = ["oui", "toi", "#", "comment", "ca", "#", "va"]
+        lexvar = sppasLexRep()
+        lexvar.set_span(5)
+        winspk2 = lexvar.windowing(dataspk2)
+        index = sppasLexRep._index_windows(winspk2)
+        self.assertEqual([0, 1], index["toi"])
+        self.assertEqual([2, 3, 4, 5, 6], index["va"])
+        self.assertFalse("#" in index)
+
+        # only the windows with the first word are examined
+        winspk1 = lexvar.windowing(dataspk1)
+        self.assertEqual("ca", sppasLexRep._get_first_word(winspk1[2]))
+        self.assertEqual("et", sppasLexRep._get_first_word(winspk1[5]))
+        self.assertIsNone(sppasLexRep._get_first_word(DataSpeaker(["#"])))
+        sources = lexvar._detect_all_sources(winspk1, winspk2)
+        self.assertEqual([(2, 1), (7, 0)],
+                         [(s.get_start(), s.get_end()) for s in sources])
+
+    # -----------------------------------------------------------------------
+
     def test_sources_identifiers(self):
         content = ["bonjour", "moi", "ca", "va", "bien", "#", "et", "toi", "ca", "va", "#"]
         dataspk = DataSpeaker(content)
@@ -43,15 +43,34 @@
 
 import unittest
 import os.path
+import shutil
+import numpy
 
 from sppas.src.config import paths
+from sppas.src.wkps.fileutils import sppasFileUtils
+from sppas.src.anndata import sppasTier
+from sppas.src.anndata import sppasLocation
+from sppas.src.anndata import sppasInterval
+from sppas.src.anndata import sppasPoint
+from sppas.src.anndata import sppasLabel
+from sppas.src.anndata import sppasTag
+from sppas.src.imgdata import sppasImage
+from sppas.src.imgdata import sppasCoords
+from sppas.src.videodata import sppasVideoReader
+from sppas.src.videodata import sppasVideoWriter
+from ..FaceSights.sights import Sights
+from ..FaceSights.sights import sppasSightsImageWriter
+from ..FaceSights.videosights import sppasSightsVideoBuffer
+from ..FaceSights.videosights import sppasSightsVideoWriter
 from ..CuedSpeech.keyrules import KeyRules
 from ..CuedSpeech.lpckeys import CuedSpeechKeys
+from ..CuedSpeech.lpcvideo import CuedSpeechVideoTagger
 from ..CuedSpeech.sppascuedspeech import sppasCuedSpeech
 
 # ---------------------------------------------------------------------------
 
 FRA_KEYS = os.path.join(paths.resources, "lpc", "fra.txt")
+TEMP = sppasFileUtils().set_random()
 
 # ---------------------------------------------------------------------------
 
@@ -295,3 +314,80 @@ class TestRunCuedSpeech(unittest.TestCase):
         self.lpc.load_resources(FRA_KEYS)
 
 
+
+
+# ---------------------------------------------------------------------------
+
+
+class TestCuedSpeechVideoTagger(unittest.TestCase):
+
+    def setUp(self):
+        if os.path.exists(TEMP) is False:
+            os.mkdir(TEMP)
+        self.video = os.path.join(TEMP, "video.mp4")
+        self.sights = os.path.join(TEMP, "video-sights")
+
+        # A video with 250 images of a face moving on the images
+        writer = sppasVideoWriter()
+        writer.set_fps(25)
+        writer.open(self.video)
+        for i in range(250):
+            image = numpy.full((120, 160, 3), (i * 3) % 256, dtype=numpy.uint8)
+            writer.write(sppasImage(input_array=image))
+        writer.close()
+
+        video_buffer = sppasSightsVideoBuffer(self.video)
+        writer = sppasSightsVideoWriter(sppasSightsImageWriter())
+        writer.set_options(csv=True)
+        read_next = True
+        while read_next is True:
+            read_next = video_buffer.next()
+            first = video_buffer.get_buffer_range()[0]
+            for i in range(len(video_buffer)):
+                sights = Sights(68)
+                for k in range(68):
+                    sights.set_sight(k, 40 + (k * 7 + first + i) % 80, 20 + (k * 5) % 80, 0.9)
+                video_buffer.set_coordinates(i, [sppasCoords(40, 20, 80, 80)])
+                video_buffer.set_sight(i, 0, sights)
+            writer.write(video_buffer, self.sights)
+        video_buffer.close()
+        writer.close()
+
+        # The C-V keys during the video
+        self.keys = sppasTier("CV-keys")
+        for i in range(30):
+            begin = 0.5 + (i * 0.3)
+            location = sppasLocation(sppasInterval(sppasPoint(begin), sppasPoint(begin + 0.3)))
+            self.keys.create_annotation(location, [sppasLabel(sppasTag(str(i % 8 + 1))),
+                                                   sppasLabel(sppasTag(str(i % 5 + 1)))])
+
+    def tearDown(self):
+        shutil.rmtree(TEMP)
+
+    # -----------------------------------------------------------------------
+
+    def test_workers(self):
+        tagger = CuedSpeechVideoTagger()
+        with self.assertRaises(Exception):
+            tagger.set_nb_workers(0)
+
+        # The keys estimated with several processes are the same as the
+        # ones of a single process, and so are the tagged images.
+        frames = list()
+        for nb in (1, 2):
+            tagger.set_nb_workers(nb)
+            tagger.load(self.video, self.sights + ".csv")
+            output = os.path.join(TEMP, "video-lpc{:d}".format(nb))
+            new_files = tagger.tag(self.keys, output)
+            tagger.close()
+            self.assertEqual(1, len(new_files))
+
+            reader = sppasVideoReader()
+            reader.open(new_files[0])
+            frames.append(reader.read(0, reader.get_nframes()))
+            reader.close()
+
+        self.assertEqual(250, len(frames[0]))
+        self.assertEqual(len(frames[0]), len(frames[1]))
+        for image1, image2 in zip(frames[0], frames[1]):
+            self.assertTrue(numpy.array_equal(image1, image2))
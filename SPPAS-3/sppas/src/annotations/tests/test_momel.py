@@ -0,0 +1,119 @@
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.annotations.tests.test_momel.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :author:       Brigitte Bigi
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      develop@sppas.org
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2021  Brigitte Bigi
+    :summary:      Test Momel.
+
+"""
+import unittest
+import os.path
+
+from sppas.src.config import paths
+
+from ..Momel.momel import Momel, numpy_import
+from ..Momel import sppasMomel
+
+# ---------------------------------------------------------------------------
+
+sample = os.path.join(paths.samples, "samples-eng", "ENG_M15_ENG_T02.PitchTier")
+
+# ---------------------------------------------------------------------------
+
+
+class TestMomel(unittest.TestCase):
+    """Test of the class Momel."""
+
+    def setUp(self):
+        self.pitch = sppasMomel().fix_pitch(sample)
+
+    # -----------------------------------------------------------------------
+
+    def annotate(self, pitch, vectorized, block_size=4096):
+        """Return the anchors of Momel as tuples and the modified pitch."""
+        momel = Momel()
+        momel.set_option_vectorized(vectorized)
+        momel.BLOCK_SIZE = block_size
+        pitch = list(pitch)
+        anchors = momel.annotate(pitch)
+        return [(a.x, a.y, a.p) for a in anchors], pitch
+
+    # -----------------------------------------------------------------------
+
+    def test_annotate(self):
+        # the pitch of the first IPU
+        anchors, _ = self.annotate(self.pitch[:290], vectorized=False)
+        self.assertGreater(len(anchors), 5)
+        for x, y, p in anchors:
+            self.assertTrue(0 <= x < 290)
+            self.assertTrue(50 < y < 600)
+
+        with self.assertRaises(IOError):
+            Momel().annotate([])
+
+    # -----------------------------------------------------------------------
+
+    def test_input_extensions(self):
+        """A file with pitch values is preferred to the audio file."""
+        extensions = sppasMomel.get_input_extensions()
+        self.assertEqual(1, len(extensions))
+        self.assertTrue(".PitchTier" in extensions[0])
+        self.assertTrue(".wav" in extensions[0])
+        self.assertLess(extensions[0].index(".PitchTier"),
+                        extensions[0].index(".wav"))
+
+    # -----------------------------------------------------------------------
+
+    @unittest.skipIf(numpy_import is False, "numpy is not installed")
+    def test_vectorized(self):
+        """The array-based implementation gives the same anchors."""
+        for start, end in ((0, 290), (290, 800), (0, len(self.pitch))):
+            expected = self.annotate(self.pitch[start:end], vectorized=False)
+            self.assertEqual(expected,
+                             self.annotate(self.pitch[start:end], True))
+            self.assertEqual(expected,
+                             self.annotate(self.pitch[start:end], True, 100))
+
+        # glitches: successive values are eliminated
+        for vectorized in (False, True):
+            pitch = [100., 100., 120., 110., 100., 100., 130., 100.]
+            momel = Momel()
+            momel.set_option_vectorized(vectorized)
+            momel.set_pitch_array(pitch)
+            momel.elim_glitch()
+            self.assertEqual([100., 100., 0., 0., 100., 100., 0., 100.],
+                             pitch)
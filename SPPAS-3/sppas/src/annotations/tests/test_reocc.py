@@ -38,6 +38,7 @@ from sppas.src.anndata import sppasLabel
 from sppas.src.anndata import sppasTag
 from sppas.src.anndata import sppasLocation
 from sppas.src.anndata import sppasPoint
+from sppas.src.anndata import sppasInterval
 from sppas.src.anndata import sppasAnnotation
 from sppas.src.anndata import sppasTier
 
@@ -157,6 +158,9 @@ class TestReOccurences(unittest.TestCase):
         self.assertEqual(2, len(reocc))
         self.assertEqual(a1, reocc[0])
         self.assertEqual(a1, reocc[1])
+        # re-occurrences are in the given order, without duplicates
+        self.assertIs(a1bis, ReOccurences.eval(a1, [a1bis, a2, a1, a1bis])[0])
+        self.assertEqual(2, len(ReOccurences.eval(a1, [a1bis, a2, a1, a1bis])))
 
         # Annotations have several labels. Labels have only one tag.
 
@@ -210,6 +214,37 @@ class TestReOccurences(unittest.TestCase):
         self.assertEqual(1, len(reocc))
         self.assertEqual(a2, reocc[0])
 
+    # -----------------------------------------------------------------------
+
+    def test_find(self):
+        """Search for re-occurrences into indexed annotations."""
+        tier = sppasTier("spk2")
+        for i, content in enumerate(["le", "chat", "le", "chien", "x"]):
+            tier.create_annotation(
+                sppasLocation(sppasInterval(sppasPoint(i), sppasPoint(i+1))),
+                sppasLabel(sppasTag(content)))
+        tier[4].append_label(sppasLabel([sppasTag("le"), sppasTag("chat")]))
+
+        reocc = ReOccurences()
+        self.assertEqual([], reocc.window(sppasPoint(0.), 2))
+        reocc.set_annotations(tier)
+        self.assertEqual([0, 1], reocc.window(sppasPoint(0.), 2))
+        self.assertEqual([2, 3, 4], reocc.window(sppasPoint(2.), 5))
+        self.assertEqual([], reocc.window(sppasPoint(6.), 5))
+
+        le = sppasAnnotation(sppasLocation(sppasPoint(0)),
+                             sppasLabel(sppasTag("le")))
+        self.assertEqual([tier[0], tier[2], tier[4]], reocc.find(le))
+        self.assertEqual(reocc.find(le), ReOccurences.eval(le, tier))
+        self.assertEqual([tier[2]], reocc.find(le, [1, 2, 3]))
+        self.assertEqual([], reocc.find(le, []))
+        le_chat = sppasAnnotation(sppasLocation(sppasPoint(0)),
+                                  [sppasLabel(sppasTag("le")),
+                                   sppasLabel(sppasTag("chat"))])
+        self.assertEqual([tier[4]], reocc.find(le_chat))
+        unlabelled = sppasAnnotation(sppasLocation(sppasPoint(0)))
+        self.assertEqual([], reocc.find(unlabelled))
+
 # ---------------------------------------------------------------------------
 
 
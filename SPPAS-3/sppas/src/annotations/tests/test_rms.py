@@ -100,6 +100,31 @@ class TestIntervalsRMS(unittest.TestCase):
         self.assertEqual(1228, estimator.get_rms())
         self.assertEqual(953.83, round(estimator.get_fmean(), 3))
 
+    def test_estimate_intervals(self):
+        estimator = IntervalsRMS(self.channel)
+        self.assertEqual(list(), estimator.estimate_intervals([]))
+        duration = self.channel.get_duration()
+        intervals = [(0., duration), (0., 0.7), (1.4, 2.4), (2.4, 3.4),
+                     (0.003, 0.0131), (duration - 0.05, duration + 1.),
+                     (duration + 1., duration + 2.)]
+        results = estimator.estimate_intervals(intervals)
+        self.assertEqual(len(intervals), len(results))
+        self.assertEqual(696, results[0][0])
+        self.assertEqual(359.631, round(results[0][2], 3))
+        self.assertEqual(1228, results[3][0])
+        self.assertEqual(0, results[6][0])
+        self.assertEqual([], results[6][1])
+
+        # Same results than estimating intervals one by one
+        for (begin, end), result in zip(intervals, results):
+            estimator.estimate(begin, end)
+            self.assertEqual(estimator.get_rms(), result[0])
+            self.assertEqual(estimator.get_values(), result[1])
+            self.assertEqual(estimator.get_fmean(), result[2])
+
+        with self.assertRaises(Exception):
+            estimator.estimate_intervals([(0., 1.), (1., 1.005)])
+
     def test_sppasrms(self):
         rms = sppasRMS()
         rms.set_tiername("Tokens")
@@ -180,6 +180,24 @@ class TestDataSpeaker(unittest.TestCase):
         d = DataSpeaker(["tok1", "tok2", "tok1"])
         self.assertEqual(d.is_word_repeated(0, 1, d), 2)
         self.assertEqual(d.is_word_repeated(1, 2, d), -1)
+        d2 = DataSpeaker(["*", "tok2", "tok1", "#", "tok1"])
+        self.assertEqual(d.is_word_repeated(0, 0, d2), 2)
+        self.assertEqual(d.is_word_repeated(0, 3, d2), 4)
+        self.assertEqual(d.is_word_repeated(0, 5, d2), -1)
+        self.assertEqual(d.is_word_repeated(0, -1, d2), -1)
+        self.assertEqual(d2.is_word_repeated(0, 0, d), -1)
+
+    # -----------------------------------------------------------------------
+
+    def test_find_word(self):
+        d = DataSpeaker(["tok1", "*", "tok2", "tok1", "<tok2>"])
+        self.assertEqual(sorted(d.get_vocabulary()), ["tok1", "tok2"])
+        self.assertEqual(d.find_word("tok1"), 0)
+        self.assertEqual(d.find_word("tok1", 1), 3)
+        self.assertEqual(d.find_word("tok2", 3), 4)
+        self.assertEqual(d.find_word("tok2", 5), -1)
+        self.assertEqual(d.find_word("*"), -1)
+        self.assertEqual(d.find_word("toto"), -1)
 
 # ---------------------------------------------------------------------------
 
@@ -52,7 +52,9 @@ from sppas.src.anndata import sppasPoint
 from sppas.src.anndata import sppasLabel
 from sppas.src.anndata import sppasTag
 from sppas.src.anndata import sppasTrsRW
+from sppas.src.wkps.fileutils import sppasFileUtils
 
+from ..Syll.rules import SyllRules
 from ..Syll.syllabify import Syllabifier
 from ..Syll.sppassyll import sppasSyll
 
@@ -62,6 +64,103 @@ from ..Syll.sppassyll import sppasSyll
 POL_SYLL = os.path.join(paths.resources, "syll", "syllConfig-pol.txt")
 FRA_SYLL = os.path.join(paths.resources, "syll", "syllConfig-fra.txt")
 
+RULES = """PHONCLASS a V
+PHONCLASS i V
+PHONCLASS E W
+PHONCLASS j G
+PHONCLASS p P
+PHONCLASS t P
+PHONCLASS d P
+PHONCLASS g P
+PHONCLASS s F
+PHONCLASS z F
+PHONCLASS Z F
+PHONCLASS l L
+PHONCLASS m N
+GENRULE VV 0
+GENRULE VXV 0
+GENRULE VXXV 1
+GENRULE VXXXV 1
+EXCRULE VPLV 0
+EXCRULE VPGV 0
+OTHRULE ANY ANY V d g -1
+OTHRULE ANY ANY V z Z 1
+OTHRULE ANY ANY ANY V t 1
+OTHRULE ANY V s t ANY -1
+"""
+
+# -------------------------------------------------------------------------
+
+
+class TestSyllRules(unittest.TestCase):
+    """Compiled rules of the syllabification."""
+
+    def setUp(self):
+        self.filename = sppasFileUtils().set_random() + ".txt"
+        with open(self.filename, "w") as fp:
+            fp.write(RULES)
+        self.rules = SyllRules(self.filename)
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    # -----------------------------------------------------------------------
+
+    def test_class_ids(self):
+        self.assertEqual("#", self.rules.get_class_name(0))
+        self.assertEqual([0, 0], self.rules.get_class_ids(["#", "UNK"]))
+        ids = self.rules.get_class_ids(["a", "E", "p", "l", "j"])
+        self.assertEqual(["V", "W", "P", "L", "G"],
+                         [self.rules.get_class_name(i) for i in ids])
+        self.assertEqual(2, len(self.rules.get_vowel_ids()))
+        self.assertTrue(ids[0] in self.rules.get_vowel_ids())
+        self.assertTrue(ids[1] in self.rules.get_vowel_ids())
+
+    # -----------------------------------------------------------------------
+
+    def test_class_ids_boundary(self):
+        for classes in ("VV", "VPV", "VPLV", "VPGV", "VPPV", "VFFFV",
+                        "VPPPPV"):
+            ids = [self.rules.get_class_ids([p])[0] for p in
+                   ["a" if c == "V" else {"P": "p", "L": "l", "G": "j",
+                                          "F": "s"}[c] for c in classes]]
+            self.assertEqual(self.rules.get_class_rules_boundary(classes),
+                             self.rules.get_class_ids_boundary(tuple(ids)))
+
+    # -----------------------------------------------------------------------
+
+    def test_phonemes_gap(self):
+        for phonemes in ("ANY ANY V d g", "ANY ANY V z Z", "ANY ANY V g d",
+                         "ANY ANY ANY V t", "ANY V s t p", "ANY V s p t",
+                         "V s t p d", "s t p d z z"):
+            self.assertEqual(self.rules.get_gap(phonemes),
+                             self.rules.get_phonemes_gap(phonemes.split()))
+
+        # the rules are compiled when they are loaded
+        self.rules.gap["ANY ANY V d g"] = 2
+        self.assertEqual(-1, self.rules.get_phonemes_gap(
+            ("ANY", "ANY", "V", "d", "g")))
+        self.rules.compile()
+        self.assertEqual(2, self.rules.get_phonemes_gap(
+            ("ANY", "ANY", "V", "d", "g")))
+
+    # -----------------------------------------------------------------------
+
+    def test_annotate(self):
+        syll = Syllabifier(self.filename)
+        self.assertEqual([], syll.annotate([]))
+        self.assertEqual([], syll.annotate(["#", "p", "UNK"]))
+        self.assertEqual([(1, 1)], syll.annotate(["UNK", "a", "#"]))
+        self.assertEqual([(0, 0), (1, 3)], syll.annotate(["a", "p", "l", "a"]))
+        self.assertEqual([(0, 1), (2, 3)], syll.annotate(["a", "p", "t", "a"]))
+        self.assertEqual([(0, 0), (1, 3)], syll.annotate(["a", "d", "g", "a"]))
+        self.assertEqual([(0, 2), (3, 3)], syll.annotate(["a", "z", "Z", "a"]))
+        self.assertEqual([(0, 1), (3, 5)],
+                         syll.annotate(["a", "p", "#", "t", "a", "m"]))
+        self.assertEqual([[(0, 0), (1, 2)], [], [(0, 0), (1, 1)]],
+                         syll.annotate_batch([["a", "p", "a"], ["#"],
+                                              ["a", "E"]]))
+
 # -------------------------------------------------------------------------
 
 
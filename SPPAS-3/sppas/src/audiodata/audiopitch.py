@@ -32,26 +32,69 @@
     src.audiodata.audiopitch.py
     ~~~~~~~~~~~~~~~~~~~~~~~~~~~
 
-    TO BE IMPLEMENTED.
+    Estimate the fundamental frequency (F0) of a channel with YIN:
+
+        A. de Cheveigne, H. Kawahara (2002).
+        YIN, a fundamental frequency estimator for speech and music.
+        Journal of the Acoustical Society of America, 111(4), pp. 1917-1930.
+
+    Requires numpy, which is installed with the "video" feature.
 
 """
+import sppas.src.audiodata.aio
+from sppas.src.config import sppasPackageFeatureError
+
+from .audiodataexc import SampleWidthError
+
+# ---------------------------------------------------------------------------
 
 
 class AudioPitch(object):
-    """
+    """A pitch estimator of an audio channel.
+
     :author:       Nicolas Chazeau, Brigitte Bigi
     :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
     :contact:      develop@sppas.org
     :license:      GPL, v3
-    :copyright:    Copyright (C) 2011-2017  Brigitte Bigi
-    :summary:      A pitch audio utility class. NOT IMPLEMENTED!!!!
+    :copyright:    Copyright (C) 2011-2021  Brigitte Bigi
+    :summary:      A pitch audio utility class.
+
+    A pitch value is estimated every delta seconds: the i-th value is the
+    one of the frame centered at time i*delta. Unvoiced frames have a 0.
+    pitch value. This is the list sppasMomel is expecting.
+
+    All the frames of a chunk of the channel are estimated at once: the
+    difference function of YIN is computed from the auto-correlation of
+    the frames with FFTs.
+
+    :Example:
+
+        >>> pitch = AudioPitch(delta=0.01)
+        >>> values = pitch.eval_pitch("sample.wav")
 
     """
-    def __init__(self, delta=0.01):
-        """Create a new AudioPitch instance."""
 
+    def __init__(self, delta=0.01, fmin=50., fmax=600., threshold=0.3,
+                 silence=0.2):
+        """Create a new AudioPitch instance.
+
+        :param delta: (float) Time step between two pitch values, in seconds
+        :param fmin: (float) Minimum F0 value to search for, in Hz
+        :param fmax: (float) Maximum F0 value to search for, in Hz
+        :param threshold: (float) Maximum aperiodicity of a voiced frame
+        :param silence: (float) Frames with a rms lower than this ratio of
+        the rms of the channel are unvoiced
+
+        """
         self.pitch = []
-        self.delta = delta
+        self.delta = float(delta)
+        self.fmin = float(fmin)
+        self.fmax = float(fmax)
+        self.threshold = float(threshold)
+        self.silence = float(silence)
+        if self.delta <= 0. or self.fmin <= 0. or self.fmax <= self.fmin:
+            raise ValueError("Invalid pitch estimation parameters: delta={}, "
+                             "fmin={}, fmax={}".format(delta, fmin, fmax))
 
     # ------------------------------------------------------------------
 
@@ -62,8 +105,8 @@ class AudioPitch(object):
         :returns: float
 
         """
-        idx = int(time/self.delta) + 1
-        if len(self.pitch) < idx:
+        idx = int(round(time / self.delta))
+        if 0 <= idx < len(self.pitch):
             return self.pitch[idx]
         else:
             raise ValueError('%d not in range' % idx)
@@ -85,10 +128,178 @@ class AudioPitch(object):
     # ------------------------------------------------------------------
 
     def eval_pitch(self, filename):
-        """WILL evaluate pitch values...
+        """Evaluate the pitch values of the first channel of an audio file.
+
+        :param filename: (str) Name of an audio file
+        :returns: (list of float) pitch values, 0. if unvoiced
 
         """
-        raise NotImplementedError
+        audio = sppas.src.audiodata.aio.open(filename)
+        idx = audio.extract_channel(0)
+        channel = audio.get_channel(idx)
+        audio.close()
+
+        return self.eval_channel_pitch(channel)
+
+    # ------------------------------------------------------------------
+
+    def eval_channel_pitch(self, channel, chunk_duration=10.):
+        """Evaluate the pitch values of a channel.
+
+        :param channel: (sppasChannel) The channel to work on
+        :param chunk_duration: (float) Duration of the chunks, in seconds
+        :returns: (list of float) pitch values, 0. if unvoiced
+
+        """
+        self.pitch = list()
+        for values in self.iter_pitch(channel, chunk_duration):
+            self.pitch.extend(values)
+
+        return self.pitch
+
+    # ------------------------------------------------------------------
+
+    def iter_pitch(self, channel, chunk_duration=10.):
+        """Estimate the pitch values of a channel, chunk by chunk.
+
+        Only one chunk of the channel is converted into samples at a time,
+        so that long files can be processed in a bounded memory.
+
+        :param channel: (sppasChannel) The channel to work on
+        :param chunk_duration: (float) Duration of the chunks, in seconds
+        :returns: a generator of lists of pitch values
+
+        """
+        try:
+            import numpy
+        except ImportError:
+            raise sppasPackageFeatureError("numpy", "video")
+
+        framerate = channel.get_framerate()
+        sampwidth = channel.get_sampwidth()
+        frames = channel.get_frames()
+        nsamples = len(frames) // sampwidth
+
+        hop = int(round(self.delta * framerate))
+        tau_max = int(framerate / self.fmin)
+        # The integration window of a frame is centered on its time
+        before = tau_max // 2
+        frame_len = 2 * tau_max
+        nb_values = nsamples // hop + 1 if nsamples > 0 else 0
+        min_rms = self.silence * channel.rms()
+        chunk_values = max(1, int(chunk_duration / self.delta))
+
+        for first in range(0, nb_values, chunk_values):
+            last = min(nb_values, first + chunk_values)
+            # Samples of the frames centered at first*hop ... (last-1)*hop
+            start = first * hop - before
+            end = (last - 1) * hop - before + frame_len
+            samples = AudioPitch.__samples(
+                numpy, frames, sampwidth,
+                max(0, start), min(nsamples, end))
+            samples = numpy.pad(samples, (max(0, -start), max(0, end - nsamples)))
+
+            f0 = self.__yin(numpy, samples, framerate, hop, last - first, min_rms)
+            yield [round(float(v), 6) for v in f0]
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __samples(numpy, frames, sampwidth, begin, end):
+        """Return the samples between begin and end, as float values."""
+        data = frames[begin * sampwidth:end * sampwidth]
+        if sampwidth == 1:
+            return numpy.frombuffer(data, dtype=numpy.uint8).astype(numpy.float64)
+        if sampwidth == 2:
+            return numpy.frombuffer(data, dtype="<i2").astype(numpy.float64)
+        if sampwidth == 4:
+            return numpy.frombuffer(data, dtype="<i4").astype(numpy.float64)
+        if sampwidth == 3:
+            b = numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, 3)
+            values = b[:, 0].astype(numpy.int32) | \
+                (b[:, 1].astype(numpy.int32) << 8) | \
+                (b[:, 2].astype(numpy.int8).astype(numpy.int32) << 16)
+            return values.astype(numpy.float64)
+
+        raise SampleWidthError(sampwidth)
+
+    # -----------------------------------------------------------------------
+
+    def __yin(self, numpy, samples, framerate, hop, nb_frames, min_rms=0.):
+        """Return the F0 values of the frames of the samples.
+
+        The i-th frame starts at sample i*hop and is made of 2*tau_max
+        samples: the integration window is the first half of the frame and
+        the lags are up to tau_max.
+
+        """
+        tau_min = max(2, int(framerate / self.fmax))
+        tau_max = int(framerate / self.fmin)
+        w = tau_max
+        frame_len = 2 * tau_max
+        samples = samples - samples.mean() if len(samples) > 0 else samples
+
+        # all the frames, without copying the samples
+        frames = numpy.lib.stride_tricks.as_strided(
+            samples,
+            shape=(nb_frames, frame_len),
+            strides=(samples.strides[0] * hop, samples.strides[0]),
+            writeable=False)
+
+        # Difference function: d(tau) = e(0) + e(tau) - 2 r(tau), with
+        # r the cross-correlation of the window and the frame, and e the
+        # energy of the window starting at tau.
+        size = 1
+        while size < frame_len:
+            size *= 2
+        fft_frames = numpy.fft.rfft(frames, size, axis=1)
+        fft_window = numpy.fft.rfft(frames[:, :w], size, axis=1)
+        r = numpy.fft.irfft(numpy.conj(fft_window) * fft_frames, size,
+                            axis=1)[:, :tau_max + 1]
+        cum = numpy.concatenate(
+            (numpy.zeros((nb_frames, 1)), numpy.cumsum(frames ** 2, axis=1)),
+            axis=1)
+        energy = cum[:, w:w + tau_max + 1] - cum[:, :tau_max + 1]
+        diff = energy[:, :1] + energy - 2. * r
+        diff[:, 0] = 0.
+        numpy.maximum(diff, 0., out=diff)
+
+        # Cumulative mean normalized difference function
+        cmnd = numpy.ones_like(diff)
+        cum_diff = numpy.cumsum(diff[:, 1:], axis=1)
+        taus = numpy.arange(1, tau_max + 1)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            cmnd[:, 1:] = numpy.where(cum_diff > 0., diff[:, 1:] * taus / cum_diff, 1.)
+
+        # Absolute threshold: the first tau below the threshold, then
+        # the next local minimum.
+        below = cmnd[:, tau_min:tau_max] < self.threshold
+        voiced = below.any(axis=1)
+        tau = numpy.argmax(below, axis=1) + tau_min
+        rows = numpy.arange(nb_frames)
+        while True:
+            nxt = numpy.minimum(tau + 1, tau_max)
+            move = voiced & (cmnd[rows, nxt] < cmnd[rows, tau])
+            if bool(move.any()) is False:
+                break
+            tau = numpy.where(move, nxt, tau)
+
+        # Parabolic interpolation of the minimum
+        left = cmnd[rows, numpy.maximum(tau - 1, 1)]
+        center = cmnd[rows, tau]
+        right = cmnd[rows, numpy.minimum(tau + 1, tau_max)]
+        denominator = left + right - 2. * center
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            shift = numpy.where(numpy.abs(denominator) > 1e-12,
+                                0.5 * (left - right) / denominator, 0.)
+        shift = numpy.clip(shift, -1., 1.)
+
+        f0 = framerate / (tau + shift)
+        voiced &= (f0 >= self.fmin) & (f0 <= self.fmax)
+        voiced &= numpy.sqrt(energy[:, 0] / w) >= min_rms
+        return numpy.where(voiced, f0, 0.)
 
     # -----------------------------------------------------------------------
     # Overloads
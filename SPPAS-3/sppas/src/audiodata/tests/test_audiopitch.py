@@ -0,0 +1,115 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.audiodata.tests.test_audiopitch.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :contact:      develop@sppas.org
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2021  Brigitte Bigi
+    :summary:      Test the pitch estimator.
+
+"""
+import unittest
+import os.path
+import math
+import struct
+
+from sppas.src.config import paths
+from sppas.src.anndata import sppasTrsRW
+
+from ..channel import sppasChannel
+from ..audiopitch import AudioPitch
+
+# ---------------------------------------------------------------------------
+
+sample = os.path.join(paths.samples, "samples-eng", "ENG_M15_ENG_T02.wav")
+sample_praat = os.path.join(paths.samples, "samples-eng", "ENG_M15_ENG_T02.PitchTier")
+
+# ---------------------------------------------------------------------------
+
+
+def sine_channel(frequencies, framerate=16000, duration=0.5):
+    """Return a channel with a sine of each frequency, or silence if 0."""
+    samples = list()
+    for f in frequencies:
+        for i in range(int(duration * framerate)):
+            samples.append(int(8000. * math.sin(2. * math.pi * f * i / framerate)))
+    frames = struct.pack("<%dh" % len(samples), *samples)
+    return sppasChannel(framerate, 2, frames)
+
+# ---------------------------------------------------------------------------
+
+
+class TestAudioPitch(unittest.TestCase):
+
+    def test_init(self):
+        pitch = AudioPitch()
+        self.assertEqual(0.01, pitch.get_pitch_delta())
+        self.assertEqual(0, len(pitch))
+        with self.assertRaises(ValueError):
+            AudioPitch(fmin=300., fmax=100.)
+        with self.assertRaises(ValueError):
+            pitch.get_pitch(1.)
+
+    def test_sine(self):
+        channel = sine_channel([100., 0., 220.], duration=0.5)
+        pitch = AudioPitch(delta=0.01)
+        values = pitch.eval_channel_pitch(channel)
+        self.assertEqual(151, len(values))
+        self.assertEqual(values, pitch.get_pitch_list())
+        for i in range(5, 45):
+            self.assertAlmostEqual(100., values[i], delta=1.)
+        for i in range(55, 95):
+            self.assertEqual(0., values[i])
+        for i in range(105, 145):
+            self.assertAlmostEqual(220., values[i], delta=2.)
+        self.assertAlmostEqual(220., pitch.get_pitch(1.2), delta=2.)
+
+        # the same values are estimated chunk by chunk
+        chunks = list(pitch.iter_pitch(channel, chunk_duration=0.33))
+        self.assertEqual(5, len(chunks))
+        self.assertEqual(values, [v for chunk in chunks for v in chunk])
+
+        # empty channel
+        self.assertEqual([], pitch.eval_channel_pitch(sppasChannel()))
+
+    def test_sample(self):
+        """Compare to the pitch values estimated by Praat."""
+        values = AudioPitch().eval_pitch(sample)
+        trs = sppasTrsRW(sample_praat).read()
+        good = 0
+        for ann in trs[0]:
+            idx = int(round(ann.get_lowest_localization().get_midpoint() / 0.01))
+            expected = ann.get_best_tag().get_typed_content()
+            if abs(values[idx] - expected) < 0.05 * expected:
+                good += 1
+        self.assertGreater(good, 0.75 * len(trs[0]))
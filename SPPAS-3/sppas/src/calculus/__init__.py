@@ -42,11 +42,13 @@ calculus: proposes some math on data.
 This package includes mathematical functions to estimate descriptive
 statistics, for the scoring or in the domain of the information theory.
 
-No required other package.
+No required other package. If numpy is installed, it is used to estimate
+the statistics of groups of data values on arrays.
 
 """
 
 from .stats.descriptivesstats import sppasDescriptiveStatistics
+from .stats.groupedstats import sppasGroupedStatistics
 from .scoring.kappa import sppasKappa
 from .scoring.ubpa import ubpa
 
@@ -65,6 +67,7 @@ from .infotheory import symbols_to_items
 
 __all__ = (
     "sppasDescriptiveStatistics",
+    "sppasGroupedStatistics",
     "sppasKappa",
     "squared_euclidian",
     "euclidian",
@@ -0,0 +1,569 @@
+# -*- coding: UTF-8 -*-
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.calculus.stats.groupedstats.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+
+import math
+
+from .central import fsum
+from .central import fmin
+from .central import fmax
+from .central import fmean
+from .central import fmedian
+from .variability import lvariance
+from .variability import lstdev
+from .variability import lzs
+from .variability import rPVI
+from .variability import nPVI
+from .moment import lvariation
+from .linregress import tga_linear_regression
+
+try:
+    import numpy
+    numpy_import = True
+except ImportError:
+    numpy_import = False
+
+# ----------------------------------------------------------------------------
+
+
+class sppasGroupedStatistics(object):
+    """Descriptive statistics estimated on groups of data values.
+
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2021  Brigitte Bigi
+    :author:       Brigitte Bigi
+    :contact:      develop@sppas.org
+
+    Data values are given in a single array, with the array of the group
+    identifier of each value. The identifiers are the indexes of the groups,
+    in the range [0, nb_groups). The values of a group are in the order
+    they appear in the array.
+
+    If numpy is available, the statistics of all the groups are estimated
+    together on arrays: the sums are made with math.fsum() and the
+    accumulations in the same order than the functions of this package,
+    so that results are the same than the ones of sppasDescriptiveStatistics.
+    Otherwise, the functions of this package are applied on each group.
+
+    >>> groups = [0, 0, 1, 1, 1]
+    >>> durations = [0.1, 0.2, 0.3, 0.1, 0.3]
+    >>> s = sppasGroupedStatistics(groups, durations, names=['tg1', 'tg2'])
+    >>> s.total()
+    >>> {'tg1': 0.3, 'tg2': 0.7}
+
+    """
+
+    def __init__(self, groups, values, names=None):
+        """Create a sppasGroupedStatistics instance.
+
+        :param groups: (list or array) Group identifier of each value
+        :param values: (list or array) Data values
+        :param names: (list) Name of each group. Default is the identifiers.
+
+        """
+        if len(groups) != len(values):
+            raise ValueError("Expected as many group identifiers than "
+                             "values. Got {:d} and {:d}."
+                             "".format(len(groups), len(values)))
+        groups = [int(g) for g in groups]
+        if len(groups) > 0 and min(groups) < 0:
+            raise ValueError("Invalid negative group identifier.")
+
+        nb_groups = 0
+        if len(groups) > 0:
+            nb_groups = max(groups) + 1
+        if names is None:
+            names = list(range(nb_groups))
+        elif len(names) < nb_groups:
+            raise ValueError("Expected at least {:d} group names. Got {:d}."
+                             "".format(nb_groups, len(names)))
+        self.__names = list(names)
+        self.__groups = groups
+        self.__data = values
+
+        # The values of each group are created only if needed
+        self.__lists = None
+        self.__vectorized = numpy_import
+        if numpy_import is True:
+            self.__init_arrays()
+
+    # -----------------------------------------------------------------------
+
+    @classmethod
+    def from_dict(cls, dict_items):
+        """Create a sppasGroupedStatistics from a dictionary.
+
+        :param dict_items: (dict) key=name of the group, value=list of values
+        :returns: (sppasGroupedStatistics)
+
+        """
+        groups = list()
+        values = list()
+        for i, key in enumerate(dict_items):
+            groups.extend([i] * len(dict_items[key]))
+            values.extend(dict_items[key])
+
+        return cls(groups, values, names=list(dict_items.keys()))
+
+    # -----------------------------------------------------------------------
+
+    def set_vectorized(self, value=True):
+        """Enable or disable the estimation on arrays.
+
+        :param value: (bool)
+        :raises: ImportError: numpy is not installed
+
+        """
+        value = bool(value)
+        if value is True and numpy_import is False:
+            raise ImportError("numpy is required to vectorize the "
+                              "estimation of the statistics.")
+        if value is True and self.__vectorized is False:
+            self.__init_arrays()
+        self.__vectorized = value
+
+    # -----------------------------------------------------------------------
+
+    def get_names(self):
+        """Return the list of group names."""
+        return list(self.__names)
+
+    # -----------------------------------------------------------------------
+    # Estimators
+    # -----------------------------------------------------------------------
+
+    def len(self):
+        """Estimate the number of occurrences of data values.
+
+        :returns: (dict) a dictionary of tuples (key, len)
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(len)
+        return self.__to_dict(self.__counts)
+
+    # -----------------------------------------------------------------------
+
+    def total(self):
+        """Estimate the sum of data values.
+
+        :returns: (dict) a dictionary of tuples (key, total) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(fsum)
+        return self.__to_dict(self.__totals)
+
+    # -----------------------------------------------------------------------
+
+    def min(self):
+        """Estimate the minimum of data values.
+
+        :returns: (dict) a dictionary of (key, min) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(fmin)
+        return self.__reduce(numpy.minimum)
+
+    # -----------------------------------------------------------------------
+
+    def max(self):
+        """Estimate the maximum of data values.
+
+        :returns: (dict) a dictionary of (key, max) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(fmax)
+        return self.__reduce(numpy.maximum)
+
+    # -----------------------------------------------------------------------
+
+    def mean(self):
+        """Estimate the arithmetic mean of data values.
+
+        :returns: (dict) a dictionary of (key, mean) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(fmean)
+        return self.__to_dict(self.__means)
+
+    # -----------------------------------------------------------------------
+
+    def median(self):
+        """Estimate the 'middle' score of the data values.
+
+        :returns: (dict) a dictionary of (key, median) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(fmedian)
+
+        result = numpy.zeros(len(self.__names))
+        middle = self.__counts // 2
+
+        # odd number of values: the middle one
+        odd = (self.__counts % 2) == 1
+        result[odd] = self.__values[self.__starts[odd] + middle[odd]]
+
+        # even number of values: the mean of the 2 middle sorted ones
+        even = (self.__counts % 2 == 0) & (self.__counts > 0)
+        if even.any():
+            order = numpy.lexsort((self.__values, self.__ids))
+            ordered = self.__values[order]
+            idx = self.__starts[even] + middle[even]
+            result[even] = (ordered[idx] + ordered[idx-1]) / 2.
+
+        return self.__to_dict(result)
+
+    # -----------------------------------------------------------------------
+
+    def variance(self):
+        """Estimate the unbiased sample variance of data values.
+
+        :returns: (dict) a dictionary of (key, variance) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(lvariance)
+        return self.__to_dict(self.__variances())
+
+    # -----------------------------------------------------------------------
+
+    def stdev(self):
+        """Estimate the standard deviation of data values.
+
+        :returns: (dict) a dictionary of (key, stddev) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(lstdev)
+        return self.__to_dict(numpy.sqrt(self.__variances()))
+
+    # -----------------------------------------------------------------------
+
+    def coefvariation(self):
+        """Estimate the coefficient of variation of data values.
+
+        :returns: (dict) a dictionary of (key, coefvariation) of float
+        values (given as a percentage).
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(lvariation)
+
+        means = self.__means
+        stdev = numpy.sqrt(self.__variances())
+        result = numpy.zeros(len(self.__names))
+        valid = means != 0.
+        result[valid] = stdev[valid] / means[valid] * 100.
+        return self.__to_dict(result)
+
+    # -----------------------------------------------------------------------
+
+    def zscore(self):
+        """Estimate the z-scores of data values.
+
+        :returns: (dict) a dictionary of (key, [z-scores]) of float values
+        :raises: ZeroDivisionError if the values of a group are all equal
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(lzs)
+
+        # a group with less than 2 values has z-scores 0.
+        stdev = numpy.sqrt(self.__variances())
+        valid = self.__counts > 1
+        if (stdev[valid] == 0.).any():
+            raise ZeroDivisionError("float division by zero")
+        stdev[~valid] = 1.
+        scores = (self.__values - self.__means[self.__ids]) / \
+            stdev[self.__ids]
+        scores[~valid[self.__ids]] = 0.
+        scores = scores.tolist()
+        return self.__to_dict(
+            [scores[s:s+n] for s, n in zip(self.__starts, self.__counts)])
+
+    # -----------------------------------------------------------------------
+
+    def rPVI(self):
+        """Estimate the Raw Pairwise Variability Index of data values.
+
+        :returns: (dict) a dictionary of (key, rPVI) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(rPVI)
+
+        deltas = numpy.fabs(self.__values[1:] - self.__values[:-1])
+        sums = numpy.array(self.__fsums(deltas.tolist(), self.__counts - 1))
+        return self.__to_dict(self.__pvi(sums, 1.))
+
+    # -----------------------------------------------------------------------
+
+    def nPVI(self):
+        """Estimate the Normalized Pairwise Variability Index of data values.
+
+        :returns: (dict) a dictionary of (key, nPVI) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(nPVI)
+
+        d1 = self.__values[:-1]
+        d2 = self.__values[1:]
+        ratios = numpy.fabs(d1 - d2) / ((d1 + d2) / 2.)
+        sums = self.__cumsums(ratios, self.__counts - 1)
+        return self.__to_dict(self.__pvi(sums, 100.))
+
+    # -----------------------------------------------------------------------
+
+    def intercept_slope_original(self):
+        """Estimate the linear regression with x=position of the values.
+
+        :returns: (dict) a dict of (key, (intercept, slope)) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(lambda values: tga_linear_regression(
+                [(pos, dur) for pos, dur in enumerate(values)]))
+
+        x = numpy.arange(len(self.__values)) - self.__starts[self.__ids]
+        # the sum of the positions is exact: n*(n-1)/2
+        sum_x = (self.__counts * (self.__counts - 1) // 2).astype(numpy.float64)
+        return self.__regression(x.astype(numpy.float64), sum_x)
+
+    # -----------------------------------------------------------------------
+
+    def intercept_slope(self):
+        """Estimate the linear regression with x=timestamps of the values.
+
+        The timestamp of a value is the sum of the previous ones.
+
+        :returns: (dict) a dict of (key, (intercept, slope)) of float values
+
+        """
+        if self.__vectorized is False:
+            return self.__apply(
+                lambda values: tga_linear_regression(
+                    sppasGroupedStatistics.__timestamps(values)))
+
+        x = self.__cumsums(self.__values, self.__counts, last=False)
+        return self.__regression(x)
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __init_arrays(self):
+        """Store the values of all groups in contiguous arrays."""
+        nb_groups = len(self.__names)
+        ids = numpy.array(self.__groups, dtype=numpy.int64)
+        values = numpy.array(self.__data, dtype=numpy.float64)
+        if len(ids) > 1 and (ids[1:] < ids[:-1]).any():
+            order = numpy.argsort(ids, kind="stable")
+            ids = ids[order]
+            values = values[order]
+        self.__ids = ids
+        self.__values = values
+        self.__counts = numpy.bincount(ids, minlength=nb_groups)
+        self.__starts = numpy.zeros(nb_groups, dtype=numpy.int64)
+        if nb_groups > 0:
+            self.__starts[1:] = numpy.cumsum(self.__counts)[:-1]
+
+        self.__totals = numpy.array(self.__fsums(values.tolist(),
+                                                 self.__counts))
+        self.__means = numpy.zeros(nb_groups)
+        filled = self.__counts > 0
+        self.__means[filled] = self.__totals[filled] / self.__counts[filled]
+        self.__var = None
+
+    # -----------------------------------------------------------------------
+
+    def __apply(self, function):
+        """Apply a function on the list of values of each group."""
+        if self.__lists is None:
+            self.__lists = [list() for _ in self.__names]
+            for g, v in zip(self.__groups, self.__data):
+                self.__lists[g].append(v)
+        return self.__to_dict([function(values) for values in self.__lists])
+
+    # -----------------------------------------------------------------------
+
+    def __to_dict(self, results):
+        """Return a dict with the name of the groups and their results."""
+        if numpy_import is True and isinstance(results, numpy.ndarray):
+            results = results.tolist()
+        return dict(zip(self.__names, results))
+
+    # -----------------------------------------------------------------------
+
+    def __reduce(self, ufunc):
+        """Reduce the values of each filled group with a numpy ufunc."""
+        result = numpy.zeros(len(self.__names))
+        filled = self.__counts > 0
+        if filled.any():
+            result[filled] = ufunc.reduceat(self.__values,
+                                            self.__starts[filled])
+        return self.__to_dict(result)
+
+    # -----------------------------------------------------------------------
+
+    def __variances(self):
+        """Return the variance of the values of each group."""
+        if self.__var is None:
+            self.__var = self.__estimate_variances()
+        return self.__var.copy()
+
+    # -----------------------------------------------------------------------
+
+    def __estimate_variances(self):
+        """Estimate the variance of the values of each group."""
+        deviations = (self.__values - self.__means[self.__ids]) ** 2
+        sums = numpy.array(self.__fsums(deviations.tolist(), self.__counts))
+        result = numpy.zeros(len(self.__names))
+        filled = self.__counts > 0
+        result[filled] = sums[filled] / self.__counts[filled]
+        return result
+
+    # -----------------------------------------------------------------------
+
+    def __pvi(self, sums, factor):
+        """Return the PVI of each group from the sums of the pairs."""
+        result = numpy.zeros(len(self.__names))
+        pairs = self.__counts - 1
+        valid = pairs > 0
+        result[valid] = factor * sums[valid] / pairs[valid]
+        return result
+
+    # -----------------------------------------------------------------------
+
+    def __regression(self, x, sum_x=None):
+        """Return the TGA linear regression of each group.
+
+        Like tga_linear_regression(), 0. is the result of an empty group.
+
+        :param x: (array) x values of the points
+        :param sum_x: (array) Sum of the x values of each group, if known
+
+        """
+        counts = self.__counts
+        filled = counts > 0
+        if sum_x is None:
+            sum_x = numpy.array(self.__fsums(x.tolist(), counts))
+        mean_x = numpy.zeros(len(self.__names))
+        mean_x[filled] = sum_x[filled] / counts[filled]
+        mean_y = self.__means
+
+        dx = x - mean_x[self.__ids]
+        dy = self.__values - mean_y[self.__ids]
+        xy_sum = self.__cumsums(dx * dy, counts)
+        xsq_sum = self.__cumsums(dx * dx, counts)
+
+        m = xy_sum.copy()
+        nonzero = xsq_sum != 0
+        m[nonzero] = xy_sum[nonzero] / xsq_sum[nonzero]
+        b = mean_y - m * mean_x
+
+        results = list()
+        for n, intercept, slope in zip(counts, b.tolist(), m.tolist()):
+            if n == 0:
+                results.append(0.)
+            else:
+                results.append((intercept, slope))
+        return self.__to_dict(results)
+
+    # -----------------------------------------------------------------------
+
+    def __fsums(self, flat, counts):
+        """Return the math.fsum() of the values of each group.
+
+        :param flat: (list) Values of all groups, from the group starts
+        :param counts: (array) Number of values of each group
+
+        """
+        sums = list()
+        for start, n in zip(self.__starts.tolist(), counts.tolist()):
+            if n > 0:
+                sums.append(math.fsum(flat[start:start+n]))
+            else:
+                sums.append(0.)
+        return sums
+
+    # -----------------------------------------------------------------------
+
+    def __cumsums(self, flat, counts, last=True):
+        """Accumulate the values of each group in their order.
+
+        The groups of the same size are accumulated together so that the
+        result is the one of the successive additions of a loop.
+
+        :param flat: (array) Values of all groups, from the group starts
+        :param counts: (array) Number of values of each group
+        :param last: (bool) Return the total of each group. If False,
+        return the array of the sums of the previous values of each value.
+
+        """
+        if last is True:
+            result = numpy.zeros(len(counts))
+        else:
+            result = numpy.zeros(len(flat))
+
+        for size in numpy.unique(counts):
+            if size <= 0:
+                continue
+            groups = numpy.nonzero(counts == size)[0]
+            idx = self.__starts[groups][:, None] + numpy.arange(size)
+            acc = numpy.cumsum(flat[idx], axis=1)
+            if last is True:
+                result[groups] = acc[:, -1]
+            else:
+                result[idx[:, 1:]] = acc[:, :-1]
+        return result
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __timestamps(values):
+        """Return the list of (timestamp, value) of a list of values."""
+        points = list()
+        timestamp = 0.
+        for value in values:
+            points.append((timestamp, value))
+            timestamp += value
+        return points
@@ -39,6 +39,9 @@ from ..stats.central import fsum, fmult, fmin, fmax, fmean, fgeometricmean, fhar
 from ..stats.frequency import freq, percent, percentile, quantile
 from ..stats.linregress import tga_linear_regression, tansey_linear_regression
 from ..stats.linregress import gradient_descent, gradient_descent_linear_regression, compute_error_for_line_given_points
+from ..stats.descriptivesstats import sppasDescriptiveStatistics
+from ..stats.groupedstats import sppasGroupedStatistics
+from ..stats.groupedstats import numpy_import
 
 # TODO: test the followings: lmoment, lvariation, lskew, lkurtosis, lvariance, lstdev, lz, rPVI, nPVI
 # from ..stats.moment import lmoment, lvariation, lskew, lkurtosis
@@ -205,3 +208,59 @@ class TestStats(unittest.TestCase):
         b, m = gradient_descent(points, b, m, learning_rate=0.0001, num_iterations=50000)
         self.assertEqual(round(b, 4), 7.9910)
         self.assertEqual(round(m, 4), 1.3224)
+
+# ---------------------------------------------------------------------------
+
+
+class TestGroupedStats(unittest.TestCase):
+
+    def setUp(self):
+        self.d = dict()
+        self.d["tg1"] = [0.1, 0.2, 0.3]
+        self.d["tg2"] = [0.1, 0.3, 0.2, 0.25]
+        self.d["tg3"] = [0.3]
+        self.d["tg4"] = []
+
+    def test_init(self):
+        s = sppasGroupedStatistics([0, 1, 0, 2], [1., 2., 3., 4.])
+        self.assertEqual([0, 1, 2], s.get_names())
+        self.assertEqual({0: 2, 1: 1, 2: 1}, s.len())
+        self.assertEqual({0: 4., 1: 2., 2: 4.}, s.total())
+        s = sppasGroupedStatistics([1, 1], [1., 2.], names=["a", "b", "c"])
+        self.assertEqual({"a": 0, "b": 2, "c": 0}, s.len())
+        with self.assertRaises(ValueError):
+            sppasGroupedStatistics([0, 1], [1.])
+        with self.assertRaises(ValueError):
+            sppasGroupedStatistics([0, -1], [1., 2.])
+        with self.assertRaises(ValueError):
+            sppasGroupedStatistics([0, 3], [1., 2.], names=["a"])
+
+    def test_same_results(self):
+        ref = sppasDescriptiveStatistics(self.d)
+        s = sppasGroupedStatistics.from_dict(self.d)
+        self.assertEqual(list(self.d.keys()), s.get_names())
+        for vectorized in (numpy_import, False):
+            s.set_vectorized(vectorized)
+            self.assertEqual(ref.len(), s.len())
+            self.assertEqual(ref.total(), s.total())
+            self.assertEqual(ref.min(), s.min())
+            self.assertEqual(ref.max(), s.max())
+            self.assertEqual(ref.mean(), s.mean())
+            self.assertEqual(ref.median(), s.median())
+            self.assertEqual(ref.variance(), s.variance())
+            self.assertEqual(ref.stdev(), s.stdev())
+            self.assertEqual(ref.coefvariation(), s.coefvariation())
+            self.assertEqual(ref.zscore(), s.zscore())
+            self.assertEqual(0.6, s.total()["tg1"])
+            self.assertEqual(0.225, round(s.median()["tg2"], 5))
+
+            self.assertEqual(0., s.rPVI()["tg3"])
+            self.assertEqual(0.11667, round(s.rPVI()["tg2"], 5))
+            self.assertEqual(53, int(s.nPVI()["tg1"]))
+            self.assertEqual(0., s.intercept_slope()["tg4"])
+            self.assertEqual((0.1, 0.1), tuple(
+                round(v, 5) for v in s.intercept_slope_original()["tg1"]))
+            self.assertEqual((0.3, 0.), s.intercept_slope()["tg3"])
+
+        with self.assertRaises(ZeroDivisionError):
+            sppasGroupedStatistics([0, 0], [1., 1.]).zscore()
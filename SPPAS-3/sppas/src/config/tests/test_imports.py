@@ -0,0 +1,140 @@
+"""
+:filename: sppas.src.config.tests.test_imports.py
+:author: Brigitte Bigi
+:contact: develop@sppas.org
+:summary: Benchmark of the time to import the sppas package.
+
+.. _This file is part of SPPAS: http://www.sppas.org/
+..
+    -------------------------------------------------------------------------
+
+     ___   __    __    __    ___
+    /     |  \  |  \  |  \  /              the automatic
+    \__   |__/  |__/  |___| \__             annotation and
+       \  |     |     |   |    \             analysis
+    ___/  |     |     |   | ___/              of speech
+
+    Copyright (C) 2011-2021  Brigitte Bigi
+    Laboratoire Parole et Langage, Aix-en-Provence, France
+
+    Use of this software is governed by the GNU Public License, version 3.
+
+    SPPAS is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    SPPAS is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+    This banner notice must not be removed.
+
+    -------------------------------------------------------------------------
+
+"""
+
+import os
+import sys
+import json
+import importlib
+import subprocess
+import unittest
+
+from sppas.src.config import paths
+
+# ---------------------------------------------------------------------------
+
+# A cold start of a CLI tool or of a worker must be well under one second.
+MAX_IMPORT_TIME = 1.
+
+# Run a statement in a fresh interpreter and report the time and the
+# list of the imported modules.
+SCRIPT = """
+import sys, time, json
+start = time.perf_counter()
+{statement:s}
+elapsed = time.perf_counter() - start
+sys.stderr.write(json.dumps(dict(time=elapsed, modules=list(sys.modules))))
+"""
+
+# ---------------------------------------------------------------------------
+
+
+class TestImportTime(unittest.TestCase):
+
+    def cold_run(self, statement):
+        """Run the given statement in a new python process.
+
+        :param statement: (str) Python statement, an import for example
+        :returns: (float, list) Time to run and the list of loaded modules
+
+        """
+        p = subprocess.run(
+            [sys.executable, "-c", SCRIPT.format(statement=statement)],
+            cwd=os.path.dirname(paths.sppas),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True)
+        if p.returncode != 0:
+            self.fail("'{:s}' failed:\n{:s}".format(statement, p.stderr))
+        result = json.loads(p.stderr.strip().split("\n")[-1])
+        return result["time"], result["modules"]
+
+    # -----------------------------------------------------------------------
+
+    def test_import_sppas(self):
+        t, modules = self.cold_run("import sppas")
+        self.assertLess(t, MAX_IMPORT_TIME)
+
+        # Images, videos, annotations and GUI are imported on demand
+        self.assertNotIn("cv2", modules)
+        self.assertNotIn("sppas.src.imgdata", modules)
+        self.assertNotIn("sppas.src.videodata", modules)
+        self.assertNotIn("sppas.src.annotations", modules)
+        self.assertNotIn("sppas.src.ui", modules)
+
+        # Readers/writers of annotated files are imported on demand
+        self.assertIn("sppas.src.anndata.aio.readwrite", modules)
+        self.assertNotIn("sppas.src.anndata.aio.xra", modules)
+        self.assertNotIn("sppas.src.anndata.aio.annotationpro", modules)
+
+    # -----------------------------------------------------------------------
+
+    def test_import_annotations(self):
+        t, modules = self.cold_run("import sppas.src.annotations")
+        self.assertLess(t, MAX_IMPORT_TIME)
+        self.assertNotIn("sppas.src.annotations.FaceDetection", modules)
+        self.assertNotIn("sppas.src.annotations.CuedSpeech", modules)
+
+    # -----------------------------------------------------------------------
+
+    def test_lazy_attributes(self):
+        # An unknown attribute does not import any package
+        t, modules = self.cold_run(
+            "import sppas\n"
+            "try:\n"
+            "    sppas.toto\n"
+            "except AttributeError:\n"
+            "    pass")
+        self.assertNotIn("sppas.src.annotations", modules)
+        self.assertNotIn("sppas.src.plugins", modules)
+        self.assertNotIn("cv2", modules)
+
+        # A class imports its package only
+        t, modules = self.cold_run("from sppas import sppasMomel")
+        self.assertIn("sppas.src.annotations", modules)
+        self.assertNotIn("sppas.src.plugins", modules)
+
+    # -----------------------------------------------------------------------
+
+    def test_lazy_names(self):
+        # The lazy classes are the ones exported by their package
+        import sppas
+        for package_name, names in sppas._LAZY_PACKAGES.items():
+            package = importlib.import_module(package_name)
+            self.assertEqual(sorted(package.__all__), sorted(names))
@@ -868,6 +868,20 @@ class sppasImage(numpy.ndarray):
 
         """
         img = self.copy()
+        img.surround(coords, color, thickness, score)
+        return img
+
+    # -----------------------------------------------------------------------
+
+    def surround(self, coords, color=(50, 100, 200), thickness=2, score=False):
+        """Add a square surrounding all the given coords, in-place.
+
+        :param coords: (List of sppasCoords) Areas to surround
+        :param color: (int, int, int) Rectangle color
+        :param thickness: (int) Thickness of lines that make up the rectangle. Negative values, like CV_FILLED , mean that the function has to draw a filled rectangle.
+        :param score: (bool) Add the confidence score of the coords
+
+        """
         for c in coords:
             c = sppasCoords.to_coords(c)
             if c.w > 0 and c.h > 0:
@@ -875,11 +889,9 @@ class sppasImage(numpy.ndarray):
                 text = ""
                 if score is True and c.get_confidence() > 0.:
                     text = "{:.3f}".format(c.get_confidence())
-                img.surround_coord(c, color, thickness, text)
+                self.surround_coord(c, color, thickness, text)
             else:
-                img.surround_point(c, color, thickness)
-
-        return img
+                self.surround_point(c, color, thickness)
 
     # -----------------------------------------------------------------------
 
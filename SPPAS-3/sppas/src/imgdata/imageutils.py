@@ -481,3 +481,89 @@ def overlay(back_image, over_image, x, y, w, h):
 
     return back_image
 
+
+# ----------------------------------------------------------------------------
+
+
+def coords_to_array(coords):
+    """Return the (N, 5) array of a list of coordinates.
+
+    Each row of the array is (x, y, w, h, confidence). The confidence score
+    of a coordinate is 0. if not set.
+
+    :param coords: (list of sppasCoords)
+    :return: (numpy.ndarray) Array of float64 values
+
+    """
+    boxes = numpy.zeros((len(coords), 5), dtype=numpy.float64)
+    for i, c in enumerate(coords):
+        boxes[i] = (c.x, c.y, c.w, c.h, c.get_confidence())
+    return boxes
+
+# ----------------------------------------------------------------------------
+
+
+def array_to_coords(boxes):
+    """Return the list of coordinates of a (N, 5) or (N, 4) array.
+
+    :param boxes: (numpy.ndarray) Rows of (x, y, w, h[, confidence])
+    :return: (list of sppasCoords)
+
+    """
+    coords = list()
+    for row in boxes:
+        c = sppasCoords(int(row[0]), int(row[1]), int(row[2]), int(row[3]))
+        if len(row) > 4:
+            c.set_confidence(float(row[4]))
+        coords.append(c)
+    return coords
+
+# ----------------------------------------------------------------------------
+
+
+def intersection_areas(boxes, others=None):
+    """Return the intersection areas of all pairs of rectangles.
+
+    The same as sppasCoords.intersection_area() for each pair of rows.
+
+    :param boxes: (numpy.ndarray) Rows of (x, y, w, h, ...)
+    :param others: (numpy.ndarray) Rows of (x, y, w, h, ...) or None for boxes
+    :return: (numpy.ndarray) (N, M) array of the areas
+
+    """
+    if others is None:
+        others = boxes
+    x1 = boxes[:, 0]
+    y1 = boxes[:, 1]
+    xmax1 = x1 + boxes[:, 2]
+    ymax1 = y1 + boxes[:, 3]
+    x2 = others[:, 0]
+    y2 = others[:, 1]
+    xmax2 = x2 + others[:, 2]
+    ymax2 = y2 + others[:, 3]
+    dx = numpy.minimum(xmax1[:, None], xmax2[None, :]) - numpy.maximum(x1[:, None], x2[None, :])
+    dy = numpy.minimum(ymax1[:, None], ymax2[None, :]) - numpy.maximum(y1[:, None], y2[None, :])
+
+    return numpy.where((dx >= 0) & (dy >= 0), dx * dy, 0.)
+
+# ----------------------------------------------------------------------------
+
+
+def coords_similarities(boxes, others=None):
+    """Return the similarity scores of all pairs of rectangles.
+
+    The same as sppasCoordsCompare.compare_coords() for each pair of rows:
+    the intersection area divided by the mean of both areas. The score is
+    nan if one of the rectangles is unknown, i.e. its row is nan.
+
+    :param boxes: (numpy.ndarray) Rows of (x, y, w, h, ...)
+    :param others: (numpy.ndarray) Rows of (x, y, w, h, ...) or None for boxes
+    :return: (numpy.ndarray) (N, M) array of scores
+
+    """
+    if others is None:
+        others = boxes
+    areas1 = boxes[:, 2] * boxes[:, 3]
+    areas2 = others[:, 2] * others[:, 3]
+    with numpy.errstate(invalid="ignore", divide="ignore"):
+        return intersection_areas(boxes, others) / ((areas1[:, None] + areas2[None, :]) / 2.)
@@ -411,20 +411,24 @@ class sppasCoordsImageWriter(object):
 
     # -----------------------------------------------------------------------
 
-    def tag_image(self, image, coords, colors=list()):
+    def tag_image(self, image, coords, colors=list(), inplace=False):
         """Tag the image at the given coords.
 
         :param image: (sppasImage) The image to write
         :param coords: (list of sppasCoords OR list(list of sppasCoords)) The coordinates of objects
         :param colors: list of (r,g,b) List of tuple with RGB int values
-        :return: a copy of the image with colored squares at the given coords
+        :param inplace: (bool) Tag the given image instead of a copy of it
+        :return: the image -- or a copy of it -- with colored squares at the given coords
 
         """
         if coords is None:
             return image
 
         # Make a copy of the image to tag it without changing the given one
-        img = sppasImage(input_array=image.copy())
+        if inplace is True:
+            img = image
+        else:
+            img = sppasImage(input_array=image.copy())
         w, h = img.size()
         pen_width = max(2, int(float(w + h) / 500.))
 
@@ -444,7 +448,7 @@ class sppasCoordsImageWriter(object):
         :param img: (sppasImage) The image to write
         :param coords: (list of sppasCoords OR list(list of sppasCoords)) The coordinates of objects
         :param colors: List of (r,g,b) Tuple with RGB int values
-        :return: (sppasImage)
+        :return: (sppasImage) The given image, tagged in-place
         
         """
         for i, c in enumerate(coords):
@@ -465,7 +469,7 @@ class sppasCoordsImageWriter(object):
             # the confidence inside the square if the coord is not a point
             if isinstance(c, (list, tuple)) is False:
                 c = [c]
-            img = img.isurround(c, color=rgb, thickness=pen_width, score=True)
+            img.surround(c, color=rgb, thickness=pen_width, score=True)
 
         return img
 
@@ -52,8 +52,8 @@ from sppas.src.config import sppasTrash
 
 from .coordinates import sppasCoords
 from .image import sppasImage
-from .imageutils import sppasImageCompare
 from .imageutils import sppasCoordsCompare
+from .imageutils import coords_similarities
 
 # ---------------------------------------------------------------------------
 
@@ -93,6 +93,12 @@ class ImagesFIFO(object):
         self.__cur_coords = None    # lastly observed
         self.__ref_coords = None    # reference
 
+    # -----------------------------------------------------------------------
+
+    def get_limit(self):
+        """Return the max number of images of the queue."""
+        return self.__limit
+
     # -----------------------------------------------------------------------
     # Coordinates
     # -----------------------------------------------------------------------
@@ -203,6 +209,276 @@ class ImagesFIFO(object):
 # ---------------------------------------------------------------------------
 
 
+class IdentitiesMatrix(object):
+    """Fixed-size vectors of identities stored into contiguous matrices.
+
+    Each identity is a row of the matrices, so that a new image or new
+    coords are compared to all the identities at once:
+
+        - boxes: (n, 2, 4) reference and current coords -- nan if unknown
+        - patterns: (n, P) mean of the normalized downscaled gray images
+        - histograms: (n, H) mean of the color histograms of the images
+        - sizes: (n, 2) mean width and height of the images
+        - counts: (n,) number of images of the means
+
+    Like the ImagesFIFO of an identity, the means are the ones of its last
+    images only: the vectors of the images of each identity are stored in
+    a queue of a given size, and the means of the identity are updated
+    when an image is added. The images themselves are not needed to
+    compare with.
+
+    """
+
+    # Width and height of the downscaled gray images
+    PATTERN_SIZE = 16
+
+    # Number of bins of the histogram of each color channel
+    HISTOGRAM_BINS = 8
+
+    # -----------------------------------------------------------------------
+
+    def __init__(self):
+        """Create an empty instance."""
+        self.__size = 0
+        self.__boxes = None
+        self.__patterns = None
+        self.__histograms = None
+        self.__sizes = None
+        self.__counts = None
+        self.__allocate(8)
+
+        # The queue of the vectors of the last images of each identity
+        self.__vectors = list()
+
+    # -----------------------------------------------------------------------
+
+    def append(self, nb_img=ImagesFIFO.DEFAULT_QUEUE_SIZE):
+        """Append a new identity without coords nor images.
+
+        :param nb_img: (int) Number of the last images of the means
+        :return: (int) Index of the new row
+
+        """
+        if self.__size == len(self.__counts):
+            self.__allocate(2 * len(self.__counts))
+        row = self.__size
+        self.__boxes[row] = numpy.nan
+        self.__patterns[row] = 0.
+        self.__histograms[row] = 0.
+        self.__sizes[row] = 0.
+        self.__counts[row] = 0
+        self.__vectors.append(collections.deque(maxlen=nb_img))
+        self.__size += 1
+        return row
+
+    # -----------------------------------------------------------------------
+
+    def remove(self, row):
+        """Remove the identity of the given row.
+
+        The next rows are shifted by one.
+
+        :param row: (int) Index of the row
+
+        """
+        if 0 <= row < self.__size:
+            for array in (self.__boxes, self.__patterns, self.__histograms,
+                          self.__sizes, self.__counts):
+                array[row:self.__size - 1] = array[row + 1:self.__size]
+            self.__vectors.pop(row)
+            self.__size -= 1
+
+    # -----------------------------------------------------------------------
+
+    def set_coords(self, row, coords, current=True):
+        """Set the current or the reference coords of an identity.
+
+        :param row: (int) Index of the row
+        :param coords: (sppasCoords or None)
+        :param current: (bool) Set the current coords or the reference ones
+
+        """
+        idx = 1 if current is True else 0
+        if coords is None:
+            self.__boxes[row, idx] = numpy.nan
+        else:
+            self.__boxes[row, idx] = (coords.x, coords.y, coords.w, coords.h)
+
+    # -----------------------------------------------------------------------
+
+    def add_image(self, row, image, reference=False):
+        """Update the means of an identity with the given image.
+
+        The oldest image of the identity is forgotten if its queue is full.
+
+        :param row: (int) Index of the row
+        :param image: (sppasImage)
+        :param reference: (bool) Restart the means from this image
+
+        """
+        vectors = self.__vectors[row]
+        if reference is True:
+            vectors.clear()
+        w, h = image.size()
+        vectors.append((IdentitiesMatrix.image_to_pattern(image),
+                        IdentitiesMatrix.image_to_histogram(image),
+                        numpy.array((w, h), dtype=numpy.float64)))
+
+        self.__counts[row] = len(vectors)
+        if len(vectors) > 0:
+            patterns, histograms, sizes = zip(*vectors)
+            self.__patterns[row] = numpy.mean(patterns, axis=0)
+            self.__histograms[row] = numpy.mean(histograms, axis=0)
+            self.__sizes[row] = numpy.mean(sizes, axis=0)
+
+    # -----------------------------------------------------------------------
+
+    def coords_scores(self, coords):
+        """Return the similarity of the given coords with all the identities.
+
+        The score is the one of the current coords if the reference ones
+        are unknown and conversely, or an interpolation of both of them.
+
+        :param coords: (sppasCoords)
+        :return: (numpy.ndarray) Scores of the n identities -- 0. if unknown
+
+        """
+        box = numpy.array([[coords.x, coords.y, coords.w, coords.h]], dtype=numpy.float64)
+        ref = coords_similarities(self.__boxes[:self.__size, 0], box)[:, 0]
+        cur = coords_similarities(self.__boxes[:self.__size, 1], box)[:, 0]
+
+        scores = (0.4 * ref) + (0.6 * cur)
+        scores = numpy.where(numpy.isnan(ref), cur, scores)
+        scores = numpy.where(numpy.isnan(cur), ref, scores)
+        return numpy.nan_to_num(scores, nan=0.)
+
+    # -----------------------------------------------------------------------
+
+    def kids_coords_scores(self):
+        """Return the similarity of the coords of all pairs of identities.
+
+        :return: (numpy.ndarray) (n, n) average of the scores of the
+        reference coords and of the current coords -- 0. if unknown
+
+        """
+        ref = coords_similarities(self.__boxes[:self.__size, 0])
+        cur = coords_similarities(self.__boxes[:self.__size, 1])
+        return (numpy.nan_to_num(ref, nan=0.) + numpy.nan_to_num(cur, nan=0.)) / 2.
+
+    # -----------------------------------------------------------------------
+
+    def images_scores(self, image):
+        """Return the similarity of the given image with all the identities.
+
+        Linear interpolation of the similarity of the downscaled gray
+        images (cosine), of the color histograms (intersection), of the
+        areas and of the sizes, with the empirically fixed weights of
+        sppasImagesSimilarity.predict_compare_images().
+
+        :param image: (sppasImage)
+        :return: (numpy.ndarray) Scores of the n identities -- 0. if no image
+
+        """
+        n = self.__size
+        pattern = IdentitiesMatrix.image_to_pattern(image)
+        histogram = IdentitiesMatrix.image_to_histogram(image)
+        w, h = image.size()
+
+        # Appearance: cosine of the gray patterns and intersection of histograms
+        norms = numpy.linalg.norm(self.__patterns[:n], axis=1) * numpy.linalg.norm(pattern)
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            cosine = numpy.nan_to_num(self.__patterns[:n].dot(pattern) / norms, nan=0.)
+        intersection = numpy.minimum(self.__histograms[:n], histogram).sum(axis=1)
+
+        # Dimensions: ratios of the areas, of the widths and of the heights
+        widths = self.__sizes[:n, 0]
+        heights = self.__sizes[:n, 1]
+        with numpy.errstate(invalid="ignore", divide="ignore"):
+            areas = numpy.minimum(widths * heights, w * h) / numpy.maximum(widths * heights, w * h)
+            w_ratio = numpy.minimum(widths, w) / numpy.maximum(widths, w)
+            h_ratio = numpy.minimum(heights, h) / numpy.maximum(heights, h)
+        areas = numpy.where(numpy.maximum(widths * heights, w * h) < 2, 0., areas)
+        w_ratio = numpy.where(numpy.maximum(widths, w) > 2, w_ratio, 0.)
+        h_ratio = numpy.where(numpy.maximum(heights, h) > 2, h_ratio, 0.)
+        sizes = (w_ratio + h_ratio) / 2.
+
+        scores = (0.4 * numpy.maximum(0., cosine)) + (0.3 * intersection) + \
+                 (0.15 * areas) + (0.15 * sizes)
+        return numpy.where(self.__counts[:n] > 0, scores, 0.)
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def image_to_pattern(image):
+        """Return the normalized downscaled gray image as a vector.
+
+        :param image: (sppasImage)
+        :return: (numpy.ndarray) Zero-mean unit-norm vector
+
+        """
+        size = IdentitiesMatrix.PATTERN_SIZE
+        img = numpy.asarray(image)
+        if img.ndim == 3:
+            img = cv2.cvtColor(img[:, :, :3], cv2.COLOR_BGR2GRAY)
+        small = cv2.resize(img, (size, size), interpolation=cv2.INTER_AREA)
+        vector = small.astype(numpy.float64).ravel()
+        vector -= vector.mean()
+        norm = numpy.linalg.norm(vector)
+        if norm > 0.:
+            vector /= norm
+        return vector
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def image_to_histogram(image):
+        """Return the color histograms of the image as a vector summing to 1.
+
+        :param image: (sppasImage)
+        :return: (numpy.ndarray)
+
+        """
+        bins = IdentitiesMatrix.HISTOGRAM_BINS
+        img = numpy.asarray(image)
+        if img.ndim == 2:
+            img = img[:, :, None]
+        img = img[:, :, :3]
+        nb = img.shape[2]
+        # the bin of each value in each channel, shifted by channel
+        values = (img.reshape(-1, nb).astype(numpy.int64) * bins) // 256
+        values += numpy.arange(nb) * bins
+        histogram = numpy.bincount(values.ravel(), minlength=3 * bins).astype(numpy.float64)
+        total = histogram.sum()
+        if total > 0.:
+            histogram /= total
+        return histogram
+
+    # -----------------------------------------------------------------------
+
+    def __allocate(self, capacity):
+        """Enlarge the matrices to the given number of rows."""
+        pattern = IdentitiesMatrix.PATTERN_SIZE * IdentitiesMatrix.PATTERN_SIZE
+        histogram = 3 * IdentitiesMatrix.HISTOGRAM_BINS
+        arrays = (numpy.full((capacity, 2, 4), numpy.nan),
+                  numpy.zeros((capacity, pattern)),
+                  numpy.zeros((capacity, histogram)),
+                  numpy.zeros((capacity, 2)),
+                  numpy.zeros(capacity, dtype=numpy.int64))
+        if self.__counts is not None:
+            for new, old in zip(arrays, (self.__boxes, self.__patterns, self.__histograms,
+                                         self.__sizes, self.__counts)):
+                new[:self.__size] = old[:self.__size]
+        self.__boxes, self.__patterns, self.__histograms, self.__sizes, self.__counts = arrays
+
+    # -----------------------------------------------------------------------
+
+    def __len__(self):
+        """Return the number of identities."""
+        return self.__size
+
+# ---------------------------------------------------------------------------
+
+
 class sppasImagesSimilarity(object):
     """Estimate similarity between images to identify objects.
 
@@ -215,8 +491,18 @@ class sppasImagesSimilarity(object):
         - the slower is to compare image contents (colors, size, ...)
         - the most generic is to use the OpenCV recognition system.
 
+    The coords and the images of the known identifiers are also summarized
+    into the rows of an IdentitiesMatrix, so that the given coords or image
+    are compared to all the identifiers at once.
+
     """
 
+    # Default min score to identify an image. With the mean of 10 crops of
+    # a face, other crops shifted, scaled and brightened by up to 6% are
+    # scored 0.81 to 0.98 -- 0.67 to 0.96 by up to 10%. The other parts of
+    # the pictures, often accepted by 0.4, are scored 0.32 to 0.70.
+    IMAGE_SCORE_LEVEL = 0.7
+
     def __init__(self):
         """Create an instance.
 
@@ -224,8 +510,14 @@ class sppasImagesSimilarity(object):
         # Known objects: key=identifier, value=ImagesFIFO()
         self.__kids = collections.OrderedDict()
 
-        # Members for the SPPAS similarity measures
+        # Fixed-size vectors of the known objects, in the order of the kids
+        self.__matrix = IdentitiesMatrix()
+        self.__rows = dict()
+
+        # Members for the SPPAS similarity measures: min score of the coords
+        # and of the images to identify an object
         self.__score_level = 0.4
+        self.__image_score_level = sppasImagesSimilarity.IMAGE_SCORE_LEVEL
 
         # Members for OpenCV automatic recognizer
         self.__fr = False
@@ -252,6 +544,7 @@ class sppasImagesSimilarity(object):
         """
         pid = "id{:03d}".format(self.__id_idx)
         self.__kids[pid] = ImagesFIFO(nb_img)
+        self.__rows[pid] = self.__matrix.append(self.__kids[pid].get_limit())
         self.__id_idx += 1
 
         return pid
@@ -266,6 +559,8 @@ class sppasImagesSimilarity(object):
         """
         if kid in self.__kids:
             del self.__kids[kid]
+            self.__matrix.remove(self.__rows[kid])
+            self.__rows = {k: i for i, k in enumerate(self.__kids)}
 
     # -----------------------------------------------------------------------
 
@@ -282,6 +577,7 @@ class sppasImagesSimilarity(object):
             raise sppasKeyError(kid, "dict(ImagesFIFO)")
 
         self.__kids[kid].add(image, reference)
+        self.__matrix.add_image(self.__rows[kid], image, reference)
 
     # -----------------------------------------------------------------------
 
@@ -341,6 +637,7 @@ class sppasImagesSimilarity(object):
             raise sppasKeyError(kid, "dict(ImagesFIFO)")
 
         self.__kids[kid].set_cur_coords(coords)
+        self.__matrix.set_coords(self.__rows[kid], coords, current=True)
 
     # -----------------------------------------------------------------------
 
@@ -370,6 +667,7 @@ class sppasImagesSimilarity(object):
             raise sppasKeyError(kid, "dict(ImagesFIFO)")
 
         self.__kids[kid].set_ref_coords(coords)
+        self.__matrix.set_coords(self.__rows[kid], coords, current=False)
 
     # -----------------------------------------------------------------------
 
@@ -386,7 +684,7 @@ class sppasImagesSimilarity(object):
     # -----------------------------------------------------------------------
 
     def set_score_level(self, value):
-        """Fix threshold score for the identification measure.
+        """Fix threshold score for the identification measure of coords.
 
         :param value: (float) Value in range [0., 1.]
 
@@ -399,6 +697,20 @@ class sppasImagesSimilarity(object):
 
     # -----------------------------------------------------------------------
 
+    def set_image_score_level(self, value=IMAGE_SCORE_LEVEL):
+        """Fix threshold score for the identification measure of images.
+
+        :param value: (float) Value in range [0., 1.]
+
+        """
+        value = float(value)
+        if value < 0. or value > 1.:
+            raise IntervalRangeException(value, 0, 1)
+
+        self.__image_score_level = value
+
+    # -----------------------------------------------------------------------
+
     def compare_kids_coords(self, kid1, kid2):
         """Return a similarity score between two known identifiers.
 
@@ -425,6 +737,18 @@ class sppasImagesSimilarity(object):
 
     # -----------------------------------------------------------------------
 
+    def compare_all_kids_coords(self):
+        """Return the similarity scores of all pairs of known identifiers.
+
+        The same as compare_kids_coords() for all pairs, at once.
+
+        :return: (numpy.ndarray) (n, n) scores in the order of the identifiers
+
+        """
+        return self.__matrix.kids_coords_scores()
+
+    # -----------------------------------------------------------------------
+
     def identify(self, image=None, coords=None):
         """Among the known identifiers, who matches the given image/coords.
 
@@ -475,41 +799,17 @@ class sppasImagesSimilarity(object):
     def predict_compare_images(self, image):
         """Compare the given image to the existing ones.
 
-        Evaluate similarity of image contents (very very low).
+        Evaluate similarity of image contents with the mean of the last
+        images of each identifier: gray patterns, colors, area and size.
+        The best identifier is returned if its score is greater than the
+        image score level.
 
         :param image: (sppasImage) The image to compare with
         :return: tuple(kid, score) or (None, 0.)
 
         """
-        scores = dict()
-        for ref_name in self.__kids:
-            sc = None
-            ref_img = self.__kids[ref_name].get_ref_image()
-            if ref_img is not None:
-                cmp = sppasImageCompare(image, ref_img)
-                areas = cmp.compare_areas()
-                sizes = cmp.compare_sizes()
-                mse = cmp.compare_with_mse()
-                kld = cmp.compare_with_kld()
-                scx = (0.4 * mse) + (0.3 * kld) + (0.15 * areas) + (0.15 * sizes)
-                if sc is not None:
-                    # we already used coords to have a score
-                    sc = (sc+scx) / 2.
-                else:
-                    sc = scx
-
-            if sc is None:
-                sc = 0.
-            scores[ref_name] = sc
-
-        # choose the better score (or not!)
-        # if at least one image have a good score
-        scores = collections.Counter(scores)
-        sorted_scores = scores.most_common()
-        if sorted_scores[0][1] > self.__score_level:
-            return sorted_scores[0]
-
-        return None, 0.
+        return self.__best_score(self.__matrix.images_scores(image),
+                                 self.__image_score_level)
 
     # -----------------------------------------------------------------------
 
@@ -520,35 +820,24 @@ class sppasImagesSimilarity(object):
         :return: tuple(kid, score) or (None, 0.)
 
         """
-        scores = dict()
-        for ref_name in self.__kids:
-            ref_coords = self.__kids[ref_name].get_ref_coords()
-            cur_coords = self.__kids[ref_name].get_cur_coords()
-            sc1 = sc2 = None
-            if ref_coords is not None:
-                ccr = sppasCoordsCompare(ref_coords, coords)
-                sc1 = ccr.compare_coords()
-            if cur_coords is not None:
-                ccr = sppasCoordsCompare(cur_coords, coords)
-                sc2 = ccr.compare_coords()
-            if sc1 is None or sc2 is None:
-                if sc1 is None:
-                    sc = sc2
-                else:
-                    sc = sc1
-            else:
-                sc = (0.4 * sc1) + (0.6 * sc2)
-
-            if sc is None:
-                sc = 0.
-            scores[ref_name] = sc
-
-        # choose the better score (or not!)
-        # if at least one image have a good score
-        scores = collections.Counter(scores)
-        sorted_scores = scores.most_common()
-        if sorted_scores[0][1] > self.__score_level:
-            return sorted_scores[0]
+        return self.__best_score(self.__matrix.coords_scores(coords),
+                                 self.__score_level)
+
+    # -----------------------------------------------------------------------
+
+    def __best_score(self, scores, level):
+        """Return the identifier with the best of the given scores.
+
+        :param scores: (numpy.ndarray) A score for each known identifier
+        :param level: (float) Min score to identify
+        :return: tuple(kid, score) or (None, 0.) if the best is too low
+
+        """
+        if len(scores) > 0:
+            # the first one in case of equal scores
+            best = int(numpy.argmax(scores))
+            if scores[best] > level:
+                return list(self.__kids.keys())[best], float(scores[best])
 
         return None, 0.
 
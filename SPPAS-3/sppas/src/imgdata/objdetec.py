@@ -53,6 +53,8 @@ from sppas.src.config import msg
 
 from .coordinates import sppasCoords
 from .image import sppasImage
+from .imageutils import coords_to_array
+from .imageutils import intersection_areas
 
 # ---------------------------------------------------------------------------
 
@@ -81,6 +83,9 @@ class BaseObjectsDetector(object):
         >>> # Browse through the detected object coordinates:
         >>> for c in f:
         >>>     print(c)
+        >>> # Detect all the objects in several images
+        >>> for image in f.detect_all(images):
+        >>>     print(len(f))
 
     An object detector is instantiated from a model. It will be used to
     detect the objects matching the model in an image. Detected objects are
@@ -95,6 +100,7 @@ class BaseObjectsDetector(object):
 
     DEFAULT_MIN_RATIO = 0.05   # Min object area is 5% of the image
     DEFAULT_MIN_SCORE = 0.28   # Min value of the normalized confidence score
+    DEFAULT_BATCH_SIZE = 16    # Max number of images of a batch detection
 
     # -----------------------------------------------------------------------
 
@@ -118,6 +124,9 @@ class BaseObjectsDetector(object):
         # ranging [0., 1.]
         self.__min_score = BaseObjectsDetector.DEFAULT_MIN_SCORE
 
+        # Maximum number of images detected together by detect_all()
+        self.__batch_size = BaseObjectsDetector.DEFAULT_BATCH_SIZE
+
     # -----------------------------------------------------------------------
 
     def invalidate(self):
@@ -179,6 +188,28 @@ class BaseObjectsDetector(object):
 
     # -----------------------------------------------------------------------
 
+    def get_batch_size(self):
+        """Return the max number of images to detect objects together."""
+        return self.__batch_size
+
+    # -----------------------------------------------------------------------
+
+    def set_batch_size(self, value):
+        """Set the max number of images to detect objects together.
+
+        It is used by detect_all() with the detectors supporting batches.
+
+        :param value: (int) Value ranging [1, 256]
+        :raise: ValueError
+
+        """
+        value = BaseObjectsDetector.to_dtype(value)
+        if value < 1 or value > 256:
+            raise IntervalRangeException(value, 1, 256)
+        self.__batch_size = value
+
+    # -----------------------------------------------------------------------
+
     def get_best(self, nb=1):
         """Return a copy of the coordinates with the n-best scores.
 
@@ -255,10 +286,7 @@ class BaseObjectsDetector(object):
         self.invalidate()
 
         # Convert image to sppasImage if necessary
-        if isinstance(image, numpy.ndarray) is True:
-            image = sppasImage(input_array=image)
-        if isinstance(image, sppasImage) is False:
-            raise sppasTypeError("image", "sppasImage")
+        image = BaseObjectsDetector.to_image(image)
 
         # Verify if a model is instantiated
         if self._detector is None:
@@ -270,14 +298,39 @@ class BaseObjectsDetector(object):
         self._detection(image)
 
         # Filter and sort by confidence scores
-        self.filter_confidence(self.get_min_score())
-        self.sort_by_score()
+        self._filter_detection(image)
 
-        try:
-            self.filter_overlapped()
-            self.sort_by_score()
-        except NotImplementedError:
-            pass
+    # -----------------------------------------------------------------------
+
+    def detect_all(self, images):
+        """Determine the coordinates of all the detected objects of images.
+
+        This is a generator: at each step, the detected objects of the next
+        image are available, exactly like after invoking detect() with this
+        image. The detection is applied on batches of images, which is much
+        faster with the detectors supporting it.
+
+        A batch is analyzed by the current process, with the threads of
+        OpenCV. When several processes are detecting objects at the same
+        time, each one has to limit the number of threads of OpenCV with
+        cv2.setNumThreads(), like the processes detecting the faces of the
+        segments of a video do.
+
+        :param images: (list of sppasImage or numpy.ndarray)
+        :return: (generator of sppasImage) the current image
+
+        """
+        images = [BaseObjectsDetector.to_image(image) for image in images]
+        if self._detector is None:
+            raise sppasError(ERR_MODEL_MISS)
+
+        all_coords = self._batch_detection(images)
+        for image, coords in zip(images, all_coords):
+            self._coords = coords
+            self._filter_detection(image)
+            yield image
+
+        self.invalidate()
 
     # -----------------------------------------------------------------------
 
@@ -342,6 +395,23 @@ class BaseObjectsDetector(object):
 
     # -----------------------------------------------------------------------
 
+    @staticmethod
+    def to_image(image):
+        """Convert an image to sppasImage or raise the appropriate exception.
+
+        :param image: (sppasImage or numpy.ndarray)
+        :returns: (sppasImage)
+        :raises: TypeError
+
+        """
+        if isinstance(image, numpy.ndarray) is True:
+            image = sppasImage(input_array=image)
+        if isinstance(image, sppasImage) is False:
+            raise sppasTypeError("image", "sppasImage")
+        return image
+
+    # -----------------------------------------------------------------------
+
     @staticmethod
     def to_dtype(value, dtype=int):
         """Convert a value to dtype or raise the appropriate exception.
@@ -385,6 +455,43 @@ class BaseObjectsDetector(object):
 
     # -----------------------------------------------------------------------
 
+    def _batch_detection(self, images):
+        """Determine the coordinates of the detected objects of images.
+
+        Can be overridden by detectors supporting batches. By default, the
+        images are processed one after the other.
+
+        :param images: (list of sppasImage)
+        :return: (list of list of sppasCoords) Detected objects of each image
+
+        """
+        all_coords = list()
+        for image in images:
+            self.invalidate()
+            self._detection(image)
+            all_coords.append(self._coords)
+        self.invalidate()
+        return all_coords
+
+    # -----------------------------------------------------------------------
+
+    def _filter_detection(self, image):
+        """Filter and sort the detected objects of the given image.
+
+        :param image: (sppasImage) The image the objects were detected in
+
+        """
+        self.filter_confidence(self.get_min_score())
+        self.sort_by_score()
+
+        try:
+            self.filter_overlapped()
+            self.sort_by_score()
+        except NotImplementedError:
+            pass
+
+    # -----------------------------------------------------------------------
+
     def filter_overlapped(self, overlap=50.):
         """Remove overlapping detected objects.
 
@@ -577,6 +684,10 @@ class BaseNeuralNetDetector(BaseObjectsDetector):
         1. FP16 version of the original Caffe implementation (5.4 MB)
         2. 8 bit Quantized version using TensorFlow (2.7 MB)
 
+    Several images of the same size can be analyzed with a single forward
+    pass of the network: their blobs are stacked into a 4D blob and each
+    detection is assigned to its image by the first value of its row.
+
     """
 
     def __init__(self):
@@ -592,32 +703,81 @@ class BaseNeuralNetDetector(BaseObjectsDetector):
         """
         # make predictions
         try:
-            detections = self._net_detections(image)
+            detections = self._net_detections([image])
         except cv2.error as e:
             raise sppasError("DNN detection failed: {}".format(str(e)))
 
-        # Loops over the detections and for each object in detection
-        # get the confidence score.
-        w, h = image.size()
-        self._coords = list()
-        for i in range(detections.shape[2]):
-            # Sets the confidence score of the current object
-            confidence = detections[0, 0, i, 2]
+        self._coords = self.__detections_to_coords(detections, image)
 
-            # Filter out weak detections by ignoring too small objects,
-            # i.e. less than 5% of the image size.
-            new_coords = self.__to_coords(detections, i, w, h, confidence)
-            if new_coords.w > int(float(w) * self.get_min_ratio()) and new_coords.h > int(
-                    float(h) * self.get_min_ratio()):
-                self._coords.append(new_coords)
+    # -----------------------------------------------------------------------
+
+    def _batch_detection(self, images):
+        """Determine the coordinates of the detected objects of images.
+
+        Consecutive images of the same size are analyzed together, by
+        batches of at most 'batch_size' images. A batch is a single forward
+        pass of the net: OpenCV spreads it over its threads, not over the
+        images.
+
+        :param images: (list of sppasImage)
+        :return: (list of list of sppasCoords) Detected objects of each image
+
+        """
+        all_coords = list()
+        start = 0
+        while start < len(images):
+            # the images of the batch
+            size = images[start].size()
+            end = start + 1
+            while end < len(images) and end - start < self.get_batch_size() \
+                    and images[end].size() == size:
+                end += 1
+            batch = images[start:end]
+
+            # make predictions
+            try:
+                detections = self._net_detections(batch)
+            except cv2.error as e:
+                raise sppasError("DNN detection failed: {}".format(str(e)))
+
+            # split the detections of the batch into the ones of each image
+            if len(batch) == 1:
+                all_coords.append(self.__detections_to_coords(detections, batch[0]))
+            else:
+                image_ids = detections[0, 0, :, 0]
+                for i, image in enumerate(batch):
+                    image_detections = detections[:, :, image_ids == i, :]
+                    all_coords.append(self.__detections_to_coords(image_detections, image))
+
+            start = end
+
+        return all_coords
 
     # -----------------------------------------------------------------------
 
-    def _net_detections(self, image):
-        """To be overridden. Initialize net and blob for the processing.
+    def _net_detections(self, images):
+        """Run the net on images and return the detections.
 
+        :param images: (list of sppasImage) Images of the same size
         :returns: detections.
 
+        """
+        # To detect objects, pass the blob through the net to analyze it
+        self._detector.setInput(self._net_blob(images))
+
+        # Runs forward pass to compute output of layer.
+        # Then return the detections. They contain predictions about
+        # what the images contain, type: "numpy.ndarray"
+        return self._detector.forward()
+
+    # -----------------------------------------------------------------------
+
+    def _net_blob(self, images):
+        """To be overridden. Return the 4D blob of the images for the net.
+
+        :param images: (list of sppasImage) Images of the same size
+        :returns: (numpy.ndarray)
+
         """
         raise NotImplementedError
 
@@ -632,28 +792,63 @@ class BaseNeuralNetDetector(BaseObjectsDetector):
         """
         selected = [c for c in self._coords]
         self._coords = list()
+        if len(selected) == 0:
+            return
+
+        # Estimate the overlaps of all pairs of objects at once: rows are
+        # the objects, columns are the other ones.
+        boxes = coords_to_array(selected)
+        in_areas = intersection_areas(boxes)
+        with numpy.errstate(divide="ignore", invalid="ignore"):
+            area_s = (in_areas / (boxes[:, 2] * boxes[:, 3])[:, None]) * 100.
+        bigger = (boxes[:, 2][:, None] < boxes[:, 2][None, :]) | \
+                 (boxes[:, 3][:, None] < boxes[:, 3][None, :])
+        # reject an object if more than 50% of its area is overlapping
+        # another one and the other one has a bigger dimension, either w
+        # or h or both
+        rejecting = (in_areas > 0) & (area_s > overlap) & bigger & (boxes[:, 4] > 0.)[None, :]
+        numpy.fill_diagonal(rejecting, False)
+
+        invalidated = numpy.zeros(len(selected), dtype=bool)
         for i, coord in enumerate(selected):
-            # does this coord is overlapping some other ones?
-            keep_me = True
-            for j, other in enumerate(selected):
-                if i != j and coord.intersection_area(other) > 0:
-                    # if we did not already invalidated other
-                    if other.get_confidence() > 0.:
-                        area_o, area_s = coord.overlap(other)
-                        # reject this object if more than 50% of its area is
-                        # overlapping another one and the other one has a
-                        # bigger dimension, either w or h or both
-                        if area_s > overlap and (coord.w < other.w or coord.h < other.h):
-                            # Invalidate this coord. It won't be considered anymore.
-                            keep_me = False
-                            coord.set_confidence(0.)
-                            break
-
-            if keep_me is True:
+            # does this coord is overlapping some other ones we did not
+            # already invalidated?
+            if numpy.any(rejecting[i] & ~invalidated):
+                # Invalidate this coord. It won't be considered anymore.
+                invalidated[i] = True
+                coord.set_confidence(0.)
+            else:
                 self._coords.append(coord)
 
     # -----------------------------------------------------------------------
 
+    def __detections_to_coords(self, detections, image):
+        """Convert the net detections of an image into a list of sppasCoords.
+
+        :param detections: (numpy.ndarray) Detections of the image only
+        :param image: (sppasImage) The image the objects were detected in
+        :returns: A list of coordinates objects.
+
+        """
+        # Loops over the detections and for each object in detection
+        # get the confidence score.
+        w, h = image.size()
+        coords = list()
+        for i in range(detections.shape[2]):
+            # Sets the confidence score of the current object
+            confidence = detections[0, 0, i, 2]
+
+            # Filter out weak detections by ignoring too small objects,
+            # i.e. less than 5% of the image size.
+            new_coords = self.__to_coords(detections, i, w, h, confidence)
+            if new_coords.w > int(float(w) * self.get_min_ratio()) and new_coords.h > int(
+                    float(h) * self.get_min_ratio()):
+                coords.append(new_coords)
+
+        return coords
+
+    # -----------------------------------------------------------------------
+
     def __to_coords(self, detections, index, width, height, confidence):
         """Convert net detections into a list of sppasCoords.
 
@@ -714,33 +909,26 @@ class NeuralNetCaffeDetector(BaseNeuralNetDetector):
 
     # -----------------------------------------------------------------------
 
-    def _net_detections(self, image):
-        """Initialize net and blob for the processing.
+    def _net_blob(self, images):
+        """Return the 4D blob of the images for the net.
 
-        :returns: detections.
+        :param images: (list of sppasImage) Images of the same size
+        :returns: (numpy.ndarray)
 
         """
-        # Load the image and construct an input blob for the image.
+        # Load the images and construct an input blob for the images.
         # This blob corresponds to the defaults proto and model.
-        # blobFromImages creates 4-dimensional blob from image.
+        # blobFromImages creates 4-dimensional blob from images.
         # Optionally resizes and crops image from center, subtract mean
         # values, scales values by scalefactor, swap Blue and Red channels.
         # blobFromImage(image, scalefactor=1.0, size, mean, swapRB=False, crop=False)
         # but, to resize, I prefer my own solution: width will be proportional
-        img = image.iresize(width=0, height=360)
-        w, h = img.size()
+        imgs = [image.iresize(width=0, height=360) for image in images]
+        w, h = imgs[0].size()
         # In all tutorials, the following image conversion is given:
         # blob = cv2.dnn.blobFromImage(image, 1.0, (w, h), (104, 177, 123))
         # all but one different gives better result -- as far as I tested:
-        blob = cv2.dnn.blobFromImage(img, 1.0, (w, h), (103.93, 116.77, 123.68))
-
-        # To detect faces, pass the blob through the net to analyze it
-        self._detector.setInput(blob)
-
-        # Runs forward pass to compute output of layer.
-        # Then return the detections. They contain predictions about
-        # what the image contains, type: "numpy.ndarray"
-        return self._detector.forward()
+        return cv2.dnn.blobFromImages(imgs, 1.0, (w, h), (103.93, 116.77, 123.68))
 
 # ---------------------------------------------------------------------------
 
@@ -777,24 +965,17 @@ class NeuralNetTensorFlowDetector(BaseNeuralNetDetector):
 
     # -----------------------------------------------------------------------
 
-    def _net_detections(self, image):
-        """Initialize net and blob for the processing.
+    def _net_blob(self, images):
+        """Return the 4D blob of the images for the net.
 
-        :returns: detections.
+        :param images: (list of sppasImage) Images of the same size
+        :returns: (numpy.ndarray)
 
         """
-        # Load the image and construct an input blob
-        img = image.iresize(width=0, height=360)
-        w, h = img.size()
-        blob = cv2.dnn.blobFromImage(img, 1.0, (w, h), (103.93, 116.77, 123.68), False, False)
-
-        # To detect faces, pass the blob through the net to analyze it
-        self._detector.setInput(blob)
-
-        # Runs forward pass to compute output of layer.
-        # Then return the detections. They contain predictions about
-        # what the image contains, type: "numpy.ndarray"
-        return self._detector.forward()
+        # Load the images and construct an input blob
+        imgs = [image.iresize(width=0, height=360) for image in images]
+        w, h = imgs[0].size()
+        return cv2.dnn.blobFromImages(imgs, 1.0, (w, h), (103.93, 116.77, 123.68), False, False)
 
 # ---------------------------------------------------------------------------
 
@@ -828,23 +1009,16 @@ class NeuralNetONNXDetector(BaseNeuralNetDetector):
 
     # -----------------------------------------------------------------------
 
-    def _net_detections(self, image):
-        """Initialize net and blob for the processing.
+    def _net_blob(self, images):
+        """Return the 4D blob of the images for the net.
 
-        :returns: detections.
+        :param images: (list of sppasImage) Images of the same size
+        :returns: (numpy.ndarray)
 
         """
-        # Load the image and construct an input blob for the image.
+        # Load the images and construct an input blob for the images.
         # This blob corresponds to the default model
-        blob = cv2.dnn.blobFromImage(image, 1.0, (320, 240), (127, 127, 127), False, False)
-
-        # To detect faces, pass the blob through the net to analyze it
-        self._detector.setInput(blob)
-
-        # Runs forward pass to compute output of layer.
-        # Then return the detections. They contain predictions about
-        # what the image contains, type: "numpy.ndarray"
-        return self._detector.forward()
+        return cv2.dnn.blobFromImages(images, 1.0, (320, 240), (127, 127, 127), False, False)
 
 # ---------------------------------------------------------------------------
 # Detect object with a detector
@@ -893,6 +1067,7 @@ class sppasImageObjectDetection(BaseObjectsDetector):
         """Create a new ImageObjectDetection instance."""
         super(sppasImageObjectDetection, self).__init__()
         self._extension = ""
+        self.__models = list()
 
     # -----------------------------------------------------------------------
 
@@ -904,6 +1079,12 @@ class sppasImageObjectDetection(BaseObjectsDetector):
 
     # -----------------------------------------------------------------------
 
+    def get_models(self):
+        """Return the filenames of the models of the object recognizers."""
+        return list(self.__models)
+
+    # -----------------------------------------------------------------------
+
     def load_model(self, model, *args):
         """Instantiate detector(s) from the given models.
 
@@ -915,20 +1096,38 @@ class sppasImageObjectDetection(BaseObjectsDetector):
 
         """
         self._detector = list()
+        self.__models = list()
         detector = sppasImageObjectDetection.create_detector_from_extension(model)
         detector.load_model(model)
         self._detector.append(detector)
+        self.__models.append(model)
 
         for filename in args:
             try:
                 detector = sppasImageObjectDetection.create_detector_from_extension(filename)
                 detector.load_model(filename)
                 self._detector.append(detector)
+                self.__models.append(filename)
             except Exception as e:
                 logging.error(e)
 
         for detector in self._detector:
             detector.set_min_ratio(self.get_min_ratio() / len(self._detector))
+            detector.set_batch_size(self.get_batch_size())
+
+    # -----------------------------------------------------------------------
+
+    def set_batch_size(self, value):
+        """Override. Set the max number of images to detect objects together.
+
+        :param value: (int) Value ranging [1, 256]
+        :raise: ValueError
+
+        """
+        BaseObjectsDetector.set_batch_size(self, value)
+        if self._detector is not None:
+            for detector in self._detector:
+                detector.set_batch_size(value)
 
     # -----------------------------------------------------------------------
 
@@ -980,6 +1179,26 @@ class sppasImageObjectDetection(BaseObjectsDetector):
 
     # -----------------------------------------------------------------------
 
+    def _batch_detection(self, images):
+        """Determine the coordinates of the detected objects of images.
+
+        No filter nor sort is applied. Results are "as it".
+
+        :param images: (list of sppasImage)
+        :return: (list of list of sppasCoords) Detected objects of each image
+
+        """
+        all_coords = [list() for _ in images]
+        for detector in self._detector:
+            for i, image in enumerate(detector.detect_all(images)):
+                # Add detected objects to our list
+                for coord in detector:
+                    all_coords[i].append(coord)
+
+        return all_coords
+
+    # -----------------------------------------------------------------------
+
     def filter_overlapped(self, overlap=50., norm_score=True):
         """Remove overlapping detected objects and too small scores.
 
@@ -1002,35 +1221,35 @@ class sppasImageObjectDetection(BaseObjectsDetector):
                 c.set_confidence(score / float(len(self._detector)))
             detected.append(c)
 
+        # Estimate the overlaps of all pairs of objects at once: j object
+        # is overlapping i if more than 50% of its area is overlapping i.
+        if len(detected) > 1:
+            boxes = coords_to_array(detected)
+            in_areas = intersection_areas(boxes)
+            with numpy.errstate(divide="ignore", invalid="ignore"):
+                area_o = (in_areas / (boxes[:, 2] * boxes[:, 3])[None, :]) * 100.
+            overlapping = (in_areas > 0) & (area_o > overlap)
+            numpy.fill_diagonal(overlapping, False)
+        else:
+            overlapping = numpy.zeros((len(detected), len(detected)), dtype=bool)
+
         # Reduce the list of detected objects by selecting overlapping
         # objects and adjust their scores:
         #    - add confidence score to the one we keep and
         #    - cancel confidence score of the one we remove
-        for i, coord in enumerate(detected):
+        scores = [c.get_confidence() for c in detected]
+        for i in range(len(detected)):
             # does this coord is overlapping some other ones?
-            for j, other in enumerate(detected):
+            for j in numpy.flatnonzero(overlapping[i]):
                 # if we did not already cancelled the other coordinates
-                if other.get_confidence() == 0. or i == j:
+                if scores[j] == 0.:
                     continue
-                # if i and j are overlapping
-                if coord.intersection_area(other) > 0:
-                    # how much are they overlapping?
-                    area_o, area_s = coord.overlap(other)
-                    # reject j object if more than 50% of its area is
-                    # overlapping i. (normally i has a better score)
-                    if area_o > overlap:
-                        c = min(1., other.get_confidence() + coord.get_confidence())
-                        coord.set_confidence(c)
-                        other.set_confidence(0.)
-                    """
-                    # reject "i" object if more than 50% of its area is
-                    # overlapping "j" and "j" has a significant bigger 
-                    # dimension, either w or h or both
-                    if area_s > overlap and (coord.w < other.w or coord.h < other.h):
-                        c = min(1., other.get_confidence() + coord.get_confidence())
-                        coord.set_confidence(0.)
-                        other.set_confidence(c)
-                    """
+                # reject j object (normally i has a better score)
+                scores[i] = min(1., scores[j] + scores[i])
+                scores[j] = 0.
+        for coord, score in zip(detected, scores):
+            if score != coord.get_confidence():
+                coord.set_confidence(score)
 
         # Select results for norm_score = True or False
         # selected = list()
@@ -149,6 +149,21 @@ class TestImage(unittest.TestCase):
 
     # -----------------------------------------------------------------------
 
+    def test_surround(self):
+        blank = sppasImage(0).blank_image(100, 200)
+        coords = [sppasCoords(10, 10, 30, 30, 0.8), sppasCoords(60, 60)]
+
+        # a new image is tagged
+        img = blank.isurround(coords, color=(10, 20, 30), score=True)
+        self.assertEqual(0, numpy.count_nonzero(blank))
+        self.assertGreater(numpy.count_nonzero(img), 0)
+
+        # the image is tagged in-place, the same way
+        blank.surround(coords, color=(10, 20, 30), score=True)
+        self.assertTrue(numpy.array_equal(img, blank))
+
+    # -----------------------------------------------------------------------
+
     def test_crop(self):
         image = sppasImage(filename=TestImage.fn)
         cropped = image.icrop(sppasCoords(886, 222, 177, 189))
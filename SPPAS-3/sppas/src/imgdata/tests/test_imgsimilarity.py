@@ -0,0 +1,171 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.imgdata.tests.test_imgsimilarity.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+
+import os
+import unittest
+import numpy
+
+from sppas.src.config import IntervalRangeException
+
+from ..coordinates import sppasCoords
+from ..image import sppasImage
+from ..imgsimilarity import IdentitiesMatrix
+from ..imgsimilarity import sppasImagesSimilarity
+
+# ---------------------------------------------------------------------------
+
+
+class TestIdentitiesMatrix(unittest.TestCase):
+
+    def setUp(self):
+        x, y = numpy.meshgrid(numpy.arange(60), numpy.arange(80))
+        gray = (127 + 100 * numpy.sin(x / 5.) * numpy.cos(y / 7.)).astype(numpy.uint8)
+        self.img1 = sppasImage(input_array=numpy.dstack([gray, gray // 2, gray]))
+        self.img2 = sppasImage(input_array=numpy.dstack([255 - gray, gray, gray // 3]))
+
+    # -----------------------------------------------------------------------
+
+    def test_append_remove(self):
+        m = IdentitiesMatrix()
+        self.assertEqual(0, len(m))
+        for i in range(20):
+            self.assertEqual(i, m.append())
+            m.set_coords(i, sppasCoords(i * 10, 0, 10, 10))
+        self.assertEqual(20, len(m))
+
+        m.remove(0)
+        self.assertEqual(19, len(m))
+        scores = m.coords_scores(sppasCoords(10, 0, 10, 10))
+        self.assertEqual(19, len(scores))
+        self.assertEqual(1., scores[0])
+        self.assertEqual(0., scores[1])
+
+    # -----------------------------------------------------------------------
+
+    def test_images_scores(self):
+        m = IdentitiesMatrix()
+        m.append()
+        m.append()
+        m.append()
+        m.add_image(0, self.img1)
+        m.add_image(1, self.img2)
+        scores = m.images_scores(self.img1)
+        self.assertAlmostEqual(1., scores[0])
+        self.assertLess(scores[1], scores[0])
+        # no image for the 3rd identity
+        self.assertEqual(0., scores[2])
+
+        # the mean of images is updated incrementally
+        m.add_image(0, self.img2)
+        self.assertLess(m.images_scores(self.img1)[0], scores[0])
+        m.add_image(0, self.img1, reference=True)
+        self.assertAlmostEqual(1., m.images_scores(self.img1)[0])
+
+    # -----------------------------------------------------------------------
+
+    def test_images_window(self):
+        m = IdentitiesMatrix()
+        m.append(nb_img=3)
+        m.add_image(0, self.img1)
+        m.add_image(0, self.img2)
+        m.add_image(0, self.img2)
+        self.assertLess(m.images_scores(self.img2)[0], 0.999)
+        # img1 is out of the window of the last 3 images
+        m.add_image(0, self.img2)
+        self.assertAlmostEqual(1., m.images_scores(self.img2)[0])
+
+        # the windows follow the rows
+        m.append(nb_img=1)
+        m.add_image(1, self.img2)
+        m.add_image(1, self.img1)
+        m.remove(0)
+        self.assertAlmostEqual(1., m.images_scores(self.img1)[0])
+
+# ---------------------------------------------------------------------------
+
+
+class TestImagesSimilarity(unittest.TestCase):
+
+    def test_identify(self):
+        s = sppasImagesSimilarity()
+        self.assertEqual((None, 0.), s.identify(coords=sppasCoords(0, 0, 10, 10)))
+
+        k1 = s.create_identifier()
+        k2 = s.create_identifier()
+        k3 = s.create_identifier()
+        s.set_ref_coords(k1, sppasCoords(0, 0, 100, 100))
+        s.set_ref_coords(k2, sppasCoords(200, 0, 100, 100))
+        s.set_cur_coords(k2, sppasCoords(210, 10, 100, 100))
+        s.set_ref_coords(k3, sppasCoords(10, 10, 100, 100))
+
+        kid, score = s.identify(coords=sppasCoords(205, 5, 100, 100))
+        self.assertEqual(k2, kid)
+        self.assertAlmostEqual((0.4 * 0.9025) + (0.6 * 0.9025), score)
+        self.assertEqual((None, 0.), s.identify(coords=sppasCoords(500, 500, 10, 10)))
+
+        # the same as comparing each pair of identifiers
+        scores = s.compare_all_kids_coords()
+        for i, kid1 in enumerate(s):
+            for j, kid2 in enumerate(s):
+                self.assertAlmostEqual(s.compare_kids_coords(kid1, kid2), scores[i, j])
+
+        s.remove_identifier(k1)
+        self.assertEqual((2, 2), s.compare_all_kids_coords().shape)
+        kid, score = s.identify(coords=sppasCoords(10, 10, 100, 100))
+        self.assertEqual(k3, kid)
+        self.assertEqual(1., score)
+
+    # -----------------------------------------------------------------------
+
+    def test_identify_image(self):
+        x, y = numpy.meshgrid(numpy.arange(60), numpy.arange(80))
+        gray = (127 + 100 * numpy.sin(x / 5.) * numpy.cos(y / 7.)).astype(numpy.uint8)
+        img1 = sppasImage(input_array=numpy.dstack([gray, gray // 2, gray]))
+        grad = (x * 4).astype(numpy.uint8)
+        img2 = sppasImage(input_array=numpy.dstack([grad, grad, grad]))
+
+        s = sppasImagesSimilarity()
+        k1 = s.create_identifier(nb_img=5)
+        s.add_image(k1, img1, reference=True)
+        kid, score = s.identify(image=img1)
+        self.assertEqual(k1, kid)
+        self.assertAlmostEqual(1., score)
+        # a different image is not identified with the default level...
+        self.assertEqual((None, 0.), s.identify(image=img2))
+        # ... but it is with a low one
+        s.set_image_score_level(0.4)
+        self.assertEqual(k1, s.identify(image=img2)[0])
+        with self.assertRaises(IntervalRangeException):
+            s.set_image_score_level(1.5)
@@ -37,8 +37,14 @@ import os
 import unittest
 
 from sppas.src.config import paths
+from ..coordinates import sppasCoords
 from ..image import sppasImage
 from ..imageutils import sppasImageCompare
+from ..imageutils import coords_to_array
+from ..imageutils import array_to_coords
+from ..imageutils import intersection_areas
+from ..imageutils import coords_similarities
+from ..imageutils import sppasCoordsCompare
 
 # ---------------------------------------------------------------------------
 
@@ -198,3 +204,46 @@ class TestImageCompare(unittest.TestCase):
         print("* img1 vs neg-img1: {}".format(result))
         result = sppasImageCompare(img2, img2.inegative()).compare_with_kld()
         print("* img2 vs neg-img2: {}".format(result))
+
+# ---------------------------------------------------------------------------
+
+
+class TestCoordsArray(unittest.TestCase):
+
+    def test_coords_to_array(self):
+        coords = [sppasCoords(10, 20, 30, 40, 0.5), sppasCoords(1, 2, 3, 4)]
+        boxes = coords_to_array(coords)
+        self.assertEqual((2, 5), boxes.shape)
+        self.assertEqual([10., 20., 30., 40., 0.5], list(boxes[0]))
+        self.assertEqual([1., 2., 3., 4., 0.], list(boxes[1]))
+        self.assertEqual((0, 5), coords_to_array(list()).shape)
+
+        back = array_to_coords(boxes)
+        self.assertEqual(coords, back)
+        self.assertEqual(0.5, back[0].get_confidence())
+        self.assertEqual(0., back[1].get_confidence())
+        self.assertEqual(list(), array_to_coords(boxes[:0]))
+
+    def test_intersection_areas(self):
+        coords = [sppasCoords(0, 0, 100, 100),
+                  sppasCoords(50, 50, 100, 100),
+                  sppasCoords(100, 0, 10, 10),
+                  sppasCoords(300, 300, 10, 10)]
+        areas = intersection_areas(coords_to_array(coords))
+        self.assertEqual((4, 4), areas.shape)
+        for i, c1 in enumerate(coords):
+            for j, c2 in enumerate(coords):
+                self.assertEqual(c1.intersection_area(c2), areas[i, j])
+
+    def test_coords_similarities(self):
+        coords = [sppasCoords(0, 0, 100, 100),
+                  sppasCoords(50, 50, 100, 100),
+                  sppasCoords(100, 0, 10, 10)]
+        scores = coords_similarities(coords_to_array(coords))
+        for i, c1 in enumerate(coords):
+            for j, c2 in enumerate(coords):
+                self.assertEqual(sppasCoordsCompare(c1, c2).compare_coords(), scores[i, j])
+
+        scores = coords_similarities(coords_to_array(coords), coords_to_array(coords[:1]))
+        self.assertEqual((3, 1), scores.shape)
+        self.assertEqual(0.25, scores[1, 0])
@@ -190,15 +190,7 @@ class sppasAcModel(object):
                                  '{:s} is already in the model.'
                                  ''.format(hmm.get_name()))
 
-        if hmm.definition is None:
-            raise TypeError('Expected an hmm with a definition as key. '
-                            'No definition was given.')
-
-        if hmm.definition.get('states', None) is None or\
-                hmm.definition.get('transition', None) is None:
-            raise TypeError('Expected an hmm with a definition '
-                            'including states and transitions.')
-
+        sppasAcModel._check_hmm_definition(hmm)
         self._hmms.append(hmm)
 
     # -----------------------------------------------------------------------
@@ -280,13 +272,17 @@ class sppasAcModel(object):
         - replace all the "T_..." by the corresponding macro, for transitions.
 
         """
+        # Index the macros by their names, once for all the hmms
+        states_macros = self._get_macros_definitions('state')
+        transitions_macros = self._get_macros_definitions('transition')
+
         for hmm in self._hmms:
 
             states = hmm.definition['states']
             transition = hmm.definition['transition']
 
             if all(isinstance(state['state'], (collections.OrderedDict, collections.defaultdict)) for state in states) is False:
-                new_states = self._fill_states(states)
+                new_states = self._fill_states(states, states_macros)
                 if all(s is not None for s in new_states):
                     hmm.definition['states'] = new_states
                 else:
@@ -294,7 +290,7 @@ class sppasAcModel(object):
                                      '{:s}'.format(states))
 
             if isinstance(transition, (collections.OrderedDict, collections.defaultdict)) is False:
-                new_trs = self._fill_transition(transition)
+                new_trs = self._fill_transition(transition, transitions_macros)
                 if new_trs is not None:
                     hmm.definition['transition'] = new_trs
                 else:
@@ -430,33 +426,33 @@ class sppasAcModel(object):
         other_copy = copy.deepcopy(other)
         other_copy.fill_hmms()
 
-        # Merge the list of HMMs
+        # Merge the list of HMMs.
+        # The hmms of self are indexed by their names. The ones of the other
+        # model that are appended or that replace an existing one are added
+        # at the end of the list, in their order.
         appended = 0
         interpolated = 0
         kept = len(self._hmms)
         changed = 0
+        hmms = collections.OrderedDict((h.get_name(), h) for h in self._hmms)
+        new_hmms = list()
         for hmm in other_copy.get_hmms():
-            got = False
-            for h in self._hmms:
-                if h.get_name() == hmm.get_name():
-                    got = True
-                    if gamma == 1.0:
-                        pass
-                    elif gamma == 0.:
-                        self.pop_hmm(hmm.get_name())
-                        self.append_hmm(hmm)
-                        changed = changed + 1
-                        kept = kept - 1
-                    else:
-                        self_hmm = self.get_hmm(hmm.get_name())
-                        res = self_hmm.static_linear_interpolation(hmm, gamma)
-                        if res is True:
-                            interpolated = interpolated + 1
-                            kept = kept - 1
-                    break
-            if got is False:
-                self.append_hmm(hmm)
+            self_hmm = hmms.get(hmm.get_name(), None)
+            if self_hmm is None:
+                sppasAcModel._check_hmm_definition(hmm)
+                new_hmms.append(hmm)
                 appended = appended + 1
+            elif gamma == 0.:
+                hmms.pop(hmm.get_name())
+                new_hmms.append(hmm)
+                changed = changed + 1
+                kept = kept - 1
+            elif gamma < 1.:
+                res = self_hmm.static_linear_interpolation(hmm, gamma)
+                if res is True:
+                    interpolated = interpolated + 1
+                    kept = kept - 1
+        self._hmms[:] = list(hmms.values()) + new_hmms
 
         # Merge the tiedlists
         self._tiedlist.merge(other.get_tiedlist())
@@ -528,7 +524,38 @@ class sppasAcModel(object):
     # Private
     # -----------------------------------------------------------------------
 
-    def _fill_states(self, states):
+    @staticmethod
+    def _check_hmm_definition(hmm):
+        """Raise TypeError if the hmm has no states or no transition."""
+        if hmm.definition is None:
+            raise TypeError('Expected an hmm with a definition as key. '
+                            'No definition was given.')
+
+        if hmm.definition.get('states', None) is None or\
+                hmm.definition.get('transition', None) is None:
+            raise TypeError('Expected an hmm with a definition '
+                            'including states and transitions.')
+
+    # ----------------------------------
+
+    def _get_macros_definitions(self, key):
+        """Return a dict with name/definition of the macros of the given key.
+
+        :param key: (str) One of 'state', 'transition', 'variance', ...
+
+        """
+        definitions = dict()
+        if self._macros is not None:
+            for macro in self._macros:
+                if macro.get(key, None):
+                    definitions[macro[key]['name']] = macro[key]['definition']
+        return definitions
+
+    # ----------------------------------
+
+    def _fill_states(self, states, states_macros=None):
+        if states_macros is None:
+            states_macros = self._get_macros_definitions('state')
         new_states = list()
         for state in states:
             if isinstance(state['state'], (collections.OrderedDict,
@@ -536,30 +563,28 @@ class sppasAcModel(object):
                 new_states.append(state)
                 continue
             news = copy.deepcopy(state)
-            news['state'] = self._fill_state(state['state'])
+            news['state'] = self._fill_state(state['state'], states_macros)
             new_states.append(news)
         return new_states
 
     # ----------------------------------
 
-    def _fill_state(self, state):
-        new_state = None
-        if self._macros is not None:
-            for macro in self._macros:
-                if macro.get('state', None):
-                    if macro['state']['name'] == state:
-                        new_state = copy.deepcopy(macro['state']['definition'])
+    def _fill_state(self, state, states_macros=None):
+        if states_macros is None:
+            states_macros = self._get_macros_definitions('state')
+        new_state = states_macros.get(state, None)
+        if new_state is not None:
+            new_state = copy.deepcopy(new_state)
         return new_state
 
     # ----------------------------------
 
-    def _fill_transition(self, transition):
-        new_transition = None
-        if self._macros is not None:
-            for macro in self._macros:
-                if macro.get('transition', None):
-                    if macro['transition']['name'] == transition:
-                        new_transition = copy.deepcopy(macro['transition']['definition'])
+    def _fill_transition(self, transition, transitions_macros=None):
+        if transitions_macros is None:
+            transitions_macros = self._get_macros_definitions('transition')
+        new_transition = transitions_macros.get(transition, None)
+        if new_transition is not None:
+            new_transition = copy.deepcopy(new_transition)
         return new_transition
 
     # -----------------------------------------------------------------------
@@ -38,10 +38,12 @@ import glob
 
 from sppas.src.dependencies.grako.parsing import graken, Parser
 from sppas.src.utils.makeunicode import basestring
+from sppas.src.resources.dumpfile import sppasDumpFile
 
-from ..modelsexc import MioFolderError, MioFileError
+from ..modelsexc import MioFolderError, MioFileError, MioFileFormatError
 from .hmm import sppasHMM
 from .acmbaseio import sppasBaseIO
+from .htkparser import sppasHtkParser
 
 # ---------------------------------------------------------------------------
 
@@ -68,6 +70,11 @@ class sppasHtkIO(sppasBaseIO):
     This class is able to load and save HMM-based acoustic models from
     HTK-ASCII files.
 
+    Files are loaded with a dedicated tokenizer-based parser; the slower
+    grammar-based one is used only for the parts of the format this one
+    does not support. When a whole model folder is read, a dump of the
+    hmmdefs file is saved and re-used until the hmmdefs file is modified.
+
     """
     @staticmethod
     def detect(folder):
@@ -101,7 +108,7 @@ class sppasHtkIO(sppasBaseIO):
 
     # -----------------------------------------------------------------------
 
-    def read(self, folder, filename=None):
+    def read(self, folder, filename=None, nodump=False):
         """Load all known data from a folder or only the given file.
 
         The default file names are:
@@ -115,6 +122,7 @@ class sppasHtkIO(sppasBaseIO):
 
         :param folder: (str) Folder name of the acoustic model
         :param filename: (str) Optional name of a single file to read
+        :param nodump: (bool) Create or not a dump file of the hmmdefs
 
         """
         # Find the hmmdefs file, or the other files
@@ -133,9 +141,21 @@ class sppasHtkIO(sppasBaseIO):
             if len(hmmdefs_files) == 0:
                 raise MioFolderError(folder)
 
-        # Read the macros and the hmms
+        # Read the macros and the hmms, from a dump file if any
+        dp = None
+        data = None
+        if filename is None and nodump is False and \
+                os.path.basename(hmmdefs_files[0]) == "hmmdefs":
+            dp = sppasDumpFile(hmmdefs_files[0])
+            data = dp.load_from_dump()
+
         try:
-            self.read_macros_hmms(hmmdefs_files)
+            if data is None:
+                self.read_macros_hmms(hmmdefs_files)
+                if dp is not None:
+                    dp.save_as_dump(self.__dump_data())
+            else:
+                self.__load_dump_data(data)
         except Exception:
             raise MioFolderError(folder)
 
@@ -277,21 +297,40 @@ class sppasHtkIO(sppasBaseIO):
         if len(text) == 0:
             raise MioFileError(" ".join(filenames))
 
-        parser = HtkModelParser()
-        htk_model = HtkModelSemantics()  # OrderedDict()
-        model = parser.parse(text,
-                             rule_name='model',
-                             ignorecase=True,
-                             semantics=htk_model,
-                             comments_re="\(\*.*?\*\)",
-                             trace=False)
+        try:
+            model = sppasHtkParser().parse(text)
+        except MioFileFormatError:
+            parser = HtkModelParser()
+            htk_model = HtkModelSemantics()  # OrderedDict()
+            model = parser.parse(text,
+                                 rule_name='model',
+                                 ignorecase=True,
+                                 semantics=htk_model,
+                                 comments_re="\(\*.*?\*\)",
+                                 trace=False)
+
+        self.__load_dump_data(
+            (model['macros'], [(h['name'], h['definition'])
+                               for h in model['hmms']]))
+
+    # -----------------------------------------------------------------------
+
+    def __dump_data(self):
+        """Return the macros and the hmms, as saved into a dump file."""
+        return self._macros, [(h.get_name(), h.get_definition())
+                              for h in self._hmms]
+
+    # -----------------------------------------------------------------------
 
-        self._macros = model['macros']
+    def __load_dump_data(self, data):
+        """Set the macros and the hmms from the data of a dump file."""
+        macros, hmms = data
+        self._macros = macros
         self._hmms = list()
-        for h in model['hmms']:
+        for name, definition in hmms:
             new_hmm = sppasHMM()
-            new_hmm.set_name(h['name'])
-            new_hmm.set_definition(h['definition'])
+            new_hmm.set_name(name)
+            new_hmm.set_definition(definition)
             self._hmms.append(new_hmm)
 
     # -----------------------------------------------------------------------
@@ -501,8 +501,7 @@ class HMMInterpolation:
         :param gammas: List of coefficients (must sum to 1.)
 
         """
-        int_values = [v*g for (v, g) in zip(values, gammas)]
-        return sum(int_values)
+        return sum([v*g for (v, g) in zip(values, gammas)])
 
     # -----------------------------------------------------------------------
 
@@ -514,12 +513,9 @@ class HMMInterpolation:
         :param gammas: List of coefficients (must sum to 1.)
 
         """
-        intvec = list()
-        for i in range(len(vectors[0])):
-            values = [v[i] for v in vectors]
-            intvec.append(HMMInterpolation.linear_interpolate_values(values,
-                                                                     gammas))
-        return intvec
+        # Interpolate column by column: the i-th values of all the vectors
+        return [sum([v*g for (v, g) in zip(values, gammas)])
+                for values in zip(*vectors)]
 
     # -----------------------------------------------------------------------
 
@@ -531,12 +527,8 @@ class HMMInterpolation:
         :param gammas: List of coefficients (must sum to 1.)
 
         """
-        intmat = list()
-        for i in range(len(matrices[0])):
-            vectors = [m[i] for m in matrices]
-            intmat.append(HMMInterpolation.linear_interpolate_vectors(vectors,
-                                                                      gammas))
-        return intmat
+        return [HMMInterpolation.linear_interpolate_vectors(vectors, gammas)
+                for vectors in zip(*matrices)]
 
     # -----------------------------------------------------------------------
 
@@ -560,8 +552,7 @@ class HMMInterpolation:
         matrix = HMMInterpolation.linear_interpolate_matrix(trans_matrix,
                                                             gammas)
 
-        # t = collections.OrderedDict()
-        t = copy.deepcopy(transitions[0])
+        t = copy.copy(transitions[0])
         t['matrix'] = matrix
         return t
 
@@ -577,20 +568,26 @@ class HMMInterpolation:
         :returns: state (OrderedDict)
 
         """
-        # interpolated state
-        int_state = copy.deepcopy(states[0])
-
         # get states
         state = [s['state'] for s in states]
         if all(type(item) == collections.OrderedDict for item in state) is False:
             return None
 
+        # interpolated state: the streams are created below, so that only
+        # the other keys have to be copied.
+        int_state = copy.copy(states[0])
+        int_state['state'] = collections.OrderedDict()
+        for key, value in state[0].items():
+            if key == 'streams':
+                int_state['state'][key] = list(value)
+            else:
+                int_state['state'][key] = copy.deepcopy(value)
+
         # Keys of state are: 'streams', 'streams_mixcount', 'weights', 'duration'
 
         # streams / weights are lists.
         streams = [s['streams'] for s in state]
-        for i in range(len(streams[0])):
-            values = [v[i] for v in streams]
+        for i, values in enumerate(zip(*streams)):
             int_state['state']['streams'][i] = \
                 HMMInterpolation.linear_interpolate_streams(values, gammas)
 
@@ -616,11 +613,11 @@ class HMMInterpolation:
 
         """
         # interpolated mixtures
-        int_mix = copy.deepcopy(streams[0])
+        int_mix = copy.copy(streams[0])
 
         mixtures = [item['mixtures'] for item in streams]
-        for i in range(len(mixtures[0])):
-            values = [v[i] for v in mixtures]
+        int_mix['mixtures'] = list(mixtures[0])
+        for i, values in enumerate(zip(*mixtures)):
             int_mix['mixtures'][i] = \
                 HMMInterpolation.linear_interpolate_mixtures(values, gammas)
 
@@ -668,9 +665,16 @@ class HMMInterpolation:
         if int_mean is None or int_vari is None or int_gcst is None:
             return None
 
-        int_mixt = copy.deepcopy(mixtures[0])
+        # Only the dicts on the path to the interpolated values are copied
+        pdf = pdfs[0]
+        int_mixt = copy.copy(mixtures[0])
         int_mixt['weight'] = int_wgt
+        int_mixt['pdf'] = copy.copy(pdf)
+        int_mixt['pdf']['mean'] = copy.copy(pdf['mean'])
         int_mixt['pdf']['mean']['vector'] = int_mean
+        int_mixt['pdf']['covariance'] = copy.copy(pdf['covariance'])
+        int_mixt['pdf']['covariance']['variance'] = \
+            copy.copy(pdf['covariance']['variance'])
         int_mixt['pdf']['covariance']['variance']['vector'] = int_vari
         int_mixt['pdf']['gconst'] = int_gcst
 
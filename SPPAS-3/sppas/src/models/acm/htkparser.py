@@ -0,0 +1,500 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.models.acm.htkparser.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+import re
+import collections
+
+from ..modelsexc import MioFileFormatError
+
+# ---------------------------------------------------------------------------
+
+# A keyword of the HTK-ASCII format is either a macro with its name (the
+# rest of the line), or a symbol between "<" and ">". Global options macros
+# have no name. The text between two keywords is a block of numbers.
+KEYWORDS_RE = re.compile(r'(~[oO](?=[\s<]|$)|~[a-zA-Z][^\n]*|<[^>\n]*>)')
+COMMENTS_RE = re.compile(r'\(\*.*?\*\)')
+
+COV_KINDS = ('diagc', 'invdiagc', 'fullc', 'lltc', 'xformc')
+DUR_KINDS = ('nulld', 'poissond', 'gammad', 'gen')
+BASE_KINDS = ('discrete', 'lpcepstra', 'lpdelcep', 'lprefc', 'lpc',
+              'mfcc', 'fbank', 'melspec', 'user')
+PARM_OPTIONS = ('_D', '_A', '_T', '_E', '_N', '_Z', '_O', '_0', '_V', '_C', '_K')
+
+# Tokens starting a mixture, a stream, or an option
+MIXTURE_START = ('<mixture>', '~m', '<rclass>', '<mean>', '~u')
+STREAM_START = ('<stream>', '<tmix>', '<dprob>') + MIXTURE_START
+
+# ---------------------------------------------------------------------------
+
+
+class sppasHtkParser(object):
+    """Tokenizer-based parser of HTK-ASCII acoustic models.
+
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2021  Brigitte Bigi
+    :author:       Brigitte Bigi
+    :contact:      develop@sppas.org
+
+    The text is split into keywords and blocks of numbers with a single
+    regular expression, then a recursive descent fills the macros and the
+    hmms. The result is the same as the one of the grammar-based
+    HtkModelParser with HtkModelSemantics -- same OrderedDict keys in the
+    same order, same lists of floats, but it is built in a fraction of the
+    time.
+
+    Only the parts of the format that SPPAS can write are supported: the
+    other ones (regression trees, input transforms, full covariances,
+    tied-mixtures or discrete pdfs) raise MioFileFormatError.
+
+    :Example:
+
+        >>> model = sppasHtkParser().parse(text)
+        >>> macros = model['macros']
+        >>> hmms = model['hmms']
+
+    """
+
+    def __init__(self):
+        """Create a sppasHtkParser instance."""
+        self.__tokens = list()
+        self.__pos = 0
+
+    # -----------------------------------------------------------------------
+
+    def parse(self, text):
+        """Parse the text of an HTK-ASCII model.
+
+        :param text: (str) Content of the macros and/or hmms files
+        :returns: (OrderedDict) with 'macros' and 'hmms' keys
+        :raises: MioFileFormatError
+
+        """
+        self.__tokenize(text)
+        try:
+            model = self._model()
+        except (ValueError, IndexError):
+            raise MioFileFormatError("HTK-ASCII")
+
+        if self.__pos < len(self.__tokens):
+            raise MioFileFormatError(self.__tokens[self.__pos][1])
+
+        return model
+
+    # -----------------------------------------------------------------------
+    # Rules
+    # -----------------------------------------------------------------------
+
+    def _model(self):
+        macros = list()
+        hmms = list()
+        while self.__peek() in ('~o', '~t', '~s', '~v', '~u', '~d'):
+            macros.append(self._macrodef())
+        while self.__peek() in ('~h', '<beginhmm>'):
+            hmms.append(self._hmmmacro())
+
+        # An empty closure is appended after the non-empty ones
+        d = collections.OrderedDict()
+        if len(macros) > 0:
+            d['macros'] = macros
+        if len(hmms) > 0:
+            d['hmms'] = hmms
+        return sppasHtkParser.__define(d, (), ('macros', 'hmms'))
+
+    # -----------------------------------------------------------------------
+
+    def _macrodef(self):
+        key = self.__peek()
+        if key == '~o':
+            self.__next()
+            macro = ('options',
+                     collections.OrderedDict(definition=self._global_opts()))
+        else:
+            name = self.__macro_name()
+            if key == '~t':
+                macro = ('transition', self.__named(name, self._transp_def()))
+            elif key == '~s':
+                macro = ('state', self.__named(name, self._stateinfo_def()))
+            elif key == '~v':
+                macro = ('variance', self.__named(name, self._vector_def('<variance>')))
+            elif key == '~u':
+                macro = ('mean', self.__named(name, self._vector_def('<mean>')))
+            else:
+                macro = ('duration', self.__named(name, self._vector_def('<duration>')))
+
+        d = collections.OrderedDict([macro])
+        return sppasHtkParser.__define(
+            d, ('transition', 'state', 'options', 'variance', 'mean', 'duration'))
+
+    # -----------------------------------------------------------------------
+
+    def _hmmmacro(self):
+        d = collections.OrderedDict()
+        if self.__peek() == '~h':
+            d['name'] = self.__macro_name()
+        d['definition'] = self._hmm_def()
+        return sppasHtkParser.__define(d, ('name', 'definition'))
+
+    # -----------------------------------------------------------------------
+
+    def _hmm_def(self):
+        self.__expect('<beginhmm>')
+        d = collections.OrderedDict()
+        if self.__peek() not in ('<numstates>', None):
+            d['options'] = self._global_opts()
+        self.__expect('<numstates>')
+        d['state_count'] = int(self.__numbers(1)[0])
+        d['states'] = list()
+        while self.__peek() == '<state>':
+            self.__next()
+            state = collections.OrderedDict()
+            state['index'] = int(self.__numbers(1)[0])
+            if self.__peek() == '~s':
+                state['state'] = self.__macro_name()
+            else:
+                state['state'] = self._stateinfo_def()
+            d['states'].append(state)
+        if len(d['states']) == 0:
+            raise ValueError('<State>')
+
+        if self.__peek() == '~t':
+            d['transition'] = self.__macro_name()
+        else:
+            d['transition'] = self._transp_def()
+        duration = self._duration()
+        if duration is not None:
+            d['duration'] = duration
+        self.__expect('<endhmm>')
+
+        return sppasHtkParser.__define(
+            d, ('options', 'state_count', 'regression_tree', 'transition', 'duration'),
+            ('states', ))
+
+    # -----------------------------------------------------------------------
+
+    def _global_opts(self):
+        options = list()
+        while True:
+            key = self.__peek()
+            if key is None or key.startswith('<') is False:
+                break
+            option = self._option(self.__tokens[self.__pos][2][1:-1])
+            if option is None:
+                break
+            options.append(option)
+
+        if len(options) == 0:
+            raise ValueError('option')
+        return options
+
+    # -----------------------------------------------------------------------
+
+    def _option(self, symbol):
+        """Return the option of the given symbol or None if not an option."""
+        lower = symbol.lower()
+        d = collections.OrderedDict()
+        if lower == 'hmmsetid':
+            self.__next()
+            d['hmm_set_id'] = sppasHtkParser.__unquote(self.__text())
+        elif lower == 'streaminfo':
+            self.__next()
+            values = [int(v) for v in self.__numbers(1)]
+            d['stream_info'] = collections.OrderedDict(
+                [('count', values[0]), ('sizes', values[1:])])
+        elif lower == 'vecsize':
+            self.__next()
+            d['vector_size'] = int(self.__numbers(1)[0])
+        elif lower in COV_KINDS:
+            self.__next()
+            d['covariance_kind'] = lower
+        elif lower in DUR_KINDS:
+            self.__next()
+            d['duration_kind'] = lower
+        else:
+            parm_kind = sppasHtkParser.__parm_kind(symbol)
+            if parm_kind is None:
+                return None
+            self.__next()
+            d['parameter_kind'] = parm_kind
+
+        return sppasHtkParser.__define(
+            d, ('hmm_set_id', 'stream_info', 'vector_size', 'input_transform',
+                'covariance_kind', 'duration_kind', 'parameter_kind'))
+
+    # -----------------------------------------------------------------------
+
+    def _stateinfo_def(self):
+        d = collections.OrderedDict()
+        if self.__peek() == '<nummixes>':
+            self.__next()
+            d['streams_mixcount'] = [int(v) for v in self.__numbers(1)]
+        if self.__peek() == '~w':
+            d['weights'] = self.__macro_name()
+        elif self.__peek() == '<sweights>':
+            d['weights'] = self._vector_def('<sweights>')
+
+        d['streams'] = list()
+        while self.__peek() in STREAM_START:
+            d['streams'].append(self._stream())
+        if len(d['streams']) == 0:
+            raise ValueError('<Stream>')
+
+        duration = self._duration()
+        if duration is not None:
+            d['duration'] = duration
+
+        return sppasHtkParser.__define(
+            d, ('streams_mixcount', 'weights', 'duration'), ('streams', ))
+
+    # -----------------------------------------------------------------------
+
+    def _stream(self):
+        d = collections.OrderedDict()
+        if self.__peek() == '<stream>':
+            self.__next()
+            d['dim'] = int(self.__numbers(1)[0])
+        if self.__peek() in ('<tmix>', '<dprob>'):
+            raise ValueError(self.__peek())
+
+        d['mixtures'] = list()
+        while self.__peek() in MIXTURE_START:
+            d['mixtures'].append(self._mixture())
+        if len(d['mixtures']) == 0:
+            raise ValueError('<Mixture>')
+
+        return sppasHtkParser.__define(
+            d, ('dim', 'tmixpdf', 'discpdf'), ('mixtures', ))
+
+    # -----------------------------------------------------------------------
+
+    def _mixture(self):
+        d = collections.OrderedDict()
+        if self.__peek() == '<mixture>':
+            self.__next()
+            values = self.__numbers(2)
+            d['index'] = int(values[0])
+            d['weight'] = float(values[1])
+        if self.__peek() == '~m':
+            d['pdf'] = self.__macro_name()
+        else:
+            d['pdf'] = self._mixpdf_def()
+
+        return sppasHtkParser.__define(d, ('index', 'weight', 'pdf'))
+
+    # -----------------------------------------------------------------------
+
+    def _mixpdf_def(self):
+        d = collections.OrderedDict()
+        if self.__peek() == '<rclass>':
+            self.__next()
+            d['regression_class'] = int(self.__numbers(1)[0])
+
+        if self.__peek() == '~u':
+            d['mean'] = self.__macro_name()
+        else:
+            d['mean'] = self._vector_def('<mean>')
+
+        if self.__peek() == '~v':
+            variance = self.__macro_name()
+        else:
+            variance = self._vector_def('<variance>')
+        d['covariance'] = collections.OrderedDict(variance=variance)
+
+        if self.__peek() == '<gconst>':
+            self.__next()
+            d['gconst'] = float(self.__numbers(1)[0])
+
+        return sppasHtkParser.__define(
+            d, ('regression_class', 'mean', 'covariance', 'gconst'))
+
+    # -----------------------------------------------------------------------
+
+    def _duration(self):
+        """Return the optional duration, or None."""
+        if self.__peek() == '~d':
+            return self.__macro_name()
+        if self.__peek() == '<duration>':
+            return self._vector_def('<duration>')
+        return None
+
+    # -----------------------------------------------------------------------
+
+    def _vector_def(self, symbol):
+        """A mean, a variance, a duration or weights: dim then vector."""
+        self.__expect(symbol)
+        values = self.__numbers(1)
+        vector = [float(v) for v in values[1:]]
+        if len(vector) == 0:
+            raise ValueError(symbol)
+
+        return collections.OrderedDict([('dim', int(values[0])),
+                                        ('vector', vector)])
+
+    # -----------------------------------------------------------------------
+
+    def _transp_def(self):
+        self.__expect('<transp>')
+        values = self.__numbers(2)
+        dim = int(values[0])
+        array = [float(v) for v in values[1:]]
+        # Only complete rows are kept, like HtkModelSemantics does.
+        size = len(array) - (len(array) % dim)
+        matrix = [array[i:i+dim] for i in range(0, size, dim)]
+
+        return collections.OrderedDict([('dim', dim), ('matrix', matrix)])
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __tokenize(self, text):
+        """Split the text into a list of (kind, key, text).
+
+        kind is 'K' for a keyword and 'N' for a block of numbers. key is the
+        lower-case keyword or the macro type, like '~h'.
+
+        """
+        text = COMMENTS_RE.sub("", text)
+        self.__tokens = list()
+        self.__pos = 0
+        for i, part in enumerate(KEYWORDS_RE.split(text)):
+            if i % 2 == 1:
+                if part.startswith('~'):
+                    key = part[:2].lower()
+                else:
+                    key = part.lower()
+                self.__tokens.append(('K', key, part))
+            else:
+                part = part.strip()
+                if len(part) > 0:
+                    self.__tokens.append(('N', None, part))
+
+    # -----------------------------------------------------------------------
+
+    def __peek(self):
+        """Return the key of the current keyword or None."""
+        if self.__pos < len(self.__tokens):
+            return self.__tokens[self.__pos][1]
+        return None
+
+    # -----------------------------------------------------------------------
+
+    def __next(self):
+        token = self.__tokens[self.__pos]
+        self.__pos += 1
+        return token
+
+    # -----------------------------------------------------------------------
+
+    def __expect(self, key):
+        if self.__peek() != key:
+            raise ValueError(key)
+        self.__pos += 1
+
+    # -----------------------------------------------------------------------
+
+    def __text(self):
+        """Return the text following a keyword, until the end of line."""
+        kind, key, text = self.__next()
+        if kind != 'N':
+            raise ValueError(text)
+        return text.split('\n')[0]
+
+    # -----------------------------------------------------------------------
+
+    def __numbers(self, minimum):
+        """Return the block of numbers following a keyword."""
+        kind, key, text = self.__next()
+        if kind != 'N':
+            raise ValueError(text)
+        values = text.split()
+        if len(values) < minimum:
+            raise ValueError(text)
+        return values
+
+    # -----------------------------------------------------------------------
+
+    def __macro_name(self):
+        """Return the unquoted name of the current macro."""
+        kind, key, text = self.__next()
+        if kind != 'K' or key.startswith('~') is False:
+            raise ValueError(text)
+        return sppasHtkParser.__unquote(text[2:].strip())
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __named(name, definition):
+        return collections.OrderedDict([('name', name),
+                                        ('definition', definition)])
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __unquote(txt):
+        if txt.startswith('"') and txt.endswith('"'):
+            return txt[1:-1]
+        return txt
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __parm_kind(symbol):
+        """Return the parameter kind of a symbol or None."""
+        lower = symbol.lower()
+        for base in BASE_KINDS:
+            if lower.startswith(base):
+                options = list()
+                tail = symbol[len(base):].upper()
+                while len(tail) > 0:
+                    if tail[:2] not in PARM_OPTIONS:
+                        return None
+                    options.append(tail[:2])
+                    tail = tail[2:]
+                return collections.OrderedDict([('base', base),
+                                                ('options', options)])
+        return None
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def __define(d, keys, list_keys=()):
+        """Add the missing keys, like the grammar-based parser does."""
+        for key in list_keys:
+            if key not in d:
+                d[key] = list()
+        for key in keys:
+            if key not in d:
+                d[key] = None
+        return d
@@ -58,6 +58,8 @@ class sppasTiedList(object):
         """Create a sppasTiedList instance."""
         self.observed = list()
         self.tied = dict()
+        # Index of the observed entries, to check membership in O(1)
+        self.__observed = set()
 
     # -----------------------------------------------------------------------
 
@@ -113,7 +115,7 @@ class sppasTiedList(object):
         :param entry: (str) triphone/biphone/monophone
 
         """
-        return entry in self.observed
+        return entry in self.__observed
 
     # -----------------------------------------------------------------------
 
@@ -137,7 +139,7 @@ class sppasTiedList(object):
         :returns: bool
 
         """
-        if tied in self.tied or tied in self.observed:
+        if tied in self.tied or tied in self.__observed:
             return False
 
         if observed is None:
@@ -179,8 +181,9 @@ class sppasTiedList(object):
         :returns: bool
 
         """
-        if entry not in self.observed:
+        if entry not in self.__observed:
             self.observed.append(entry)
+            self.__observed.add(entry)
             return True
         return False
 
@@ -213,10 +216,11 @@ class sppasTiedList(object):
         that are using this observed item.
 
         """
-        if entry in self.observed:
+        if entry in self.__observed:
             self.observed.remove(entry)
+            self.__observed.discard(entry)
             if propagate is True:
-                for k, v in self.tied.items():
+                for k, v in list(self.tied.items()):
                     if v == entry:
                         self.tied.pop(k)
 
@@ -66,10 +66,13 @@ class sppasArpaIO(object):
         """Set the model of the sppasSLM.
 
         :param slm: (list) List of tuples for 1-gram, 2-grams, ...
+        Each n-gram model can be either a list or a sized iterable, like
+        the probabilities of sppasNgramsModel with stream option.
 
         """
         if not (isinstance(slm, list) and
-                all([isinstance(m, list) for m in slm])):
+                all([hasattr(m, "__len__") and hasattr(m, "__iter__")
+                     and not isinstance(m, str) for m in slm])):
             raise ModelsDataTypeError("slm",
                                       "list of lists of tuples",
                                       type(slm))
@@ -149,12 +152,21 @@ class sppasArpaIO(object):
 
          \end\
 
+        The n-grams are written one after the other so that the model is
+        never serialized into a string.
+
         :param filename: (str) File where to save the model.
 
         """
         if self.__slm is not None:
             with codecs.open(filename, 'w', sg.__encoding__) as f:
-                f.write(self._serialize_slm())
+                f.write(self._serialize_header())
+                for n, m in enumerate(self.__slm):
+                    f.write("\\"+str(n+1)+"-grams: \n")
+                    for ngram in m:
+                        f.write(sppasArpaIO._serialize_line(*ngram))
+                    f.write("\n")
+                f.write(sppasArpaIO._serialize_footer())
 
     # -----------------------------------------------------------------------
     # Private
@@ -207,16 +219,27 @@ class sppasArpaIO(object):
         r = "\\"+str(order)+"-grams: \n"
 
         for (wseq, lp, bo) in model:
-            r += str(round(lp, 6)) + "\t" + wseq
-            if bo is not None:
-                r += "\t"+str(round(bo, 6))
-            r += "\n"
+            r += sppasArpaIO._serialize_line(wseq, lp, bo)
         r += "\n"
 
         return r
 
     # -----------------------------------------------------------------------
 
+    @staticmethod
+    def _serialize_line(wseq, lp, bo):
+        """Serialize one n-gram of an ARPA file.
+
+        p(a_z)  a_z  bow(a_z)
+
+        """
+        r = str(round(lp, 6)) + "\t" + wseq
+        if bo is not None:
+            r += "\t"+str(round(bo, 6))
+        return r + "\n"
+
+    # -----------------------------------------------------------------------
+
     @staticmethod
     def _serialize_footer():
         r"""Serialize the footer of an ARPA file.
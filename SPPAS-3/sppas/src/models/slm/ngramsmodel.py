@@ -33,6 +33,7 @@
 
 """
 import collections
+import concurrent.futures
 import math
 
 from sppas.src.config import symbols
@@ -193,17 +194,36 @@ class sppasNgramsModel(object):
 
     # -----------------------------------------------------------------------
 
-    def count(self, *datafiles):
+    def count(self, *datafiles, nb_workers=1):
         """Count ngrams from data files.
 
+        With several workers, the files are shared out into shards and each
+        shard is counted by a process of a pool. The counts of the shards
+        are then merged, always in the same order, and the minimum count is
+        applied: the result is the same as the one of a single process.
+
         :param datafiles: (*args) is a set of file names, with UTF-8 encoding.
         If the file contains more than one tier, only the first one is used.
+        :param nb_workers: (int) Number of processes to count the shards
 
         """
         self._create_counters()
 
-        for ngram_counter in self._ngramcounts:
-            ngram_counter.count(*datafiles)
+        nb_workers = min(int(nb_workers), len(datafiles))
+        if nb_workers > 1:
+            shards = [datafiles[i::nb_workers] for i in range(nb_workers)]
+            with concurrent.futures.ProcessPoolExecutor(nb_workers) as executor:
+                results = executor.map(count_ngrams,
+                                       [self.order] * nb_workers,
+                                       [self.wrdlist] * nb_workers,
+                                       shards)
+                for counters in results:
+                    for ngram_counter, shard_counter in zip(self._ngramcounts, counters):
+                        ngram_counter.merge(shard_counter)
+        else:
+            counters = count_ngrams(self.order, self.wrdlist, datafiles)
+            for ngram_counter, shard_counter in zip(self._ngramcounts, counters):
+                ngram_counter.merge(shard_counter)
 
         # We already fixed a count threshold
         if self.mincount > 1:
@@ -245,12 +265,17 @@ class sppasNgramsModel(object):
 
     # -----------------------------------------------------------------------
 
-    def probabilities(self, method="lograw"):
+    def probabilities(self, method="lograw", stream=False):
         """Return a list of probabilities.
 
         :param method: (str) method to estimate probabilities
+        :param stream: (bool) Estimate the probabilities only when iterated
         :returns: list of n-gram probabilities.
 
+        If stream is True, the probabilities of each order is a sized
+        iterable instead of a list: it can be given to sppasArpaIO to save
+        the model without keeping all the probabilities in memory.
+
         :Example:
 
             >>> probas = probabilities("logml")
@@ -269,18 +294,25 @@ class sppasNgramsModel(object):
         method = su.to_lower()
 
         if method == "raw":
-            return self._probas_as_raw(tolog=False)
-
-        if method == "lograw":
-            return self._probas_as_raw(tolog=True)
-
-        if method == "ml":
-            return self._probas_as_ml(tolog=False)
+            estimator, tolog = self._probas_as_raw, False
+        elif method == "lograw":
+            estimator, tolog = self._probas_as_raw, True
+        elif method == "ml":
+            estimator, tolog = self._probas_as_ml, False
+        elif method == "logml":
+            estimator, tolog = self._probas_as_ml, True
+        else:
+            raise NgramMethodNameError(method)
 
-        if method == "logml":
-            return self._probas_as_ml(tolog=True)
+        models = list()
+        for n in range(len(self._ngramcounts)):
+            probas = sppasNgramsProbas(len(self._ngramcounts[n]),
+                                       estimator, n, tolog)
+            if stream is False:
+                probas = list(probas)
+            models.append(probas)
 
-        raise NgramMethodNameError(method)
+        return models
 
     # -----------------------------------------------------------------------
     # Private
@@ -299,95 +331,110 @@ class sppasNgramsModel(object):
 
     # -----------------------------------------------------------------------
 
-    def _probas_as_raw(self, tolog=True):
+    def _probas_as_raw(self, n, tolog=True):
         """Do not estimate probas... just return raw counts.
 
+        :param n: (int) Index of the counter, i.e. the order-1.
         :param tolog: (bool)
 
         """
-        models = []
-
-        for n in range(len(self._ngramcounts)):
-
-            ngram = []
-            for entry in self._ngramcounts[n].get_ngrams():
-                token = " ".join(entry)
-                c = self._ngramcounts[n].get_count(token)
-                if token == self._ss and tolog is True:
-                    ngram.append((self._ss, -99, None))
+        for entry, c in self._ngramcounts[n].get_ngrams_counts():
+            token = " ".join(entry)
+            if token == self._ss and tolog is True:
+                yield self._ss, -99, None
+            else:
+                if tolog is False:
+                    yield token, c, None
                 else:
-                    if tolog is False:
-                        ngram.append((token, c, None))
-                    else:
-                        ngram.append((token, math.log(c, 10.), None))
-            models.append(ngram)
-
-        return models
+                    yield token, math.log(c, 10.), None
 
     # -----------------------------------------------------------------------
 
-    def _probas_as_ml(self, tolog=True):
+    def _probas_as_ml(self, n, tolog=True):
         r"""Estimate probas with maximum likelihood method.
 
         (1) p(a_z) = c(a_z)/c(a_)
 
+        The n-grams are sorted, so that all the n-grams sharing the same
+        history a_ are consecutive: c(a_) is then get only once for all of
+        them and the probabilities are estimated in one pass.
+
+        :param n: (int) Index of the counter, i.e. the order-1.
         :param tolog: (bool)
 
         """
-        models = []
+        old_hist = None
+        total = float(self._ngramcounts[n].get_ncount())
+        for entry, c in self._ngramcounts[n].get_ngrams_counts():
+
+            # Estimates c(a_)
+            if n > 0:
+                hist = entry[:-1]
+                if hist != old_hist:
+                    if n == 1 and hist[0] == self._ss:
+                        total = float(self._ngramcounts[n-1].get_ngram_count((self._es,)))
+                    else:
+                        total = float(self._ngramcounts[n-1].get_ngram_count(hist))
+                    old_hist = hist
+
+            # Estimates p(a_z)
+            token = " ".join(entry)
+            f = float(c) / total
+
+            # bow
+            bow = None
+            if n < (len(self._ngramcounts)-1):
+                bow = 0
+                if token == self._es:
+                    bow = -99
+
+            # Adjust f if unigram(start-sent), then append
+            if token == self._ss:
+                if tolog is True:
+                    yield self._ss, -99., bow
+                else:
+                    yield self._ss, 0., bow
+            else:
+                if tolog is False:
+                    yield token, f, bow
+                else:
+                    yield token, math.log(f, 10.), bow
 
-        for n in range(len(self._ngramcounts)):
-            # n is the index in ngramcounts, i.e. the expected order-1.
+# ---------------------------------------------------------------------------
 
-            ngram = []
-            oldhist = ""
-            for entry in self._ngramcounts[n].get_ngrams():
 
-                total = 0
-                # Estimates c(a_)
-                if n == 0:
-                    # unigrams
-                    total = float(self._ngramcounts[n].get_ncount())
-                else:
-                    hist = " ".join(entry[:-1])
-                    hist = hist.strip()
-                    if hist != oldhist:
-                        if hist == self._ss:
-                            total = float(
-                                self._ngramcounts[n-1].get_count(self._es))
-                        else:
-                            total = float(
-                                self._ngramcounts[n-1].get_count(hist))
-
-                # Estimates c(a_z)
-                token = " ".join(entry)
-                c = self._ngramcounts[n].get_count(token)
-
-                # Estimates p(a_z)
-                f = float(c) / total
-
-                # bow
-                bow = None
-                if n < (len(self._ngramcounts)-1):
-                    bow = 0
-                    if token == self._es:
-                        bow = -99
-
-                # Adjust f if unigram(start-sent), then append
-                if token == self._ss:
-                    if tolog is True:
-                        ngram.append((self._ss, -99., bow))
-                    else:
-                        ngram.append((self._ss, 0., bow))
-                else:
-                    if tolog is False:
-                        ngram.append((token, f, bow))
-                    else:
-                        ngram.append((token, math.log(f, 10.), bow))
+class sppasNgramsProbas(object):
+    """The n-gram probabilities of a given order, estimated on demand.
 
-            models.append(ngram)
+    :organization: Laboratoire Parole et Langage, Aix-en-Provence, France
+    :license:      GPL, v3
+    :copyright:    Copyright (C) 2011-2021  Brigitte Bigi
+    :author:       Brigitte Bigi
+    :contact:      develop@sppas.org
 
-        return models
+    The number of n-grams is known but the probabilities are estimated
+    only while iterating.
+
+    """
+
+    def __init__(self, size, estimator, *args):
+        """Create a sppasNgramsProbas instance.
+
+        :param size: (int) Number of n-grams
+        :param estimator: (function) Generator of the probabilities
+        :param args: Arguments of the estimator
+
+        """
+        self.__size = size
+        self.__estimator = estimator
+        self.__args = args
+
+    def __len__(self):
+        return self.__size
+
+    def __iter__(self):
+        for t in self.__estimator(*self.__args):
+            yield t
 
 # ---------------------------------------------------------------------------
 
@@ -401,6 +448,13 @@ class sppasNgramCounter(object):
     :author:       Brigitte Bigi
     :contact:      develop@sppas.org
 
+    Tokens are interned: each one is stored only once in a vocabulary and
+    the n-grams are counted as tuples of the integer identifiers of their
+    tokens. Strings are re-created only when the n-grams are requested.
+
+    Two counters of the same order can be merged, which allows to count
+    n-grams of several data files in parallel.
+
     """
 
     def __init__(self, n=1, wordslist=None):
@@ -417,11 +471,25 @@ class sppasNgramCounter(object):
         self._n = n   # n-gram order to count
         self._ss = START_SENT_SYMBOL
         self._es = END_SENT_SYMBOL
-        self._datacounts = collections.defaultdict(lambda: None)
         self._wordslist = wordslist
         self._nsent = 0   # number of sentences (estimated)
         self._ncount = 0   # number of observed n-grams (estimated)
 
+        # Interned tokens: token -> identifier, and identifier -> token
+        self._ids = dict()
+        self._tokens = list()
+        self._ss_id = self._intern(self._ss)
+        self._es_id = self._intern(self._es)
+
+        # key=tuple of token identifiers, value=count
+        self._datacounts = collections.Counter()
+
+    # -----------------------------------------------------------------------
+
+    def get_order(self):
+        """Return the n-gram order value."""
+        return self._n
+
     # -----------------------------------------------------------------------
 
     def get_ngrams(self):
@@ -430,7 +498,37 @@ class sppasNgramCounter(object):
         :returns: list of tuples
 
         """
-        return sorted(self._datacounts.keys())
+        return [entry for entry, c in self.get_ngrams_counts()]
+
+    # -----------------------------------------------------------------------
+
+    def get_ngrams_counts(self):
+        """Get the list of alphabetically-ordered n-grams with their count.
+
+        :returns: list of tuples (n-gram, count)
+
+        """
+        # Sorting integers is much faster than sorting tuples of strings:
+        # the identifiers are replaced by the alphabetical rank of their
+        # token and the ranks of a n-gram are packed into a single integer.
+        tokens = self._tokens
+        size = len(tokens)
+        rank = [0] * size
+        for r, i in enumerate(sorted(range(size), key=tokens.__getitem__)):
+            rank[i] = r
+
+        packed = list()
+        for key in self._datacounts:
+            p = 0
+            for i in key:
+                p = p * size + rank[i]
+            packed.append((p, key))
+        packed.sort()
+
+        counts = self._datacounts
+        get_token = tokens.__getitem__
+        return [(tuple(map(get_token, key)), counts[key])
+                for p, key in packed]
 
     # -----------------------------------------------------------------------
 
@@ -441,7 +539,13 @@ class sppasNgramCounter(object):
         :returns: (int)
 
         """
-        return self._datacounts.get(ngram, 0)
+        key = list()
+        for token in ngram:
+            i = self._ids.get(token, None)
+            if i is None:
+                return 0
+            key.append(i)
+        return self._datacounts.get(tuple(key), 0)
 
     # -----------------------------------------------------------------------
 
@@ -452,8 +556,7 @@ class sppasNgramCounter(object):
         :returns: (int)
 
         """
-        tt = tuple(sequence.split())
-        return self._datacounts.get(tt, 0)
+        return self.get_ngram_count(sequence.split())
 
     # -----------------------------------------------------------------------
 
@@ -477,22 +580,37 @@ class sppasNgramCounter(object):
 
         """
         for filename in datafiles:
-            parser = sppasTrsRW(filename)
-            trs = parser.read()
-            if len(trs) == 0:
-                continue
-
-            tier = trs[0]
-            for ann in tier:
-                labels = ann.get_labels()
-                for label in labels:
-                    for tag, score in label:
-                        if tag.is_empty() is False and\
-                           tag.is_silence() is False:
-                            self.append_sentence(tag.get_content())
+            for sentence in sppasNgramCounter.read_sentences(filename):
+                self.append_sentence(sentence)
 
         if self._n == 1:
-            self._datacounts[((self._ss),)] = 0
+            self._datacounts[(self._ss_id,)] = 0
+
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def read_sentences(filename):
+        """Return the sentences of a data file.
+
+        :param filename: (str) If the file contains more than one tier,
+        only the first one is used.
+        :returns: (list of str)
+
+        """
+        parser = sppasTrsRW(filename)
+        trs = parser.read()
+        if len(trs) == 0:
+            return list()
+
+        sentences = list()
+        for ann in trs[0]:
+            for label in ann.get_labels():
+                for tag, score in label:
+                    if tag.is_empty() is False and\
+                       tag.is_silence() is False:
+                        sentences.append(tag.get_content())
+
+        return sentences
 
     # -----------------------------------------------------------------------
 
@@ -502,28 +620,53 @@ class sppasNgramCounter(object):
         :param sentence: (str) A sentence with tokens separated by whitespace.
 
         """
-        # get the list of observed tokens
-        symbols = self._sentence_to_tokens(sentence)
-
-        # get a list of ngrams from a list of tokens.
-        ngrams = list(zip(*[symbols[i:] for i in range(self._n)]))
-
-        # append the list of ngrams into a dictionary of such items.
-        for each in ngrams:
+        # get the list of identifiers of the observed tokens
+        tokens = self._sentence_to_tokens(sentence)
+        ids = list(map(self._ids.get, tokens))
+        if None in ids:
+            ids = [self._intern(token) for token in tokens]
 
-            v = 1 + self._datacounts.get(each, 0)
-            self._datacounts[each] = v
+        # count the ngrams of the list of identifiers.
+        datacounts = self._datacounts
+        datacounts.update(zip(*[ids[i:] for i in range(self._n)]))
+        nb_ngrams = max(0, len(ids) - self._n + 1)
 
         if self._n == 1:
-            self._datacounts[((self._ss),)] = 0
+            datacounts[(self._ss_id,)] = 0
 
         self._nsent = self._nsent + 1
-        self._ncount = self._ncount + len(ngrams) - 1
+        self._ncount = self._ncount + nb_ngrams - 1
         # notice that we don't add count of sent-start,
         # but we add it for sent-end
 
     # -----------------------------------------------------------------------
 
+    def merge(self, other):
+        """Add the counts of another counter of the same order into self.
+
+        The vocabulary of other is re-mapped into the one of self.
+
+        :param other: (sppasNgramCounter)
+        :raises: NgramOrderValueError
+
+        """
+        if other.get_order() != self._n:
+            raise NgramOrderValueError(self._n, self._n, other.get_order())
+
+        remap = [self._intern(token) for token in other._tokens]
+        if remap == list(range(len(remap))):
+            # same identifiers in both vocabularies
+            self._datacounts.update(other._datacounts)
+        else:
+            self._datacounts.update(
+                {tuple(remap[i] for i in key): c
+                 for key, c in other._datacounts.items()})
+
+        self._nsent += other._nsent
+        self._ncount += other._ncount
+
+    # -----------------------------------------------------------------------
+
     def shave(self, value):
         """Remove data if count is lower than the given value.
 
@@ -534,7 +677,7 @@ class sppasNgramCounter(object):
         # so... 2 steps: we store keys to delete, then we pop them!
         topop = []
         for k, c in self._datacounts.items():
-            if k[0] == self._ss or k[0] == self._es:
+            if k[0] == self._ss_id or k[0] == self._es_id:
                 continue
             if c < value:
                 topop.append(k)
@@ -545,6 +688,22 @@ class sppasNgramCounter(object):
     # Private
     # -----------------------------------------------------------------------
 
+    def _intern(self, token):
+        """Return the identifier of a token; add it to the vocab if needed.
+
+        :param token: (str)
+        :returns: (int)
+
+        """
+        i = self._ids.get(token, None)
+        if i is None:
+            i = len(self._tokens)
+            self._ids[token] = i
+            self._tokens.append(token)
+        return i
+
+    # -----------------------------------------------------------------------
+
     def _sentence_to_tokens(self, sentence):
         """Return the (ordered) list of tokens of the given sentence.
 
@@ -569,3 +728,37 @@ class sppasNgramCounter(object):
         if tokens[-1] != self._es:
             tokens.append(self._es)
         return tokens
+
+    # -----------------------------------------------------------------------
+    # Overloads
+    # -----------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self._datacounts)
+
+# ---------------------------------------------------------------------------
+
+
+def count_ngrams(order, wordslist, datafiles):
+    """Count the n-grams of all orders up to the given one from data files.
+
+    Each file is read only once. This function is the task of the workers
+    of sppasNgramsModel.count().
+
+    :param order: (int) Maximum n-gram order
+    :param wordslist: (sppasVocabulary) a list of accepted tokens or None.
+    :param datafiles: (list) File names, with UTF-8 encoding.
+    :returns: (list of sppasNgramCounter) One counter for each order
+
+    """
+    counters = [sppasNgramCounter(n+1, wordslist) for n in range(order)]
+    for filename in datafiles:
+        sentences = sppasNgramCounter.read_sentences(filename)
+        for ngram_counter in counters:
+            for sentence in sentences:
+                ngram_counter.append_sentence(sentence)
+
+    # Add the start-sentence symbol into the unigrams
+    counters[0].count()
+
+    return counters
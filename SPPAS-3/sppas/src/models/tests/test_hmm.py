@@ -1,6 +1,7 @@
 # -*- coding:utf-8 -*-
 
 import unittest
+import copy
 import os
 
 from sppas.src.utils.compare import sppasCompare
@@ -129,3 +130,10 @@ class TestHMMinterpolation(unittest.TestCase):
         self.assertTrue(sp.equals(sts, ahmm1.definition['states']))
         sts = self.lin.linear_states(states, [0, 1])
         self.assertTrue(sp.equals(sts, ahmm2.definition['states']))
+
+        # the interpolated states do not share data with the given ones
+        expected = copy.deepcopy(states)
+        sts = self.lin.linear_states(states, [0.5, 0.5])
+        sts[0]['state']['streams'][0]['mixtures'][0]['pdf']['mean']['vector'][0] = 100.
+        sts[0]['state']['streams'][0]['mixtures'][0]['pdf']['gconst'] = 100.
+        self.assertTrue(sp.equals(expected, states))
@@ -12,6 +12,10 @@ from sppas.src.utils.compare import sppasCompare
 
 from ..acm.acmbaseio import sppasBaseIO
 from ..acm.readwrite import sppasACMRW
+from ..acm.acmodelhtkio import sppasHtkIO
+from ..acm.acmodelhtkio import HtkModelParser
+from ..acm.acmodelhtkio import HtkModelSemantics
+from ..acm.htkparser import sppasHtkParser
 from ..modelsexc import MioFolderError
 from ..modelsexc import MioFileFormatError
 
@@ -85,6 +89,68 @@ class TestMIO(unittest.TestCase):
         # model = rw.read()
         # self.assertEqual(len(model), 1368)   # monophones, biphones, triphones
 
+    def test_htk_parser(self):
+        # The parser and the grammar-based one return the same model
+        for filename in ("1-hmmdefs", "2-hmmdefs", "N-hmm",
+                         os.path.join("protos", "macros"),
+                         os.path.join("protos", "vFloors"),
+                         os.path.join("protos", "sil.hmm"),
+                         os.path.join("protos", "proto.hmm")):
+            with open(os.path.join(DATA, filename), "r") as fp:
+                text = fp.read()
+            expected = HtkModelParser().parse(text,
+                                              rule_name='model',
+                                              ignorecase=True,
+                                              semantics=HtkModelSemantics(),
+                                              comments_re="\\(\\*.*?\\*\\)")
+            model = sppasHtkParser().parse(text)
+            self.assertEqual(list(expected.keys()), list(model.keys()))
+            self.assertTrue(sppasCompare().equals(expected, model))
+
+        # Unsupported parts of the format
+        with self.assertRaises(MioFileFormatError):
+            sppasHtkParser().parse("~h \"a\"\n<BeginHMM> <NumStates> 3 "
+                                   "<State> 2 <TMix> mix 1.0 <TransP> 3 "
+                                   "0 1 0 0 0.5 0.5 0 0 0 <EndHMM>")
+        with self.assertRaises(MioFileFormatError):
+            sppasHtkParser().parse("~o <VecSize> 2 <MFCC> 12")
+
+    def test_dump(self):
+        folder = os.path.join(TEMP, "protos")
+        model = sppasHtkIO()
+        model.read(folder)
+        model.write(folder, "hmmdefs")
+        dump_file = os.path.join(folder, "hmmdefs.dump")
+        self.assertFalse(os.path.exists(dump_file))
+
+        # The dump is created at the first read of the folder
+        model1 = sppasHtkIO()
+        model1.read(folder)
+        self.assertTrue(os.path.exists(dump_file))
+        model2 = sppasHtkIO()
+        model2.read(folder)
+        self.assertEqual(len(model1.get_hmms()), len(model2.get_hmms()))
+        sp = sppasCompare()
+        for hmm1, hmm2 in zip(model1.get_hmms(), model2.get_hmms()):
+            self.assertEqual(hmm1.get_name(), hmm2.get_name())
+            self.assertTrue(sp.equals(hmm1.get_definition(), hmm2.get_definition()))
+        self.assertTrue(sp.equals(model1.get_macros(), model2.get_macros()))
+
+        # The dump is not used anymore if hmmdefs is modified
+        model2.pop_hmm(model2.get_hmms()[0].get_name())
+        model2.write(folder, "hmmdefs")
+        stat = os.stat(dump_file)
+        os.utime(os.path.join(folder, "hmmdefs"),
+                 (stat.st_atime + 1, stat.st_mtime + 1))
+        model3 = sppasHtkIO()
+        model3.read(folder)
+        self.assertEqual(len(model2.get_hmms()), len(model3.get_hmms()))
+
+        # No dump
+        os.remove(dump_file)
+        model3.read(folder, nodump=True)
+        self.assertFalse(os.path.exists(dump_file))
+
     def test_load_save(self):
         self._test_load_save(os.path.join(MODEL_PATH, "models-jpn"))
         self._test_load_save(os.path.join(MODEL_PATH, "models-nan"))
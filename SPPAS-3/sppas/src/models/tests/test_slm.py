@@ -141,6 +141,35 @@ class TestNgramCounter(unittest.TestCase):
         self.assertEqual(ngramcounter.get_count(START_SENT_SYMBOL), 0)
         self.assertEqual(ngramcounter.get_count(END_SENT_SYMBOL), 3)
 
+    def testMerge(self):
+        c1 = sppasNgramCounter(2)
+        c1.append_sentence(self.sent1)
+        c2 = sppasNgramCounter(2)
+        c2.append_sentence(self.sent3)
+        c2.append_sentence(self.sent2)
+        c1.merge(c2)
+
+        ngramcounter = sppasNgramCounter(2)
+        ngramcounter.count(self.corpusfile)
+        self.assertEqual(ngramcounter.get_ngrams_counts(), c1.get_ngrams_counts())
+        self.assertEqual(ngramcounter.get_ncount(), c1.get_ncount())
+        self.assertEqual(c1.get_count('d c'), 2)
+
+        with self.assertRaises(NgramOrderValueError):
+            c1.merge(sppasNgramCounter(3))
+
+    def testNgramsCounts(self):
+        ngramcounter = sppasNgramCounter(2)
+        ngramcounter.append_sentence("b a b")
+        self.assertEqual(
+            [((START_SENT_SYMBOL, 'b'), 1), (('a', 'b'), 1),
+             (('b', END_SENT_SYMBOL), 1), (('b', 'a'), 1)],
+            ngramcounter.get_ngrams_counts())
+        self.assertEqual([e for e, c in ngramcounter.get_ngrams_counts()],
+                         ngramcounter.get_ngrams())
+        self.assertEqual(1, ngramcounter.get_ngram_count(('a', 'b')))
+        self.assertEqual(0, ngramcounter.get_ngram_count(('a', 'z')))
+
 # ---------------------------------------------------------------------------
 
 
@@ -344,6 +373,36 @@ class TestNgramsModel(unittest.TestCase):
             if token == "a b"+END_SENT_SYMBOL:
                 self.assertEqual(round(value, 6), round(math.log(0.428571, 10), 6))
 
+    def testParallelCount(self):
+        files = list()
+        for i, sent in enumerate((self.sent1, self.sent2, self.sent3) * 2):
+            files.append(os.path.join(TEMP, "corpus{:d}.txt".format(i)))
+            with open(files[-1], "w") as f:
+                f.write(sent + "\n")
+                f.write("a b c d\n")
+
+        serial = sppasNgramsModel(3)
+        serial.set_min_count(2)
+        serial.count(*files)
+        parallel = sppasNgramsModel(3)
+        parallel.set_min_count(2)
+        parallel.count(*files, nb_workers=3)
+
+        for c1, c2 in zip(serial._ngramcounts, parallel._ngramcounts):
+            self.assertEqual(c1.get_ngrams_counts(), c2.get_ngrams_counts())
+            self.assertEqual(c1.get_ncount(), c2.get_ncount())
+        self.assertEqual(serial.probabilities("logml"),
+                         parallel.probabilities("logml"))
+
+    def testStreamProbabilities(self):
+        model = sppasNgramsModel(3)
+        model.count(self.corpusfile)
+        for method in ("raw", "lograw", "ml", "logml"):
+            probas = model.probabilities(method)
+            streams = model.probabilities(method, stream=True)
+            self.assertEqual([len(p) for p in probas], [len(p) for p in streams])
+            self.assertEqual(probas, [list(p) for p in streams])
+
 # ---------------------------------------------------------------------------
 
 
@@ -380,6 +439,12 @@ class TestSLM(unittest.TestCase):
         arpaio.set(probas)
         arpaio.save(fn1)
 
+        fn3 = os.path.join(TEMP, "model3.arpa")
+        arpaio.set(model.probabilities("logml", stream=True))
+        arpaio.save(fn3)
+        with open(fn1) as f1, open(fn3) as f3:
+            self.assertEqual(f1.read(), f3.read())
+
         slm1 = sppasSLM()
         slm1.load_from_arpa(fn1)
         slm1.save_as_arpa(fn2)
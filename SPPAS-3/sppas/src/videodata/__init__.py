@@ -109,6 +109,7 @@ if cfg.feature_installed("video") is True:
     from .videocoords import sppasCoordsVideoWriter
     from .videocoords import sppasCoordsVideoReader
     from .videoutils import sppasImageVideoWriter
+    from .videosegments import sppasVideoSegments
     video_extensions = sppasVideoWriter.get_extensions()
 
 else:
@@ -151,6 +152,10 @@ else:
         pass
 
 
+    class sppasVideoSegments(sppasVideodataError):
+        pass
+
+
 # ---------------------------------------------------------------------------
 
 
@@ -165,6 +170,7 @@ __all__ = (
     "sppasCoordsVideoBuffer",
     "sppasCoordsVideoWriter",
     "sppasCoordsVideoReader",
+    "sppasVideoSegments",
     "video_extensions",
 )
 
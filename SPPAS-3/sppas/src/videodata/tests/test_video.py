@@ -99,6 +99,43 @@ class TestVideoReader(unittest.TestCase):
         bv.seek(200)
         self.assertEqual(200, bv.tell())
 
+        # seek forward by grabbing frames, then backward
+        frame = bv.read_frame()
+        bv.seek(205)
+        self.assertEqual(205, bv.tell())
+        bv.seek(200)
+        self.assertEqual(200, bv.tell())
+        self.assertTrue(np.array_equal(frame, bv.read_frame()))
+        self.assertEqual(201, bv.tell())
+
+        # seek to the current position
+        bv.seek(201)
+        self.assertEqual(201, bv.tell())
+
+    # -----------------------------------------------------------------------
+
+    def test_seek_indexed(self):
+        bv = sppasVideoReader()
+        bv.open(TestVideoReader.VIDEO)
+        timestamps = bv.get_timestamps()
+        self.assertEqual(bv.get_nframes(), len(timestamps))
+        self.assertTrue(os.path.exists(TestVideoReader.VIDEO + sppasVideoReader.INDEX_EXT))
+        frames = [bv.read_frame() for i in range(300)]
+        bv.close()
+        self.assertEqual(0, len(bv.get_timestamps()))
+
+        # the index is loaded from the dump file
+        bv.open(TestVideoReader.VIDEO)
+        self.assertEqual(timestamps, bv.get_timestamps())
+
+        # seek backward and far forward
+        for pos in (250, 100, 3, 299, 120):
+            bv.seek(pos)
+            self.assertEqual(pos, bv.tell())
+            self.assertTrue(np.array_equal(frames[pos], bv.read_frame()))
+            self.assertEqual(pos + 1, bv.tell())
+        bv.close()
+
     # -----------------------------------------------------------------------
 
     def test_read(self):
@@ -265,3 +302,40 @@ class TestVideoWriter(unittest.TestCase):
         os.remove(TestVideoWriter.VIDEO)
 
         # How to really test it??? the aspect of images; etc
+
+    # -----------------------------------------------------------------------
+
+    def test_write_queue(self):
+        if os.path.exists(TestVideoWriter.VIDEO):
+            os.remove(TestVideoWriter.VIDEO)
+        bv = sppasVideoWriter()
+        self.assertEqual(0, bv.get_queue_size())
+        with self.assertRaises(ValueError):
+            bv.set_queue_size(-1)
+        bv.set_queue_size(4)
+        self.assertEqual(4, bv.get_queue_size())
+
+        bv.open(TestVideoWriter.VIDEO)
+        with self.assertRaises(Exception):
+            bv.set_queue_size(0)
+        for i in range(20):
+            img = sppasImage(0).blank_image(704, 528)
+            img.fill(i * 10)
+            bv.write(img)
+        # the images of the queue are encoded when closing
+        bv.close()
+
+        reader = sppasVideoReader()
+        reader.open(TestVideoWriter.VIDEO)
+        self.assertEqual(20, reader.get_nframes())
+        reader.close()
+        os.remove(TestVideoWriter.VIDEO)
+
+        # an error of the encoding thread is raised when closing
+        bv.open(TestVideoWriter.VIDEO)
+        bv.write("not an image")
+        with self.assertRaises(Exception):
+            bv.close()
+        self.assertFalse(bv.is_opened())
+        bv.close()
+        os.remove(TestVideoWriter.VIDEO)
@@ -223,6 +223,53 @@ class TestVideoBuffer(unittest.TestCase):
 
     # -----------------------------------------------------------------------
 
+    def test_next_prefetch(self):
+        bv = sppasVideoReaderBuffer(TestVideoBuffer.VIDEO, size=50, overlap=5)
+        self.assertFalse(bv.get_prefetch())
+        bp = sppasVideoReaderBuffer(TestVideoBuffer.VIDEO, size=50, overlap=5)
+        bp.set_prefetch(True)
+        self.assertTrue(bp.get_prefetch())
+
+        # The same buffers are filled in, with or without prefetch
+        res = True
+        while res is True:
+            res = bv.next()
+            self.assertEqual(res, bp.next())
+            self.assertEqual(bv.get_buffer_range(), bp.get_buffer_range())
+            self.assertEqual(bv.tell_buffer(), bp.tell_buffer())
+            self.assertEqual(len(bv), len(bp))
+            for i in range(len(bv)):
+                self.assertTrue(np.array_equal(bv[i], bp[i]))
+
+        # Seeking invalidates the pre-fetched frames
+        bp.seek_buffer(100)
+        bp.next()
+        self.assertEqual((100, 144), bp.get_buffer_range())
+        bp.set_buffer_overlap(10)
+        bp.next()
+        self.assertEqual((140, 184), bp.get_buffer_range())
+        bp.close()
+        bv.close()
+
+    # -----------------------------------------------------------------------
+
+    def test_next_no_decode(self):
+        bv = sppasVideoReaderBuffer(TestVideoBuffer.VIDEO, size=50, overlap=5)
+        res = bv.next(decode=False)
+        self.assertTrue(res)
+        self.assertEqual(0, bv.tell())
+        self.assertEqual((0, 49), bv.get_buffer_range())
+        self.assertEqual([None]*50, list(bv))
+
+        # Last buffer is not full
+        bv.seek_buffer(bv.get_nframes()-15)
+        res = bv.next(decode=False)
+        self.assertFalse(res)
+        self.assertEqual(15, len(bv))
+        self.assertEqual((bv.get_nframes()-15, bv.get_nframes()-1), bv.get_buffer_range())
+
+    # -----------------------------------------------------------------------
+
     def test_eval_max_buffer_size(self):
         bv = sppasVideoReaderBuffer(None, size=-1, overlap=0)
         self.assertEqual(86, bv.get_buffer_size())
@@ -0,0 +1,104 @@
+"""
+    ..
+        ---------------------------------------------------------------------
+         ___   __    __    __    ___
+        /     |  \  |  \  |  \  /              the automatic
+        \__   |__/  |__/  |___| \__             annotation and
+           \  |     |     |   |    \             analysis
+        ___/  |     |     |   | ___/              of speech
+
+        http://www.sppas.org/
+
+        Use of this software is governed by the GNU Public License, version 3.
+
+        SPPAS is free software: you can redistribute it and/or modify
+        it under the terms of the GNU General Public License as published by
+        the Free Software Foundation, either version 3 of the License, or
+        (at your option) any later version.
+
+        SPPAS is distributed in the hope that it will be useful,
+        but WITHOUT ANY WARRANTY; without even the implied warranty of
+        MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+        GNU General Public License for more details.
+
+        You should have received a copy of the GNU General Public License
+        along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+        This banner notice must not be removed.
+
+        ---------------------------------------------------------------------
+
+    src.videodata.tests.test_videosegments.py
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+"""
+
+import unittest
+import os
+
+from sppas.src.config import paths
+from sppas.src.config import NegativeValueError
+from sppas.src.config import IntervalRangeException
+
+from ..videosegments import sppasVideoSegments
+
+# ---------------------------------------------------------------------------
+
+
+def frame_indexes(video, start, end, offset):
+    """Return a result for each frame of a segment."""
+    return [i + offset for i in range(start, end)]
+
+# ---------------------------------------------------------------------------
+
+
+class TestVideoSegments(unittest.TestCase):
+
+    VIDEO = os.path.join(paths.samples, "faces", "video_sample.mp4")
+
+    # -----------------------------------------------------------------------
+
+    def test_init(self):
+        with self.assertRaises(Exception):
+            sppasVideoSegments("toto.xxx")
+
+        segments = sppasVideoSegments(TestVideoSegments.VIDEO)
+        self.assertEqual(1181, segments.get_nframes())
+        self.assertEqual(1, segments.get_nb_workers())
+        self.assertEqual(0, segments.get_overlap())
+
+        with self.assertRaises(IntervalRangeException):
+            sppasVideoSegments(TestVideoSegments.VIDEO, nb_workers=0)
+        with self.assertRaises(NegativeValueError):
+            sppasVideoSegments(TestVideoSegments.VIDEO, overlap=-1)
+
+    # -----------------------------------------------------------------------
+
+    def test_segments(self):
+        segments = sppasVideoSegments(TestVideoSegments.VIDEO)
+        self.assertEqual([(0, 0, 1181)], segments.get_segments())
+
+        segments.set_nb_workers(2)
+        self.assertEqual([(0, 0, 590), (590, 590, 1181)],
+                         segments.get_segments())
+
+        segments.set_overlap(10)
+        self.assertEqual([(0, 0, 590), (580, 590, 1181)],
+                         segments.get_segments())
+
+        # segments are not smaller than MIN_SEGMENT_SIZE
+        segments.set_nb_workers(100)
+        self.assertEqual(1181 // sppasVideoSegments.MIN_SEGMENT_SIZE,
+                         len(segments.get_segments()))
+
+    # -----------------------------------------------------------------------
+
+    def test_map(self):
+        segments = sppasVideoSegments(TestVideoSegments.VIDEO)
+        expected = [i + 5 for i in range(1181)]
+        self.assertEqual(expected, segments.map(frame_indexes, 5))
+
+        # results are stitched in the order of the frames, without overlaps
+        segments.set_nb_workers(3)
+        segments.set_overlap(20)
+        self.assertEqual(expected, segments.map(frame_indexes, 5))
@@ -42,7 +42,10 @@ the opencv cv2.VideoCapture and cv2.VideoWriter.
 
 """
 
+import os
 import logging
+import threading
+import queue
 import numpy as np
 import cv2
 
@@ -51,6 +54,7 @@ from sppas.src.config import IntervalRangeException
 from sppas.src.config import RangeBoundsException
 from sppas.src.config import sppasKeyError
 from sppas.src.utils.datatype import bidict
+from sppas.src.resources import sppasDumpFile
 from sppas.src.imgdata import sppasImage
 
 from .videodataexc import VideoOpenError
@@ -86,12 +90,45 @@ class sppasVideoReader(object):
     >>> # Release the video stream
     >>> vid.close()
 
+    The current position is stored in order to avoid asking OpenCV to
+    seek, which decodes from the previous keyframe of most codecs: seeking
+    to the current position does nothing and seeking a few frames forward
+    only grabs the frames in between.
+
+    When a video file is opened for the first time, its frames are browsed
+    once to index the timestamp of each frame. This index is saved in a
+    dump file beside the video. The other seeks are then frame-accurate:
+    the video is seeked at the timestamp of a previous frame, the frame
+    really reached is found in the index from its timestamp, and the next
+    frames are grabbed until the expected one.
+
     """
 
+    # Max number of frames to grab instead of seeking forward
+    MAX_FORWARD_GRAB = 32
+
+    # Extension of the file with the index of the frames of a video
+    INDEX_EXT = ".frames"
+
+    # Max number of frames to go backward when seeking with the index
+    MAX_SEEK_BACKWARD = 256
+
+    # -----------------------------------------------------------------------
+
     def __init__(self):
         """Create a sppasVideoReader. """
         self.__video = cv2.VideoCapture()
         self.__lock = False
+        self.__pos = 0
+
+        # Properties of the video stream: they are not asked to OpenCV
+        # while a thread may be decoding frames.
+        self.__fps = 0.
+        self.__size = (0, 0)
+        self.__nframes = 0
+
+        # Timestamp of each frame of the video, in milliseconds
+        self.__timestamps = list()
 
         # Options to modify the image read from the video
         self.__rotate = 0.
@@ -160,6 +197,10 @@ class sppasVideoReader(object):
 
         # Create an OpenCV VideoCapture object and open the video
         self.__video = self.__open_video(video)
+        self.__fps = float(self.__video.get(cv2.CAP_PROP_FPS))
+        self.__size = (int(self.__video.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                       int(self.__video.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self.__nframes = int(self.__video.get(cv2.CAP_PROP_FRAME_COUNT))
 
         # Test the video under this platform...
         success = True
@@ -176,6 +217,53 @@ class sppasVideoReader(object):
 
         # Set the beginning of the video to the frame 0
         self.__video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.__pos = 0
+
+        # Index the timestamps of the frames of a video file
+        if isinstance(video, str) and os.path.isfile(video):
+            self.__load_index(video)
+
+    # -----------------------------------------------------------------------
+
+    def get_timestamps(self):
+        """Return the indexed timestamp of each frame, in milliseconds.
+
+        :return: (list) Empty list if the video is not indexed
+
+        """
+        return list(self.__timestamps)
+
+    # -----------------------------------------------------------------------
+
+    def __load_index(self, video):
+        """Load the index of the timestamps of the frames or create it.
+
+        :param video: (str) Video filename
+
+        """
+        fn, ext = os.path.splitext(video)
+        dump = sppasDumpFile(video, ext + sppasVideoReader.INDEX_EXT)
+        data = dump.load_from_dump()
+        if data is not None and data.get("video") == os.path.basename(video):
+            self.__timestamps = data["timestamps"]
+            return
+
+        # Browse the video to get the timestamp of each frame
+        self.__timestamps = list()
+        while self.__video.grab() is True:
+            self.__timestamps.append(self.__video.get(cv2.CAP_PROP_POS_MSEC))
+        self.__video.set(cv2.CAP_PROP_POS_FRAMES, 0)
+
+        # The frames can't be found from non-increasing timestamps
+        for t1, t2 in zip(self.__timestamps, self.__timestamps[1:]):
+            if t2 <= t1:
+                logging.warning("The frames of the video {} can't be indexed."
+                                "".format(video))
+                self.__timestamps = list()
+                return
+
+        dump.save_as_dump({"video": os.path.basename(video),
+                           "timestamps": self.__timestamps})
 
     # -----------------------------------------------------------------------
 
@@ -215,6 +303,8 @@ class sppasVideoReader(object):
         """Release the flow taken by the reading of the video."""
         self.__video.release()
         self.__lock = False
+        self.__pos = 0
+        self.__timestamps = list()
 
     # -----------------------------------------------------------------------
 
@@ -228,7 +318,9 @@ class sppasVideoReader(object):
             return None
         success, img = self.__video.read()
         if img is None or success is False:
+            self.__pos = int(self.__video.get(cv2.CAP_PROP_POS_FRAMES))
             return None
+        self.__pos += 1
 
         if process_image is False:
             return sppasImage(input_array=img)
@@ -295,13 +387,18 @@ class sppasVideoReader(object):
         if self.__lock is False:
             return 0
 
-        return int(self.__video.get(cv2.CAP_PROP_POS_FRAMES))
+        return self.__pos
 
     # -----------------------------------------------------------------------
 
     def seek(self, value):
         """Set a new frame position in the video.
 
+        Nothing is done if the position is the current one, and the frames
+        are grabbed if the position is at most MAX_FORWARD_GRAB frames
+        forward. Otherwise, the video stream is seeked with the index of
+        the frames or, if the video is not indexed, by OpenCV.
+
         :param value: (int)
         :raise: IOError, IntervalRangeException
 
@@ -309,9 +406,86 @@ class sppasVideoReader(object):
         if self.__lock is False:
             raise IOError("No video is opened: seek is not possible.")
         value = self.check_frame(value)
+        if value == self.__pos:
+            return
+
+        delta = value - self.__pos
+        if 0 < delta <= sppasVideoReader.MAX_FORWARD_GRAB:
+            while self.__pos < value:
+                if self.__video.grab() is False:
+                    break
+                self.__pos += 1
+            if self.__pos == value:
+                return
+
+        if self.__seek_indexed(value) is True:
+            return
+
         success = self.__video.set(cv2.CAP_PROP_POS_FRAMES, value)
         if success is False:
+            self.__pos = int(self.__video.get(cv2.CAP_PROP_POS_FRAMES))
             raise IOError("Seek is not supported by your platform for this video.")
+        self.__pos = value
+
+    # -----------------------------------------------------------------------
+
+    def __seek_indexed(self, value):
+        """Set a new frame position in the video with the index of frames.
+
+        The video is seeked at the timestamp of a frame before the given
+        one. The frame really reached is found in the index from its
+        timestamp, then the next frames are grabbed until the given one.
+        If the frame reached is after the expected one, the video is seeked
+        further backward.
+
+        :param value: (int) A valid frame position
+        :return: (bool) False if the video is not indexed or the seek failed
+
+        """
+        if value == 0 or value > len(self.__timestamps):
+            return False
+
+        # The frame to be grabbed just before reading the expected one
+        target = value - 1
+        start = target
+        while target - start <= sppasVideoReader.MAX_SEEK_BACKWARD:
+            self.__video.set(cv2.CAP_PROP_POS_MSEC, self.__timestamps[start])
+            if self.__video.grab() is False:
+                break
+            current = self.__index_frame(self.__video.get(cv2.CAP_PROP_POS_MSEC))
+            if current <= target:
+                while current < target:
+                    if self.__video.grab() is False:
+                        break
+                    current += 1
+                if current == target:
+                    self.__pos = value
+                    return True
+                break
+            if start == 0:
+                break
+            start = max(0, start - 2 * (current - target))
+
+        logging.warning("The frame {:d} can't be reached with the index of "
+                        "frames.".format(value))
+        return False
+
+    # -----------------------------------------------------------------------
+
+    def __index_frame(self, timestamp):
+        """Return the index of the frame with the nearest timestamp.
+
+        :param timestamp: (float) Time in milliseconds
+        :return: (int)
+
+        """
+        idx = int(np.searchsorted(self.__timestamps, timestamp))
+        if idx == len(self.__timestamps):
+            return idx - 1
+        if idx > 0:
+            if timestamp - self.__timestamps[idx-1] < self.__timestamps[idx] - timestamp:
+                return idx - 1
+        return idx
 
     # -----------------------------------------------------------------------
 
@@ -348,7 +522,7 @@ class sppasVideoReader(object):
         """Return the FPS of the current video (float)."""
         if self.__lock is False:
             return 0
-        return float(self.__video.get(cv2.CAP_PROP_FPS))
+        return self.__fps
 
     # -----------------------------------------------------------------------
 
@@ -356,7 +530,7 @@ class sppasVideoReader(object):
         """Return the width of the frames in the video."""
         if self.__lock is False:
             return 0
-        return int(self.__video.get(cv2.CAP_PROP_FRAME_WIDTH))
+        return self.__size[0]
 
     # -----------------------------------------------------------------------
 
@@ -364,7 +538,7 @@ class sppasVideoReader(object):
         """Return the height of the frames in the video."""
         if self.__lock is False:
             return 0
-        return int(self.__video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        return self.__size[1]
 
     # -----------------------------------------------------------------------
 
@@ -372,7 +546,7 @@ class sppasVideoReader(object):
         """Return the number of frames in the video."""
         if self.__lock is False:
             return 0
-        return int(self.__video.get(cv2.CAP_PROP_FRAME_COUNT))
+        return self.__nframes
 
     # -----------------------------------------------------------------------
     # Private
@@ -411,12 +585,20 @@ class sppasVideoWriter(object):
     This class is embedding a VideoWriter() object and define some
     getters and setters to manage such video easily.
 
+    When a queue size is fixed, the images are resized and encoded by a
+    background thread: write() only puts the image into a bounded queue,
+    so that the encoding overlaps with the processing of the next images.
+    A written image must then not be modified by the caller.
+
     """
 
     # Actually, I don't know what exactly is the max value of cv2.VideoWriter
     # 1000 is the max my nvidia GE Force GT 80 accepts in its configuration
     MAX_FPS = 1000.
 
+    # Default number of images waiting to be encoded by the thread
+    DEFAULT_QUEUE_SIZE = 16
+
     # Associate a human-readable FOURCC code and a file extension
     FOURCC = {
         ".mp4": "mpv4",
@@ -470,6 +652,12 @@ class sppasVideoWriter(object):
         self.__lock = False        # True if a video stream is opened
         self.__nframes = 0         # number of images already been written
 
+        # Members to encode the images in a background thread
+        self.__queue_size = 0      # max nb of images in the queue. 0=no thread
+        self.__queue = None
+        self.__thread = None
+        self.__error = None        # exception raised by the thread
+
     # -----------------------------------------------------------------------
     # Getters and setters
     # -----------------------------------------------------------------------
@@ -603,6 +791,31 @@ class sppasVideoWriter(object):
             raise IntervalRangeException(value, 0., sppasVideoWriter.MAX_FPS)
         self._fps = value
 
+    # -----------------------------------------------------------------------
+
+    def get_queue_size(self):
+        """Return the max number of images waiting to be encoded (0=no thread)."""
+        return self.__queue_size
+
+    # -----------------------------------------------------------------------
+
+    def set_queue_size(self, value=DEFAULT_QUEUE_SIZE):
+        """Encode the images in a background thread through a bounded queue.
+
+        :param value: (int) Max number of images in the queue. 0 to encode synchronously.
+        :raise: VideoLockError, NegativeValueError
+
+        """
+        if self.__lock is True:
+            logging.error("The video queue can only be changed if the video "
+                          "stream is not already opened.")
+            raise VideoLockError
+
+        value = int(value)
+        if value < 0:
+            raise NegativeValueError(value)
+        self.__queue_size = value
+
     # -----------------------------------------------------------------------
     # Manage the video stream
     # -----------------------------------------------------------------------
@@ -631,6 +844,14 @@ class sppasVideoWriter(object):
             logging.error("Video {} can't be created: {}".format(video, str(e)))
             raise VideoWriteError(video)
 
+        # Start the thread encoding the images
+        self.__error = None
+        if self.__queue_size > 0:
+            self.__queue = queue.Queue(maxsize=self.__queue_size)
+            self.__thread = threading.Thread(target=self.__encode_queue)
+            self.__thread.daemon = True
+            self.__thread.start()
+
     # -----------------------------------------------------------------------
 
     def is_opened(self):
@@ -640,11 +861,29 @@ class sppasVideoWriter(object):
     # -----------------------------------------------------------------------
 
     def close(self):
-        """Release the flow taken by the reading of the video."""
+        """Release the flow taken by the writing of the video.
+
+        The images waiting in the queue are encoded before. The video is
+        released even if the encoding thread failed, then its error is
+        raised.
+
+        :raise: Exception raised by the encoding thread
+
+        """
+        if self.__thread is not None:
+            self.__queue.put(None)
+            self.__thread.join()
+            self.__thread = None
+            self.__queue = None
         self.__video.release()
         self.__lock = False
         self.__nframes = 0
 
+        error = self.__error
+        self.__error = None
+        if error is not None:
+            raise error
+
     # -----------------------------------------------------------------------
     # Getters and setters
     # -----------------------------------------------------------------------
@@ -708,10 +947,52 @@ class sppasVideoWriter(object):
     # -----------------------------------------------------------------------
 
     def write(self, image):
-        """Append an image to the video stream."""
+        """Append an image to the video stream.
+
+        :param image: (sppasImage) Image to append
+        :raise: Exception if no video is opened or the encoding failed
+
+        """
         if self.__lock is False:
             raise Exception("Actually there's no video stream defined.")
 
+        if self.__thread is None:
+            self.__write_image(image)
+        else:
+            if self.__error is not None:
+                raise self.__error
+            self.__queue.put(image)
+
+    # -----------------------------------------------------------------------
+    # Private
+    # -----------------------------------------------------------------------
+
+    def __encode_queue(self):
+        """Encode the images of the queue until None. Target of the thread.
+
+        Once an error occurred, the next images are ignored.
+
+        """
+        while True:
+            image = self.__queue.get()
+            if image is None:
+                break
+            if self.__error is None:
+                try:
+                    self.__write_image(image)
+                except Exception as e:
+                    logging.error("Image can't be encoded into the video: {}"
+                                  "".format(str(e)))
+                    self.__error = e
+
+    # -----------------------------------------------------------------------
+
+    def __write_image(self, image):
+        """Resize the image to the video size then encode it.
+
+        :param image: (sppasImage) Image to append
+
+        """
         # Resize the image and/or add black background all around and/or 
         # center...
         w, h = self._size
@@ -40,6 +40,7 @@
 """
 
 import logging
+import threading
 
 from sppas.src.config import NegativeValueError
 from sppas.src.config import IndexRangeException
@@ -68,6 +69,12 @@ class sppasVideoReaderBuffer(sppasVideoReader):
     Release the flow taken by the reading of the video:
     >>> v.close()
 
+    When the prefetch is enabled, the frames of the next buffer are decoded
+    by a background thread while the current one is processed. The video
+    stream is then owned by this thread: read() or seek() should not be
+    invoked between two calls to next().
+    >>> v.set_prefetch(True)
+
     """
 
     DEFAULT_BUFFER_SIZE = 100
@@ -89,6 +96,12 @@ class sppasVideoReaderBuffer(sppasVideoReader):
         """
         super(sppasVideoReaderBuffer, self).__init__()
 
+        # The thread decoding the next buffer and its result
+        self.__prefetch = False
+        self.__thread = None
+        self.__thread_stop = threading.Event()
+        self.__prefetched = None
+
         # Initialization of the buffer size and buffer overlaps
         self.__nb_img = 0
         self.__overlap = 0
@@ -130,6 +143,8 @@ class sppasVideoReaderBuffer(sppasVideoReader):
 
     def reset(self):
         """Reset the buffer but does not change anything to the video."""
+        self.__stop_prefetch()
+
         # List of images
         self.__images = list()
 
@@ -138,6 +153,29 @@ class sppasVideoReaderBuffer(sppasVideoReader):
 
     # -----------------------------------------------------------------------
 
+    def get_prefetch(self):
+        """Return True if the next buffer is decoded in background."""
+        return self.__prefetch
+
+    # -----------------------------------------------------------------------
+
+    def set_prefetch(self, value=True):
+        """Decode the frames of the next buffer while using the current one.
+
+        After each call to next(), a thread starts to read the frames of
+        the following buffer, so that the decoding of the video overlaps
+        with the processing of the images of the current buffer.
+
+        :param value: (bool) Enable or disable the prefetch
+
+        """
+        value = bool(value)
+        if value is False:
+            self.__stop_prefetch()
+        self.__prefetch = value
+
+    # -----------------------------------------------------------------------
+
     def get_buffer_size(self):
         """Return the defined size of the buffer."""
         return self.__nb_img
@@ -179,6 +217,7 @@ class sppasVideoReaderBuffer(sppasVideoReader):
             raise ValueError("The already defined overlap value {:d} can't be "
                              "greater than the buffer size.")
 
+        self.__stop_prefetch()
         self.__nb_img = value
         logging.info("The video buffer is set to {:d} images".format(self.__nb_img))
 
@@ -202,6 +241,7 @@ class sppasVideoReaderBuffer(sppasVideoReader):
         overlap = int(value)
         if overlap >= self.__nb_img or overlap < 0:
             raise ValueError
+        self.__stop_prefetch()
         self.__overlap = value
 
     # -----------------------------------------------------------------------
@@ -244,9 +284,14 @@ class sppasVideoReaderBuffer(sppasVideoReader):
 
     # -----------------------------------------------------------------------
 
-    def next(self):
+    def next(self, decode=True):
         """Fill in the buffer with the next sequence of images of the video.
 
+        If the images are not decoded, the buffer is filled in with None:
+        the frame indexes of the buffer are updated but the video stream
+        is not browsed at all.
+
+        :param decode: (bool) Read the images from the video
         :return: False if we reached the end of the video
 
         """
@@ -262,10 +307,18 @@ class sppasVideoReaderBuffer(sppasVideoReader):
 
         # Set the beginning position to read in the video
         start_frame = self.__buffer_idx[1] + 1
-        self.seek(start_frame)
 
-        # Launch and store the result of the reading
-        result = self.__load_frames(nb_frames)
+        # Launch and store the result of the reading, or get the frames
+        # the prefetch thread already read.
+        if decode is True:
+            result = self.__get_prefetched(start_frame, nb_frames)
+            if result is None:
+                self.seek(start_frame)
+                result = self.__load_frames(nb_frames)
+        else:
+            self.__stop_prefetch()
+            nb_frames = min(nb_frames, self.get_nframes() - start_frame)
+            result = [None] * nb_frames
         next_frame = start_frame + len(result)  #self.tell()
 
         # Update the buffer and the frame indexes with the current result
@@ -275,6 +328,10 @@ class sppasVideoReaderBuffer(sppasVideoReader):
         self.__images.extend(result)
         result.clear()
 
+        # Decode the frames of the next buffer while this one is used
+        if decode is True and self.__prefetch is True and next_frame < self.get_nframes():
+            self.__start_prefetch(next_frame, delta)
+
         return next_frame != self.get_nframes()
 
     # -----------------------------------------------------------------------
@@ -328,9 +385,78 @@ class sppasVideoReaderBuffer(sppasVideoReader):
     # Private
     # -----------------------------------------------------------------------
 
-    def __load_frames(self, nb_frames):
+    def __start_prefetch(self, start_frame, nb_frames):
+        """Start the thread reading the frames of the next buffer.
+
+        :param start_frame: (int) Index of the first frame to read
+        :param nb_frames: (int) Number of frames to read
+
+        """
+        self.__stop_prefetch()
+        self.__thread_stop.clear()
+        self.__thread = threading.Thread(target=self.__prefetch_frames,
+                                         args=(start_frame, nb_frames))
+        self.__thread.daemon = True
+        self.__thread.start()
+
+    # -----------------------------------------------------------------------
+
+    def __prefetch_frames(self, start_frame, nb_frames):
+        """Read the frames of the next buffer. Target of the thread.
+
+        :param start_frame: (int) Index of the first frame to read
+        :param nb_frames: (int) Number of frames to read
+
+        """
+        try:
+            self.seek(start_frame)
+            images = self.__load_frames(nb_frames, self.__thread_stop)
+        except Exception as e:
+            logging.error("Frames of the video can't be pre-fetched from "
+                          "{:d}: {:s}".format(start_frame, str(e)))
+            return
+        if self.__thread_stop.is_set() is False:
+            self.__prefetched = (start_frame, nb_frames, images)
+
+    # -----------------------------------------------------------------------
+
+    def __stop_prefetch(self):
+        """Stop the prefetch thread and forget its frames."""
+        if self.__thread is not None:
+            self.__thread_stop.set()
+            self.__thread.join()
+            self.__thread = None
+        self.__prefetched = None
+
+    # -----------------------------------------------------------------------
+
+    def __get_prefetched(self, start_frame, nb_frames):
+        """Return the frames read by the prefetch thread, if any.
+
+        :param start_frame: (int) Index of the expected first frame
+        :param nb_frames: (int) Expected number of frames
+        :returns: a list of sppasImage instances or None
+
+        """
+        if self.__thread is None:
+            return None
+        self.__thread.join()
+        self.__thread = None
+        prefetched = self.__prefetched
+        self.__prefetched = None
+        if prefetched is None:
+            return None
+        if prefetched[0] != start_frame or prefetched[1] != nb_frames:
+            return None
+        return prefetched[2]
+
+    # -----------------------------------------------------------------------
+
+    def __load_frames(self, nb_frames, stop_event=None):
         """Browse a sequence of a video.
 
+        :param nb_frames: (int) Number of frames to read
+        :param stop_event: (threading.Event) Interrupt the reading if set
         :returns: a list of sppasImage instances
 
         """
@@ -345,6 +471,8 @@ class sppasVideoReaderBuffer(sppasVideoReader):
 
         # Browse the video
         for i in range(nb_frames):
+            if stop_event is not None and stop_event.is_set():
+                break
             # Grab the next frame.
             image_array = self.read_frame()
             # Add the image in the storage list
@@ -48,6 +48,7 @@ from sppas.src.config import annots
 from sppas.src.config import sppasTrash
 from sppas.src.config import sppasExtensionWriteError
 from sppas.src.config import sppasTypeError
+from sppas.src.config import NegativeValueError
 from sppas.src.imgdata import sppasCoords
 from sppas.src.imgdata import sppasCoordsImageWriter
 from sppas.src.imgdata import image_extensions
@@ -88,11 +89,13 @@ class sppasCoordsVideoBuffer(sppasVideoReaderBuffer):
 
     # -----------------------------------------------------------------------
 
-    def next(self):
+    def next(self, decode=True):
         """Override. Fill in the buffer with the next images & reset coords.
 
+        :param decode: (bool) Read the images from the video
+
         """
-        ret = sppasVideoReaderBuffer.next(self)
+        ret = sppasVideoReaderBuffer.next(self, decode)
         self.__coords = [list()] * self.get_buffer_size()
         return ret
 
@@ -307,6 +310,9 @@ class sppasCoordsVideoWriter(object):
         self._folder = False  # save results as images in a folder
         self._fps = 25.       # default video framerate -- important
 
+        # Max number of images waiting to be encoded by the video writers
+        self._queue_size = sppasVideoWriter.DEFAULT_QUEUE_SIZE
+
         # The default output file extensions
         self._video_ext = annots.video_extension
         self._image_ext = annots.image_extension
@@ -371,6 +377,28 @@ class sppasCoordsVideoWriter(object):
 
     # -----------------------------------------------------------------------
 
+    def get_queue_size(self):
+        """Return the max number of images waiting to be encoded (0=no thread)."""
+        return self._queue_size
+
+    # -----------------------------------------------------------------------
+
+    def set_queue_size(self, value):
+        """Fix the max number of images waiting to be encoded of the videos.
+
+        The new value is applied to the next created video files.
+
+        :param value: (int) Number of images. 0 to encode synchronously.
+        :raise: NegativeValueError
+
+        """
+        value = int(value)
+        if value < 0:
+            raise NegativeValueError(value)
+        self._queue_size = value
+
+    # -----------------------------------------------------------------------
+
     def get_video_output(self):
         """Return True if images will be saved into a video, as it."""
         return self._video
@@ -389,6 +417,18 @@ class sppasCoordsVideoWriter(object):
 
     # -----------------------------------------------------------------------
 
+    def get_image_output(self):
+        """Return True if the images are required to save the results.
+
+        If not, only the coordinates are written: the video can be browsed
+        without decoding its images.
+
+        """
+        return self._video or self._folder or \
+            self._img_writer.options.get_tag_output()
+
+    # -----------------------------------------------------------------------
+
     def get_tag_output(self):
         """Return True if faces of the images will be surrounded."""
         return self._img_writer.options.get_tag_output()
@@ -443,12 +483,20 @@ class sppasCoordsVideoWriter(object):
         """Close all currently used sppasVideoWriter().
 
         It has to be invoked when writing buffers is finished in order to
-        release the video writers.
+        release the video writers. Both are released even if the encoding
+        of one of them failed, then the error is raised.
 
         """
-        if self._tag_video_writer is not None:
-            self._tag_video_writer.close()
-            self._tag_video_writer = None
+        video_writer = self._video_writer
+        tag_video_writer = self._tag_video_writer
+        self._video_writer = None
+        self._tag_video_writer = None
+        try:
+            if video_writer is not None:
+                video_writer.close()
+        finally:
+            if tag_video_writer is not None:
+                tag_video_writer.close()
 
     # -----------------------------------------------------------------------
 
@@ -521,8 +569,20 @@ class sppasCoordsVideoWriter(object):
                 mode = "a+"
 
         with codecs.open(out_csv_name, mode, encoding="utf-8") as fd:
-            for i in range(video_buffer.__len__()):
-                self.write_coords(fd, video_buffer, buffer_nb, i)
+            self.write_buffer_coords(fd, video_buffer, buffer_nb)
+
+    # -----------------------------------------------------------------------
+
+    def write_buffer_coords(self, fd, video_buffer, buffer_idx):
+        """Write the coords of all the images of the buffer into the stream.
+
+        :param fd: (Stream) File descriptor, String descriptor, stdout, etc
+        :param video_buffer: (sppasCoordsVideoBuffer)
+        :param buffer_idx: (int) Buffer number
+
+        """
+        for i in range(video_buffer.__len__()):
+            self.write_coords(fd, video_buffer, buffer_idx, i)
 
     # -----------------------------------------------------------------------
 
@@ -713,6 +773,7 @@ class sppasCoordsVideoWriter(object):
             writer.set_size(w, h)
             writer.set_fps(self._fps)
             writer.set_aspect("extend")
+            writer.set_queue_size(self._queue_size)
             writer.open(filename)
         except Exception as e:
             logging.error("OpenCV failed to open the VideoWriter for file "
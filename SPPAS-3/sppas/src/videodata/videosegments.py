@@ -0,0 +1,201 @@
+# -*- coding : UTF-8 -*-
+"""
+:filename: sppas.src.videodata.videosegments.py
+:author:   Brigitte Bigi
+:contact:  develop@sppas.org
+:summary:  Process the segments of a video in parallel.
+
+.. _This file is part of SPPAS: <http://www.sppas.org/>
+..
+    -------------------------------------------------------------------------
+
+     ___   __    __    __    ___
+    /     |  \  |  \  |  \  /              the automatic
+    \__   |__/  |__/  |___| \__             annotation and
+       \  |     |     |   |    \             analysis
+    ___/  |     |     |   | ___/              of speech
+
+    Copyright (C) 2011-2021  Brigitte Bigi
+    Laboratoire Parole et Langage, Aix-en-Provence, France
+
+    Use of this software is governed by the GNU Public License, version 3.
+
+    SPPAS is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    SPPAS is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with SPPAS. If not, see <http://www.gnu.org/licenses/>.
+
+    This banner notice must not be removed.
+
+    -------------------------------------------------------------------------
+
+"""
+
+import logging
+import concurrent.futures
+
+from sppas.src.config import NegativeValueError
+from sppas.src.config import IntervalRangeException
+
+from .video import sppasVideoReader
+
+# ---------------------------------------------------------------------------
+
+
+class sppasVideoSegments(object):
+    """Split a video into segments and process them in a pool of processes.
+
+    The frames of the video are shared out into as many segments as
+    workers. Each segment can start some frames before its first frame,
+    so that a process depending on the previous images (a tracking, for
+    example) has time to converge. The results of the frames of such an
+    overlap are ignored.
+
+    The given function is invoked in a worker process with the video
+    filename, the index of the first frame to read, the index of the frame
+    to stop reading at, and the given arguments. It must return the list of
+    the results of all the frames it read. Results are stitched back in the
+    order of the frames, whatever the order the workers finish: the result
+    is the same as the one of a single process.
+
+    :Example:
+
+    >>> segments = sppasVideoSegments("my_video.mp4", nb_workers=4)
+    >>> # A list with the result of each frame of the video
+    >>> results = segments.map(my_function, arg1, arg2)
+
+    """
+
+    # Min number of frames of a segment
+    MIN_SEGMENT_SIZE = 100
+
+    # -----------------------------------------------------------------------
+
+    def __init__(self, video, nb_workers=1, overlap=0):
+        """Create a new instance.
+
+        :param video: (str) The video filename to process
+        :param nb_workers: (int) Max number of processes
+        :param overlap: (int) Number of frames to read before each segment
+        :raise: VideoOpenError, NegativeValueError, IntervalRangeException
+
+        """
+        reader = sppasVideoReader()
+        reader.open(video)
+        self.__nframes = reader.get_nframes()
+        reader.close()
+        self.__video = video
+
+        self.__nb_workers = 1
+        self.__overlap = 0
+        self.set_nb_workers(nb_workers)
+        self.set_overlap(overlap)
+
+    # -----------------------------------------------------------------------
+
+    def get_nframes(self):
+        """Return the number of frames of the video."""
+        return self.__nframes
+
+    # -----------------------------------------------------------------------
+
+    def get_nb_workers(self):
+        """Return the max number of processes."""
+        return self.__nb_workers
+
+    # -----------------------------------------------------------------------
+
+    def set_nb_workers(self, value=1):
+        """Set the max number of processes, i.e. of segments.
+
+        :param value: (int) Number of processes
+        :raise: IntervalRangeException
+
+        """
+        value = int(value)
+        if value < 1:
+            raise IntervalRangeException(value, 1, max(1, self.__nframes))
+        self.__nb_workers = value
+
+    # -----------------------------------------------------------------------
+
+    def get_overlap(self):
+        """Return the number of frames read before each segment."""
+        return self.__overlap
+
+    # -----------------------------------------------------------------------
+
+    def set_overlap(self, value=0):
+        """Set the number of frames to read before each segment.
+
+        :param value: (int) Number of frames
+        :raise: NegativeValueError
+
+        """
+        value = int(value)
+        if value < 0:
+            raise NegativeValueError(value)
+        self.__overlap = value
+
+    # -----------------------------------------------------------------------
+
+    def get_segments(self):
+        """Return the list of segments of the video.
+
+        Each segment is a tuple with the index of the first frame to read,
+        the index of its first frame and the index of the frame to stop at.
+
+        :return: (list of tuple)
+
+        """
+        nb = min(self.__nb_workers,
+                 self.__nframes // sppasVideoSegments.MIN_SEGMENT_SIZE)
+        nb = max(1, nb)
+
+        segments = list()
+        for i in range(nb):
+            start = (i * self.__nframes) // nb
+            end = ((i + 1) * self.__nframes) // nb
+            segments.append((max(0, start - self.__overlap), start, end))
+        return segments
+
+    # -----------------------------------------------------------------------
+
+    def map(self, function, *args):
+        """Process all the segments and return the result of each frame.
+
+        :param function: (callable) A picklable function to process a segment
+        :param args: Other arguments of the function
+        :return: (list) The result of each frame of the video
+
+        """
+        segments = self.get_segments()
+        nb = len(segments)
+        logging.info("The video is processed by {:d} segments".format(nb))
+
+        if nb == 1:
+            first, start, end = segments[0]
+            results = [function(self.__video, first, end, *args)]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(nb) as executor:
+                results = list(executor.map(
+                    function,
+                    [self.__video] * nb,
+                    [s[0] for s in segments],
+                    [s[2] for s in segments],
+                    *[[arg] * nb for arg in args]))
+
+        # Stitch the results of the segments, ignoring the overlaps
+        frames = list()
+        for (first, start, end), result in zip(segments, results):
+            frames.extend(result[start - first:end - first])
+
+        return frames